@@ -0,0 +1,73 @@
+"""
+Benchmark de compresión de respuestas (gzip / brotli)
+
+Mide tiempo de compresión y bytes resultantes por nivel para un listado de
+tareas sintético, usando el mismo success_response que las Lambdas.
+
+Lambda asigna CPU proporcional a la memoria (1 vCPU completa a 1769 MB), así
+que el tiempo local se escala por 1769 / --memory para estimar el costo real.
+
+Uso:
+    python benchmarks/bench_compression.py --tasks 2000 --memory 512
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'lambda', 'tasks-list'))
+
+from utils.response import success_response  # noqa: E402
+
+from fixtures import build_tasks  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FULL_VCPU_MEMORY_MB = 1769
+
+
+def measure(compress, raw, repeat):
+    """Retornar (mejor tiempo en ms, bytes comprimidos)"""
+    best = float('inf')
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(compress(raw))
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=2000, help='Tareas en el payload')
+    parser.add_argument('--memory', type=int, default=512, help='Memoria de la Lambda en MB')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeticiones por nivel (se toma el mejor)')
+    args = parser.parse_args()
+    
+    body = success_response(200, {'tasks': build_tasks(args.tasks), 'count': args.tasks})['body']
+    raw = body.encode('utf-8')
+    scale = FULL_VCPU_MEMORY_MB / args.memory
+    
+    print(f"Payload: {args.tasks} tareas, {len(raw) / 1024:.1f} KB sin comprimir")
+    print(f"Escala de CPU para {args.memory} MB: x{scale:.2f}\n")
+    print(f"{'codec':<12}{'nivel':>6}{'KB':>10}{'ratio':>8}{'ms local':>10}{'ms lambda':>11}")
+    
+    candidates = [('gzip', level, lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0))
+                  for level in range(1, 10)]
+    if brotli is not None:
+        candidates += [('brotli', quality, lambda data, quality=quality: brotli.compress(data, quality=quality))
+                       for quality in range(0, 12)]
+    
+    for codec, level, compress in candidates:
+        elapsed, size = measure(compress, raw, args.repeat)
+        print(f"{codec:<12}{level:>6}{size / 1024:>10.1f}{len(raw) / size:>8.1f}"
+              f"{elapsed:>10.2f}{elapsed * scale:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
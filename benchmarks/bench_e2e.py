@@ -0,0 +1,476 @@
+"""
+Benchmark end-to-end de los endpoints contra DynamoDB con datos sintéticos
+
+Siembra la tabla con la forma pedida (ver dataset.py) y, para cada
+endpoint, carga el app.py de su función en este proceso e invoca
+lambda_handler con eventos de API Gateway (REST, proxy) realistas: token
+válido, headers del cliente, pathParameters, requestContext y body JSON.
+Con --target router todos los requests pasan por api-router.
+
+Por endpoint reporta latencia p50/p95/p99, llamadas a DynamoDB por request
+(por tipo), items y bytes leídos y RCU/WCU consumidas (ddb_calls.py). Los
+endpoints de escritura consumen lo que crean los anteriores (tasks-delete
+borra las tareas de tasks-create, projects-delete los proyectos de
+projects-create), así el dataset no cambia de forma durante la corrida.
+
+Sin --endpoint-url la tabla vive en moto (en memoria): las latencias sirven
+para comparar commits entre sí, no como valor absoluto; las llamadas y la
+capacidad sí son las reales. Con DynamoDB Local la tabla se recrea vacía
+en cada corrida.
+
+Con --save se guardan los resultados; con --baseline se comparan y el
+script termina con código 1 si el p95 de algún endpoint empeoró más de
+--tolerance o si hace más llamadas a DynamoDB que antes.
+
+Uso:
+    python benchmarks/bench_e2e.py --shape small --save e2e-baseline.json
+    python benchmarks/bench_e2e.py --endpoint-url http://localhost:8000 --shape medium
+    python benchmarks/bench_e2e.py --users 50 --tasks-per-project 1000 --baseline e2e-baseline.json
+"""
+
+import argparse
+import base64
+import contextlib
+import gzip
+import importlib
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+# Sin las líneas EMF por request (el benchmark mide aparte)
+os.environ.setdefault('METRICS_ENABLED', 'false')
+
+from dataset import BENCH_PASSWORD, SHAPES, create_table, seed  # noqa: E402
+from ddb_calls import CallRecorder  # noqa: E402
+from fixtures import ROUTER  # noqa: E402
+
+from utils.auth_utils import generate_token  # noqa: E402
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'lambda')
+
+# Margen absoluto bajo el cual una diferencia de p95 se considera ruido
+NOISE_FLOOR_MS = 2
+
+
+@dataclass
+class Endpoint:
+    """Un endpoint: función que lo atiende, recurso de API Gateway y armado del request"""
+    function: str
+    method: str
+    resource: str
+    build: object
+    query: dict = None
+
+
+@dataclass
+class Scenario:
+    """Estado compartido entre endpoints durante la corrida"""
+    dataset: object
+    rng: random.Random
+    tokens: dict = field(default_factory=dict)
+    created_projects: list = field(default_factory=list)
+    created_tasks: list = field(default_factory=list)
+    
+    def user(self, user_id=None):
+        if user_id is None:
+            return self.rng.choice(self.dataset.users)
+        return next(u for u in self.dataset.users if u['userId'] == user_id)
+    
+    def membership(self):
+        return self.rng.choice(self.dataset.memberships)
+    
+    def owned(self):
+        return self.rng.choice(self.dataset.owned)
+
+
+class LambdaContext:
+    """Contexto mínimo con los atributos que expone el runtime de Lambda"""
+    
+    def __init__(self, function_name):
+        self.function_name = function_name
+        self.memory_limit_in_mb = 512
+        self.aws_request_id = str(uuid.uuid4())
+    
+    def get_remaining_time_in_millis(self):
+        return 30000
+
+
+# ==================== ESCENARIOS ====================
+# Cada build(scenario, i) retorna (userId o None, pathParameters, body)
+
+def _register(s, i):
+    return None, None, {'email': f"bench-new-{i}-{s.rng.getrandbits(32)}@example.com",
+                        'password': BENCH_PASSWORD, 'name': f"Nuevo {i}"}
+
+
+def _login(s, i):
+    return None, None, {'email': s.user()['email'], 'password': BENCH_PASSWORD}
+
+
+def _user_only(s, i):
+    return s.user()['userId'], None, None
+
+
+def _create_project(s, i):
+    return s.user()['userId'], None, {'name': f"Proyecto benchmark {i}", 'description': 'Creado por bench_e2e'}
+
+
+def _member_project(s, i):
+    user_id, project_id = s.membership()
+    return user_id, {'id': project_id}, None
+
+
+def _update_project(s, i):
+    user_id, project_id = s.owned()
+    return user_id, {'id': project_id}, {'status': 'active' if i % 2 else 'completed'}
+
+
+def _delete_project(s, i):
+    user_id, project_id = s.created_projects.pop()
+    return user_id, {'id': project_id}, None
+
+
+def _create_task(s, i):
+    user_id, project_id = s.membership()
+    return user_id, {'id': project_id}, {'title': f"Tarea benchmark {i}", 'description': 'Creada por bench_e2e'}
+
+
+def _update_task(s, i):
+    user_id, project_id = s.membership()
+    task_id = s.rng.choice(s.dataset.tasks[project_id])
+    return user_id, {'projectId': project_id, 'taskId': task_id}, {'status': ['pending', 'in_progress', 'completed'][i % 3]}
+
+
+def _delete_task(s, i):
+    user_id, project_id, task_id = s.created_tasks.pop()
+    return user_id, {'projectId': project_id, 'taskId': task_id}, None
+
+
+# En orden de ejecución: los deletes van después de los creates que consumen
+ENDPOINTS = [
+    Endpoint('auth-register', 'POST', '/auth/register', _register),
+    Endpoint('auth-login', 'POST', '/auth/login', _login),
+    Endpoint('auth-profile', 'GET', '/auth/me', _user_only),
+    Endpoint('projects-list', 'GET', '/projects', _user_only),
+    Endpoint('projects-create', 'POST', '/projects', _create_project),
+    Endpoint('projects-get', 'GET', '/projects/{id}', _member_project),
+    Endpoint('projects-update', 'PUT', '/projects/{id}', _update_project),
+    Endpoint('tasks-list', 'GET', '/projects/{id}/tasks', _member_project),
+    Endpoint('tasks-create', 'POST', '/projects/{id}/tasks', _create_task),
+    Endpoint('tasks-update', 'PUT', '/projects/{projectId}/tasks/{taskId}', _update_task),
+    Endpoint('tasks-export', 'GET', '/projects/{id}/export', _member_project),
+    Endpoint('tasks-delete', 'DELETE', '/projects/{projectId}/tasks/{taskId}', _delete_task),
+    Endpoint('projects-delete', 'DELETE', '/projects/{id}', _delete_project),
+]
+
+
+def build_event(endpoint, scenario, i, router, accept_encoding):
+    """
+    Evento de API Gateway (REST, integración proxy) para una iteración
+    
+    Returns:
+        (userId autenticado o None, evento)
+    """
+    user_id, path_parameters, body = endpoint.build(scenario, i)
+    
+    path = endpoint.resource
+    for name, value in (path_parameters or {}).items():
+        path = path.replace('{' + name + '}', value)
+    
+    headers = {
+        'Accept': 'application/json',
+        'Accept-Encoding': accept_encoding,
+        'Content-Type': 'application/json',
+        'Host': 'bench.execute-api.us-east-1.amazonaws.com',
+        'User-Agent': 'bench-e2e/1.0',
+        'X-Forwarded-For': '127.0.0.1',
+        'X-Forwarded-Proto': 'https',
+    }
+    if user_id:
+        token = scenario.tokens.get(user_id)
+        if token is None:
+            token = scenario.tokens[user_id] = generate_token(scenario.user(user_id))
+        headers['Authorization'] = f"Bearer {token}"
+    
+    resource = endpoint.resource
+    if router:
+        resource, path_parameters = '/{proxy+}', {'proxy': path.lstrip('/')}
+    
+    return user_id, {
+        'resource': resource,
+        'path': path,
+        'httpMethod': endpoint.method,
+        'headers': headers,
+        'multiValueHeaders': {k: [v] for k, v in headers.items()},
+        'queryStringParameters': endpoint.query,
+        'multiValueQueryStringParameters': {k: [v] for k, v in endpoint.query.items()} if endpoint.query else None,
+        'pathParameters': path_parameters,
+        'stageVariables': None,
+        'requestContext': {
+            'accountId': '123456789012',
+            'apiId': 'bench',
+            'resourcePath': resource,
+            'httpMethod': endpoint.method,
+            'path': f"/dev{path}",
+            'stage': 'dev',
+            'protocol': 'HTTP/1.1',
+            'requestId': str(uuid.uuid4()),
+            'requestTimeEpoch': int(time.time() * 1000),
+            'identity': {'sourceIp': '127.0.0.1', 'userAgent': headers['User-Agent']},
+        },
+        'body': json.dumps(body) if body is not None else None,
+        'isBase64Encoded': False,
+    }
+
+
+def decode_body(response):
+    """Body de la respuesta como texto, deshaciendo base64 y Content-Encoding"""
+    body = response.get('body') or ''
+    if not response.get('isBase64Encoded'):
+        return body
+    
+    raw = base64.b64decode(body)
+    encoding = (response.get('headers') or {}).get('Content-Encoding')
+    if encoding == 'gzip':
+        raw = gzip.decompress(raw)
+    elif encoding == 'br':
+        import brotli
+        raw = brotli.decompress(raw)
+    return raw.decode('utf-8')
+
+
+def remember_created(endpoint, scenario, user_id, response):
+    """Guardar lo que crean los endpoints de escritura para los deletes"""
+    if response['statusCode'] != 201 or endpoint.function not in ('projects-create', 'tasks-create'):
+        return
+    
+    data = json.loads(decode_body(response))['data']
+    if endpoint.function == 'projects-create':
+        scenario.created_projects.append((user_id, data['project']['projectId']))
+    else:
+        task = data['task']
+        scenario.created_tasks.append((user_id, task['projectId'], task['taskId']))
+
+
+@contextlib.contextmanager
+def function_app(function):
+    """
+    Importar app.py de una función en este proceso
+    
+    Todas las funciones tienen módulos app/utils/handlers con el mismo nombre,
+    así que se descartan los de la función anterior. El directorio queda en
+    sys.path mientras dura el bloque porque los handlers se importan lazy.
+    """
+    for name in list(sys.modules):
+        if name == 'app' or name.split('.')[0] in ('utils', 'handlers'):
+            del sys.modules[name]
+    
+    sys.path.insert(0, os.path.join(LAMBDA_DIR, function))
+    try:
+        yield importlib.import_module('app')
+    finally:
+        sys.path.pop(0)
+
+
+def percentile(values, pct):
+    """Percentil por rango más cercano"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def request_counts(usage):
+    """Contadores de un request que se pueden acotar en un presupuesto"""
+    return {'calls': usage['calls'], **usage['operations'],
+            'itemsRead': usage['itemsRead'], 'bytesRead': usage['bytesRead']}
+
+
+def run_endpoint(app, endpoint, scenario, recorder, iterations, warmup=0, router=False,
+                 accept_encoding='gzip, deflate, br'):
+    """Invocar un endpoint warmup + iterations veces y resumir las medidas"""
+    context = LambdaContext(ROUTER if router else endpoint.function)
+    latencies, sizes = [], []
+    statuses, totals, peak = Counter(), Counter(), Counter()
+    rcu = wcu = 0
+    
+    for i in range(warmup + iterations):
+        user_id, event = build_event(endpoint, scenario, i, router, accept_encoding)
+        
+        recorder.reset()
+        start = time.perf_counter()
+        response = app.lambda_handler(event, context)
+        elapsed = time.perf_counter() - start
+        
+        remember_created(endpoint, scenario, user_id, response)
+        if i < warmup:
+            continue
+        
+        usage = recorder.snapshot()
+        latencies.append(elapsed * 1000)
+        sizes.append(len(response.get('body') or ''))
+        statuses[str(response['statusCode'])] += 1
+        rcu += usage['rcu']
+        wcu += usage['wcu']
+        
+        counts = request_counts(usage)
+        totals.update(counts)
+        for name, value in counts.items():
+            peak[name] = max(peak[name], value)
+    
+    operations = sorted(k for k in totals if k not in ('calls', 'itemsRead', 'bytesRead'))
+    return {
+        'requests': iterations,
+        'status': dict(statuses),
+        'latencyMs': {
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'mean': statistics.fmean(latencies),
+            'max': max(latencies),
+        },
+        'ddb': {
+            'callsPerRequest': totals['calls'] / iterations,
+            'operationsPerRequest': {op: totals[op] / iterations for op in operations},
+            'itemsReadPerRequest': totals['itemsRead'] / iterations,
+            'bytesReadPerRequest': totals['bytesRead'] / iterations,
+            'rcuPerRequest': rcu / iterations,
+            'wcuPerRequest': wcu / iterations,
+            'maxPerRequest': dict(peak),
+        },
+        'responseBytes': statistics.fmean(sizes),
+    }
+
+
+def start_backend(endpoint_url=None):
+    """Apuntar boto3 a DynamoDB Local (endpoint_url) o arrancar moto en memoria"""
+    if endpoint_url:
+        os.environ['AWS_ENDPOINT_URL_DYNAMODB'] = endpoint_url
+        os.environ.setdefault('AWS_ACCESS_KEY_ID', 'local')
+        os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'local')
+    else:
+        try:
+            from moto import mock_aws
+        except ImportError:
+            raise SystemExit('Sin --endpoint-url se necesita moto: pip install "moto[dynamodb]"')
+        os.environ['AWS_ACCESS_KEY_ID'] = os.environ['AWS_SECRET_ACCESS_KEY'] = 'testing'
+        mock_aws().start()
+
+
+def recreate_table(table_name):
+    """Borrar la tabla si existe y crearla vacía"""
+    import boto3
+    dynamodb = boto3.resource('dynamodb')
+    if table_name in dynamodb.meta.client.list_tables()['TableNames']:
+        dynamodb.Table(table_name).delete()
+        dynamodb.meta.client.get_waiter('table_not_exists').wait(TableName=table_name)
+    return create_table(dynamodb, table_name)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=LAMBDA_DIR).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Retornar los endpoints con p95 o llamadas a DynamoDB peores que el baseline"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if not previous:
+            continue
+        
+        before, after = previous['latencyMs']['p95'], result['latencyMs']['p95']
+        if after > max(before * (1 + tolerance), before + NOISE_FLOOR_MS):
+            regressions.append((name, 'p95 ms', before, after))
+        
+        before, after = previous['ddb']['callsPerRequest'], result['ddb']['callsPerRequest']
+        if after > before + 1e-9:
+            regressions.append((name, 'llamadas DynamoDB', before, after))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shape', choices=sorted(SHAPES), default='small', help='Preset de forma del dataset')
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--projects-per-user', type=int)
+    parser.add_argument('--tasks-per-project', type=int)
+    parser.add_argument('--members-per-project', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=200, help='Requests medidos por endpoint')
+    parser.add_argument('--warmup', type=int, default=10, help='Requests previos no medidos')
+    parser.add_argument('--target', choices=['functions', 'router'], default='functions')
+    parser.add_argument('--endpoints', nargs='*', help='Funciones a medir (default: todas)')
+    parser.add_argument('--accept-encoding', default='gzip, deflate, br')
+    parser.add_argument('--endpoint-url', default=None, help='p.ej. http://localhost:8000 para DynamoDB Local')
+    parser.add_argument('--table', default='ProjectManagement-bench')
+    parser.add_argument('--save', help='Guardar resultados en este archivo JSON')
+    parser.add_argument('--baseline', help='Comparar contra un JSON guardado con --save')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Regresión de p95 permitida (0.2 = 20%%)')
+    args = parser.parse_args()
+    
+    shape = dict(SHAPES[args.shape])
+    for key in shape:
+        if getattr(args, key) is not None:
+            shape[key] = getattr(args, key)
+    
+    os.environ['TABLE_NAME'] = args.table
+    start_backend(args.endpoint_url)
+    table = recreate_table(args.table)
+    
+    start = time.perf_counter()
+    dataset = seed(table, seed=args.seed, **shape)
+    print(f"Dataset: {dataset.items} items en {time.perf_counter() - start:.1f} s ({shape})")
+    
+    recorder = CallRecorder().install()
+    scenario = Scenario(dataset=dataset, rng=random.Random(args.seed))
+    endpoints = [e for e in ENDPOINTS if not args.endpoints or e.function in args.endpoints]
+    
+    print(f"{'endpoint':<18}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'ddb/req':>9}{'items/req':>10}{'KB/req':>8}{'RCU/req':>9}{'WCU/req':>9}  status")
+    results = {}
+    for endpoint in endpoints:
+        with function_app(ROUTER if args.target == 'router' else endpoint.function) as app:
+            result = run_endpoint(app, endpoint, scenario, recorder, args.iterations, args.warmup,
+                                  args.target == 'router', args.accept_encoding)
+        results[endpoint.function] = result
+        
+        latency, ddb = result['latencyMs'], result['ddb']
+        print(f"{endpoint.function:<18}{latency['p50']:>9.2f}{latency['p95']:>9.2f}{latency['p99']:>9.2f}"
+              f"{ddb['callsPerRequest']:>9.2f}{ddb['itemsReadPerRequest']:>10.1f}{ddb['bytesReadPerRequest'] / 1024:>8.1f}"
+              f"{ddb['rcuPerRequest']:>9.2f}{ddb['wcuPerRequest']:>9.2f}  {result['status']}")
+    
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'backend': args.endpoint_url or 'moto',
+                'target': args.target,
+                'shape': shape,
+                'iterations': args.iterations,
+                'endpoints': results,
+            }, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, metric, before, after in regressions:
+            print(f"REGRESIÓN {name}: {metric} {before:.2f} -> {after:.2f}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Tiempo de pared por endpoint con y sin las lecturas en paralelo de utils.async_db
+
+Corre los endpoints de bench_e2e.py dos veces sobre el mismo dataset: con
+DB_FANOUT=false (todas las llamadas a DynamoDB una después de otra, como el
+código anterior) y con DB_FANOUT=true. Los endpoints que no hacen fan-out
+sirven de control: la diferencia tiene que quedar en el ruido.
+
+Moto responde en microsegundos, así que sin una latencia de red no hay nada
+que solapar: --latency-ms agrega esa espera a cada llamada (un hook de
+botocore antes del envío). El default se parece al p50 de un GetItem dentro
+de la región; con --endpoint-url y --latency-ms 0 se mide la red real.
+
+Para ver los BatchGetItem en paralelo de GET /projects hacen falta más de
+100 proyectos por usuario (--projects-per-user 250).
+
+Uso:
+    python benchmarks/bench_fanout.py
+    python benchmarks/bench_fanout.py --latency-ms 8 --endpoints projects-get tasks-list
+    python benchmarks/bench_fanout.py --users 4 --projects-per-user 250 --endpoints projects-list auth-profile
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+
+from bench_e2e import ENDPOINTS, Scenario, function_app, recreate_table, run_endpoint, start_backend
+from dataset import SHAPES, seed
+from ddb_calls import CallRecorder
+
+DEFAULT_ENDPOINTS = ['projects-get', 'projects-list', 'auth-profile', 'tasks-list']
+
+
+def install_latency(latency_ms):
+    """Esperar latency_ms antes de cada llamada a DynamoDB de la sesión por defecto"""
+    import boto3
+    
+    def delay(**kwargs):
+        time.sleep(latency_ms / 1000)
+    
+    boto3._get_default_session().events.register('before-call.dynamodb.*', delay)
+
+
+def run_mode(endpoint, fanout, dataset, recorder, args):
+    """Medir un endpoint con DB_FANOUT en el modo pedido (la función se reimporta)"""
+    os.environ['DB_FANOUT'] = 'true' if fanout else 'false'
+    
+    # Mismo seed en los dos modos: los mismos usuarios y proyectos en el mismo orden
+    scenario = Scenario(dataset=dataset, rng=random.Random(args.seed))
+    with function_app(endpoint.function) as app:
+        return run_endpoint(app, endpoint, scenario, recorder, args.iterations, args.warmup)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shape', choices=sorted(SHAPES), default='small', help='Preset de forma del dataset')
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--projects-per-user', type=int)
+    parser.add_argument('--tasks-per-project', type=int)
+    parser.add_argument('--members-per-project', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=100, help='Requests medidos por endpoint y modo')
+    parser.add_argument('--warmup', type=int, default=10, help='Requests previos no medidos')
+    parser.add_argument('--latency-ms', type=float, default=5, help='Latencia agregada a cada llamada (0 = ninguna)')
+    parser.add_argument('--endpoints', nargs='*', default=DEFAULT_ENDPOINTS, help='Funciones a medir')
+    parser.add_argument('--endpoint-url', default=None, help='p.ej. http://localhost:8000 para DynamoDB Local')
+    parser.add_argument('--table', default='ProjectManagement-fanout')
+    parser.add_argument('--save', help='Guardar resultados en este archivo JSON')
+    args = parser.parse_args()
+    
+    shape = dict(SHAPES[args.shape])
+    for key in shape:
+        if getattr(args, key) is not None:
+            shape[key] = getattr(args, key)
+    
+    os.environ['TABLE_NAME'] = args.table
+    start_backend(args.endpoint_url)
+    table = recreate_table(args.table)
+    dataset = seed(table, seed=args.seed, **shape)
+    print(f"Dataset: {dataset.items} items ({shape}), latencia agregada {args.latency_ms:g} ms por llamada")
+    
+    if args.latency_ms > 0:
+        install_latency(args.latency_ms)
+    recorder = CallRecorder().install()
+    
+    print(f"{'endpoint':<16}{'ddb/req':>8}{'sync p50':>10}{'async p50':>11}{'sync p95':>10}{'async p95':>11}{'ahorro p50':>12}")
+    results = {}
+    for endpoint in (e for e in ENDPOINTS if e.function in args.endpoints):
+        sync = run_mode(endpoint, False, dataset, recorder, args)
+        fanout = run_mode(endpoint, True, dataset, recorder, args)
+        results[endpoint.function] = {'sync': sync, 'fanout': fanout}
+        
+        before, after = sync['latencyMs'], fanout['latencyMs']
+        saved = before['p50'] - after['p50']
+        print(f"{endpoint.function:<16}{fanout['ddb']['callsPerRequest']:>8.2f}{before['p50']:>10.2f}{after['p50']:>11.2f}"
+              f"{before['p95']:>10.2f}{after['p95']:>11.2f}{saved:>8.2f} ms {100 * saved / before['p50']:>3.0f}%")
+    
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'shape': shape, 'latencyMs': args.latency_ms, 'endpoints': results}, f, indent=2)
+        print(f"Resultados en {args.save}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Respuesta y tiempo de los listados completos contra los mismos con ?fields=
+
+Corre projects-list, projects-get y tasks-list dos veces sobre el mismo
+dataset: sin parámetros (todos los atributos) y con los campos de una vista
+de tablero (FIELDS). Con fields el handler pide a DynamoDB un
+ProjectionExpression, así que baja lo que viaja por la red y lo que boto3
+parsea; las RCU no cambian porque DynamoDB cobra el item completo.
+
+Por default los proyectos son grandes (500 tareas) y cada tarea trae una
+descripción de --description-bytes, que es el caso donde más pesa leer
+atributos que la vista no muestra. Las respuestas se miden sin comprimir
+(Accept-Encoding: identity).
+
+Uso:
+    python benchmarks/bench_fields.py
+    python benchmarks/bench_fields.py --tasks-per-project 1000 --description-bytes 4096
+    python benchmarks/bench_fields.py --endpoints tasks-list --save fields.json
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+from dataclasses import replace
+
+from bench_e2e import ENDPOINTS, Scenario, function_app, recreate_table, run_endpoint, start_backend
+from dataset import seed
+from ddb_calls import CallRecorder
+
+# Campos de una vista de tablero por endpoint
+FIELDS = {
+    'projects-list': 'projectId,name,status,taskCount',
+    'projects-get': 'projectId,name,status,taskCount,userRole',
+    'tasks-list': 'taskId,title,status,assignedTo',
+}
+
+SHAPE = dict(users=4, projects_per_user=2, tasks_per_project=500, members_per_project=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--projects-per-user', type=int)
+    parser.add_argument('--tasks-per-project', type=int)
+    parser.add_argument('--members-per-project', type=int)
+    parser.add_argument('--description-bytes', type=int, default=2048, help='Tamaño de la descripción de cada tarea')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=30, help='Requests medidos por endpoint y modo')
+    parser.add_argument('--warmup', type=int, default=3, help='Requests previos no medidos')
+    parser.add_argument('--endpoints', nargs='*', default=sorted(FIELDS), help='Funciones a medir')
+    parser.add_argument('--endpoint-url', default=None, help='p.ej. http://localhost:8000 para DynamoDB Local')
+    parser.add_argument('--table', default='ProjectManagement-fields')
+    parser.add_argument('--save', help='Guardar resultados en este archivo JSON')
+    args = parser.parse_args()
+    
+    shape = dict(SHAPE)
+    for key in shape:
+        if getattr(args, key) is not None:
+            shape[key] = getattr(args, key)
+    
+    # Las descripciones de más de 16 KB van al blob store local
+    os.environ['TABLE_NAME'] = args.table
+    os.environ['BLOB_PATH'] = tempfile.mkdtemp(prefix='bench-fields-')
+    start_backend(args.endpoint_url)
+    table = recreate_table(args.table)
+    dataset = seed(table, seed=args.seed, description_bytes=args.description_bytes, **shape)
+    print(f"Dataset: {dataset.items} items ({shape}), descripciones de {args.description_bytes} bytes")
+    
+    recorder = CallRecorder().install()
+    
+    print(f"{'endpoint':<15}{'KB todo':>9}{'KB fields':>11}{'ddb KB todo':>13}{'ddb KB fields':>15}"
+          f"{'p50 todo':>10}{'p50 fields':>12}{'ahorro p50':>12}")
+    results = {}
+    for endpoint in (e for e in ENDPOINTS if e.function in args.endpoints and e.function in FIELDS):
+        modes = {}
+        for mode, query in (('all', None), ('fields', {'fields': FIELDS[endpoint.function]})):
+            # Mismo seed en los dos modos: los mismos usuarios y proyectos en el mismo orden
+            scenario = Scenario(dataset=dataset, rng=random.Random(args.seed))
+            with function_app(endpoint.function) as app:
+                modes[mode] = run_endpoint(app, replace(endpoint, query=query), scenario, recorder,
+                                           args.iterations, args.warmup, accept_encoding='identity')
+        results[endpoint.function] = modes
+        
+        full, sparse = modes['all'], modes['fields']
+        saved = full['latencyMs']['p50'] - sparse['latencyMs']['p50']
+        print(f"{endpoint.function:<15}{full['responseBytes'] / 1024:>9.1f}{sparse['responseBytes'] / 1024:>11.1f}"
+              f"{full['ddb']['bytesReadPerRequest'] / 1024:>13.1f}{sparse['ddb']['bytesReadPerRequest'] / 1024:>15.1f}"
+              f"{full['latencyMs']['p50']:>10.2f}{sparse['latencyMs']['p50']:>12.2f}"
+              f"{saved:>8.2f} ms {100 * saved / full['latencyMs']['p50']:>3.0f}%")
+    
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'shape': shape, 'descriptionBytes': args.description_bytes, 'fields': FIELDS,
+                       'endpoints': results}, f, indent=2)
+        print(f"Resultados en {args.save}")
+
+
+if __name__ == '__main__':
+    main()
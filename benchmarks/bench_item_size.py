@@ -0,0 +1,144 @@
+"""
+Tamaño facturable de los items en el esquema v1 y v2 (utils.item_codec)
+
+Genera el dataset de dataset.py sin escribirlo y calcula, para cada item,
+el tamaño con que DynamoDB factura lectura y escritura (nombres de atributo
+incluidos) en el formato v1 (nombres lógicos, timestamps ISO) y en el v2
+(nombres cortos, epoch ms). Reporta el promedio por tipo de entidad y lo que
+cambia en capacidad:
+
+    WCU/item    unidades de escritura por PutItem (1 KB cada una)
+    RCU query   lectura consistente de todas las tareas de un proyecto
+                (Query, 4 KB por unidad sobre la suma de los items)
+
+--description-bytes reemplaza la descripción de cada tarea por un texto de
+ese tamaño, para ver la compresión y el blob store de las descripciones
+largas (los blobs se escriben en un directorio temporal y no cuentan en el
+tamaño del item).
+
+Uso:
+    python benchmarks/bench_item_size.py
+    python benchmarks/bench_item_size.py --shape medium
+    python benchmarks/bench_item_size.py --tasks-per-project 500 --json sizes.json
+    python benchmarks/bench_item_size.py --description-bytes 4096
+"""
+
+import argparse
+import json
+import math
+import tempfile
+from collections import defaultdict
+from decimal import Decimal
+
+from dataset import SHAPES, Dataset, iter_items
+
+from utils.blob_store import LocalBlobStore, set_blob_store
+from utils.item_codec import pack_item
+
+ENTITY_TYPES = {
+    ('USER', 'PROFILE'): 'USER',
+    ('USER', 'PROJECT'): 'USER_PROJECT',
+    ('PROJECT', 'METADATA'): 'PROJECT',
+    ('PROJECT', 'MEMBER'): 'MEMBER',
+    ('PROJECT', 'TASK'): 'TASK',
+}
+
+
+def value_size(value):
+    """Bytes de un valor según las reglas de tamaño de DynamoDB"""
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (int, float, Decimal)):
+        digits = str(abs(Decimal(value))).replace('.', '').strip('0') or '0'
+        return (len(digits) + 1) // 2 + 1
+    if isinstance(value, dict):
+        return 3 + sum(len(k.encode('utf-8')) + value_size(v) + 1 for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 3 + sum(value_size(v) + 1 for v in value)
+    raise TypeError(f"Tipo no soportado: {type(value).__name__}")
+
+
+def item_size(item):
+    """Tamaño facturable de un item: nombre + valor de cada atributo"""
+    return sum(len(name.encode('utf-8')) + value_size(value) for name, value in item.items())
+
+
+def entity_type(item):
+    return ENTITY_TYPES.get((item['PK'].split('#')[0], item['SK'].split('#')[0]), 'OTHER')
+
+
+def measure(shape, seed, description_bytes=None):
+    """Tamaños v1/v2 por entidad, WCU por item y RCU del Query de tareas por proyecto"""
+    sizes = defaultdict(lambda: {'items': 0, 'v1': 0, 'v2': 0, 'wcu1': 0, 'wcu2': 0})
+    task_bytes = defaultdict(lambda: [0, 0])
+    
+    for item in iter_items(Dataset(), seed=seed, description_bytes=description_bytes, **shape):
+        v1, v2 = item_size(item), item_size(pack_item(item))
+        entity = sizes[entity_type(item)]
+        entity['items'] += 1
+        entity['v1'] += v1
+        entity['v2'] += v2
+        entity['wcu1'] += math.ceil(v1 / 1024)
+        entity['wcu2'] += math.ceil(v2 / 1024)
+        
+        if item['SK'].startswith('TASK#'):
+            task_bytes[item['PK']][0] += v1
+            task_bytes[item['PK']][1] += v2
+    
+    projects = len(task_bytes) or 1
+    query_rcu = {
+        'v1': sum(math.ceil(v1 / 4096) for v1, _ in task_bytes.values()) / projects,
+        'v2': sum(math.ceil(v2 / 4096) for _, v2 in task_bytes.values()) / projects,
+    }
+    return dict(sizes), query_rcu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shape', choices=sorted(SHAPES), default='small', help='Preset de forma del dataset')
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--projects-per-user', type=int)
+    parser.add_argument('--tasks-per-project', type=int)
+    parser.add_argument('--members-per-project', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--description-bytes', type=int, help='Tamaño de la descripción de cada tarea')
+    parser.add_argument('--json', help='Guardar resultados en este archivo JSON')
+    args = parser.parse_args()
+    
+    shape = dict(SHAPES[args.shape])
+    for key in shape:
+        if getattr(args, key) is not None:
+            shape[key] = getattr(args, key)
+    
+    with tempfile.TemporaryDirectory() as blobs:
+        set_blob_store(LocalBlobStore(blobs))
+        sizes, query_rcu = measure(shape, args.seed, args.description_bytes)
+    
+    print(f"Dataset {shape}")
+    print(f"{'entidad':<14}{'items':>8}{'v1 B':>9}{'v2 B':>9}{'ahorro':>9}{'WCU v1':>9}{'WCU v2':>9}")
+    total = {'items': 0, 'v1': 0, 'v2': 0, 'wcu1': 0, 'wcu2': 0}
+    for name in sorted(sizes):
+        entity = sizes[name]
+        for key in total:
+            total[key] += entity[key]
+        n = entity['items']
+        print(f"{name:<14}{n:>8}{entity['v1'] / n:>9.1f}{entity['v2'] / n:>9.1f}"
+              f"{100 * (1 - entity['v2'] / entity['v1']):>8.1f}%{entity['wcu1'] / n:>9.2f}{entity['wcu2'] / n:>9.2f}")
+    
+    n = total['items']
+    print(f"{'total':<14}{n:>8}{total['v1'] / n:>9.1f}{total['v2'] / n:>9.1f}"
+          f"{100 * (1 - total['v2'] / total['v1']):>8.1f}%{total['wcu1'] / n:>9.2f}{total['wcu2'] / n:>9.2f}")
+    print(f"RCU por Query de las tareas de un proyecto: {query_rcu['v1']:.2f} -> {query_rcu['v2']:.2f}")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'shape': shape, 'descriptionBytes': args.description_bytes, 'entities': sizes, 'total': total, 'queryRcu': query_rcu}, f, indent=2)
+        print(f"Resultados en {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark del pre-calentamiento en el init (PREWARM)
+
+Para cada modo (PREWARM=false / true) lanza --repeat procesos nuevos de
+projects-list y mide:
+
+    init            import app (con PREWARM incluye boto3, jwt y la conexión)
+    primer request  GET /projects con token válido (Query a DynamoDB)
+    segundo request el mismo request con el contenedor ya caliente
+
+Necesita un endpoint DynamoDB real o DynamoDB Local con la tabla creada;
+la conexión es justamente lo que se mide.
+
+Uso:
+    python benchmarks/bench_prewarm.py --endpoint-url http://localhost:8000 --table ProjectManagement-dev
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+FUNCTION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'lambda', 'projects-list')
+
+SCRIPT = '''
+import json, time
+start = time.perf_counter()
+import app
+init = time.perf_counter() - start
+
+from utils.auth_utils import generate_token
+token = generate_token({'userId': 'bench-prewarm', 'email': 'bench@example.com', 'name': 'Bench'})
+event = {'httpMethod': 'GET', 'path': '/projects', 'headers': {'Authorization': 'Bearer ' + token}}
+
+timings = {'init': init}
+for name in ('firstRequest', 'secondRequest'):
+    start = time.perf_counter()
+    response = app.lambda_handler(dict(event), None)
+    timings[name] = time.perf_counter() - start
+    assert response['statusCode'] == 200, response
+print(json.dumps(timings))
+'''
+
+
+def run(prewarm, args):
+    env = dict(os.environ)
+    env['PREWARM'] = 'true' if prewarm else 'false'
+    env['TABLE_NAME'] = args.table
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    if args.endpoint_url:
+        env['AWS_ENDPOINT_URL_DYNAMODB'] = args.endpoint_url
+    
+    result = subprocess.run([sys.executable, '-c', SCRIPT], cwd=FUNCTION_DIR, env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--endpoint-url', default=None, help='p.ej. http://localhost:8000 para DynamoDB Local')
+    parser.add_argument('--table', default=os.environ.get('TABLE_NAME', 'ProjectManagement-dev'))
+    parser.add_argument('--repeat', type=int, default=5, help='Procesos por modo (mediana)')
+    args = parser.parse_args()
+    
+    print(f"{'PREWARM':<10}{'init ms':>10}{'1er req ms':>12}{'2do req ms':>12}{'init+1er ms':>13}")
+    for prewarm in (False, True):
+        runs = [run(prewarm, args) for _ in range(args.repeat)]
+        init, first, second = (statistics.median(r[key] for r in runs) * 1000
+                               for key in ('init', 'firstRequest', 'secondRequest'))
+        print(f"{str(prewarm).lower():<10}{init:>10.1f}{first:>12.1f}{second:>12.1f}{init + first:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark: funciones individuales vs router único (lambdalith)
+
+Mide tres cosas:
+
+1. Init: tiempo de `import app` más el primer request (sin token, no toca
+   DynamoDB) en un proceso nuevo, para cada función y para el router: lo
+   que paga un cold start antes de responder.
+2. Dispatch en caliente: µs por invocación de un request que no toca
+   DynamoDB (401 sin token) en la función individual y en el router.
+3. Exposición a cold starts: simulación de llegadas Poisson con --rate
+   requests/minuto por ruta y contenedores que expiran tras --idle-minutes
+   sin tráfico. Con 12 funciones cada ruta mantiene sus propios
+   contenedores; con el router comparten uno.
+
+Uso:
+    python benchmarks/bench_router.py --rate 0.2 --idle-minutes 10
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+
+from fixtures import FUNCTION_ROUTES, ROUTER
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'lambda')
+
+INIT_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import app
+app.lambda_handler(json.loads(sys.argv[1]), None)
+print(time.perf_counter() - start)
+'''
+
+DISPATCH_SCRIPT = '''
+import json, sys, time
+import app
+event = json.loads(sys.argv[1])
+count = int(sys.argv[2])
+app.lambda_handler(dict(event), None)
+start = time.perf_counter()
+for _ in range(count):
+    app.lambda_handler(dict(event), None)
+print((time.perf_counter() - start) / count)
+'''
+
+
+def function_dirs():
+    return sorted(
+        name for name in os.listdir(LAMBDA_DIR)
+        if os.path.exists(os.path.join(LAMBDA_DIR, name, 'app.py'))
+    )
+
+
+def run_in_function(function, script, *args):
+    env = dict(os.environ)
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    env.setdefault('TABLE_NAME', 'ProjectManagement-bench')
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    output = subprocess.run(
+        [sys.executable, '-c', script, *args],
+        cwd=os.path.join(LAMBDA_DIR, function),
+        env=env, capture_output=True, text=True, check=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def first_event(function):
+    method, path = FUNCTION_ROUTES[function]
+    return json.dumps({'httpMethod': method, 'path': path, 'headers': {}})
+
+
+def measure_init(repeat):
+    return {
+        function: statistics.median(
+            run_in_function(function, INIT_SCRIPT, first_event(function)) for _ in range(repeat)
+        ) * 1000
+        for function in function_dirs()
+    }
+
+
+def measure_dispatch(count):
+    event = json.dumps({'httpMethod': 'GET', 'path': '/projects', 'headers': {}})
+    return {
+        'projects-list': run_in_function('projects-list', DISPATCH_SCRIPT, event, str(count)) * 1e6,
+        ROUTER: run_in_function(ROUTER, DISPATCH_SCRIPT, event, str(count)) * 1e6,
+    }
+
+
+def simulate_cold_starts(routes, rate_per_minute, idle_minutes, hours, seed):
+    """
+    Fracción de requests que caen en un contenedor frío
+    
+    Supone concurrencia 1 (tráfico bajo): un request es frío si su función
+    no recibió tráfico en los últimos idle_minutes.
+    """
+    rng = random.Random(seed)
+    arrivals = []
+    for route in range(routes):
+        t = 0.0
+        while True:
+            t += rng.expovariate(rate_per_minute)
+            if t > hours * 60:
+                break
+            arrivals.append((t, route))
+    arrivals.sort()
+    
+    def cold_fraction(function_of):
+        last_seen = {}
+        cold = 0
+        for t, route in arrivals:
+            function = function_of(route)
+            if function not in last_seen or t - last_seen[function] > idle_minutes:
+                cold += 1
+            last_seen[function] = t
+        return cold / len(arrivals) if arrivals else 0.0
+    
+    return {
+        'requests': len(arrivals),
+        'functions': cold_fraction(lambda route: route),
+        ROUTER: cold_fraction(lambda route: ROUTER),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='Procesos por medición de init (mediana)')
+    parser.add_argument('--invocations', type=int, default=2000, help='Invocaciones para medir dispatch')
+    parser.add_argument('--rate', type=float, default=0.2, help='Requests por minuto por ruta')
+    parser.add_argument('--idle-minutes', type=float, default=10, help='Minutos hasta reciclar un contenedor')
+    parser.add_argument('--hours', type=float, default=24 * 7, help='Horas simuladas')
+    parser.add_argument('--json', help='Guardar resultados en este archivo')
+    args = parser.parse_args()
+    
+    init = measure_init(args.repeat)
+    dispatch = measure_dispatch(args.invocations)
+    routes = len([f for f in init if f != ROUTER])
+    cold = simulate_cold_starts(routes, args.rate, args.idle_minutes, args.hours, seed=42)
+    
+    print('Init + primer request (ms, mediana)')
+    for function, ms in init.items():
+        print(f"  {function:<18}{ms:>8.1f}")
+    
+    print('\nDispatch en caliente (GET /projects sin token, µs por invocación)')
+    for function, us in dispatch.items():
+        print(f"  {function:<18}{us:>8.1f}")
+    
+    print(f"\nRequests en contenedor frío ({routes} rutas a {args.rate} req/min, "
+          f"reciclado a {args.idle_minutes} min, {cold['requests']} requests)")
+    print(f"  {'funciones':<18}{cold['functions'] * 100:>7.1f}%")
+    print(f"  {ROUTER:<18}{cold[ROUTER] * 100:>7.1f}%")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'initMs': init, 'dispatchUs': dispatch, 'coldStartFraction': cold}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
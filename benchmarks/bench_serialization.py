@@ -0,0 +1,72 @@
+"""
+Microbenchmark de serialización JSON de respuestas
+
+Compara el encoder anterior (json + DecimalEncoder a float) con los backends
+registrados en utils.response (json de la stdlib y orjson si está instalado)
+sobre payloads de 10k tareas y 10k proyectos (estos últimos con Decimals).
+
+Uso:
+    python benchmarks/bench_serialization.py --count 10000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'lambda', 'tasks-list'))
+
+from utils import response  # noqa: E402
+
+from fixtures import build_projects, build_tasks  # noqa: E402
+
+
+class LegacyDecimalEncoder(json.JSONEncoder):
+    """Encoder usado antes de los backends configurables"""
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return float(obj)
+        return super().default(obj)
+
+
+def legacy_dumps(obj):
+    return json.dumps(obj, cls=LegacyDecimalEncoder)
+
+
+def measure(dumps, payload, repeat):
+    """Retornar (mejor tiempo en ms, bytes)"""
+    best = float('inf')
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(dumps(payload))
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=10000, help='Items por payload')
+    parser.add_argument('--repeat', type=int, default=10, help='Repeticiones (se toma el mejor)')
+    args = parser.parse_args()
+    
+    payloads = {
+        'tasks': {'success': True, 'data': {'tasks': build_tasks(args.count), 'count': args.count}},
+        'projects': {'success': True, 'data': {'projects': build_projects(args.count), 'count': args.count}},
+    }
+    backends = [('legacy', legacy_dumps)]
+    backends += [(name, response.get_serializer(name)) for name in response.available_serializers()]
+    
+    print(f"{'payload':<10}{'backend':<10}{'ms':>10}{'KB':>10}{'vs legacy':>11}")
+    for payload_name, payload in payloads.items():
+        baseline = None
+        for backend_name, dumps in backends:
+            elapsed, size = measure(dumps, payload, args.repeat)
+            baseline = baseline or elapsed
+            print(f"{payload_name:<10}{backend_name:<10}{elapsed:>10.2f}{size / 1024:>10.1f}{baseline / elapsed:>10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Lecturas con y sin el cache compartido de utils.shared_cache
+
+Corre por api-router un tráfico mixto sobre el mismo dataset dos veces: sin
+cache y con SHARED_CACHE. La mayoría de los requests son lecturas
+(projects-get, projects-list, tasks-list) y --write-ratio de ellos son
+tasks-update sobre los mismos proyectos, que invalidan todo lo cacheado del
+proyecto (también los listados de proyectos de sus miembros). Por endpoint
+reporta p50/p95, llamadas a DynamoDB por request y tasa de aciertos.
+
+Sin --redis-url el cache es LocalCache (en memoria, un solo proceso); con
+--redis-url se usa un servidor Redis real. Como en bench_fanout.py,
+--latency-ms agrega latencia de red a cada llamada a DynamoDB y
+--cache-latency-ms a cada comando del cache local (un GET de Redis en la
+misma AZ anda por debajo del milisegundo).
+
+Uso:
+    python benchmarks/bench_shared_cache.py
+    python benchmarks/bench_shared_cache.py --write-ratio 0.2 --requests 2000
+    python benchmarks/bench_shared_cache.py --redis-url redis://localhost:6379/0 --cache-latency-ms 0
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from collections import Counter, defaultdict
+
+from bench_e2e import ENDPOINTS, Scenario, build_event, function_app, percentile, recreate_table, start_backend
+from bench_fanout import install_latency
+from dataset import SHAPES, seed
+from ddb_calls import CallRecorder
+from fixtures import ROUTER
+
+READS = ['projects-get', 'projects-list', 'tasks-list']
+WRITE = 'tasks-update'
+
+
+class SlowCache:
+    """Un cliente de cache con latency_ms de espera por comando"""
+    
+    def __init__(self, client, latency_ms):
+        self.client = client
+        self.latency_ms = latency_ms
+    
+    def __getattr__(self, name):
+        command = getattr(self.client, name)
+        
+        def call(*args, **kwargs):
+            time.sleep(self.latency_ms / 1000)
+            return command(*args, **kwargs)
+        return call
+
+
+def make_cache(args):
+    """Cliente del modo cacheado (se vacía el prefijo de la corrida en Redis)"""
+    from utils.shared_cache import KEY_PREFIX, create_shared_cache
+    
+    if args.redis_url:
+        client = create_shared_cache('redis', args.redis_url)
+        for key in client.scan_iter(f"{KEY_PREFIX}:*"):
+            client.delete(key)
+        return client
+    
+    client = create_shared_cache('local')
+    return SlowCache(client, args.cache_latency_ms) if args.cache_latency_ms else client
+
+
+def run_mode(cached, dataset, recorder, args):
+    """Correr el tráfico mixto con o sin cache y resumir por endpoint"""
+    endpoints = {e.function: e for e in ENDPOINTS if e.function in READS + [WRITE]}
+    # Mismo seed en los dos modos: la misma secuencia de requests
+    scenario = Scenario(dataset=dataset, rng=random.Random(args.seed))
+    mix = random.Random(args.seed + 1)
+    
+    latencies = defaultdict(list)
+    calls, hits, misses = Counter(), Counter(), Counter()
+    
+    with function_app(ROUTER) as app:
+        from utils.shared_cache import get_stats, set_shared_cache
+        set_shared_cache(make_cache(args) if cached else None)
+        context = None
+        
+        for i in range(args.warmup + args.requests):
+            function = WRITE if mix.random() < args.write_ratio else mix.choice(READS)
+            _, event = build_event(endpoints[function], scenario, i, True, 'identity')
+            
+            recorder.reset()
+            start = time.perf_counter()
+            app.lambda_handler(event, context)
+            elapsed = time.perf_counter() - start
+            if i < args.warmup:
+                continue
+            
+            latencies[function].append(elapsed * 1000)
+            calls[function] += recorder.snapshot()['calls']
+            stats = get_stats() or {'hits': 0, 'misses': 0}
+            hits[function] += stats['hits']
+            misses[function] += stats['misses']
+        
+        set_shared_cache(None)
+    
+    results = {}
+    for function, values in sorted(latencies.items()):
+        lookups = hits[function] + misses[function]
+        results[function] = {
+            'requests': len(values),
+            'latencyMs': {'p50': percentile(values, 50), 'p95': percentile(values, 95), 'mean': statistics.fmean(values)},
+            'callsPerRequest': calls[function] / len(values),
+            'hitRate': hits[function] / lookups if lookups else None,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shape', choices=sorted(SHAPES), default='small', help='Preset de forma del dataset')
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--projects-per-user', type=int)
+    parser.add_argument('--tasks-per-project', type=int)
+    parser.add_argument('--members-per-project', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--requests', type=int, default=1000, help='Requests medidos por modo')
+    parser.add_argument('--warmup', type=int, default=20, help='Requests previos no medidos')
+    parser.add_argument('--write-ratio', type=float, default=0.05, help='Fracción de requests que son tasks-update')
+    parser.add_argument('--latency-ms', type=float, default=5, help='Latencia agregada a cada llamada a DynamoDB')
+    parser.add_argument('--cache-latency-ms', type=float, default=0.5, help='Latencia por comando del cache local')
+    parser.add_argument('--redis-url', help='Usar este servidor Redis en lugar del cache local')
+    parser.add_argument('--endpoint-url', default=None, help='p.ej. http://localhost:8000 para DynamoDB Local')
+    parser.add_argument('--table', default='ProjectManagement-cache')
+    parser.add_argument('--save', help='Guardar resultados en este archivo JSON')
+    args = parser.parse_args()
+    
+    shape = dict(SHAPES[args.shape])
+    for key in shape:
+        if getattr(args, key) is not None:
+            shape[key] = getattr(args, key)
+    
+    os.environ['TABLE_NAME'] = args.table
+    start_backend(args.endpoint_url)
+    table = recreate_table(args.table)
+    dataset = seed(table, seed=args.seed, **shape)
+    print(f"Dataset: {dataset.items} items ({shape}), {100 * args.write_ratio:.0f}% escrituras")
+    
+    recorder = CallRecorder().install()
+    if args.latency_ms:
+        install_latency(args.latency_ms)
+    
+    modes = {'off': run_mode(False, dataset, recorder, args), 'cache': run_mode(True, dataset, recorder, args)}
+    
+    print(f"{'endpoint':<15}{'p50 off':>9}{'p50 cache':>11}{'p95 off':>9}{'p95 cache':>11}"
+          f"{'ddb off':>9}{'ddb cache':>11}{'aciertos':>10}")
+    for function in sorted(modes['off']):
+        off, cache = modes['off'][function], modes['cache'][function]
+        hit_rate = '-' if cache['hitRate'] is None else f"{100 * cache['hitRate']:.0f}%"
+        print(f"{function:<15}{off['latencyMs']['p50']:>9.2f}{cache['latencyMs']['p50']:>11.2f}"
+              f"{off['latencyMs']['p95']:>9.2f}{cache['latencyMs']['p95']:>11.2f}"
+              f"{off['callsPerRequest']:>9.2f}{cache['callsPerRequest']:>11.2f}{hit_rate:>10}")
+    
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'shape': shape, 'writeRatio': args.write_ratio, 'latencyMs': args.latency_ms,
+                       'cacheLatencyMs': args.cache_latency_ms, 'redis': bool(args.redis_url), 'modes': modes}, f, indent=2)
+        print(f"Resultados en {args.save}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Microbenchmark de la verificación de tokens con y sin el cache de auth_utils
+
+Genera --tokens tokens distintos y decodifica --requests veces tokens
+elegidos al azar entre ellos: primero verificando siempre la firma
+(_verify_token, lo que hacía decode_token antes del cache) y después con
+decode_token y un cache de --cache-size entradas. Con más tokens que
+entradas se ven los evictions del LRU. Reporta el costo por llamada y los
+contadores del cache.
+
+Uso:
+    python benchmarks/bench_token_cache.py
+    python benchmarks/bench_token_cache.py --tokens 5000 --cache-size 1024
+    python benchmarks/bench_token_cache.py --requests 200000 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'lambda', 'auth-profile'))
+
+from utils import auth_utils  # noqa: E402
+
+
+def measure(decode, tokens, repeat):
+    """Mejor tiempo por llamada en microsegundos"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for token in tokens:
+            if decode(token) is None:
+                raise SystemExit('Token rechazado durante el benchmark')
+        best = min(best, time.perf_counter() - start)
+    return best / len(tokens) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tokens', type=int, default=100, help='Tokens distintos (usuarios activos)')
+    parser.add_argument('--requests', type=int, default=50000, help='Decodificaciones por repetición')
+    parser.add_argument('--cache-size', type=int, default=auth_utils.TOKEN_CACHE_SIZE, help='Entradas del LRU')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones (se toma la mejor)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    issued = [
+        auth_utils.generate_token({'userId': f"user-{i}", 'email': f"user-{i}@example.com", 'name': f"Usuario {i}"})
+        for i in range(args.tokens)
+    ]
+    tokens = [rng.choice(issued) for _ in range(args.requests)]
+    auth_utils.prewarm_jwt()
+    
+    verify_us = measure(auth_utils._verify_token, tokens, args.repeat)
+    
+    auth_utils._token_cache = auth_utils._TokenCache(args.cache_size)
+    cached_us = measure(auth_utils.decode_token, tokens, args.repeat)
+    stats = auth_utils.get_token_cache_stats()
+    
+    lookups = stats['hits'] + stats['misses'] + stats['expired']
+    print(f"{args.tokens} tokens, {args.requests} decodificaciones x {args.repeat}, cache de {args.cache_size}")
+    print(f"{'modo':<12}{'us/llamada':>12}{'llamadas/s':>14}")
+    print(f"{'jwt.decode':<12}{verify_us:>12.2f}{1e6 / verify_us:>14.0f}")
+    print(f"{'cache':<12}{cached_us:>12.2f}{1e6 / cached_us:>14.0f}   {verify_us / cached_us:.1f}x")
+    print(f"aciertos {100 * stats['hits'] / lookups:.1f}%, evictions {stats['evictions']}, "
+          f"entradas {stats['size']}")
+
+
+if __name__ == '__main__':
+    main()
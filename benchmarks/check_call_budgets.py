@@ -0,0 +1,87 @@
+"""
+Presupuesto de llamadas a DynamoDB por endpoint
+
+Corre cada endpoint de bench_e2e.py en este proceso contra moto (o DynamoDB
+Local con --endpoint-url), una vez por cada forma de dataset de
+call_budgets.json, y termina con código 1 si algún request supera su
+presupuesto o no responde 2xx. Las formas difieren a propósito en
+proyectos por usuario y tareas por proyecto: un límite fijo que se cumple
+en todas descarta los N+1 (p.ej. un GetItem por proyecto en GET /projects).
+
+Los límites son por request sobre los contadores de ddb_calls.py: calls,
+GetItem, Query, Scan, BatchGet, Write, itemsRead y bytesRead.
+
+Uso:
+    python benchmarks/check_call_budgets.py
+    python benchmarks/check_call_budgets.py --endpoints projects-list auth-profile
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+from bench_e2e import ENDPOINTS, Scenario, function_app, recreate_table, run_endpoint, start_backend
+from dataset import seed
+from ddb_calls import CallRecorder
+
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'call_budgets.json')
+
+
+def check(result, budget):
+    """Retornar las violaciones [(contador, límite, máximo observado)] de un endpoint"""
+    peak = result['ddb']['maxPerRequest']
+    violations = [(name, limit, peak.get(name, 0)) for name, limit in budget.items() if peak.get(name, 0) > limit]
+    
+    failed = sum(count for status, count in result['status'].items() if not status.startswith('2'))
+    if failed:
+        violations.append(('status', '2xx', result['status']))
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budgets', default=BUDGETS_FILE)
+    parser.add_argument('--endpoints', nargs='*', help='Funciones a verificar (default: todas las del archivo)')
+    parser.add_argument('--endpoint-url', default=None, help='p.ej. http://localhost:8000 para DynamoDB Local')
+    parser.add_argument('--table', default='ProjectManagement-budget')
+    args = parser.parse_args()
+    
+    with open(args.budgets) as f:
+        budgets = json.load(f)
+    
+    endpoints = [
+        e for e in ENDPOINTS
+        if e.function in budgets['endpoints'] and (not args.endpoints or e.function in args.endpoints)
+    ]
+    
+    os.environ['TABLE_NAME'] = args.table
+    start_backend(args.endpoint_url)
+    recorder = CallRecorder().install()
+    
+    failures = 0
+    for shape in budgets['shapes']:
+        dataset = seed(recreate_table(args.table), **shape)
+        scenario = Scenario(dataset=dataset, rng=random.Random(0))
+        print(f"Forma {shape}")
+        
+        for endpoint in endpoints:
+            with function_app(endpoint.function) as app:
+                result = run_endpoint(app, endpoint, scenario, recorder, budgets['requests'])
+            
+            violations = check(result, budgets['endpoints'][endpoint.function])
+            peak = result['ddb']['maxPerRequest']
+            summary = ', '.join(f"{name} {value}" for name, value in sorted(peak.items()) if name != 'bytesRead')
+            print(f"  {'EXCEDE' if violations else 'ok':<7}{endpoint.function:<18}{summary}")
+            
+            for name, limit, observed in violations:
+                print(f"         {name}: límite {limit}, observado {observed}", file=sys.stderr)
+            failures += bool(violations)
+    
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
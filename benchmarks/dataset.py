@@ -0,0 +1,172 @@
+"""
+Dataset sintético sembrado en DynamoDB para los benchmarks end-to-end
+
+La forma se define con cuatro dimensiones:
+
+    users               usuarios registrados (todos con BENCH_PASSWORD)
+    projects_per_user   proyectos de los que cada usuario es owner
+    tasks_per_project   tareas de cada proyecto
+    members_per_project miembros (rol member) además del owner
+
+Los items se construyen con los mismos helpers de utils.db_utils que usan
+los handlers, así que el dataset sigue el modelo de la tabla aunque cambie.
+"""
+
+import os
+import random
+import sys
+import uuid
+from dataclasses import dataclass, field
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'lambda', 'tasks-create'))
+
+from utils.auth_utils import hash_password  # noqa: E402
+from utils.db_utils import (  # noqa: E402
+    build_membership_items, build_project_item, build_task_item, build_user_item
+)
+from utils.item_codec import pack_item  # noqa: E402
+
+BENCH_PASSWORD = 'bench-password'
+
+TASK_STATUSES = ['pending', 'in_progress', 'completed']
+
+# Vocabulario de las descripciones largas (--description-bytes)
+WORDS = ('tarea proyecto usuario revisar implementar endpoint tabla consulta '
+         'respuesta error cliente servidor caso prueba deploy criterio aceptación').split()
+
+# Forma por defecto y presets para --shape
+SHAPES = {
+    'small': dict(users=20, projects_per_user=3, tasks_per_project=20, members_per_project=2),
+    'medium': dict(users=100, projects_per_user=5, tasks_per_project=100, members_per_project=4),
+    'large': dict(users=200, projects_per_user=10, tasks_per_project=500, members_per_project=8),
+}
+
+
+@dataclass
+class Dataset:
+    """Ids sembrados, para que los benchmarks armen requests válidos"""
+    users: list = field(default_factory=list)
+    memberships: list = field(default_factory=list)
+    owned: list = field(default_factory=list)
+    tasks: dict = field(default_factory=dict)
+    items: int = 0
+
+
+def create_table(dynamodb, table_name):
+    """Crear la tabla con el mismo esquema que infrastructure/template.yaml"""
+    table = dynamodb.create_table(
+        TableName=table_name,
+        BillingMode='PAY_PER_REQUEST',
+        AttributeDefinitions=[
+            {'AttributeName': 'PK', 'AttributeType': 'S'},
+            {'AttributeName': 'SK', 'AttributeType': 'S'},
+            {'AttributeName': 'email', 'AttributeType': 'S'},
+        ],
+        KeySchema=[
+            {'AttributeName': 'PK', 'KeyType': 'HASH'},
+            {'AttributeName': 'SK', 'KeyType': 'RANGE'},
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': 'EmailIndex',
+            'KeySchema': [{'AttributeName': 'email', 'KeyType': 'HASH'}],
+            'Projection': {'ProjectionType': 'ALL'},
+        }],
+    )
+    table.wait_until_exists()
+    return table
+
+
+def seed(table, users, projects_per_user, tasks_per_project, members_per_project, seed=0, description_bytes=None):
+    """
+    Sembrar el dataset con batch_writer
+    
+    Args:
+        table: recurso Table de boto3
+        users, projects_per_user, tasks_per_project, members_per_project: forma
+        seed: semilla del generador (mismo seed, mismo dataset)
+        description_bytes: Tamaño de la descripción de cada tarea (None = las cortas de siempre)
+    
+    Returns:
+        Dataset con los ids escritos
+    """
+    dataset = Dataset()
+    
+    with table.batch_writer() as batch:
+        for item in iter_items(dataset, users, projects_per_user, tasks_per_project, members_per_project, seed,
+                               description_bytes):
+            batch.put_item(Item=pack_item(item))
+            dataset.items += 1
+    
+    return dataset
+
+
+def long_description(rng, size):
+    """Texto de size bytes (UTF-8) con palabras de WORDS (se comprime como un spec real)"""
+    words = []
+    length = -1
+    while length < size:
+        words.append(rng.choice(WORDS))
+        length += len(words[-1].encode('utf-8')) + 1
+    text = ' '.join(words).encode('utf-8')[:size].decode('utf-8', 'ignore')
+    # Un corte en medio de un carácter de dos bytes se completa con un espacio
+    return text + ' ' * (size - len(text.encode('utf-8')))
+
+
+def iter_items(dataset, users, projects_per_user, tasks_per_project, members_per_project, seed=0,
+               description_bytes=None):
+    """
+    Items del dataset con nombres lógicos, sin escribirlos
+    
+    Va completando dataset con los ids a medida que genera los items.
+    """
+    rng = random.Random(seed)
+    text_rng = random.Random(seed + 1)
+    hashed_password = hash_password(BENCH_PASSWORD)
+    
+    def new_id():
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+    
+    for i in range(users):
+        user_id = new_id()
+        user = {'userId': user_id, 'email': f"bench-{i}@example.com", 'name': f"Usuario {i}"}
+        yield build_user_item(user_id, user['email'], user['name'], hashed_password)
+        dataset.users.append(user)
+    
+    for owner in dataset.users:
+        others = [u for u in dataset.users if u is not owner]
+        
+        for p in range(projects_per_user):
+            project_id = new_id()
+            name = f"Proyecto {p} de {owner['name']}"
+            members = rng.sample(others, min(members_per_project, len(others)))
+            
+            project_item = build_project_item(
+                project_id, name, 'Proyecto sembrado para benchmarks', 'active',
+                owner['userId'], owner['name']
+            )
+            project_item['taskCount'] = tasks_per_project
+            project_item['memberCount'] = 1 + len(members)
+            yield project_item
+            
+            for user, role in [(owner, 'owner')] + [(m, 'member') for m in members]:
+                yield from build_membership_items(project_id, name, user['userId'], user['name'], role)
+                dataset.memberships.append((user['userId'], project_id))
+            dataset.owned.append((owner['userId'], project_id))
+            
+            task_ids = []
+            for t in range(tasks_per_project):
+                task_id = new_id()
+                if description_bytes:
+                    description = long_description(text_rng, description_bytes)
+                else:
+                    description = 'Detalle de la tarea con criterios de aceptación. ' * (1 + t % 4)
+                yield build_task_item(
+                    task_id, project_id,
+                    f"Tarea {t}: revisar integración del módulo {t % 37}",
+                    description,
+                    TASK_STATUSES[t % 3],
+                    rng.choice([owner] + members)['userId'],
+                    owner['userId'],
+                )
+                task_ids.append(task_id)
+            dataset.tasks[project_id] = task_ids
@@ -0,0 +1,106 @@
+"""
+Conteo de llamadas a DynamoDB por request mediante eventos de botocore
+
+Se registra sobre la sesión por defecto de boto3 antes de que los handlers
+creen su recurso (utils.db_utils.get_resource es lazy), así cada cliente
+creado después (el de la tabla y el del recurso) hereda los hooks. Si la
+llamada no pide capacidad consumida se agrega ReturnConsumedCapacity (hoy
+db_utils ya la pide siempre) para poder reportar RCU/WCU.
+
+Las operaciones se agrupan por tipo:
+
+    GetItem   GetItem
+    Query     Query
+    Scan      Scan
+    BatchGet  BatchGetItem, TransactGetItems
+    Write     PutItem, UpdateItem, DeleteItem, BatchWriteItem, TransactWriteItems
+
+Para las lecturas se registran además los items devueltos y los bytes de
+la respuesta HTTP.
+"""
+
+from collections import Counter
+
+import boto3
+
+OPERATION_TYPES = {
+    'GetItem': 'GetItem',
+    'Query': 'Query',
+    'Scan': 'Scan',
+    'BatchGetItem': 'BatchGet',
+    'TransactGetItems': 'BatchGet',
+    'PutItem': 'Write',
+    'UpdateItem': 'Write',
+    'DeleteItem': 'Write',
+    'BatchWriteItem': 'Write',
+    'TransactWriteItems': 'Write',
+}
+
+READ_TYPES = {'GetItem', 'Query', 'Scan', 'BatchGet'}
+
+
+def count_items(operation, parsed):
+    """Items devueltos por una operación de lectura"""
+    if operation == 'GetItem':
+        return 1 if 'Item' in parsed else 0
+    if operation in ('Query', 'Scan'):
+        return parsed.get('Count', len(parsed.get('Items', [])))
+    if operation == 'BatchGetItem':
+        return sum(len(items) for items in parsed.get('Responses', {}).values())
+    if operation == 'TransactGetItems':
+        return sum(1 for r in parsed.get('Responses', []) if r.get('Item'))
+    return 0
+
+
+class CallRecorder:
+    """Acumula operaciones, lecturas y capacidad consumida hasta el próximo reset()"""
+    
+    def __init__(self):
+        self.reset()
+    
+    def install(self, session=None):
+        """Registrar los hooks en la sesión (por defecto la de boto3)"""
+        session = session or boto3._get_default_session()
+        session.events.register('provide-client-params.dynamodb.*', self._request_capacity)
+        session.events.register('after-call.dynamodb.*', self._record)
+        return self
+    
+    def reset(self):
+        self.operations = Counter()
+        self.items_read = 0
+        self.bytes_read = 0
+        self.rcu = 0.0
+        self.wcu = 0.0
+    
+    def snapshot(self):
+        """Totales desde el último reset()"""
+        return {
+            'calls': sum(self.operations.values()),
+            'operations': dict(self.operations),
+            'itemsRead': self.items_read,
+            'bytesRead': self.bytes_read,
+            'rcu': self.rcu,
+            'wcu': self.wcu,
+        }
+    
+    def _request_capacity(self, params, model, **kwargs):
+        if 'ReturnConsumedCapacity' in model.input_shape.members:
+            params.setdefault('ReturnConsumedCapacity', 'INDEXES' if 'IndexName' in params else 'TOTAL')
+    
+    def _record(self, http_response, parsed, model, **kwargs):
+        kind = OPERATION_TYPES.get(model.name)
+        if kind is None:
+            return
+        self.operations[kind] += 1
+        
+        consumed = parsed.get('ConsumedCapacity') or []
+        if isinstance(consumed, dict):
+            consumed = [consumed]
+        units = sum(c.get('CapacityUnits', 0) for c in consumed)
+        
+        if kind in READ_TYPES:
+            self.rcu += units
+            self.items_read += count_items(model.name, parsed)
+            self.bytes_read += len(http_response.content or b'')
+        else:
+            self.wcu += units
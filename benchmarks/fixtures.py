@@ -0,0 +1,74 @@
+"""
+Datos sintéticos y rutas compartidos por los benchmarks
+"""
+
+import uuid
+from decimal import Decimal
+
+ROUTER = 'api-router'
+
+# Request de cada función para el primer invoke (el router usa GET /projects)
+FUNCTION_ROUTES = {
+    'auth-register': ('POST', '/auth/register'),
+    'auth-login': ('POST', '/auth/login'),
+    'auth-profile': ('GET', '/auth/me'),
+    'projects-list': ('GET', '/projects'),
+    'projects-create': ('POST', '/projects'),
+    'projects-get': ('GET', '/projects/bench'),
+    'projects-update': ('PUT', '/projects/bench'),
+    'projects-delete': ('DELETE', '/projects/bench'),
+    'tasks-list': ('GET', '/projects/bench/tasks'),
+    'tasks-create': ('POST', '/projects/bench/tasks'),
+    'tasks-update': ('PUT', '/projects/bench/tasks/bench'),
+    'tasks-delete': ('DELETE', '/projects/bench/tasks/bench'),
+    'tasks-export': ('GET', '/projects/bench/export'),
+    'batch': ('POST', '/batch'),
+    ROUTER: ('GET', '/projects'),
+}
+
+
+def build_tasks(count):
+    """Generar tareas con la misma forma que devuelve get_project_tasks"""
+    project_id = str(uuid.uuid4())
+    statuses = ['pending', 'in_progress', 'completed']
+    tasks = []
+    for i in range(count):
+        task_id = str(uuid.uuid4())
+        tasks.append({
+            'PK': f"PROJECT#{project_id}",
+            'SK': f"TASK#{task_id}",
+            'taskId': task_id,
+            'projectId': project_id,
+            'title': f"Tarea {i}: revisar integración del módulo {i % 37}",
+            'description': 'Detalle de la tarea con criterios de aceptación. ' * (1 + i % 4),
+            'status': statuses[i % 3],
+            'assignedTo': str(uuid.uuid4()),
+            'createdBy': str(uuid.uuid4()),
+            'createdAt': f"2024-01-{1 + i % 28:02d}T10:{i % 60:02d}:00.000000",
+            'updatedAt': f"2024-02-{1 + i % 28:02d}T11:{i % 60:02d}:00.000000",
+        })
+    return tasks
+
+
+def build_projects(count):
+    """Generar proyectos con la misma forma que devuelve get_user_projects"""
+    user_id = str(uuid.uuid4())
+    projects = []
+    for i in range(count):
+        project_id = str(uuid.uuid4())
+        projects.append({
+            'PK': f"PROJECT#{project_id}",
+            'SK': 'METADATA',
+            'projectId': project_id,
+            'name': f"Proyecto {i}",
+            'description': 'Descripción del proyecto. ' * (1 + i % 3),
+            'status': 'active' if i % 4 else 'completed',
+            'createdBy': user_id,
+            'createdByName': 'Usuario Benchmark',
+            'createdAt': f"2024-01-{1 + i % 28:02d}T10:{i % 60:02d}:00.000000",
+            'updatedAt': f"2024-02-{1 + i % 28:02d}T11:{i % 60:02d}:00.000000",
+            'taskCount': Decimal(i % 200),
+            'memberCount': Decimal(1 + i % 8),
+            'userRole': 'owner',
+        })
+    return projects
@@ -0,0 +1,159 @@
+"""
+Profiler del init (cold start) de cada función
+
+Para cada función en src/lambda ejecuta, en un proceso nuevo con
+`python -X importtime`:
+
+    import app                      -> init (lo que corre en el INIT de Lambda)
+    app.lambda_handler(evento)      -> primer request
+
+El evento es un OPTIONS (--event options) o el request de la función sin
+token (--event unauthenticated, default); ninguno toca DynamoDB. Reporta el
+tiempo de pared de cada fase (mediana de --repeat procesos) y el costo de
+import por paquete de primer nivel.
+
+Con --save se guardan los resultados; con --baseline se comparan contra un
+archivo anterior y el script termina con código 1 si el init de alguna
+función empeoró más de --tolerance.
+
+Uso:
+    python benchmarks/profile_init.py --save init-baseline.json
+    python benchmarks/profile_init.py --baseline init-baseline.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from fixtures import FUNCTION_ROUTES
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'lambda')
+INIT_MARKER = '#init'
+PHASE_MARKER = '#first-request'
+
+SCRIPT = f'''
+import json, sys, time
+event = json.loads(sys.argv[1])
+print({INIT_MARKER!r}, file=sys.stderr, flush=True)
+start = time.perf_counter()
+import app
+init = time.perf_counter() - start
+print({PHASE_MARKER!r}, file=sys.stderr, flush=True)
+start = time.perf_counter()
+app.lambda_handler(event, None)
+first_request = time.perf_counter() - start
+print(json.dumps({{'init': init, 'firstRequest': first_request}}))
+'''
+
+# Diferencias menores a esto se consideran ruido
+NOISE_FLOOR_MS = 5.0
+
+
+def parse_importtime(lines):
+    """Sumar el tiempo propio (µs) de cada import por paquete de primer nivel"""
+    packages = {}
+    for line in lines:
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, _, name = line.split(':', 1)[1].split('|')
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+    return packages
+
+
+def profile_function(function, event, repeat):
+    env = dict(os.environ)
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    env.setdefault('TABLE_NAME', 'ProjectManagement-profile')
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', SCRIPT, json.dumps(event)],
+            cwd=os.path.join(LAMBDA_DIR, function),
+            env=env, capture_output=True, text=True, check=True
+        )
+        # Los imports previos a INIT_MARKER son del arranque del intérprete (site)
+        stderr = result.stderr.splitlines()
+        init_start = stderr.index(INIT_MARKER)
+        marker = stderr.index(PHASE_MARKER)
+        runs.append((json.loads(result.stdout.strip().splitlines()[-1]),
+                     stderr[init_start + 1:marker], stderr[marker + 1:]))
+    
+    # Desglose de módulos de la corrida con el init mediano
+    runs.sort(key=lambda run: run[0]['init'])
+    timings, init_lines, request_lines = runs[len(runs) // 2]
+    return {
+        'initMs': round(statistics.median(run[0]['init'] for run in runs) * 1000, 2),
+        'firstRequestMs': round(statistics.median(run[0]['firstRequest'] for run in runs) * 1000, 2),
+        'initModulesUs': parse_importtime(init_lines),
+        'firstRequestModulesUs': parse_importtime(request_lines),
+    }
+
+
+def build_event(function, kind):
+    method, path = FUNCTION_ROUTES[function]
+    return {'httpMethod': 'OPTIONS' if kind == 'options' else method, 'path': path, 'headers': {}}
+
+
+def top_modules(modules, limit):
+    ranked = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return ', '.join(f"{name} {us / 1000:.1f}" for name, us in ranked)
+
+
+def compare(results, baseline, tolerance):
+    """Retornar las funciones cuyo init empeoró más de la tolerancia"""
+    regressions = []
+    for function, result in results.items():
+        previous = baseline.get('functions', {}).get(function)
+        if not previous:
+            continue
+        limit = max(previous['initMs'] * (1 + tolerance), previous['initMs'] + NOISE_FLOOR_MS)
+        if result['initMs'] > limit:
+            regressions.append((function, previous['initMs'], result['initMs']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--event', choices=['options', 'unauthenticated'], default='unauthenticated')
+    parser.add_argument('--repeat', type=int, default=5, help='Procesos por función (mediana)')
+    parser.add_argument('--functions', nargs='*', help='Default: todas las de src/lambda')
+    parser.add_argument('--top', type=int, default=5, help='Paquetes a mostrar por fase')
+    parser.add_argument('--save', help='Guardar resultados en este archivo JSON')
+    parser.add_argument('--baseline', help='Comparar contra un JSON guardado con --save')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Regresión permitida (0.2 = 20%%)')
+    args = parser.parse_args()
+    
+    functions = args.functions or sorted(
+        name for name in os.listdir(LAMBDA_DIR) if name in FUNCTION_ROUTES
+    )
+    
+    results = {}
+    for function in functions:
+        result = profile_function(function, build_event(function, args.event), args.repeat)
+        results[function] = result
+        print(f"{function:<18} init {result['initMs']:>7.1f} ms  primer request {result['firstRequestMs']:>7.1f} ms")
+        print(f"{'':<18} init: {top_modules(result['initModulesUs'], args.top)}")
+        if result['firstRequestModulesUs']:
+            print(f"{'':<18} request: {top_modules(result['firstRequestModulesUs'], args.top)}")
+    
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'event': args.event, 'functions': results}, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for function, before, after in regressions:
+            print(f"REGRESIÓN {function}: init {before:.1f} ms -> {after:.1f} ms", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
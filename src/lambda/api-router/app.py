@@ -0,0 +1,43 @@
+"""
+API completa en una sola función (router)
+Endpoint: ANY /{proxy+}
+Handler: app.lambda_handler
+"""
+
+from utils.entrypoint import dispatch, preflight_response, prewarm
+from utils.response import error_response
+from utils.routing import ROUTES, match_route
+
+prewarm(*[ref for _, _, ref in ROUTES])
+
+
+def lambda_handler(event, context):
+    """
+    Handler principal del router
+    
+    Resuelve método y path contra la tabla de utils.routing y delega en el
+    mismo handler que usa la función individual de cada endpoint, así que
+    todos los endpoints comparten los contenedores calientes.
+    
+    Args:
+        event: Evento de API Gateway (integración proxy)
+        context: Contexto de Lambda
+    
+    Returns:
+        Response dict con statusCode, headers y body
+    """
+    method = event.get('httpMethod')
+    ref, params = match_route(method, event.get('path'))
+    
+    # Manejar OPTIONS para CORS (ninguna ruta declara OPTIONS: params
+    # trae los métodos permitidos del path)
+    if method == 'OPTIONS':
+        return preflight_response(','.join(params + ['OPTIONS']))
+    
+    if ref is None:
+        if params:
+            return error_response(405, 'Método no permitido', 'METHOD_NOT_ALLOWED')
+        return error_response(404, 'Ruta no encontrada', 'NOT_FOUND')
+    
+    event['pathParameters'] = {**(event.get('pathParameters') or {}), **params}
+    return dispatch(event, context, ref)
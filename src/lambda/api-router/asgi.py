@@ -0,0 +1,257 @@
+"""
+Servidor propio (ASGI) con todas las rutas de la API en un proceso
+Entry point: python asgi.py (uvicorn) o cualquier servidor ASGI con asgi:app
+
+Cada request HTTP se traduce al evento de API Gateway (REST, proxy) que
+espera app.lambda_handler, así que el código que corre es exactamente el
+del router en Lambda. Los handlers son bloqueantes (boto3, PyJWT): corren
+en un pool de ASGI_THREADS threads por proceso y el event loop solo
+atiende sockets. Keep-alive y los procesos por core los maneja uvicorn
+(--workers); cada worker importa la app y tiene su propio pool.
+
+Variables de entorno (además de las de la función):
+    ASGI_THREADS        threads del pool por worker (default 32)
+    ASGI_MAX_PENDING    requests esperando un thread antes de responder
+                        503 (default 4 x ASGI_THREADS)
+    ASGI_STAGE          stage reportado en requestContext (default 'local')
+    DB_FANOUT_THREADS   threads para las lecturas en paralelo de los
+                        handlers (default ASGI_THREADS)
+"""
+
+import asyncio
+import base64
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+# Todos los threads del pool comparten el de lecturas en paralelo de los
+# handlers (utils.async_db): se dimensiona igual salvo que se indique otro
+os.environ.setdefault('DB_FANOUT_THREADS', os.environ.get('ASGI_THREADS', '32'))
+
+from app import lambda_handler  # noqa: E402
+from utils.entrypoint import PREWARM_ENABLED  # noqa: E402
+from utils.metrics import log_error  # noqa: E402
+from utils.response import error_response  # noqa: E402
+
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', '32'))
+ASGI_MAX_PENDING = int(os.environ.get('ASGI_MAX_PENDING', str(4 * ASGI_THREADS)))
+ASGI_STAGE = os.environ.get('ASGI_STAGE', 'local')
+
+# Mismo límite de payload que API Gateway
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class LambdaContext:
+    """Lo que los handlers leen del contexto de Lambda"""
+    
+    function_name = 'api-router-asgi'
+    
+    def __init__(self, request_id):
+        self.aws_request_id = request_id
+    
+    def get_remaining_time_in_millis(self):
+        return 30000
+
+
+def build_event(scope, body, request_id):
+    """
+    Evento de API Gateway (integración proxy) a partir de un request ASGI
+    
+    Args:
+        scope: Scope HTTP del request
+        body: Body completo en bytes
+        request_id: Id del request (requestContext y contexto)
+    """
+    headers = {}
+    multi_headers = {}
+    for raw_name, raw_value in scope['headers']:
+        name = raw_name.decode('latin-1')
+        value = raw_value.decode('latin-1')
+        multi_headers.setdefault(name, []).append(value)
+        headers[name] = f"{headers[name]},{value}" if name in headers else value
+    
+    query = {}
+    multi_query = {}
+    for key, value in parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True):
+        multi_query.setdefault(key, []).append(value)
+        query[key] = value
+    
+    is_base64 = False
+    if body:
+        try:
+            text = body.decode('utf-8')
+        except UnicodeDecodeError:
+            text = base64.b64encode(body).decode('ascii')
+            is_base64 = True
+    else:
+        text = None
+    
+    client = scope.get('client') or (None, None)
+    path = scope['path']
+    
+    return {
+        'resource': '/{proxy+}',
+        'path': path,
+        'httpMethod': scope['method'],
+        'headers': headers,
+        'multiValueHeaders': multi_headers,
+        'queryStringParameters': query or None,
+        'multiValueQueryStringParameters': multi_query or None,
+        'pathParameters': {'proxy': path.lstrip('/')},
+        'stageVariables': None,
+        'requestContext': {
+            'requestId': request_id,
+            'stage': ASGI_STAGE,
+            'httpMethod': scope['method'],
+            'path': path,
+            'requestTimeEpoch': int(time.time() * 1000),
+            'identity': {'sourceIp': client[0]},
+        },
+        'body': text,
+        'isBase64Encoded': is_base64,
+    }
+
+
+def _response_parts(response):
+    """Status, headers ASGI y body en bytes de una respuesta de Lambda"""
+    body = response.get('body') or ''
+    body = base64.b64decode(body) if response.get('isBase64Encoded') else body.encode('utf-8')
+    
+    headers = [
+        (key.lower().encode('latin-1'), str(value).encode('latin-1'))
+        for key, value in (response.get('headers') or {}).items()
+        if key.lower() != 'content-length'
+    ]
+    for key, values in (response.get('multiValueHeaders') or {}).items():
+        headers.extend((key.lower().encode('latin-1'), str(v).encode('latin-1')) for v in values)
+    headers.append((b'content-length', str(len(body)).encode('latin-1')))
+    
+    return response['statusCode'], headers, body
+
+
+def _prewarm_thread():
+    """
+    Abrir la conexión a DynamoDB de cada thread del pool al crearlo
+    
+    Los recursos de boto3 son por thread (utils.db_utils); el prewarm de
+    app.py solo calienta el del thread principal.
+    """
+    if not PREWARM_ENABLED:
+        return
+    
+    try:
+        from utils.db_utils import prewarm_connection
+        prewarm_connection()
+    except Exception as e:
+        log_error('prewarm', e)
+
+
+class LambdaASGIApp:
+    """
+    App ASGI que ejecuta lambda_handler en un pool de threads acotado
+    
+    Cuando hay más de max_pending requests esperando un thread se responde
+    503 en lugar de encolar sin límite (un servidor saturado rechaza rápido
+    en vez de acumular latencia).
+    """
+    
+    def __init__(self, handler, threads=ASGI_THREADS, max_pending=ASGI_MAX_PENDING):
+        self.handler = handler
+        self.threads = threads
+        self.max_pending = max_pending
+        self._executor = None
+        self._in_flight = 0
+    
+    def _start_pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.threads, thread_name_prefix='handler', initializer=_prewarm_thread
+            )
+        return self._executor
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+    
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._start_pool()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._executor is not None:
+                    self._executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    
+    async def _http(self, scope, receive, send):
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size <= MAX_BODY_BYTES:
+                chunks.append(chunk)
+            more_body = message.get('more_body', False)
+        
+        if size > MAX_BODY_BYTES:
+            response = error_response(413, 'El request supera el tamaño máximo', 'PAYLOAD_TOO_LARGE')
+        elif self._in_flight >= self.threads + self.max_pending:
+            response = error_response(503, 'Servidor saturado, reintentar', 'SERVICE_UNAVAILABLE')
+        else:
+            request_id = str(uuid.uuid4())
+            event = build_event(scope, b''.join(chunks), request_id)
+            
+            self._in_flight += 1
+            try:
+                response = await asyncio.get_running_loop().run_in_executor(
+                    self._start_pool(), self.handler, event, LambdaContext(request_id)
+                )
+            finally:
+                self._in_flight -= 1
+        
+        status, headers, body = _response_parts(response)
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+
+app = LambdaASGIApp(lambda_handler)
+
+
+def main():
+    import argparse
+    
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit('El servidor necesita uvicorn: pip install -r requirements-server.txt')
+    
+    parser = argparse.ArgumentParser(description='API completa sobre uvicorn')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Procesos (default: uno por core)')
+    parser.add_argument('--keep-alive', type=int, default=75, help='Segundos de keep-alive (default: el de un ALB)')
+    args = parser.parse_args()
+    
+    uvicorn.run(
+        'asgi:app',
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_keep_alive=args.keep_alive,
+        access_log=False,
+    )
+
+
+if __name__ == '__main__':
+    main()
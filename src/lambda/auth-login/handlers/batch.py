@@ -0,0 +1,194 @@
+import contextvars
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+from utils import ddb_usage
+from utils.response import success_response, error_response, buffer_stream_response
+from utils.metrics import log_error, start_invocation, get_buffer, merge_buffer
+from utils.auth_utils import require_auth, verified_user
+from utils.db_utils import share_access_checks, reset_access_checks
+from utils.routing import match_route, resolve_handler
+
+BATCH_MAX_REQUESTS = int(os.environ.get('BATCH_MAX_REQUESTS', '20'))
+BATCH_THREADS = int(os.environ.get('BATCH_THREADS', '4'))
+BATCH_REF = 'handlers.batch:batch_handler'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=BATCH_THREADS, thread_name_prefix='batch')
+    return _executor
+
+
+@require_auth
+def batch_handler(event, context, user):
+    """
+    POST /batch
+    Ejecutar varios requests de la API en una sola llamada
+    
+    Body: {"requests": [{"id": "p", "method": "GET", "path": "/projects/123",
+    "query": {"fields": "name"}, "body": {...}}, ...]} (id, query y body son
+    opcionales; query también puede ir en el path y un body string se pasa
+    tal cual). Un sub-request con tipos inválidos responde 400
+    VALIDATION_ERROR.
+    
+    El token se valida una vez para todos. Los sub-requests corren en los
+    mismos handlers que sus rutas: las lecturas (GET) seguidas van en
+    paralelo, hasta BATCH_THREADS a la vez, y comparten el check de acceso
+    de cada proyecto; una escritura espera a lo anterior y corre sola, así
+    lo que viene después la ve. La respuesta trae status y body de cada uno
+    en el orden del pedido.
+    """
+    try:
+        body = json.loads(event.get('body') or '{}')
+        requests = body.get('requests') if isinstance(body, dict) else None
+        
+        if not isinstance(requests, list) or not requests:
+            return error_response(400, 'Se requiere una lista de requests', 'MISSING_REQUESTS')
+        
+        if len(requests) > BATCH_MAX_REQUESTS:
+            return error_response(400, f'Máximo {BATCH_MAX_REQUESTS} requests por batch', 'BATCH_TOO_LARGE')
+        
+        # Cada sub-request corre en una copia de este contexto: ve al usuario
+        # autenticado y los checks de acceso compartidos
+        results = [None] * len(requests)
+        with verified_user(user), share_access_checks():
+            pending = {}
+            for index, request in enumerate(requests):
+                if not _is_write(request):
+                    pending[index] = _submit(event, context, request)
+                    continue
+                
+                _wait(pending, results)
+                results[index] = _submit(event, context, request).result()
+                # Un check memoizado puede no valer más (p.ej. después de un DELETE)
+                reset_access_checks()
+            _wait(pending, results)
+        
+        responses = []
+        for response, usage, buffer in results:
+            ddb_usage.merge_usage(usage)
+            merge_buffer(buffer)
+            responses.append(response)
+        
+        return success_response(200, {
+            'responses': responses,
+            'count': len(responses)
+        })
+        
+    except ValueError:
+        return error_response(400, 'Body JSON inválido', 'INVALID_JSON')
+    except Exception as e:
+        log_error('batch', e)
+        return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
+
+
+def _is_write(request):
+    """Si el sub-request puede escribir (todo lo que no es GET)"""
+    return isinstance(request, dict) and str(request.get('method', 'GET')).upper() != 'GET'
+
+
+def _submit(event, context, request):
+    return _get_executor().submit(contextvars.copy_context().run, _run_request, event, context, request)
+
+
+def _wait(pending, results):
+    """Esperar los sub-requests en curso y guardar sus resultados"""
+    for index, future in pending.items():
+        results[index] = future.result()
+    pending.clear()
+
+
+def _run_request(event, context, request):
+    """
+    Un sub-request en un thread del pool
+    
+    Acumula ddb_usage y métricas (errores por código, excepciones) aparte;
+    batch_handler los suma a los del batch en el orden del pedido.
+    """
+    ddb_usage.reset_usage()
+    start_invocation(BATCH_REF)
+    try:
+        response = _dispatch(event, context, request)
+    except Exception as e:
+        log_error('batch_request', e)
+        response = error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
+    
+    result = {'status': response['statusCode'], 'body': _body(response)}
+    if isinstance(request, dict) and isinstance(request.get('id'), (str, int)):
+        result = {'id': request['id'], **result}
+    return result, ddb_usage.get_usage(), get_buffer()
+
+
+def _validate(request):
+    """Mensaje de error si id, method, path o query no tienen el tipo esperado"""
+    if 'id' in request and (isinstance(request['id'], bool) or not isinstance(request['id'], (str, int))):
+        return 'id debe ser string o número'
+    if not isinstance(request.get('method', 'GET'), str):
+        return 'method debe ser string'
+    if not isinstance(request['path'], str):
+        return 'path debe ser string'
+    
+    query = request.get('query')
+    if query is not None:
+        if not isinstance(query, dict):
+            return 'query debe ser un objeto'
+        if any(isinstance(value, bool) or not isinstance(value, (str, int, float)) for value in query.values()):
+            return 'Los valores de query deben ser strings o números'
+    return None
+
+
+def _dispatch(event, context, request):
+    """Resolver la ruta de un sub-request e invocar su handler"""
+    if not isinstance(request, dict) or 'path' not in request:
+        return error_response(400, 'Cada request requiere method y path', 'INVALID_REQUEST')
+    
+    error = _validate(request)
+    if error:
+        return error_response(400, error, 'VALIDATION_ERROR')
+    
+    method = request.get('method', 'GET').upper()
+    path, _, query_string = request['path'].partition('?')
+    query = {**dict(parse_qsl(query_string)), **{k: str(v) for k, v in (request.get('query') or {}).items()}}
+    ref, params = match_route(method, path)
+    
+    if ref is None:
+        if params:
+            return error_response(405, 'Método no permitido', 'METHOD_NOT_ALLOWED')
+        return error_response(404, 'Ruta no encontrada', 'NOT_FOUND')
+    
+    if ref == BATCH_REF:
+        return error_response(400, 'No se puede anidar un batch', 'NESTED_BATCH')
+    
+    # Un body string (JSON ya serializado) se pasa tal cual al handler
+    body = request.get('body')
+    if body is not None and not isinstance(body, str):
+        body = json.dumps(body)
+    
+    sub_event = dict(
+        event,
+        httpMethod=method,
+        path=path,
+        pathParameters=params,
+        queryStringParameters=query or None,
+        multiValueQueryStringParameters=None,
+        body=body,
+        isBase64Encoded=False
+    )
+    return buffer_stream_response(resolve_handler(ref)(sub_event, context))
+
+
+def _body(response):
+    """Body de una respuesta de handler: el JSON decodificado, o el texto (p.ej. NDJSON)"""
+    body = response.get('body') or ''
+    if response.get('headers', {}).get('Content-Type', '').startswith('application/json'):
+        return json.loads(body)
+    return body
@@ -1,69 +1,173 @@
-import boto3
+import contextvars
 import os
-from boto3.dynamodb.conditions import Key, Attr
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import datetime
 
-# Inicializar cliente DynamoDB
-dynamodb = boto3.resource('dynamodb')
+from . import ddb_usage
+from .repository import get_repository
+from .shared_cache import cached, cached_user, invalidate_project, invalidate_user
+
+# Operaciones de almacenamiento de los handlers: las funciones de este módulo
+# delegan en el repositorio de STORAGE_BACKEND (utils.repository). Acá quedan
+# además los builders de items, compartidos por los dos backends, y el
+# acceso a boto3 que usa utils.dynamodb_repository.
+#
+# Con SHARED_CACHE las lecturas por proyecto (metadata, miembros, tareas)
+# pasan por utils.shared_cache y las escrituras que las cambian lo invalidan
+# después de escribir.
+
 table_name = os.environ.get('TABLE_NAME', 'ProjectManagement-dev')
-table = dynamodb.Table(table_name)
+
+# boto3 (~200 ms de import) se carga en la primera operación: los preflight
+# OPTIONS y los requests que fallan validación nunca lo importan.
+# Los recursos de boto3 no son thread-safe: cada thread (en Lambda hay uno
+# solo; en el servidor ASGI, los del pool) crea el suyo
+_local = threading.local()
+_create_lock = threading.Lock()
+
+# Límite de claves por llamada de BatchGetItem
+BATCH_GET_MAX_KEYS = 100
+
+# Checks de acceso compartidos entre los sub-requests de un batch
+# (share_access_checks); None fuera de uno
+_access_checks = contextvars.ContextVar('access_checks', default=None)
+
+
+def get_resource():
+    """
+    Obtener el recurso DynamoDB de boto3, creándolo en el primer uso
+    
+    Su cliente (compartido por la tabla) lleva los hooks de ddb_usage:
+    capacidad consumida y latencia de cada llamada.
+    """
+    resource = getattr(_local, 'resource', None)
+    if resource is None:
+        import boto3
+        # La sesión por defecto de boto3 tampoco es thread-safe al crear clientes
+        with _create_lock:
+            resource = boto3.resource('dynamodb')
+        ddb_usage.install(resource.meta.client)
+        _local.resource = resource
+    return resource
+
+
+def get_table():
+    """Obtener la tabla DynamoDB, creando el recurso en el primer uso"""
+    table = getattr(_local, 'table', None)
+    if table is None:
+        table = _local.table = get_resource().Table(table_name)
+    return table
+
+
+def prewarm_connection():
+    """
+    Abrir la conexión del backend durante el init de Lambda
+    
+    Con DynamoDB resuelve DNS y completa TCP/TLS fuera del primer request;
+    la conexión queda en el pool de botocore para las invocaciones
+    siguientes. Con SQLite abre la base y crea el esquema.
+    """
+    get_repository().prewarm()
+
+
+def _key(name):
+    """boto3.dynamodb.conditions.Key importado en el primer uso"""
+    from boto3.dynamodb.conditions import Key
+    return Key(name)
+
+
+def batch_get_items(keys, projection=None):
+    """
+    Leer varios items por clave con BatchGetItem
+    
+    Las claves se envían en bloques de BATCH_GET_MAX_KEYS, en paralelo si
+    hay más de uno (utils.async_db); las UnprocessedKeys que devuelve
+    DynamoDB bajo throttling se reintentan con backoff.
+    
+    Args:
+        keys: lista de dicts {'PK': ..., 'SK': ...} sin repetidos
+        projection: ProjectionExpression y ExpressionAttributeNames (tiene
+            que incluir PK y SK)
+    
+    Returns:
+        dict {(PK, SK): item} con los items encontrados
+    """
+    chunks = [keys[start:start + BATCH_GET_MAX_KEYS] for start in range(0, len(keys), BATCH_GET_MAX_KEYS)]
+    if len(chunks) <= 1:
+        return _batch_get_chunk(chunks[0], projection) if chunks else {}
+    
+    from .async_db import call, fetch_all
+    
+    items = {}
+    for chunk_items in fetch_all(*(call(_batch_get_chunk, chunk, projection) for chunk in chunks)):
+        items.update(chunk_items)
+    return items
+
+
+def _batch_get_chunk(keys, projection=None):
+    """Un BatchGetItem de hasta BATCH_GET_MAX_KEYS claves, con sus reintentos"""
+    items = {}
+    request = {table_name: {'Keys': keys, **(projection or {})}}
+    attempt = 0
+    
+    while request:
+        response = get_resource().batch_get_item(RequestItems=request)
+        for item in response['Responses'].get(table_name, []):
+            items[(item['PK'], item['SK'])] = item
+        
+        request = response.get('UnprocessedKeys')
+        if request:
+            attempt += 1
+            time.sleep(min(0.05 * 2 ** attempt, 1))
+    
+    return items
 
 
 def get_timestamp():
-    """Obtener timestamp ISO actual"""
-    return datetime.utcnow().isoformat()
+    """Obtener timestamp ISO actual (en milisegundos, la precisión con que se guarda)"""
+    return datetime.utcnow().isoformat(timespec='milliseconds')
 
 
 # ==================== USER OPERATIONS ====================
 
-def create_user(user_id, email, name, hashed_password):
-    """Crear nuevo usuario en DynamoDB"""
-    user_item = {
+def build_user_item(user_id, email, name, hashed_password, timestamp=None):
+    """Construir el item de perfil de un usuario"""
+    return {
         'PK': f"USER#{user_id}",
         'SK': 'PROFILE',
         'userId': user_id,
         'email': email,
         'name': name,
         'password': hashed_password,
-        'createdAt': get_timestamp()
+        'createdAt': timestamp or get_timestamp()
     }
-    
-    table.put_item(Item=user_item)
-    return user_item
+
+
+def create_user(user_id, email, name, hashed_password):
+    """Crear nuevo usuario"""
+    return get_repository().create_user(user_id, email, name, hashed_password)
 
 
 def get_user_by_email(email):
     """Buscar usuario por email"""
-    response = table.query(
-        IndexName='EmailIndex',
-        KeyConditionExpression=Key('email').eq(email)
-    )
-    
-    if response['Count'] > 0:
-        return response['Items'][0]
-    return None
+    return get_repository().get_user_by_email(email)
 
 
 def get_user_by_id(user_id):
     """Obtener usuario por ID"""
-    response = table.get_item(
-        Key={
-            'PK': f"USER#{user_id}",
-            'SK': 'PROFILE'
-        }
-    )
-    
-    return response.get('Item')
+    return get_repository().get_user_by_id(user_id)
 
 
 # ==================== PROJECT OPERATIONS ====================
 
-def create_project(project_id, name, description, status, user_id, user_name):
-    """Crear nuevo proyecto"""
-    timestamp = get_timestamp()
+def build_project_item(project_id, name, description, status, user_id, user_name, timestamp=None):
+    """Construir el item METADATA de un proyecto"""
+    timestamp = timestamp or get_timestamp()
     
-    # Metadata del proyecto
-    project_item = {
+    return {
         'PK': f"PROJECT#{project_id}",
         'SK': 'METADATA',
         'projectId': project_id,
@@ -77,138 +181,163 @@ def create_project(project_id, name, description, status, user_id, user_name):
         'taskCount': 0,
         'memberCount': 1
     }
+
+
+def build_membership_items(project_id, project_name, user_id, user_name, role, timestamp=None):
+    """
+    Construir los dos items de una membresía
+    
+    Returns:
+        (member_item, user_project_item): MEMBER# bajo el proyecto y
+        PROJECT# bajo el usuario
+    """
+    timestamp = timestamp or get_timestamp()
     
-    # Miembro owner
     member_item = {
         'PK': f"PROJECT#{project_id}",
         'SK': f"MEMBER#{user_id}",
         'userId': user_id,
         'userName': user_name,
-        'role': 'owner',
+        'role': role,
         'joinedAt': timestamp
     }
     
-    # Relación usuario-proyecto
     user_project_item = {
         'PK': f"USER#{user_id}",
         'SK': f"PROJECT#{project_id}",
         'projectId': project_id,
-        'projectName': name,
-        'role': 'owner',
+        'projectName': project_name,
+        'role': role,
         'joinedAt': timestamp
     }
     
-    # Escribir en batch
-    with table.batch_writer() as batch:
-        batch.put_item(Item=project_item)
-        batch.put_item(Item=member_item)
-        batch.put_item(Item=user_project_item)
-    
-    return project_item
+    return member_item, user_project_item
 
 
-def get_user_projects(user_id):
-    """Obtener todos los proyectos de un usuario"""
-    response = table.query(
-        KeyConditionExpression=Key('PK').eq(f"USER#{user_id}") & Key('SK').begins_with('PROJECT#')
+def create_project(project_id, name, description, status, user_id, user_name):
+    """Crear nuevo proyecto (también cambia los proyectos del usuario)"""
+    project = get_repository().create_project(project_id, name, description, status, user_id, user_name)
+    invalidate_user(user_id)
+    return project
+
+
+def get_user_projects(user_id, descriptions='full', fields=None):
+    """Obtener todos los proyectos de un usuario ('preview' recorta las descripciones)"""
+    # projectId siempre se lee: la entrada del cache depende de cada proyecto
+    load_fields = fields if not fields or 'projectId' in fields else [*fields, 'projectId']
+    projects = cached_user(
+        user_id, f"projects:{descriptions}:{_variant(fields)}",
+        lambda: get_repository().get_user_projects(user_id, descriptions, load_fields),
+        lambda projects: [project['projectId'] for project in projects]
     )
-    
-    projects = []
-    for item in response['Items']:
-        project_id = item['SK'].replace('PROJECT#', '')
-        
-        # Obtener metadata del proyecto
-        project_data = table.get_item(
-            Key={
-                'PK': f"PROJECT#{project_id}",
-                'SK': 'METADATA'
-            }
-        )
-        
-        if 'Item' in project_data:
-            project = project_data['Item']
-            project['userRole'] = item.get('role', 'member')
-            projects.append(project)
-    
+    if load_fields is not fields:
+        projects = [{name: value for name, value in project.items() if name != 'projectId'} for project in projects]
     return projects
 
 
-def get_project(project_id):
-    """Obtener detalles de un proyecto"""
-    response = table.get_item(
-        Key={
-            'PK': f"PROJECT#{project_id}",
-            'SK': 'METADATA'
-        }
+def _variant(fields):
+    """Parte de la clave de cache que distingue un ?fields="""
+    return ','.join(fields) if fields else '*'
+
+
+def get_project(project_id, fields=None):
+    """Obtener detalles de un proyecto (fields: solo esos campos)"""
+    return cached(
+        project_id, f"project:{_variant(fields)}", lambda: get_repository().get_project(project_id, fields)
     )
-    
-    return response.get('Item')
 
 
 def update_project(project_id, updates):
     """Actualizar proyecto"""
-    update_expr = "SET updatedAt = :timestamp"
-    expr_values = {':timestamp': get_timestamp()}
-    expr_names = {}
-    
-    for key, value in updates.items():
-        if key in ['name', 'description', 'status']:
-            update_expr += f", #{key} = :{key}"
-            expr_values[f":{key}"] = value
-            expr_names[f"#{key}"] = key
-    
-    response = table.update_item(
-        Key={
-            'PK': f"PROJECT#{project_id}",
-            'SK': 'METADATA'
-        },
-        UpdateExpression=update_expr,
-        ExpressionAttributeValues=expr_values,
-        ExpressionAttributeNames=expr_names if expr_names else None,
-        ReturnValues='ALL_NEW'
-    )
-    
-    return response.get('Attributes')
+    project = get_repository().update_project(project_id, updates)
+    invalidate_project(project_id)
+    return project
 
 
 def delete_project(project_id):
     """Eliminar proyecto (solo metadata, las relaciones se eliminan por separado)"""
-    table.delete_item(
-        Key={
-            'PK': f"PROJECT#{project_id}",
-            'SK': 'METADATA'
-        }
-    )
+    result = get_repository().delete_project(project_id)
+    invalidate_project(project_id)
+    return result
 
 
 def check_user_project_access(user_id, project_id):
     """Verificar si el usuario tiene acceso al proyecto"""
-    response = table.get_item(
-        Key={
-            'PK': f"USER#{user_id}",
-            'SK': f"PROJECT#{project_id}"
-        }
+    shared = _access_checks.get()
+    if shared is None:
+        return get_repository().check_user_project_access(user_id, project_id)
+    return shared.get(
+        (user_id, project_id), lambda: get_repository().check_user_project_access(user_id, project_id)
     )
+
+
+class _SharedResults:
+    """
+    Resultados por clave que se calculan una sola vez
     
-    return response.get('Item')
+    Si varios threads piden la misma clave a la vez, el primero la calcula y
+    los demás esperan su resultado (o su excepción).
+    """
+    
+    def __init__(self):
+        self._futures = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key, compute):
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = self._futures[key] = Future()
+        
+        if owner:
+            try:
+                future.set_result(compute())
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+    
+    def clear(self):
+        with self._lock:
+            self._futures.clear()
+
+
+@contextmanager
+def share_access_checks():
+    """
+    Memoizar check_user_project_access mientras dura el bloque
+    
+    Lo ven el thread actual y lo que corra en una copia de su contexto
+    (los sub-requests de POST /batch y las lecturas de utils.async_db). Un
+    cambio de membresía dentro del bloque no invalida lo memoizado: después
+    de escribir hay que llamar a reset_access_checks().
+    """
+    token = _access_checks.set(_SharedResults())
+    try:
+        yield
+    finally:
+        _access_checks.reset(token)
+
+
+def reset_access_checks():
+    """Descartar los checks memoizados por share_access_checks (después de una escritura)"""
+    shared = _access_checks.get()
+    if shared is not None:
+        shared.clear()
 
 
 def get_project_members(project_id):
     """Obtener miembros de un proyecto"""
-    response = table.query(
-        KeyConditionExpression=Key('PK').eq(f"PROJECT#{project_id}") & Key('SK').begins_with('MEMBER#')
-    )
-    
-    return response.get('Items', [])
+    return cached(project_id, 'members', lambda: get_repository().get_project_members(project_id))
 
 
 # ==================== TASK OPERATIONS ====================
 
-def create_task(task_id, project_id, title, description, status, assigned_to, created_by):
-    """Crear nueva tarea"""
-    timestamp = get_timestamp()
+def build_task_item(task_id, project_id, title, description, status, assigned_to, created_by, timestamp=None):
+    """Construir el item de una tarea (usado también por el importador masivo)"""
+    timestamp = timestamp or get_timestamp()
     
-    task_item = {
+    return {
         'PK': f"PROJECT#{project_id}",
         'SK': f"TASK#{task_id}",
         'taskId': task_id,
@@ -221,86 +350,61 @@ def create_task(task_id, project_id, title, description, status, assigned_to, cr
         'createdAt': timestamp,
         'updatedAt': timestamp
     }
-    
-    table.put_item(Item=task_item)
-    
-    # Incrementar contador de tareas del proyecto
-    table.update_item(
-        Key={
-            'PK': f"PROJECT#{project_id}",
-            'SK': 'METADATA'
-        },
-        UpdateExpression='SET taskCount = if_not_exists(taskCount, :zero) + :inc',
-        ExpressionAttributeValues={
-            ':inc': 1,
-            ':zero': 0
-        }
-    )
-    
-    return task_item
 
 
-def get_project_tasks(project_id):
-    """Obtener todas las tareas de un proyecto"""
-    response = table.query(
-        KeyConditionExpression=Key('PK').eq(f"PROJECT#{project_id}") & Key('SK').begins_with('TASK#')
+def create_task(task_id, project_id, title, description, status, assigned_to, created_by):
+    """Crear nueva tarea (también cambia el taskCount del proyecto)"""
+    task = get_repository().create_task(task_id, project_id, title, description, status, assigned_to, created_by)
+    invalidate_project(project_id)
+    return task
+
+
+def get_project_tasks(project_id, descriptions='full', fields=None):
+    """Obtener todas las tareas de un proyecto ('preview' recorta las descripciones)"""
+    return cached(
+        project_id, f"tasks:{descriptions}:{_variant(fields)}",
+        lambda: get_repository().get_project_tasks(project_id, descriptions, fields)
     )
-    
-    return response.get('Items', [])
 
 
-def update_task(project_id, task_id, updates):
-    """Actualizar tarea"""
-    update_expr = "SET updatedAt = :timestamp"
-    expr_values = {':timestamp': get_timestamp()}
-    expr_names = {}
+def iter_project_task_pages(project_id, page_size=1000, first_page_size=None, descriptions='full'):
+    """
+    Iterar las tareas de un proyecto página por página
     
-    for key, value in updates.items():
-        if key in ['title', 'description', 'status', 'assignedTo']:
-            update_expr += f", #{key} = :{key}"
-            expr_values[f":{key}"] = value
-            expr_names[f"#{key}"] = key
+    Solo mantiene en memoria una página de DynamoDB a la vez.
     
-    response = table.update_item(
-        Key={
-            'PK': f"PROJECT#{project_id}",
-            'SK': f"TASK#{task_id}"
-        },
-        UpdateExpression=update_expr,
-        ExpressionAttributeValues=expr_values,
-        ExpressionAttributeNames=expr_names if expr_names else None,
-        ReturnValues='ALL_NEW'
-    )
+    Args:
+        project_id: ID del proyecto
+        page_size: Items por Query
+        first_page_size: Items de la primera Query (menor para bajar el time-to-first-byte)
+        descriptions: 'full' o 'preview' (item_codec.DESCRIPTION_MODES)
     
-    return response.get('Attributes')
+    Yields:
+        Lista de items de cada página
+    """
+    return get_repository().iter_project_task_pages(project_id, page_size, first_page_size, descriptions)
+
+
+def update_task(project_id, task_id, updates):
+    """Actualizar tarea"""
+    task = get_repository().update_task(project_id, task_id, updates)
+    invalidate_project(project_id)
+    return task
 
 
 def delete_task(project_id, task_id):
     """Eliminar tarea"""
-    table.delete_item(
-        Key={
-            'PK': f"PROJECT#{project_id}",
-            'SK': f"TASK#{task_id}"
-        }
-    )
-    
-    # Decrementar contador
-    table.update_item(
-        Key={
-            'PK': f"PROJECT#{project_id}",
-            'SK': 'METADATA'
-        },
-        UpdateExpression='SET taskCount = taskCount - :dec',
-        ExpressionAttributeValues={':dec': 1}
-    )
+    result = get_repository().delete_task(project_id, task_id)
+    invalidate_project(project_id)
+    return result
 
 
 # ==================== STATISTICS ====================
 
 def get_user_statistics(user_id):
     """Obtener estadísticas del usuario"""
-    # Proyectos del usuario
-    projects = get_user_projects(user_id)
+    # Proyectos del usuario (solo lo que se cuenta: la entrada del cache es chica)
+    projects = get_user_projects(user_id, fields=['projectId', 'status', 'taskCount'])
     
     total_projects = len(projects)
     active_projects = len([p for p in projects if p.get('status') == 'active'])
@@ -0,0 +1,220 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from .metrics import set_property
+
+# Profiling bajo demanda de invocaciones individuales
+#
+# Se activa de dos formas:
+#     PROFILE=true               una fracción PROFILE_SAMPLE_RATE de los requests
+#     header X-Debug-Profile     un request puntual, firmado con PROFILE_SECRET
+#                                (ver sign_debug_header)
+#
+# PROFILE_FORMAT=collapsed usa un profiler por muestreo (un thread lee el
+# stack del request cada PROFILE_INTERVAL_MS con sys._current_frames) y
+# produce stacks colapsados para flamegraph.pl / speedscope;
+# PROFILE_FORMAT=pstats usa cProfile (exacto, más overhead).
+#
+# El resultado va a PROFILE_OUTPUT (un directorio, p.ej. /tmp/profiles) o,
+# si no está definido, al log como una línea JSON.
+#
+# Sin PROFILE ni PROFILE_SECRET, PROFILING_ARMED es False y entrypoint no
+# llama a nada de este módulo.
+
+PROFILE_ENABLED = os.environ.get('PROFILE', 'false').lower() == 'true'
+PROFILE_SECRET = os.environ.get('PROFILE_SECRET', '')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '1'))
+PROFILE_FORMAT = os.environ.get('PROFILE_FORMAT', 'collapsed')
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', '2'))
+PROFILE_OUTPUT = os.environ.get('PROFILE_OUTPUT', '')
+
+PROFILING_ARMED = PROFILE_ENABLED or bool(PROFILE_SECRET)
+
+DEBUG_HEADER = 'X-Debug-Profile'
+
+# Filas del resumen de pstats cuando se escribe al log
+PSTATS_LOG_ROWS = 40
+
+
+class SamplingProfiler:
+    """
+    Profiler por muestreo del thread que lo inicia
+    
+    Cuenta cuántas veces se vio cada stack; el costo sobre el request es el
+    de un thread que se despierta cada `interval` segundos.
+    """
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._target = None
+        self._thread = None
+    
+    def start(self):
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+                self.samples += 1
+    
+    def collapsed(self):
+        """Stacks en formato colapsado: 'raíz;...;hoja cantidad' por línea"""
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+def collapse_stack(frame):
+    """Stack de un frame como 'módulo.función;...' desde la raíz"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{frame.f_globals.get('__name__', '?')}.{code.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def sign_debug_header(secret, ttl_seconds=300, now=None):
+    """
+    Valor del header X-Debug-Profile válido por ttl_seconds
+    
+    Formato: '<expira epoch>.<HMAC-SHA256(secret, expira) en hex>'
+    """
+    import hashlib
+    import hmac
+    
+    expires = int((now or time.time()) + ttl_seconds)
+    signature = hmac.new(secret.encode('utf-8'), str(expires).encode('utf-8'), hashlib.sha256).hexdigest()
+    return f"{expires}.{signature}"
+
+
+def verify_debug_header(value, secret, now=None):
+    """Validar firma y vencimiento de un header X-Debug-Profile"""
+    import hmac
+    
+    expires, _, signature = (value or '').partition('.')
+    if not expires.isdigit() or int(expires) < (now or time.time()):
+        return False
+    
+    expected = sign_debug_header(secret, 0, now=int(expires)).partition('.')[2]
+    return hmac.compare_digest(signature, expected)
+
+
+def should_profile(event):
+    """Decidir si se perfila este request (header firmado o muestreo)"""
+    if PROFILE_SECRET:
+        value = None
+        for key, header in (event.get('headers') or {}).items():
+            if key.lower() == DEBUG_HEADER.lower():
+                value = header
+                break
+        
+        if value and verify_debug_header(value, PROFILE_SECRET):
+            return True
+    
+    if PROFILE_ENABLED:
+        import random
+        return random.random() < PROFILE_SAMPLE_RATE
+    
+    return False
+
+
+def run_profiled(func, route, context, *args):
+    """
+    Ejecutar func(*args) bajo el profiler y guardar el resultado
+    
+    Args:
+        func: Función a perfilar
+        route: 'módulo:función' del handler (para nombrar el perfil)
+        context: Contexto de Lambda (requestId)
+        args: Argumentos de func
+    
+    Returns:
+        Lo que retorna func
+    """
+    request_id = getattr(context, 'aws_request_id', None) or str(int(time.time() * 1000))
+    
+    if PROFILE_FORMAT == 'pstats':
+        import cProfile
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            return profiler.runcall(func, *args)
+        finally:
+            _write_pstats(profiler, route, request_id, time.perf_counter() - start)
+    
+    profiler = SamplingProfiler(PROFILE_INTERVAL_MS / 1000)
+    start = time.perf_counter()
+    profiler.start()
+    try:
+        return func(*args)
+    finally:
+        profiler.stop()
+        _write_collapsed(profiler, route, request_id, time.perf_counter() - start)
+
+
+def _profile_path(route, request_id, extension):
+    os.makedirs(PROFILE_OUTPUT, exist_ok=True)
+    name = route.replace(':', '.').replace('/', '_')
+    return os.path.join(PROFILE_OUTPUT, f"{int(time.time())}-{name}-{request_id}.{extension}")
+
+
+def _write_collapsed(profiler, route, request_id, elapsed):
+    if PROFILE_OUTPUT:
+        path = _profile_path(route, request_id, 'collapsed')
+        with open(path, 'w') as f:
+            f.write(profiler.collapsed() + '\n')
+        set_property('profile', path)
+        return
+    
+    _log({
+        'type': 'profile',
+        'format': 'collapsed',
+        'route': route,
+        'requestId': request_id,
+        'durationMs': round(elapsed * 1000, 2),
+        'samples': profiler.samples,
+        'intervalMs': PROFILE_INTERVAL_MS,
+        'stacks': profiler.collapsed(),
+    })
+    set_property('profile', 'log')
+
+
+def _write_pstats(profiler, route, request_id, elapsed):
+    if PROFILE_OUTPUT:
+        path = _profile_path(route, request_id, 'pstats')
+        profiler.dump_stats(path)
+        set_property('profile', path)
+        return
+    
+    import io
+    import pstats
+    
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(PSTATS_LOG_ROWS)
+    _log({
+        'type': 'profile',
+        'format': 'pstats',
+        'route': route,
+        'requestId': request_id,
+        'durationMs': round(elapsed * 1000, 2),
+        'stats': out.getvalue(),
+    })
+    set_property('profile', 'log')
+
+
+def _log(record):
+    sys.stdout.write(json.dumps(record) + '\n')
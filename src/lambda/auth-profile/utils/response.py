@@ -1,12 +1,135 @@
+import base64
+import gzip
 import json
+import os
+from datetime import date, datetime
 from decimal import Decimal
 
+from .metrics import record_error
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional; sin él solo se ofrece gzip
+    brotli = None
+
+# orjson es opcional (sin él se usa json de la stdlib) y se importa en la
+# primera serialización: su import (~9 ms) no debe pesar en los preflight
+orjson = None
+_orjson_loaded = False
+
+# Compresión de respuestas. Niveles elegidos con benchmarks/bench_compression.py
+# a 512 MB: gzip 3 y brotli 1 están en el codo CPU/bytes; niveles mayores
+# duplican el tiempo de CPU para ahorrar menos de un 10% adicional.
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', '1024'))
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', '3'))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', '1'))
+
+# Tope de una stream_response materializada (API Gateway, api-router, batch):
+# la respuesta síncrona de Lambda no puede pasar de 6 MB. Más grande que
+# esto se responde 413 apuntando a STREAM_URL (la Function URL con response
+# streaming de tasks-export), que no tiene tope
+BUFFERED_STREAM_MAX_BYTES = int(os.environ.get('BUFFERED_STREAM_MAX_BYTES', str(5 * 1024 * 1024)))
+STREAM_URL = os.environ.get('STREAM_URL', '')
+
+# Backend de serialización: 'auto' usa orjson si está instalado
+JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+
+# Headers comunes de todas las respuestas JSON
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+    'Access-Control-Allow-Credentials': 'true'
+}
+
+
+def json_default(obj):
+    """
+    Serializar tipos no nativos de JSON
+    
+    Los Decimals enteros de DynamoDB (taskCount, memberCount...) se
+    mantienen como int; el resto se convierte a float.
+    """
+    if isinstance(obj, Decimal):
+        if obj == obj.to_integral_value():
+            return int(obj)
+        return float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 class DecimalEncoder(json.JSONEncoder):
     """Encoder personalizado para serializar Decimals de DynamoDB"""
     def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+        return json_default(obj)
+
+
+def _dumps_stdlib(obj):
+    return json.dumps(obj, default=json_default)
+
+
+def _dumps_orjson(obj):
+    try:
+        return orjson.dumps(obj, default=json_default).decode('utf-8')
+    except orjson.JSONEncodeError:
+        # p.ej. enteros fuera de 64 bits; json de la stdlib los soporta
+        return _dumps_stdlib(obj)
+
+
+_SERIALIZERS = {'json': _dumps_stdlib}
+
+
+def _load_orjson():
+    """Registrar el backend orjson si está instalado (una sola vez)"""
+    global orjson, _orjson_loaded
+    if _orjson_loaded:
+        return
+    _orjson_loaded = True
+    
+    try:
+        import orjson as orjson_module
+    except ImportError:
+        return
+    orjson = orjson_module
+    _SERIALIZERS['orjson'] = _dumps_orjson
+
+
+def register_serializer(name, func):
+    """
+    Registrar un backend de serialización
+    
+    Args:
+        name: Nombre del backend (valor de JSON_BACKEND)
+        func: Función obj -> str
+    """
+    _SERIALIZERS[name] = func
+
+
+def available_serializers():
+    """Nombres de los backends de serialización registrados"""
+    _load_orjson()
+    return sorted(_SERIALIZERS)
+
+
+def get_serializer(name=None):
+    """
+    Obtener la función de serialización del backend indicado
+    
+    Con 'auto' (o un backend no registrado) se usa orjson si está
+    disponible y si no json de la stdlib.
+    """
+    _load_orjson()
+    name = name or JSON_BACKEND
+    if name in _SERIALIZERS:
+        return _SERIALIZERS[name]
+    return _SERIALIZERS.get('orjson', _dumps_stdlib)
+
+
+def dumps(obj):
+    """Serializar obj a JSON con el backend configurado"""
+    return get_serializer()(obj)
 
 
 def success_response(status_code, data, message=None):
@@ -28,14 +151,8 @@ def success_response(status_code, data, message=None):
     
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true'
-        },
-        'body': json.dumps(body, cls=DecimalEncoder)
+        'headers': dict(RESPONSE_HEADERS),
+        'body': dumps(body)
     }
 
 
@@ -55,15 +172,176 @@ def error_response(status_code, error_message, error_code=None):
     
     if error_code:
         body['errorCode'] = error_code
+        record_error(error_code)
+    
+    return {
+        'statusCode': status_code,
+        'headers': dict(RESPONSE_HEADERS),
+        'body': dumps(body)
+    }
+
+
+def _accepted_encodings(event):
+    """
+    Parsear el header Accept-Encoding del evento
+    
+    Returns:
+        dict encoding -> q (incluye los q=0: excluyen ese encoding aunque
+        haya '*')
+    """
+    headers = event.get('headers') or {}
+    header_value = ''
+    for key, value in headers.items():
+        if key.lower() == 'accept-encoding':
+            header_value = value or ''
+            break
+    
+    encodings = {}
+    for part in header_value.split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        
+        encodings[name] = quality
+    
+    return encodings
+
+
+def _accepts(encodings, name):
+    """Si el cliente acepta el encoding: su propio q manda sobre el de '*'"""
+    return encodings.get(name, encodings.get('*', 0)) > 0
+
+
+def stream_response(status_code, chunks, content_type='application/x-ndjson'):
+    """
+    Respuesta cuyo body es un iterador de chunks (bytes)
+    
+    Los entry points con response streaming escriben cada chunk a medida que
+    se genera; los demás lo materializan con buffer_stream_response.
+    
+    Args:
+        status_code: HTTP status code
+        chunks: Iterable de bytes
+        content_type: Content-Type del body
+    """
+    headers = dict(RESPONSE_HEADERS)
+    headers['Content-Type'] = content_type
     
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true'
-        },
-        'body': json.dumps(body)
-    }
\ No newline at end of file
+        'headers': headers,
+        'body': chunks
+    }
+
+
+def is_stream_response(response):
+    """Indicar si la respuesta tiene un body iterable en vez de un string"""
+    return not isinstance(response.get('body'), (str, type(None)))
+
+
+def buffer_stream_response(response, max_bytes=None):
+    """
+    Materializar el body de una stream_response en un string
+    
+    Se deja de leer al pasar max_bytes (default BUFFERED_STREAM_MAX_BYTES):
+    la memoria queda acotada y la respuesta pasa a ser un 413
+    RESPONSE_TOO_LARGE con la URL de streaming si está configurada.
+    """
+    if not is_stream_response(response):
+        return response
+    
+    max_bytes = BUFFERED_STREAM_MAX_BYTES if max_bytes is None else max_bytes
+    chunks = []
+    size = 0
+    body = iter(response['body'])
+    try:
+        for chunk in body:
+            size += len(chunk)
+            if size > max_bytes:
+                return _too_large_response(max_bytes)
+            chunks.append(chunk)
+    finally:
+        # Cortar el generador (y sus lecturas pendientes) si no se terminó
+        close = getattr(body, 'close', None)
+        if close is not None:
+            close()
+    
+    buffered = dict(response)
+    buffered['body'] = b''.join(chunks).decode('utf-8')
+    return buffered
+
+
+def _too_large_response(max_bytes):
+    """413 para una respuesta que no entra materializada"""
+    message = f'La respuesta supera {max_bytes} bytes sin streaming'
+    if STREAM_URL:
+        message += f'; usar el mismo path en {STREAM_URL}'
+    return error_response(413, message, 'RESPONSE_TOO_LARGE')
+
+
+def compress_response(event, response):
+    """
+    Comprimir el body de la respuesta si el cliente lo acepta
+    
+    Solo se comprime cuando el body supera COMPRESSION_MIN_BYTES. Se prefiere
+    brotli si está instalado y el cliente lo acepta, si no gzip.
+    
+    Args:
+        event: Evento de API Gateway (para leer Accept-Encoding)
+        response: Response dict generado por success_response/error_response
+    
+    Returns:
+        Response dict, con body en base64 e isBase64Encoded si se comprimió
+    """
+    body = response.get('body')
+    if not isinstance(body, str) or response.get('isBase64Encoded'):
+        return response
+    
+    raw = body.encode('utf-8')
+    if len(raw) < COMPRESSION_MIN_BYTES:
+        return response
+    
+    accepted = _accepted_encodings(event)
+    if brotli is not None and accepted.get('br', 0) > 0:
+        encoding = 'br'
+        compressed = brotli.compress(raw, quality=BROTLI_QUALITY)
+    elif _accepts(accepted, 'gzip'):
+        encoding = 'gzip'
+        compressed = gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+    else:
+        return response
+    
+    if len(compressed) >= len(raw):
+        return response
+    
+    headers = dict(response.get('headers') or {})
+    headers['Content-Encoding'] = encoding
+    headers['Vary'] = 'Accept-Encoding'
+    
+    compressed_response = dict(response)
+    compressed_response['headers'] = headers
+    compressed_response['body'] = base64.b64encode(compressed).decode('ascii')
+    compressed_response['isBase64Encoded'] = True
+    return compressed_response
+
+
+def decode_request_body(event):
+    """
+    Decodificar el body del request si API Gateway lo entregó en base64
+    
+    Con BinaryMediaTypes '*/*' (necesario para devolver respuestas comprimidas)
+    API Gateway también codifica en base64 el body de los requests.
+    """
+    if event.get('isBase64Encoded') and event.get('body'):
+        event['body'] = base64.b64decode(event['body']).decode('utf-8')
+        event['isBase64Encoded'] = False
+    return event
\ No newline at end of file
@@ -4,8 +4,11 @@ Endpoint: POST /auth/register
 Handler: app.lambda_handler
 """
 
-from handlers.auth import register
-from utils.response import error_response
+from utils.entrypoint import run_handler, prewarm
+
+HANDLER = 'handlers.auth:register'
+
+prewarm(HANDLER)
 
 
 def lambda_handler(event, context):
@@ -19,24 +22,4 @@ def lambda_handler(event, context):
     Returns:
         Response dict con statusCode, headers y body
     """
-    try:
-        # Manejar OPTIONS para CORS
-        if event.get('httpMethod') == 'OPTIONS':
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-                    'Access-Control-Allow-Methods': 'POST,OPTIONS'
-                },
-                'body': ''
-            }
-        
-        # Llamar al handler especfico
-        return register(event, context)
-        
-    except Exception as e:
-        print(f"Error en lambda_handler: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
+    return run_handler(event, context, HANDLER, 'POST,OPTIONS')
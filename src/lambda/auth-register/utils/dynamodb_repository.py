@@ -0,0 +1,339 @@
+from .db_utils import (
+    get_table, batch_get_items, _key, get_timestamp,
+    build_user_item, build_project_item, build_membership_items, build_task_item
+)
+from .item_codec import (
+    physical_name, pack_field, pack_item, unpack_item, unpack_items, description_ref,
+    projection_attributes, select_fields
+)
+from .metrics import log_error
+from .repository import Repository
+
+# Implementación sobre la tabla única de DynamoDB
+#
+#     USER#<userId>        PROFILE             perfil (EmailIndex por email)
+#     USER#<userId>        PROJECT#<projectId> proyectos del usuario
+#     PROJECT#<projectId>  METADATA            proyecto
+#     PROJECT#<projectId>  MEMBER#<userId>     miembros
+#     PROJECT#<projectId>  TASK#<taskId>       tareas
+#
+# El cliente de boto3 y sus hooks (ddb_usage) los maneja db_utils. Los items
+# se escriben con pack_item() y se leen con unpack_item() (utils.item_codec):
+# fuera de este módulo los atributos tienen siempre su nombre lógico. Las
+# descripciones que item_codec manda al blob store se borran junto con su
+# item o cuando un update las reemplaza.
+
+
+def _projection(fields, keys=False):
+    """
+    ProjectionExpression para leer solo los campos lógicos pedidos
+    
+    DynamoDB cobra la lectura por el item completo igual: lo que se ahorra
+    es la respuesta (red, parseo de boto3, unpack).
+    
+    Args:
+        fields: Campos lógicos, o None para el item completo
+        keys: Incluir PK y SK (BatchGetItem indexa los items por clave)
+    
+    Returns:
+        kwargs para get_item/query/batch_get_item ({} sin fields)
+    """
+    if not fields:
+        return {}
+    
+    attributes = (['PK', 'SK'] if keys else []) + projection_attributes(fields)
+    # Todos con placeholder: name, status o description son palabras reservadas
+    names = {f"#f{i}": attribute for i, attribute in enumerate(attributes)}
+    return {'ProjectionExpression': ', '.join(names), 'ExpressionAttributeNames': names}
+
+
+class DynamoDBRepository(Repository):
+    """Repositorio sobre la tabla TABLE_NAME"""
+    
+    def prewarm(self):
+        # Un GetItem sobre una clave centinela que no existe resuelve DNS y
+        # completa TCP/TLS fuera del primer request
+        get_table().get_item(Key={'PK': 'PREWARM', 'SK': 'PREWARM'})
+    
+    # ==================== USER OPERATIONS ====================
+    
+    def create_user(self, user_id, email, name, hashed_password):
+        user_item = build_user_item(user_id, email, name, hashed_password)
+        
+        get_table().put_item(Item=pack_item(user_item))
+        return user_item
+    
+    def get_user_by_email(self, email):
+        response = get_table().query(
+            IndexName='EmailIndex',
+            KeyConditionExpression=_key('email').eq(email)
+        )
+        
+        if response['Count'] > 0:
+            return unpack_item(response['Items'][0])
+        return None
+    
+    def get_user_by_id(self, user_id):
+        response = get_table().get_item(
+            Key={
+                'PK': f"USER#{user_id}",
+                'SK': 'PROFILE'
+            }
+        )
+        
+        return unpack_item(response.get('Item'))
+    
+    # ==================== PROJECT OPERATIONS ====================
+    
+    def create_project(self, project_id, name, description, status, user_id, user_name):
+        timestamp = get_timestamp()
+        
+        # Metadata del proyecto
+        project_item = build_project_item(project_id, name, description, status, user_id, user_name, timestamp)
+        
+        # Miembro owner y relación usuario-proyecto
+        member_item, user_project_item = build_membership_items(
+            project_id, name, user_id, user_name, 'owner', timestamp
+        )
+        
+        # Escribir en batch
+        with get_table().batch_writer() as batch:
+            batch.put_item(Item=pack_item(project_item))
+            batch.put_item(Item=pack_item(member_item))
+            batch.put_item(Item=pack_item(user_project_item))
+        
+        return project_item
+    
+    def get_user_projects(self, user_id, descriptions='full', fields=None):
+        response = get_table().query(
+            KeyConditionExpression=_key('PK').eq(f"USER#{user_id}") & _key('SK').begins_with('PROJECT#')
+        )
+        
+        memberships = [(item['SK'].replace('PROJECT#', ''), unpack_item(item)) for item in response['Items']]
+        
+        # Metadata de todos los proyectos en BatchGetItem (no un GetItem por proyecto)
+        metadata = batch_get_items([
+            {'PK': f"PROJECT#{project_id}", 'SK': 'METADATA'} for project_id, _ in memberships
+        ], _projection(fields, keys=True))
+        
+        found = [
+            (item, metadata[(f"PROJECT#{project_id}", 'METADATA')])
+            for project_id, item in memberships
+            if (f"PROJECT#{project_id}", 'METADATA') in metadata
+        ]
+        
+        projects = [select_fields(project, fields) for project in unpack_items([p for _, p in found], descriptions)]
+        for (item, _), project in zip(found, projects):
+            project['userRole'] = item.get('role', 'member')
+        
+        return projects
+    
+    def get_project(self, project_id, fields=None):
+        response = get_table().get_item(
+            Key={
+                'PK': f"PROJECT#{project_id}",
+                'SK': 'METADATA'
+            },
+            **_projection(fields)
+        )
+        
+        return select_fields(unpack_item(response.get('Item')), fields)
+    
+    def update_project(self, project_id, updates):
+        return self._update_fields(
+            {'PK': f"PROJECT#{project_id}", 'SK': 'METADATA'},
+            {key: value for key, value in updates.items() if key in ['name', 'description', 'status']}
+        )
+    
+    def delete_project(self, project_id):
+        response = get_table().delete_item(
+            Key={
+                'PK': f"PROJECT#{project_id}",
+                'SK': 'METADATA'
+            },
+            ReturnValues='ALL_OLD'
+        )
+        
+        self._delete_description_blob(response.get('Attributes'))
+    
+    def check_user_project_access(self, user_id, project_id):
+        response = get_table().get_item(
+            Key={
+                'PK': f"USER#{user_id}",
+                'SK': f"PROJECT#{project_id}"
+            }
+        )
+        
+        return unpack_item(response.get('Item'))
+    
+    def get_project_members(self, project_id):
+        response = get_table().query(
+            KeyConditionExpression=_key('PK').eq(f"PROJECT#{project_id}") & _key('SK').begins_with('MEMBER#')
+        )
+        
+        return unpack_items(response.get('Items', []))
+    
+    # ==================== TASK OPERATIONS ====================
+    
+    def create_task(self, task_id, project_id, title, description, status, assigned_to, created_by):
+        task_item = build_task_item(task_id, project_id, title, description, status, assigned_to, created_by)
+        
+        get_table().put_item(Item=pack_item(task_item))
+        
+        # Incrementar contador de tareas del proyecto
+        self._add_to_counter(project_id, 'taskCount', 1)
+        
+        return task_item
+    
+    def get_project_tasks(self, project_id, descriptions='full', fields=None):
+        response = get_table().query(
+            KeyConditionExpression=_key('PK').eq(f"PROJECT#{project_id}") & _key('SK').begins_with('TASK#'),
+            **_projection(fields)
+        )
+        
+        return [select_fields(task, fields) for task in unpack_items(response.get('Items', []), descriptions)]
+    
+    def iter_project_task_pages(self, project_id, page_size=1000, first_page_size=None, descriptions='full'):
+        query_kwargs = {
+            'KeyConditionExpression': _key('PK').eq(f"PROJECT#{project_id}") & _key('SK').begins_with('TASK#'),
+            'Limit': first_page_size or page_size
+        }
+        
+        while True:
+            response = get_table().query(**query_kwargs)
+            items = unpack_items(response.get('Items', []), descriptions)
+            if items:
+                yield items
+            
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                break
+            
+            query_kwargs['ExclusiveStartKey'] = last_key
+            query_kwargs['Limit'] = page_size
+    
+    def update_task(self, project_id, task_id, updates):
+        return self._update_fields(
+            {'PK': f"PROJECT#{project_id}", 'SK': f"TASK#{task_id}"},
+            {key: value for key, value in updates.items() if key in ['title', 'description', 'status', 'assignedTo']}
+        )
+    
+    def delete_task(self, project_id, task_id):
+        response = get_table().delete_item(
+            Key={
+                'PK': f"PROJECT#{project_id}",
+                'SK': f"TASK#{task_id}"
+            },
+            ReturnValues='ALL_OLD'
+        )
+        
+        self._delete_description_blob(response.get('Attributes'))
+        
+        # Decrementar contador
+        self._add_to_counter(project_id, 'taskCount', -1)
+    
+    # ==================== HELPERS ====================
+    
+    def _update_fields(self, key, fields):
+        """
+        UpdateItem de campos lógicos más updatedAt
+        
+        Cada campo se escribe con sus atributos del esquema actual y se
+        eliminan los de las otras formas (item_codec.pack_field), así un item
+        v1 actualizado no queda con dos valores del mismo campo. Si la
+        descripción anterior estaba en el blob store y cambió, se borra.
+        
+        El update es condicional a que el item exista (UpdateItem solo crearía
+        uno con la clave y estos campos), igual que el UPDATE de SQLite.
+        
+        Returns:
+            El item actualizado, con nombres lógicos, o None si no existe
+        """
+        fields = dict(fields, updatedAt=get_timestamp())
+        set_parts, remove_parts = [], []
+        expr_names, expr_values = {}, {}
+        written, removed = {}, set()
+        
+        for name, value in fields.items():
+            attributes, stale = pack_field(name, value, (key['PK'], key['SK']))
+            written.update(attributes)
+            removed.update(stale)
+            
+            for i, (attribute, packed) in enumerate(attributes.items()):
+                set_parts.append(f"#{name}{i} = :{name}{i}")
+                expr_names[f"#{name}{i}"] = attribute
+                expr_values[f":{name}{i}"] = packed
+            
+            for i, attribute in enumerate(stale):
+                remove_parts.append(f"#{name}_stale{i}")
+                expr_names[f"#{name}_stale{i}"] = attribute
+        
+        update_expr = 'SET ' + ', '.join(set_parts)
+        if remove_parts:
+            update_expr += ' REMOVE ' + ', '.join(remove_parts)
+        
+        table = get_table()
+        try:
+            response = table.update_item(
+                Key=key,
+                UpdateExpression=update_expr,
+                ConditionExpression='attribute_exists(PK)',
+                ExpressionAttributeNames=expr_names,
+                ExpressionAttributeValues=expr_values,
+                # El item anterior, no el nuevo: trae la clave del blob que se
+                # reemplaza, y el nuevo es el anterior con este SET/REMOVE
+                ReturnValues='ALL_OLD'
+            )
+        except table.meta.client.exceptions.ConditionalCheckFailedException:
+            # La descripción que pack_field ya subió al blob store no quedó en ningún item
+            self._delete_description_blob(written)
+            return None
+        
+        old = response['Attributes']
+        item = {name: value for name, value in old.items() if name not in removed}
+        item.update(key)
+        item.update(written)
+        
+        # Misma descripción, misma clave (item_codec la arma con un hash del texto)
+        if description_ref(old) != description_ref(item):
+            self._delete_description_blob(old)
+        
+        return unpack_item(item)
+    
+    def _delete_description_blob(self, item):
+        """
+        Borrar del blob store la descripción de un item eliminado (o la que
+        reemplazó un update)
+        
+        El item ya se escribió: si el store falla se registra y el blob queda
+        huérfano, el request no falla.
+        """
+        ref = description_ref(item)
+        if not ref:
+            return
+        
+        from .blob_store import get_blob_store
+        try:
+            get_blob_store().delete(ref)
+        except Exception as e:
+            log_error(f"delete_blob {ref}", e)
+    
+    def _add_to_counter(self, project_id, name, delta):
+        """
+        Sumar delta a un contador de la metadata del proyecto
+        
+        En un item v1 el atributo del esquema actual arranca en cero y el
+        valor lógico es la suma de los dos (item_codec.unpack_item).
+        """
+        get_table().update_item(
+            Key={
+                'PK': f"PROJECT#{project_id}",
+                'SK': 'METADATA'
+            },
+            UpdateExpression='SET #counter = if_not_exists(#counter, :zero) + :delta',
+            ExpressionAttributeNames={'#counter': physical_name(name)},
+            ExpressionAttributeValues={
+                ':delta': delta,
+                ':zero': 0
+            }
+        )
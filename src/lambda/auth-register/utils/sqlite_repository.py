@@ -0,0 +1,381 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from .db_utils import (
+    get_timestamp, build_user_item, build_project_item, build_membership_items, build_task_item
+)
+from .item_codec import truncate_description, select_fields
+from .repository import Repository
+
+# Implementación embebida sobre SQLite
+#
+# Tablas relacionales en lugar de la tabla única; las filas se convierten a
+# los mismos items que devuelve DynamoDB (con los builders de db_utils).
+#
+# - WAL: los lectores no bloquean al escritor ni entre sí (varios threads
+#   del pool de asgi.py y varios procesos sobre el mismo archivo)
+# - una conexión por thread; sqlite3 cachea los statements preparados de
+#   cada conexión (SQLITE_STATEMENT_CACHE), todas las consultas usan
+#   parámetros
+# - las operaciones que escriben varias filas (proyecto + membresías, tarea
+#   + contador) van en una transacción BEGIN IMMEDIATE
+#
+# SQLITE_PATH=:memory: usa una base en memoria compartida por los threads
+# del proceso (se pierde al terminar).
+
+SQLITE_PATH = os.environ.get('SQLITE_PATH', 'projectmanagement.db')
+SQLITE_STATEMENT_CACHE = int(os.environ.get('SQLITE_STATEMENT_CACHE', '256'))
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    name TEXT,
+    password TEXT,
+    created_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS projects (
+    project_id TEXT PRIMARY KEY,
+    name TEXT,
+    description TEXT,
+    status TEXT,
+    created_by TEXT,
+    created_by_name TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    task_count INTEGER NOT NULL DEFAULT 0,
+    member_count INTEGER NOT NULL DEFAULT 1
+);
+
+-- (user, project) como clave: proyectos de un usuario y control de acceso
+CREATE TABLE IF NOT EXISTS memberships (
+    user_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    user_name TEXT,
+    project_name TEXT,
+    role TEXT,
+    joined_at TEXT,
+    PRIMARY KEY (user_id, project_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS memberships_by_project ON memberships (project_id, user_id);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    project_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    status TEXT,
+    assigned_to TEXT,
+    created_by TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (project_id, task_id)
+);
+
+-- Listado y exportación en orden de creación con paginación por cursor
+CREATE INDEX IF NOT EXISTS tasks_by_project_created ON tasks (project_id, created_at, task_id);
+"""
+
+PROJECT_FIELDS = {'name': 'name', 'description': 'description', 'status': 'status'}
+TASK_FIELDS = {'title': 'title', 'description': 'description', 'status': 'status', 'assignedTo': 'assigned_to'}
+
+
+def _user(row):
+    return build_user_item(row['user_id'], row['email'], row['name'], row['password'], row['created_at'])
+
+
+def _project(row):
+    item = build_project_item(
+        row['project_id'], row['name'], row['description'], row['status'],
+        row['created_by'], row['created_by_name'], row['created_at']
+    )
+    item['updatedAt'] = row['updated_at']
+    item['taskCount'] = row['task_count']
+    item['memberCount'] = row['member_count']
+    return item
+
+
+def _memberships(row):
+    return build_membership_items(
+        row['project_id'], row['project_name'], row['user_id'], row['user_name'], row['role'], row['joined_at']
+    )
+
+
+def _task(row):
+    item = build_task_item(
+        row['task_id'], row['project_id'], row['title'], row['description'], row['status'],
+        row['assigned_to'], row['created_by'], row['created_at']
+    )
+    item['updatedAt'] = row['updated_at']
+    return item
+
+
+def _described(item, descriptions):
+    # La columna guarda el texto completo; la vista previa se recorta al leer
+    return truncate_description(item) if descriptions == 'preview' else item
+
+
+class SQLiteRepository(Repository):
+    """
+    Repositorio sobre un archivo SQLite
+    
+    Args:
+        path: Archivo de la base (default SQLITE_PATH); ':memory:' para una
+            base en memoria compartida entre los threads
+    """
+    
+    def __init__(self, path=None):
+        path = path or SQLITE_PATH
+        self.memory = path == ':memory:'
+        self.uri = f"file:pm-{id(self)}?mode=memory&cache=shared" if self.memory else path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        
+        # La base en memoria existe mientras haya una conexión abierta
+        self._keepalive = self._connect() if self.memory else None
+    
+    def _connect(self):
+        connection = sqlite3.connect(
+            self.uri,
+            uri=self.memory,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=SQLITE_STATEMENT_CACHE,
+        )
+        connection.row_factory = sqlite3.Row
+        connection.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+        if not self.memory:
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+        return connection
+    
+    @property
+    def connection(self):
+        """Conexión del thread actual (con el esquema creado)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+            if not self._schema_ready:
+                with self._schema_lock:
+                    if not self._schema_ready:
+                        connection.executescript(SCHEMA)
+                        self._schema_ready = True
+        return connection
+    
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT (ROLLBACK si algo falla)"""
+        connection = self.connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+    
+    def prewarm(self):
+        self.connection
+    
+    # ==================== USER OPERATIONS ====================
+    
+    def create_user(self, user_id, email, name, hashed_password):
+        item = build_user_item(user_id, email, name, hashed_password)
+        self.connection.execute(
+            'INSERT INTO users (user_id, email, name, password, created_at) VALUES (?, ?, ?, ?, ?)',
+            (user_id, email, name, hashed_password, item['createdAt'])
+        )
+        return item
+    
+    def get_user_by_email(self, email):
+        row = self.connection.execute('SELECT * FROM users WHERE email = ?', (email,)).fetchone()
+        return _user(row) if row else None
+    
+    def get_user_by_id(self, user_id):
+        row = self.connection.execute('SELECT * FROM users WHERE user_id = ?', (user_id,)).fetchone()
+        return _user(row) if row else None
+    
+    # ==================== PROJECT OPERATIONS ====================
+    
+    def create_project(self, project_id, name, description, status, user_id, user_name):
+        timestamp = get_timestamp()
+        item = build_project_item(project_id, name, description, status, user_id, user_name, timestamp)
+        
+        with self.transaction() as connection:
+            connection.execute(
+                'INSERT INTO projects (project_id, name, description, status, created_by, created_by_name, '
+                'created_at, updated_at, task_count, member_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, 1)',
+                (project_id, name, description, status, user_id, user_name, timestamp, timestamp)
+            )
+            connection.execute(
+                'INSERT INTO memberships (user_id, project_id, user_name, project_name, role, joined_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (user_id, project_id, user_name, name, 'owner', timestamp)
+            )
+        return item
+    
+    def get_user_projects(self, user_id, descriptions='full', fields=None):
+        rows = self.connection.execute(
+            'SELECT p.*, m.role AS user_role FROM memberships m '
+            'JOIN projects p ON p.project_id = m.project_id '
+            'WHERE m.user_id = ? ORDER BY m.project_id',
+            (user_id,)
+        ).fetchall()
+        
+        projects = []
+        for row in rows:
+            project = select_fields(_described(_project(row), descriptions), fields)
+            project['userRole'] = row['user_role'] or 'member'
+            projects.append(project)
+        return projects
+    
+    def get_project(self, project_id, fields=None):
+        row = self.connection.execute('SELECT * FROM projects WHERE project_id = ?', (project_id,)).fetchone()
+        return select_fields(_project(row), fields) if row else None
+    
+    def update_project(self, project_id, updates):
+        columns = [(PROJECT_FIELDS[key], value) for key, value in updates.items() if key in PROJECT_FIELDS]
+        assignments = ''.join(f", {column} = ?" for column, _ in columns)
+        
+        with self.transaction() as connection:
+            connection.execute(
+                f"UPDATE projects SET updated_at = ?{assignments} WHERE project_id = ?",
+                (get_timestamp(), *(value for _, value in columns), project_id)
+            )
+            row = connection.execute('SELECT * FROM projects WHERE project_id = ?', (project_id,)).fetchone()
+        return _project(row) if row else None
+    
+    def delete_project(self, project_id):
+        self.connection.execute('DELETE FROM projects WHERE project_id = ?', (project_id,))
+    
+    def check_user_project_access(self, user_id, project_id):
+        row = self.connection.execute(
+            'SELECT * FROM memberships WHERE user_id = ? AND project_id = ?', (user_id, project_id)
+        ).fetchone()
+        return _memberships(row)[1] if row else None
+    
+    def get_project_members(self, project_id):
+        rows = self.connection.execute(
+            'SELECT * FROM memberships WHERE project_id = ? ORDER BY user_id', (project_id,)
+        ).fetchall()
+        return [_memberships(row)[0] for row in rows]
+    
+    # ==================== TASK OPERATIONS ====================
+    
+    def create_task(self, task_id, project_id, title, description, status, assigned_to, created_by):
+        item = build_task_item(task_id, project_id, title, description, status, assigned_to, created_by)
+        
+        with self.transaction() as connection:
+            connection.execute(
+                'INSERT INTO tasks (project_id, task_id, title, description, status, assigned_to, created_by, '
+                'created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (project_id, task_id, title, description, status, assigned_to, created_by,
+                 item['createdAt'], item['updatedAt'])
+            )
+            connection.execute(
+                'UPDATE projects SET task_count = task_count + 1 WHERE project_id = ?', (project_id,)
+            )
+        return item
+    
+    def get_project_tasks(self, project_id, descriptions='full', fields=None):
+        rows = self.connection.execute(
+            'SELECT * FROM tasks WHERE project_id = ? ORDER BY created_at, task_id', (project_id,)
+        ).fetchall()
+        return [select_fields(_described(_task(row), descriptions), fields) for row in rows]
+    
+    def iter_project_task_pages(self, project_id, page_size=1000, first_page_size=None, descriptions='full'):
+        # Cursor por (created_at, task_id) sobre el índice: cada página es
+        # una búsqueda, no un OFFSET que recorre las anteriores
+        rows = self.connection.execute(
+            'SELECT * FROM tasks WHERE project_id = ? ORDER BY created_at, task_id LIMIT ?',
+            (project_id, first_page_size or page_size)
+        ).fetchall()
+        
+        while rows:
+            yield [_described(_task(row), descriptions) for row in rows]
+            
+            last = rows[-1]
+            rows = self.connection.execute(
+                'SELECT * FROM tasks WHERE project_id = ? AND (created_at, task_id) > (?, ?) '
+                'ORDER BY created_at, task_id LIMIT ?',
+                (project_id, last['created_at'], last['task_id'], page_size)
+            ).fetchall()
+    
+    def update_task(self, project_id, task_id, updates):
+        columns = [(TASK_FIELDS[key], value) for key, value in updates.items() if key in TASK_FIELDS]
+        assignments = ''.join(f", {column} = ?" for column, _ in columns)
+        
+        with self.transaction() as connection:
+            connection.execute(
+                f"UPDATE tasks SET updated_at = ?{assignments} WHERE project_id = ? AND task_id = ?",
+                (get_timestamp(), *(value for _, value in columns), project_id, task_id)
+            )
+            row = connection.execute(
+                'SELECT * FROM tasks WHERE project_id = ? AND task_id = ?', (project_id, task_id)
+            ).fetchone()
+        return _task(row) if row else None
+    
+    def delete_task(self, project_id, task_id):
+        with self.transaction() as connection:
+            deleted = connection.execute(
+                'DELETE FROM tasks WHERE project_id = ? AND task_id = ?', (project_id, task_id)
+            ).rowcount
+            if deleted:
+                connection.execute(
+                    'UPDATE projects SET task_count = task_count - 1 WHERE project_id = ?', (project_id,)
+                )
+    
+    # ==================== CARGA MASIVA ====================
+    
+    def put_items(self, items):
+        """
+        Insertar items con la forma de DynamoDB (dataset de benchmarks,
+        importaciones) en una sola transacción con executemany por tabla
+        
+        Reemplaza los que ya existen. Los items que no son perfil,
+        proyecto, membresía ni tarea se ignoran.
+        """
+        users, projects, memberships, tasks = [], [], [], []
+        
+        for item in items:
+            pk, sk = item['PK'], item['SK']
+            if sk == 'PROFILE':
+                users.append((item['userId'], item['email'], item.get('name'), item.get('password'), item.get('createdAt')))
+            elif sk == 'METADATA':
+                projects.append((
+                    item['projectId'], item.get('name'), item.get('description'), item.get('status'),
+                    item.get('createdBy'), item.get('createdByName'), item.get('createdAt'), item.get('updatedAt'),
+                    int(item.get('taskCount', 0)), int(item.get('memberCount', 1))
+                ))
+            elif pk.startswith('USER#') and sk.startswith('PROJECT#'):
+                # El MEMBER# correspondiente trae userName; se completa abajo
+                memberships.append((pk[5:], item['projectId'], None, item.get('projectName'),
+                                    item.get('role'), item.get('joinedAt')))
+            elif sk.startswith('MEMBER#'):
+                memberships.append((item['userId'], pk[8:], item.get('userName'), None,
+                                    item.get('role'), item.get('joinedAt')))
+            elif sk.startswith('TASK#'):
+                tasks.append((
+                    item['projectId'], item['taskId'], item.get('title'), item.get('description'),
+                    item.get('status'), item.get('assignedTo'), item.get('createdBy'),
+                    item.get('createdAt'), item.get('updatedAt')
+                ))
+        
+        with self.transaction() as connection:
+            connection.executemany('INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?, ?)', users)
+            connection.executemany('INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', projects)
+            # Las dos mitades de una membresía se combinan en una fila
+            connection.executemany(
+                'INSERT INTO memberships VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (user_id, project_id) DO UPDATE SET '
+                'user_name = COALESCE(excluded.user_name, user_name), '
+                'project_name = COALESCE(excluded.project_name, project_name)',
+                memberships
+            )
+            connection.executemany('INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', tasks)
@@ -0,0 +1,25 @@
+"""
+Varios requests de la API en una sola llamada
+Endpoint: POST /batch
+Handler: app.lambda_handler
+"""
+
+from utils.entrypoint import run_handler, prewarm
+
+HANDLER = 'handlers.batch:batch_handler'
+
+prewarm(HANDLER)
+
+
+def lambda_handler(event, context):
+    """
+    Handler principal para Ejecutar varios requests de la API en una sola llamada
+    
+    Args:
+        event: Evento de API Gateway
+        context: Contexto de Lambda
+    
+    Returns:
+        Response dict con statusCode, headers y body
+    """
+    return run_handler(event, context, HANDLER, 'POST,OPTIONS')
@@ -0,0 +1,156 @@
+import base64
+import json
+import os
+import sys
+import threading
+import time
+
+# Captura de tráfico real para reproducirlo con tools/replay.py
+#
+# Con CAPTURE=true cada request (o una fracción CAPTURE_SAMPLE_RATE) se
+# escribe como una línea JSON con el evento saneado, su instante de llegada,
+# la ruta, el status y las llamadas a DynamoDB. El destino es el archivo
+# CAPTURE_PATH (NDJSON) o, si no está definido, el log con "type": "capture"
+# (en Lambda /tmp no sobrevive al contenedor).
+#
+# Saneamiento:
+#     Authorization        el JWT se reemplaza por sus claims (userId, email,
+#                          name) y si era válido; el replay firma uno nuevo
+#     passwords            cualquier campo del body cuyo nombre contiene
+#                          "password" queda como REDACTED
+#     requestContext,      se descartan (IPs, identidad, ids de API Gateway)
+#     multiValueHeaders,
+#     cookies y similares
+
+CAPTURE_ENABLED = os.environ.get('CAPTURE', 'false').lower() == 'true'
+CAPTURE_PATH = os.environ.get('CAPTURE_PATH', '')
+CAPTURE_SAMPLE_RATE = float(os.environ.get('CAPTURE_SAMPLE_RATE', '1'))
+
+REDACTED = '<redacted>'
+
+DROPPED_HEADERS = {
+    'authorization',
+    'cookie',
+    'x-api-key',
+    'x-debug-profile',
+    'x-forwarded-for',
+    'x-amzn-trace-id',
+    'x-amz-security-token',
+}
+
+EVENT_FIELDS = ('httpMethod', 'path', 'resource', 'pathParameters', 'queryStringParameters', 'isBase64Encoded')
+
+_lock = threading.Lock()
+
+
+def sanitize_event(event):
+    """
+    Copia del evento sin credenciales ni datos de identidad
+    
+    Returns:
+        dict con los campos de EVENT_FIELDS, headers filtrados, body sin
+        passwords y 'auth' con los claims del token (si había uno)
+    """
+    sanitized = {field: event.get(field) for field in EVENT_FIELDS if event.get(field) is not None}
+    headers = {}
+    auth = None
+    
+    for key, value in (event.get('headers') or {}).items():
+        lower = key.lower()
+        if lower == 'authorization':
+            auth = _token_claims(value)
+        elif lower not in DROPPED_HEADERS:
+            headers[key] = value
+    
+    sanitized['headers'] = headers
+    if auth is not None:
+        sanitized['auth'] = auth
+    sanitized['body'] = _sanitize_body(event.get('body'), event.get('isBase64Encoded'))
+    return sanitized
+
+
+def _token_claims(header_value):
+    """Claims del JWT de un header Authorization, sin el token"""
+    from .auth_utils import decode_token
+    
+    parts = (header_value or '').split()
+    token = parts[1] if len(parts) == 2 and parts[0].lower() == 'bearer' else None
+    if not token:
+        return {'valid': False}
+    
+    claims = decode_token(token)
+    if claims is None:
+        # Vencido o con firma inválida: guardar el userId si se puede leer,
+        # el replay igual manda un token inválido
+        try:
+            payload = token.split('.')[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        except (IndexError, ValueError):
+            claims = {}
+        valid = False
+    else:
+        valid = True
+    
+    auth = {key: claims.get(key) for key in ('userId', 'email', 'name') if key in claims}
+    auth['valid'] = valid
+    return auth
+
+
+def _sanitize_body(body, is_base64):
+    if not body or is_base64:
+        return body
+    
+    try:
+        data = json.loads(body)
+    except ValueError:
+        # Body no JSON: no hay forma segura de encontrar el password
+        return REDACTED if 'password' in body.lower() else body
+    return json.dumps(_redact_passwords(data))
+
+
+def _redact_passwords(value):
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if 'password' in key.lower() else _redact_passwords(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact_passwords(item) for item in value]
+    return value
+
+
+def capture_request(event, handler_ref, response, start, usage):
+    """
+    Escribir la captura de un request
+    
+    Args:
+        event: Evento de API Gateway (ya decodificado)
+        handler_ref: 'módulo:función' del handler
+        response: Respuesta enviada
+        start: perf_counter al inicio del request (begin_invocation)
+        usage: Uso de DynamoDB del request (utils.ddb_usage.get_usage)
+    """
+    if CAPTURE_SAMPLE_RATE < 1:
+        import random
+        if random.random() >= CAPTURE_SAMPLE_RATE:
+            return
+    
+    elapsed = time.perf_counter() - start
+    record = {
+        'type': 'capture',
+        'ts': round(time.time() - elapsed, 4),
+        'route': handler_ref,
+        'event': sanitize_event(event),
+        'statusCode': response.get('statusCode'),
+        'durationMs': round(elapsed * 1000, 2),
+        'ddbCalls': usage['calls'],
+        'ddbOperations': usage['operations'],
+    }
+    line = json.dumps(record, default=str)
+    
+    if CAPTURE_PATH:
+        with _lock:
+            with open(CAPTURE_PATH, 'a') as f:
+                f.write(line + '\n')
+    else:
+        sys.stdout.write(line + '\n')
@@ -0,0 +1,165 @@
+import json
+import os
+import threading
+import time
+
+# Capacidad consumida y latencia de las llamadas a DynamoDB por invocación
+#
+# Se engancha a los eventos de botocore del cliente que crea db_utils, así
+# que cubre todas las operaciones sin tocar cada llamada:
+#
+# - pide ReturnConsumedCapacity (INDEXES si la operación usa un índice,
+#   TOTAL si no) y acumula RCU/WCU por tabla e índice
+# - mide la latencia de cada llamada (reintentos incluidos) y guarda las que
+#   superan SLOW_OPERATION_MS junto con su clave o key condition; se publican
+#   con el resto de la invocación (fuera de una, se imprimen en el momento)
+# - get_usage() entrega el acumulado de la invocación, que entrypoint publica
+#   con las métricas del request (utils.metrics)
+#
+# No depende de X-Ray: los logs son líneas JSON en CloudWatch (o stdout en
+# local).
+#
+# El acumulado es por thread (los hooks de botocore corren en el thread que
+# hace la llamada): en el servidor ASGI de api-router cada request corre en
+# un thread del pool y no se mezcla con los demás. Las lecturas en paralelo
+# de utils.async_db corren en otros threads y se suman con merge_usage().
+
+# Llamadas más lentas que esto se loguean individualmente
+SLOW_OPERATION_MS = float(os.environ.get('SLOW_OPERATION_MS', '100'))
+
+READ_OPERATIONS = {'GetItem', 'BatchGetItem', 'Query', 'Scan', 'TransactGetItems'}
+
+_state = threading.local()
+
+
+def reset_usage():
+    """Empezar a acumular una invocación nueva (en el thread actual)"""
+    _state.usage = {'calls': 0, 'operations': {}, 'rcu': 0.0, 'wcu': 0.0, 'indexes': {}, 'ddbMs': 0.0, 'slowOperations': []}
+
+
+def get_usage():
+    """Copia de lo acumulado desde el último reset_usage() del thread actual"""
+    usage = getattr(_state, 'usage', None)
+    if usage is None:
+        return None
+    return dict(usage, operations=dict(usage['operations']), indexes=dict(usage['indexes']),
+                slowOperations=list(usage['slowOperations']))
+
+
+def merge_usage(other):
+    """
+    Sumar al acumulado del thread actual el de otro thread
+    
+    Args:
+        other: Resultado de get_usage() en el thread que hizo las llamadas
+    """
+    usage = getattr(_state, 'usage', None)
+    if usage is None or not other:
+        return
+    
+    for name in ('calls', 'rcu', 'wcu', 'ddbMs'):
+        usage[name] += other[name]
+    for field in ('operations', 'indexes'):
+        for name, value in other[field].items():
+            usage[field][name] = usage[field].get(name, 0) + value
+    usage['slowOperations'].extend(other['slowOperations'])
+
+
+def install(client):
+    """Registrar los hooks en el cliente DynamoDB de botocore"""
+    client.meta.events.register('before-parameter-build.dynamodb.*', _before_params)
+    client.meta.events.register('before-call.dynamodb.*', _before_call)
+    client.meta.events.register('after-call.dynamodb.*', _after_call)
+
+
+def _before_params(params, model, context, **kwargs):
+    if 'ReturnConsumedCapacity' in model.input_shape.members:
+        params.setdefault('ReturnConsumedCapacity', 'INDEXES' if 'IndexName' in params else 'TOTAL')
+    
+    # Corre después del transformador de boto3: las expresiones ya están armadas
+    context['ddb_params'] = params
+
+
+def _before_call(context, **kwargs):
+    context['ddb_start'] = time.perf_counter()
+
+
+def _after_call(parsed, model, context, **kwargs):
+    elapsed_ms = (time.perf_counter() - context.get('ddb_start', time.perf_counter())) * 1000
+    operation = model.name
+    
+    consumed = parsed.get('ConsumedCapacity') or []
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    units = sum(c.get('CapacityUnits', 0) for c in consumed)
+    
+    indexes = {}
+    for capacity in consumed:
+        for kind in ('GlobalSecondaryIndexes', 'LocalSecondaryIndexes'):
+            for name, index_capacity in (capacity.get(kind) or {}).items():
+                indexes[name] = indexes.get(name, 0) + index_capacity.get('CapacityUnits', 0)
+    
+    slow_operation = None
+    if elapsed_ms >= SLOW_OPERATION_MS:
+        params = context.get('ddb_params') or {}
+        slow_operation = {
+            'type': 'ddb_slow_operation',
+            'operation': operation,
+            'durationMs': round(elapsed_ms, 2),
+            'index': params.get('IndexName'),
+            'key': describe_key(operation, params),
+            'capacityUnits': units,
+            'items': parsed.get('Count'),
+        }
+    
+    usage = getattr(_state, 'usage', None)
+    if usage is not None:
+        usage['calls'] += 1
+        usage['operations'][operation] = usage['operations'].get(operation, 0) + 1
+        usage['rcu' if operation in READ_OPERATIONS else 'wcu'] += units
+        usage['ddbMs'] += elapsed_ms
+        for name, value in indexes.items():
+            usage['indexes'][name] = usage['indexes'].get(name, 0) + value
+        if slow_operation:
+            usage['slowOperations'].append(slow_operation)
+        return
+    
+    if slow_operation:
+        print(json.dumps(slow_operation, default=str))
+
+
+def _plain(value):
+    """Valor de un AttributeValue serializado ({'S': 'x'} -> 'x')"""
+    if isinstance(value, dict) and len(value) == 1:
+        return next(iter(value.values()))
+    return value
+
+
+def describe_key(operation, params):
+    """
+    Clave o key condition de una operación, legible para el log
+    
+    Args:
+        operation: Nombre de la operación ('Query', 'GetItem', ...)
+        params: Parámetros de la llamada (ya con las expresiones armadas)
+    """
+    if operation in ('Query', 'Scan'):
+        expression = params.get('KeyConditionExpression') or params.get('FilterExpression') or ''
+        if not isinstance(expression, str):
+            return str(expression)
+        
+        for placeholder, name in (params.get('ExpressionAttributeNames') or {}).items():
+            expression = expression.replace(placeholder, name)
+        for placeholder, value in sorted((params.get('ExpressionAttributeValues') or {}).items(),
+                                         key=lambda item: -len(item[0])):
+            expression = expression.replace(placeholder, repr(_plain(value)))
+        return expression
+    
+    if operation in ('BatchGetItem', 'BatchWriteItem'):
+        requests = params.get('RequestItems') or {}
+        count = sum(len(r.get('Keys', [])) if isinstance(r, dict) else len(r) for r in requests.values())
+        return f"{count} claves"
+    
+    key = params.get('Key') or params.get('Item') or {}
+    return ' '.join(f"{name}={_plain(key[name])}" for name in ('PK', 'SK') if name in key)
+
@@ -0,0 +1,139 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+
+# Interfaz de almacenamiento
+#
+# Los handlers siguen usando las funciones de utils.db_utils; esas funciones
+# delegan en el repositorio que elige STORAGE_BACKEND:
+#
+#     dynamodb (default)   utils.dynamodb_repository: la tabla única de la
+#                          plantilla (TABLE_NAME)
+#     sqlite               utils.sqlite_repository: archivo local SQLITE_PATH,
+#                          para el modo self-hosted (api-router/asgi.py) y
+#                          corridas locales sin red
+#
+# Cada implementación devuelve los mismos dicts (los items de DynamoDB, con
+# PK/SK incluidos), así que las respuestas de la API no dependen del backend.
+
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'dynamodb').lower()
+
+_repository = None
+_lock = threading.Lock()
+
+
+class Repository(ABC):
+    """Operaciones de almacenamiento que usan los handlers"""
+    
+    def prewarm(self):
+        """Abrir conexiones durante el init (ver entrypoint.prewarm)"""
+    
+    # Usuarios
+    
+    @abstractmethod
+    def create_user(self, user_id, email, name, hashed_password):
+        """Crear un usuario; retorna su item de perfil"""
+    
+    @abstractmethod
+    def get_user_by_email(self, email):
+        """Item de perfil del usuario con ese email, o None"""
+    
+    @abstractmethod
+    def get_user_by_id(self, user_id):
+        """Item de perfil del usuario, o None"""
+    
+    # Proyectos
+    
+    @abstractmethod
+    def create_project(self, project_id, name, description, status, user_id, user_name):
+        """Crear un proyecto con su creador como owner; retorna la metadata"""
+    
+    @abstractmethod
+    def get_user_projects(self, user_id, descriptions='full', fields=None):
+        """
+        Metadata de los proyectos del usuario, cada una con 'userRole'
+        
+        descriptions='preview' recorta las descripciones largas
+        (item_codec.DESCRIPTION_MODES); fields limita los items a esos campos
+        lógicos (None = todos). Vale igual para proyectos y tareas.
+        """
+    
+    @abstractmethod
+    def get_project(self, project_id, fields=None):
+        """Metadata del proyecto, o None"""
+    
+    @abstractmethod
+    def update_project(self, project_id, updates):
+        """Actualizar name/description/status; retorna la metadata nueva, o None si no existe"""
+    
+    @abstractmethod
+    def delete_project(self, project_id):
+        """Eliminar la metadata del proyecto (no sus membresías ni tareas)"""
+    
+    @abstractmethod
+    def check_user_project_access(self, user_id, project_id):
+        """Membresía del usuario en el proyecto (projectName, role), o None"""
+    
+    @abstractmethod
+    def get_project_members(self, project_id):
+        """Items MEMBER# del proyecto"""
+    
+    # Tareas
+    
+    @abstractmethod
+    def create_task(self, task_id, project_id, title, description, status, assigned_to, created_by):
+        """Crear una tarea e incrementar taskCount; retorna la tarea"""
+    
+    @abstractmethod
+    def get_project_tasks(self, project_id, descriptions='full', fields=None):
+        """Todas las tareas del proyecto"""
+    
+    @abstractmethod
+    def iter_project_task_pages(self, project_id, page_size=1000, first_page_size=None, descriptions='full'):
+        """Tareas del proyecto por páginas (una en memoria a la vez)"""
+    
+    @abstractmethod
+    def update_task(self, project_id, task_id, updates):
+        """Actualizar title/description/status/assignedTo; retorna la tarea nueva, o None si no existe"""
+    
+    @abstractmethod
+    def delete_task(self, project_id, task_id):
+        """Eliminar una tarea y decrementar taskCount"""
+
+
+def get_repository():
+    """
+    Repositorio del backend configurado, creado en el primer uso
+    
+    El import del backend es lazy: con DynamoDB no se carga sqlite3 y con
+    SQLite no se carga boto3.
+    """
+    global _repository
+    if _repository is None:
+        with _lock:
+            if _repository is None:
+                _repository = create_repository(STORAGE_BACKEND)
+    return _repository
+
+
+def create_repository(backend, **kwargs):
+    """
+    Crear un repositorio por nombre de backend
+    
+    Args:
+        backend: 'dynamodb' o 'sqlite'
+        kwargs: Opciones del backend (p.ej. path para SQLite)
+    """
+    if backend == 'dynamodb':
+        from .dynamodb_repository import DynamoDBRepository
+        return DynamoDBRepository(**kwargs)
+    if backend == 'sqlite':
+        from .sqlite_repository import SQLiteRepository
+        return SQLiteRepository(**kwargs)
+    raise ValueError(f"STORAGE_BACKEND desconocido: {backend}")
+
+
+def set_repository(repository):
+    """Reemplazar el repositorio en uso (scripts y benchmarks)"""
+    global _repository
+    _repository = repository
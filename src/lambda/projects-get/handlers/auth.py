@@ -1,6 +1,7 @@
 import json
 import uuid
 from utils.response import success_response, error_response
+from utils.metrics import log_error
 from utils.auth_utils import hash_password, verify_password, generate_token, require_auth
 from utils.db_utils import create_user, get_user_by_email, get_user_statistics
 
@@ -61,7 +62,7 @@ def register(event, context):
         }, 'Usuario registrado exitosamente')
         
     except Exception as e:
-        print(f"Error en register: {str(e)}")
+        log_error('register', e)
         return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
 
 
@@ -105,7 +106,7 @@ def login(event, context):
         }, 'Login exitoso')
         
     except Exception as e:
-        print(f"Error en login: {str(e)}")
+        log_error('login', e)
         return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
 
 
@@ -129,5 +130,5 @@ def get_profile(event, context, user):
         })
         
     except Exception as e:
-        print(f"Error en get_profile: {str(e)}")
+        log_error('get_profile', e)
         return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
\ No newline at end of file
@@ -1,25 +1,48 @@
 import json
 import uuid
 from utils.response import success_response, error_response
+from utils.metrics import log_error
 from utils.auth_utils import require_auth
+from utils.item_codec import DESCRIPTION_MODES, PROJECT_FIELDS, parse_fields, select_fields
+from utils import async_db
 from utils.db_utils import (
-    create_project, get_user_projects, get_project,
-    update_project, delete_project, check_user_project_access,
-    get_project_members
+    create_project, get_user_projects,
+    update_project, delete_project, check_user_project_access
 )
 
+# Campos de ?fields= además de los del item del proyecto
+LIST_FIELDS = PROJECT_FIELDS + ('userRole',)
+DETAIL_FIELDS = PROJECT_FIELDS + ('userRole', 'members')
+
 
 @require_auth
 def list_projects(event, context, user):
     """
-    GET /projects
+    GET /projects?descriptions=preview&fields=projectId,name,status
     Listar todos los proyectos del usuario
+    
+    Con descriptions=preview las descripciones largas llegan recortadas
+    (descriptionTruncated: true); la completa está en GET /projects/{id}.
+    Con fields cada proyecto trae solo esos campos (de LIST_FIELDS).
     """
     try:
-        projects = get_user_projects(user['userId'])
+        params = event.get('queryStringParameters') or {}
+        descriptions = params.get('descriptions', 'full')
+        if descriptions not in DESCRIPTION_MODES:
+            return error_response(400, f'Modo de descripciones no soportado: {descriptions}', 'UNSUPPORTED_DESCRIPTIONS')
+        
+        try:
+            fields = parse_fields(params.get('fields'), LIST_FIELDS)
+        except ValueError as e:
+            return error_response(400, f'Campos no soportados: {e}', 'INVALID_FIELDS')
+        
+        # createdAt se lee siempre para ordenar; userRole sale de la membresía
+        item_fields = fields and [name for name in fields if name in PROJECT_FIELDS] + ['createdAt']
+        projects = get_user_projects(user['userId'], descriptions, item_fields)
         
         # Ordenar por fecha de creación (más recientes primero)
         projects.sort(key=lambda x: x.get('createdAt', ''), reverse=True)
+        projects = [select_fields(project, fields) for project in projects]
         
         return success_response(200, {
             'projects': projects,
@@ -27,7 +50,7 @@ def list_projects(event, context, user):
         })
         
     except Exception as e:
-        print(f"Error en list_projects: {str(e)}")
+        log_error('list_projects', e)
         return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
 
 
@@ -65,44 +88,59 @@ def create_project_handler(event, context, user):
         }, 'Proyecto creado exitosamente')
         
     except Exception as e:
-        print(f"Error en create_project: {str(e)}")
+        log_error('create_project', e)
         return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
 
 
 @require_auth
 def get_project_details(event, context, user):
     """
-    GET /projects/{id}
+    GET /projects/{id}?fields=name,status,members
     Obtener detalles de un proyecto
+    
+    Con fields el proyecto trae solo esos campos (de DETAIL_FIELDS); sin
+    'members' no se leen los miembros.
     """
     try:
         project_id = event['pathParameters']['id']
         
-        # Verificar acceso
-        access = check_user_project_access(user['userId'], project_id)
+        params = event.get('queryStringParameters') or {}
+        try:
+            fields = parse_fields(params.get('fields'), DETAIL_FIELDS)
+        except ValueError as e:
+            return error_response(400, f'Campos no soportados: {e}', 'INVALID_FIELDS')
+        
+        # Con fields se lee al menos projectId, para distinguir un 404
+        item_fields = fields and ([name for name in fields if name in PROJECT_FIELDS] or ['projectId'])
+        reads = [
+            async_db.check_user_project_access(user['userId'], project_id),
+            async_db.get_project(project_id, item_fields)
+        ]
+        if not fields or 'members' in fields:
+            reads.append(async_db.get_project_members(project_id))
+        
+        # Acceso, proyecto y miembros no dependen entre sí: se leen en paralelo
+        access, project, *members = async_db.fetch_all(*reads)
+        
         if not access:
             return error_response(403, 'No tienes acceso a este proyecto', 'FORBIDDEN')
         
-        # Obtener proyecto
-        project = get_project(project_id)
         if not project:
             return error_response(404, 'Proyecto no encontrado', 'NOT_FOUND')
         
-        # Obtener miembros
-        members = get_project_members(project_id)
-        
         # Agregar información adicional
-        project['members'] = members
+        if members:
+            project['members'] = members[0]
         project['userRole'] = access.get('role', 'member')
         
         return success_response(200, {
-            'project': project
+            'project': select_fields(project, fields)
         })
         
     except KeyError:
         return error_response(400, 'ID de proyecto requerido', 'MISSING_ID')
     except Exception as e:
-        print(f"Error en get_project_details: {str(e)}")
+        log_error('get_project_details', e)
         return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
 
 
@@ -134,6 +172,8 @@ def update_project_handler(event, context, user):
         
         # Actualizar proyecto
         updated_project = update_project(project_id, updates)
+        if updated_project is None:
+            return error_response(404, 'Proyecto no encontrado', 'NOT_FOUND')
         
         return success_response(200, {
             'project': updated_project
@@ -142,7 +182,7 @@ def update_project_handler(event, context, user):
     except KeyError:
         return error_response(400, 'ID de proyecto requerido', 'MISSING_ID')
     except Exception as e:
-        print(f"Error en update_project: {str(e)}")
+        log_error('update_project', e)
         return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
 
 
@@ -170,5 +210,5 @@ def delete_project_handler(event, context, user):
     except KeyError:
         return error_response(400, 'ID de proyecto requerido', 'MISSING_ID')
     except Exception as e:
-        print(f"Error en delete_project: {str(e)}")
+        log_error('delete_project', e)
         return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
\ No newline at end of file
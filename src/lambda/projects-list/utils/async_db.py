@@ -0,0 +1,193 @@
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import db_utils, ddb_usage
+
+# Variante asyncio de las lecturas de db_utils, para lanzar en paralelo las
+# que no dependen entre sí dentro de una misma invocación:
+#
+#     access, project, members = fetch_all(
+#         check_user_project_access(user_id, project_id),
+#         get_project(project_id),
+#         get_project_members(project_id),
+#     )
+#
+# Cada corrutina ejecuta la operación sincrónica del repositorio en un pool
+# de DB_FANOUT_THREADS threads (botocore y sqlite3 liberan el GIL mientras
+# esperan), así sirve para los dos backends de utils.repository sin un
+# segundo cliente. fetch_all() es el puente para los handlers, que son
+# sincrónicos: corre las corrutinas en un event loop propio del thread
+# (creado una vez y reutilizado entre invocaciones).
+#
+# Lo que consume cada llamada en DynamoDB (ddb_usage) se suma al acumulado
+# del thread que llamó a fetch_all, así que las métricas del request no
+# cambian; ddbMs pasa a ser la suma de llamadas que se solapan. Los threads
+# corren en una copia del contexto del que llama, así que log_error y las
+# métricas de utils.metrics van al acumulador de ese request.
+#
+# Con DB_FANOUT=false las corrutinas ejecutan la operación en el thread del
+# handler, una después de otra (el comportamiento sin fan-out).
+
+DB_FANOUT_ENABLED = os.environ.get('DB_FANOUT', 'true').lower() == 'true'
+DB_FANOUT_THREADS = int(os.environ.get('DB_FANOUT_THREADS', '4'))
+
+_local = threading.local()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _mark_pool_thread():
+    _local.pool_thread = True
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=DB_FANOUT_THREADS, thread_name_prefix='db-fanout', initializer=_mark_pool_thread
+                )
+    return _executor
+
+
+def _call_tracked(func, args):
+    """Ejecutar func en un thread del pool con su propio acumulado de ddb_usage"""
+    ddb_usage.reset_usage()
+    try:
+        return func(*args), None, ddb_usage.get_usage()
+    except Exception as e:
+        return None, e, ddb_usage.get_usage()
+
+
+async def call(func, *args):
+    """
+    Ejecutar una operación sincrónica de db_utils en el pool
+    
+    Dentro de un thread del pool (una operación que a su vez hace fan-out)
+    corre en el mismo thread: esperar a otro thread del pool podría dejarlo
+    sin threads libres.
+    """
+    if not DB_FANOUT_ENABLED or getattr(_local, 'pool_thread', False):
+        return func(*args)
+    
+    # El thread del pool corre con el contexto del que llama (usuario y
+    # checks de acceso de un batch, ver utils.db_utils)
+    context = contextvars.copy_context()
+    result, error, usage = await asyncio.get_running_loop().run_in_executor(
+        _get_executor(), context.run, _call_tracked, func, args
+    )
+    ddb_usage.merge_usage(usage)
+    if error is not None:
+        raise error
+    return result
+
+
+async def _gather(coroutines):
+    # return_exceptions: todas terminan antes de propagar el primer error, así
+    # ninguna queda pendiente en el loop para la invocación siguiente
+    results = await asyncio.gather(*coroutines, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+def fetch_all(*coroutines):
+    """
+    Ejecutar corrutinas de este módulo en paralelo desde código sincrónico
+    
+    Args:
+        coroutines: Llamadas a las funciones async de este módulo
+    
+    Returns:
+        Lista con los resultados, en el orden de los argumentos
+    """
+    loop = getattr(_local, 'loop', None)
+    if loop is None:
+        loop = _local.loop = asyncio.new_event_loop()
+    if loop.is_running():
+        return _run_inline(coroutines)
+    return loop.run_until_complete(_gather(coroutines))
+
+
+def _run_inline(coroutines):
+    # fetch_all dentro de una operación que call() corrió en este mismo thread
+    # (DB_FANOUT=false): el loop ya está corriendo, pero estas corrutinas no
+    # esperan nada y terminan en el primer paso
+    pending = list(coroutines)
+    results = []
+    try:
+        while pending:
+            try:
+                pending.pop(0).send(None)
+            except StopIteration as done:
+                results.append(done.value)
+            else:
+                raise RuntimeError('fetch_all anidado con una corrutina que no terminó')
+    finally:
+        for coroutine in pending:
+            coroutine.close()
+    return results
+
+
+def prewarm():
+    """
+    Crear los threads del pool y abrir la conexión de cada uno durante el init
+    
+    Los recursos de boto3 son por thread (utils.db_utils): sin esto el primer
+    fan-out de cada thread paga crear el cliente y el handshake TLS.
+    """
+    if not DB_FANOUT_ENABLED:
+        return
+    
+    # La barrera obliga a que cada prewarm corra en un thread distinto
+    barrier = threading.Barrier(DB_FANOUT_THREADS)
+    
+    def prewarm_thread():
+        try:
+            db_utils.prewarm_connection()
+        finally:
+            try:
+                barrier.wait(timeout=5)
+            except threading.BrokenBarrierError:
+                pass
+    
+    futures = [_get_executor().submit(prewarm_thread) for _ in range(DB_FANOUT_THREADS)]
+    for future in futures:
+        future.result()
+
+
+# ==================== LECTURAS ====================
+
+async def get_user_by_id(user_id):
+    """Obtener usuario por ID"""
+    return await call(db_utils.get_user_by_id, user_id)
+
+
+async def get_user_projects(user_id, descriptions='full', fields=None):
+    """Obtener todos los proyectos de un usuario"""
+    return await call(db_utils.get_user_projects, user_id, descriptions, fields)
+
+
+async def get_project(project_id, fields=None):
+    """Obtener detalles de un proyecto"""
+    return await call(db_utils.get_project, project_id, fields)
+
+
+async def check_user_project_access(user_id, project_id):
+    """Verificar si el usuario tiene acceso al proyecto"""
+    return await call(db_utils.check_user_project_access, user_id, project_id)
+
+
+async def get_project_members(project_id):
+    """Obtener miembros de un proyecto"""
+    return await call(db_utils.get_project_members, project_id)
+
+
+async def get_project_tasks(project_id, descriptions='full', fields=None):
+    """Obtener todas las tareas de un proyecto"""
+    return await call(db_utils.get_project_tasks, project_id, descriptions, fields)
@@ -0,0 +1,192 @@
+import os
+import sys
+import time
+
+from .capture import CAPTURE_ENABLED
+from .ddb_usage import reset_usage, get_usage
+from .metrics import start_invocation, put_metric, set_property, log_error, flush
+from .profiling import PROFILING_ARMED
+from .response import error_response, compress_response, decode_request_body, buffer_stream_response, get_serializer
+from .routing import resolve_handler
+from .shared_cache import reset_stats, get_stats
+
+# Pre-calentamiento en el init de Lambda (deshabilitado por default: los
+# tests y scripts locales no abren conexiones al importar)
+PREWARM_ENABLED = os.environ.get('PREWARM', 'false').lower() == 'true'
+
+PREFLIGHT_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization'
+}
+
+
+def prewarm(*handler_refs):
+    """
+    Mover al init de Lambda el trabajo que si no paga el primer request
+    
+    Importa los handlers, jwt y boto3, prepara el serializador y abre la
+    conexión a DynamoDB (también la de cada thread de utils.async_db si la
+    función lo usa). No hace nada si PREWARM no está habilitado; un error
+    acá nunca impide que la función arranque.
+    
+    Args:
+        handler_refs: 'módulo:función' de los handlers de la función
+    """
+    if not PREWARM_ENABLED:
+        return
+    
+    try:
+        from .auth_utils import prewarm_jwt
+        from .db_utils import prewarm_connection
+        
+        for ref in handler_refs:
+            resolve_handler(ref)
+        get_serializer()
+        prewarm_jwt()
+        prewarm_connection()
+        
+        # Pool de lecturas en paralelo, solo si algún handler de la función lo usa
+        async_db = sys.modules.get(f"{__package__}.async_db")
+        if async_db is not None:
+            async_db.prewarm()
+        
+    except Exception as e:
+        log_error('prewarm', e)
+
+
+def preflight_response(allowed_methods):
+    """Respuesta a un preflight OPTIONS de CORS"""
+    headers = dict(PREFLIGHT_HEADERS)
+    headers['Access-Control-Allow-Methods'] = allowed_methods
+    
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': ''
+    }
+
+
+def begin_invocation(handler_ref):
+    """
+    Reiniciar los acumuladores de métricas, de DynamoDB y del cache
+    compartido de un request
+    
+    Returns:
+        Instante de inicio (perf_counter) para record_invocation
+    """
+    reset_usage()
+    reset_stats()
+    start_invocation(handler_ref)
+    return time.perf_counter()
+
+
+def record_invocation(response, start, context=None):
+    """
+    Emitir las métricas EMF del request: duración, tamaño de respuesta,
+    tiempo y capacidad de DynamoDB (utils.ddb_usage) y, si consultó el
+    cache compartido, aciertos y fallos (utils.shared_cache)
+    
+    Args:
+        response: Respuesta del handler (el body ya leído si era streaming)
+        start: Valor retornado por begin_invocation
+        context: Contexto de Lambda
+    """
+    duration_ms = (time.perf_counter() - start) * 1000
+    usage = get_usage()
+    
+    put_metric('Duration', round(duration_ms, 2), 'Milliseconds')
+    if isinstance(response.get('body'), str):
+        put_metric('ResponseSize', len(response['body']), 'Bytes')
+    
+    put_metric('DynamoDBTime', round(usage['ddbMs'], 2), 'Milliseconds')
+    put_metric('DynamoDBTimeShare', round(100 * usage['ddbMs'] / duration_ms, 1) if duration_ms else 0, 'Percent')
+    put_metric('DynamoDBCalls', usage['calls'], 'Count')
+    put_metric('ConsumedRCU', usage['rcu'], 'Count')
+    put_metric('ConsumedWCU', usage['wcu'], 'Count')
+    
+    cache = get_stats()
+    if cache:
+        lookups = cache['hits'] + cache['misses']
+        put_metric('CacheHits', cache['hits'], 'Count')
+        put_metric('CacheMisses', cache['misses'], 'Count')
+        if lookups:
+            put_metric('CacheHitRate', round(100 * cache['hits'] / lookups, 1), 'Percent')
+        if cache['errors']:
+            put_metric('CacheErrors', cache['errors'], 'Count')
+    
+    set_property('statusCode', response['statusCode'])
+    set_property('ddbOperations', usage['operations'])
+    if usage['indexes']:
+        set_property('ddbIndexes', usage['indexes'])
+    if usage['slowOperations']:
+        set_property('slowOperations', usage['slowOperations'])
+    
+    flush(context)
+
+
+def _invoke(event, context, handler_ref):
+    """Decodificar el body, ejecutar el handler y preparar la respuesta"""
+    decode_request_body(event)
+    response = buffer_stream_response(resolve_handler(handler_ref)(event, context))
+    return compress_response(event, response)
+
+
+def dispatch(event, context, handler_ref):
+    """
+    Invocar un handler y preparar su respuesta para API Gateway
+    
+    El módulo del handler (y con él boto3 / jwt según lo que use) se importa
+    recién acá, en el primer request que lo necesita. Al terminar se emiten
+    las métricas de la invocación (record_invocation). Con profiling armado
+    (utils.profiling) el request puede correr bajo el profiler y con
+    CAPTURE=true se guarda para replay (utils.capture).
+    
+    Args:
+        event: Evento de API Gateway
+        context: Contexto de Lambda
+        handler_ref: 'módulo:función' del handler
+    """
+    start = begin_invocation(handler_ref)
+    
+    try:
+        if PROFILING_ARMED:
+            from .profiling import should_profile, run_profiled
+            if should_profile(event):
+                response = run_profiled(_invoke, handler_ref, context, event, context, handler_ref)
+            else:
+                response = _invoke(event, context, handler_ref)
+        else:
+            response = _invoke(event, context, handler_ref)
+        
+    except Exception as e:
+        log_error('lambda_handler', e)
+        response = error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
+    
+    record_invocation(response, start, context)
+    
+    if CAPTURE_ENABLED:
+        try:
+            from .capture import capture_request
+            capture_request(event, handler_ref, response, start, get_usage())
+        except Exception as e:
+            log_error('capture', e)
+    
+    return response
+
+
+def run_handler(event, context, handler_ref, allowed_methods):
+    """
+    Entry point de las funciones de un solo endpoint
+    
+    Los OPTIONS se responden sin importar ningún handler.
+    
+    Args:
+        event: Evento de API Gateway
+        context: Contexto de Lambda
+        handler_ref: 'módulo:función' del handler
+        allowed_methods: Métodos para el preflight de CORS (p.ej. 'GET,OPTIONS')
+    """
+    if event.get('httpMethod') == 'OPTIONS':
+        return preflight_response(allowed_methods)
+    
+    return dispatch(event, context, handler_ref)
@@ -1,14 +1,105 @@
-import jwt
+import contextvars
 import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from functools import wraps
 from .response import error_response
 
+# jwt se importa dentro de generate_token/_verify_token: un preflight o un
+# request sin header Authorization no paga su import
+
 JWT_SECRET = os.environ.get('JWT_SECRET', 'dev-secret-change-in-production')
 JWT_ALGORITHM = 'HS256'
+
+# Secreto ya en bytes: jwt no lo vuelve a codificar en cada encode/decode
+JWT_KEY = JWT_SECRET.encode('utf-8')
 TOKEN_EXPIRATION_DAYS = 7
 
+# Tokens ya verificados: un mismo token se reusa en cada request durante sus
+# 7 días, así que se guardan sus claims (hasta exp) en un LRU por contenedor
+# de TOKEN_CACHE_SIZE entradas (0 lo deshabilita). La clave es el SHA-256 del
+# token, no el token. Un token revocado con revoke_token deja de valer en este
+# contenedor; los demás lo aceptan hasta que se les revoque o venza.
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', '1024'))
+
+# Usuario ya autenticado por quien ejecuta el handler (POST /batch valida el
+# token una vez para todos sus sub-requests)
+_verified_user = contextvars.ContextVar('verified_user', default=None)
+
+
+class _TokenCache:
+    """LRU acotado de claims verificados por digest del token, con contadores"""
+    
+    def __init__(self, size):
+        self.size = size
+        self._entries = OrderedDict()
+        self._revoked = {}
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'revoked': 0}
+    
+    def get(self, digest, now):
+        """Claims vigentes del token o None si hay que verificarlo"""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.counters['misses'] += 1
+                return None
+            
+            claims, expires = entry
+            if expires <= now:
+                del self._entries[digest]
+                self.counters['expired'] += 1
+                return None
+            
+            self._entries.move_to_end(digest)
+            self.counters['hits'] += 1
+            return claims
+    
+    def put(self, digest, claims, expires):
+        with self._lock:
+            self._entries[digest] = (claims, expires)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+                self.counters['evictions'] += 1
+    
+    def is_revoked(self, digest, now):
+        with self._lock:
+            expires = self._revoked.get(digest)
+            if expires is None:
+                return False
+            # Un revocado vencido ya no pasa jwt.decode: se olvida
+            if expires <= now:
+                del self._revoked[digest]
+                return False
+            self.counters['revoked'] += 1
+            return True
+    
+    def revoke(self, digest, expires):
+        with self._lock:
+            self._entries.pop(digest, None)
+            now = time.time()
+            for key in [key for key, until in self._revoked.items() if until <= now]:
+                del self._revoked[key]
+            self._revoked[digest] = expires
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for name in self.counters:
+                self.counters[name] = 0
+    
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, size=len(self._entries), revokedTokens=len(self._revoked))
+
+
+_token_cache = _TokenCache(TOKEN_CACHE_SIZE)
+
 
 def hash_password(password):
     """Hash password usando SHA256"""
@@ -30,6 +121,8 @@ def generate_token(user_data):
     Returns:
         JWT token string
     """
+    import jwt
+    
     payload = {
         'userId': user_data['userId'],
         'email': user_data['email'],
@@ -38,18 +131,48 @@ def generate_token(user_data):
         'iat': datetime.utcnow()
     }
     
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    return jwt.encode(payload, JWT_KEY, algorithm=JWT_ALGORITHM)
+
+
+def _token_digest(token):
+    return hashlib.sha256(token.encode('utf-8')).digest()
 
 
 def decode_token(token):
     """
     Decodificar JWT token
     
+    Un token ya verificado en este contenedor sale del cache de tokens sin
+    volver a verificar la firma (hasta su exp); los inválidos no se guardan.
+    
     Returns:
         dict con datos del usuario o None si es inválido
     """
+    if TOKEN_CACHE_SIZE <= 0:
+        return _verify_token(token)
+    
+    digest = _token_digest(token)
+    now = time.time()
+    if _token_cache.is_revoked(digest, now):
+        return None
+    
+    claims = _token_cache.get(digest, now)
+    if claims is None:
+        claims = _verify_token(token)
+        if claims is None or 'exp' not in claims:
+            return claims
+        _token_cache.put(digest, claims, claims['exp'])
+    
+    # Copia: el handler puede modificar su user sin tocar lo cacheado
+    return dict(claims)
+
+
+def _verify_token(token):
+    """jwt.decode con verificación de firma y exp; None si es inválido"""
+    import jwt
+    
     try:
-        decoded = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        decoded = jwt.decode(token, JWT_KEY, algorithms=[JWT_ALGORITHM])
         return decoded
     except jwt.ExpiredSignatureError:
         return None
@@ -57,6 +180,48 @@ def decode_token(token):
         return None
 
 
+def revoke_token(token):
+    """
+    Rechazar un token en este contenedor hasta que venza (p.ej. al cerrar
+    sesión), aunque ya esté en el cache
+    
+    Returns:
+        True si el token era válido y quedó revocado
+    """
+    claims = _verify_token(token)
+    if claims is None:
+        return False
+    
+    _token_cache.revoke(_token_digest(token), claims.get('exp', time.time() + TOKEN_EXPIRATION_DAYS * 86400))
+    return True
+
+
+def clear_token_cache():
+    """Vaciar el cache de tokens y sus contadores (los revocados se mantienen)"""
+    _token_cache.clear()
+
+
+def get_token_cache_stats():
+    """
+    Contadores del cache de tokens desde el arranque del contenedor
+    
+    Returns:
+        dict con hits, misses, expired, evictions, revoked (requests
+        rechazados por revocación), size y revokedTokens
+    """
+    return _token_cache.stats()
+
+
+def prewarm_jwt():
+    """
+    Importar jwt durante el init de Lambda
+    
+    Solo el import: con HS256, jwt.decode vuelve a preparar la clave en cada
+    llamada (y es barato), así que no hay nada que precomputar.
+    """
+    import jwt  # noqa: F401
+
+
 def extract_token_from_header(event):
     """
     Extraer token del header Authorization
@@ -94,6 +259,22 @@ def get_user_from_token(event):
     return decode_token(token)
 
 
+@contextmanager
+def verified_user(user):
+    """
+    Ejecutar handlers con @require_auth como user sin volver a decodificar
+    el token del evento
+    
+    Vale para el thread actual y para lo que corra en una copia de su
+    contexto (contextvars.copy_context).
+    """
+    token = _verified_user.set(user)
+    try:
+        yield
+    finally:
+        _verified_user.reset(token)
+
+
 def require_auth(handler):
     """
     Decorador para requerir autenticación en handlers
@@ -106,7 +287,7 @@ def require_auth(handler):
     """
     @wraps(handler)
     def wrapper(event, context):
-        user = get_user_from_token(event)
+        user = _verified_user.get() or get_user_from_token(event)
         
         if not user:
             return error_response(401, 'Token inválido o expirado', 'UNAUTHORIZED')
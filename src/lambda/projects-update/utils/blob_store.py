@@ -0,0 +1,141 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+
+# Almacenamiento de objetos para los valores que no conviene guardar dentro
+# del item de DynamoDB (hoy: las descripciones largas, ver utils.item_codec).
+# BLOB_STORE elige la implementación:
+#
+#     local (default)   archivos bajo BLOB_PATH; para desarrollo, scripts y
+#                       el modo self-hosted (api-router/asgi.py)
+#     s3                bucket BLOB_BUCKET (la plantilla crea uno y da
+#                       permisos a las funciones)
+#
+# Las claves las arma el que escribe (rutas con '/'); el store solo guarda
+# y devuelve bytes.
+
+BLOB_STORE = os.environ.get('BLOB_STORE', 'local').lower()
+BLOB_PATH = os.environ.get('BLOB_PATH', 'blobs')
+BLOB_BUCKET = os.environ.get('BLOB_BUCKET', '')
+
+_store = None
+_lock = threading.Lock()
+
+
+class BlobNotFound(Exception):
+    """La clave no existe en el store"""
+
+
+class BlobStore(ABC):
+    """Operaciones de un store de objetos"""
+    
+    @abstractmethod
+    def put(self, key, data):
+        """Guardar data (bytes) en key, reemplazando lo que hubiera"""
+    
+    @abstractmethod
+    def get(self, key):
+        """Bytes guardados en key; BlobNotFound si no existe"""
+    
+    @abstractmethod
+    def delete(self, key):
+        """Eliminar key (no falla si no existe)"""
+
+
+class LocalBlobStore(BlobStore):
+    """Un archivo por clave bajo un directorio"""
+    
+    def __init__(self, path=BLOB_PATH):
+        self.path = os.path.abspath(path)
+    
+    def _file(self, key):
+        path = os.path.abspath(os.path.join(self.path, key))
+        if not path.startswith(self.path + os.sep):
+            raise ValueError(f"Clave de blob inválida: {key}")
+        return path
+    
+    def put(self, key, data):
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        # Escribir aparte y renombrar: un lector nunca ve un archivo a medias
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(partial, 'wb') as f:
+            f.write(data)
+        os.replace(partial, path)
+    
+    def get(self, key):
+        try:
+            with open(self._file(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            raise BlobNotFound(key)
+    
+    def delete(self, key):
+        try:
+            os.remove(self._file(key))
+        except FileNotFoundError:
+            pass
+
+
+class S3BlobStore(BlobStore):
+    """Objetos en un bucket de S3"""
+    
+    def __init__(self, bucket=BLOB_BUCKET):
+        if not bucket:
+            raise ValueError('BLOB_STORE=s3 requiere BLOB_BUCKET')
+        self.bucket = bucket
+        self._client = None
+    
+    def _s3(self):
+        # Los clientes de boto3 (a diferencia de los recursos) son thread-safe
+        if self._client is None:
+            with _lock:
+                if self._client is None:
+                    import boto3
+                    self._client = boto3.client('s3')
+        return self._client
+    
+    def put(self, key, data):
+        self._s3().put_object(Bucket=self.bucket, Key=key, Body=data)
+    
+    def get(self, key):
+        s3 = self._s3()
+        try:
+            return s3.get_object(Bucket=self.bucket, Key=key)['Body'].read()
+        except s3.exceptions.NoSuchKey:
+            raise BlobNotFound(key)
+    
+    def delete(self, key):
+        self._s3().delete_object(Bucket=self.bucket, Key=key)
+
+
+def get_blob_store():
+    """Store de BLOB_STORE, creado en el primer uso"""
+    global _store
+    if _store is None:
+        with _lock:
+            if _store is None:
+                _store = create_blob_store(BLOB_STORE)
+    return _store
+
+
+def create_blob_store(kind, **kwargs):
+    """
+    Crear un store por nombre
+    
+    Args:
+        kind: 'local' o 's3'
+        kwargs: Opciones del store (path para local, bucket para s3)
+    """
+    if kind == 'local':
+        return LocalBlobStore(**kwargs)
+    if kind == 's3':
+        return S3BlobStore(**kwargs)
+    raise ValueError(f"BLOB_STORE desconocido: {kind}")
+
+
+def set_blob_store(store):
+    """Reemplazar el store en uso (scripts y benchmarks)"""
+    global _store
+    _store = store
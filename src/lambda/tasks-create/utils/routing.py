@@ -0,0 +1,67 @@
+import importlib
+import re
+
+# Tabla de rutas: (método, path, 'módulo:función')
+# Los nombres de los parámetros de path son los que leen los handlers
+ROUTES = [
+    ('POST', '/auth/register', 'handlers.auth:register'),
+    ('POST', '/auth/login', 'handlers.auth:login'),
+    ('GET', '/auth/me', 'handlers.auth:get_profile'),
+    ('GET', '/projects', 'handlers.projects:list_projects'),
+    ('POST', '/projects', 'handlers.projects:create_project_handler'),
+    ('GET', '/projects/{id}', 'handlers.projects:get_project_details'),
+    ('PUT', '/projects/{id}', 'handlers.projects:update_project_handler'),
+    ('DELETE', '/projects/{id}', 'handlers.projects:delete_project_handler'),
+    ('GET', '/projects/{id}/tasks', 'handlers.tasks:list_tasks'),
+    ('POST', '/projects/{id}/tasks', 'handlers.tasks:create_task_handler'),
+    ('PUT', '/projects/{projectId}/tasks/{taskId}', 'handlers.tasks:update_task_handler'),
+    ('DELETE', '/projects/{projectId}/tasks/{taskId}', 'handlers.tasks:delete_task_handler'),
+    ('GET', '/projects/{id}/export', 'handlers.tasks:export_tasks_handler'),
+    ('POST', '/batch', 'handlers.batch:batch_handler'),
+]
+
+_PARAM = re.compile(r'\{(\w+)\}')
+_handlers = {}
+
+
+def _compile(path):
+    """Convertir '/projects/{id}' en una regex con grupos nombrados"""
+    pattern = _PARAM.sub(lambda m: f"(?P<{m.group(1)}>[^/]+)", path)
+    return re.compile(f"^{pattern}/?$")
+
+
+_COMPILED_ROUTES = [(method, _compile(path), ref) for method, path, ref in ROUTES]
+
+
+def resolve_handler(ref):
+    """
+    Obtener la función de un handler a partir de 'módulo:función'
+    
+    El módulo se importa en el primer uso y la función queda cacheada.
+    """
+    handler = _handlers.get(ref)
+    if handler is None:
+        module_name, function_name = ref.split(':')
+        handler = getattr(importlib.import_module(module_name), function_name)
+        _handlers[ref] = handler
+    return handler
+
+
+def match_route(method, path):
+    """
+    Buscar la ruta para un método y path
+    
+    Returns:
+        (ref del handler, dict de parámetros de path), o (None, métodos
+        permitidos para el path) si no hay coincidencia
+    """
+    allowed = []
+    for route_method, regex, ref in _COMPILED_ROUTES:
+        match = regex.match(path or '')
+        if not match:
+            continue
+        if route_method == method:
+            return ref, match.groupdict()
+        allowed.append(route_method)
+    
+    return None, allowed
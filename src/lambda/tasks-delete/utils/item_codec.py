@@ -0,0 +1,379 @@
+import base64
+import calendar
+import hashlib
+import os
+import zlib
+from datetime import datetime, timedelta, timezone
+
+# Formato físico de los items en DynamoDB
+#
+# DynamoDB factura lectura y escritura por tamaño de item, y los nombres de
+# atributo cuentan igual que los valores: en un item chico como una
+# membresía, 'createdByName' o 'projectName' pesan tanto como el dato. El
+# esquema v2 guarda cada campo con un nombre corto (ATTRIBUTE_NAMES) y los
+# timestamps como epoch en milisegundos (un Number de ~8 bytes en lugar de
+# un string ISO de 23 a 26).
+#
+# Los handlers y los builders de db_utils trabajan siempre con los nombres
+# lógicos: utils.dynamodb_repository pasa por pack_item() al escribir y por
+# unpack_item() al leer.
+#
+#     v1   nombres lógicos, timestamps ISO (items escritos antes de v2)
+#     v2   nombres cortos, timestamps epoch ms, atributo 'v' = 2
+#
+# unpack_item() lee los dos formatos y también items mezclados: un update de
+# v2 sobre un item v1 escribe el nombre corto y elimina el largo (REMOVE),
+# salvo los contadores, donde el valor lógico es la suma de los dos
+# atributos. PK, SK y email (clave de EmailIndex) no cambian de nombre.
+#
+# ITEM_SCHEMA_VERSION=1 mantiene la escritura en v1 (los updates eliminan
+# el nombre corto): durante un deploy las versiones anteriores de las
+# funciones no leen v2.
+#
+# En v2 'description' (tareas y proyectos) se guarda según su tamaño en
+# UTF-8, para que un spec de varios KB no encarezca cada Query del listado:
+#
+#     < DESCRIPTION_COMPRESS_BYTES   d       string
+#     < DESCRIPTION_OFFLOAD_BYTES    dz      Binary con zlib
+#     el resto                       dr, dp  clave en utils.blob_store (el
+#                                            texto con zlib) y los primeros
+#                                            DESCRIPTION_PREVIEW_CHARS
+#
+# Al leer con descriptions='preview' las descripciones largas se recortan
+# (descriptionTruncated: true) y las del blob store no se van a buscar.
+
+ITEM_SCHEMA_VERSION = int(os.environ.get('ITEM_SCHEMA_VERSION', '2'))
+
+DESCRIPTION_COMPRESS_BYTES = int(os.environ.get('DESCRIPTION_COMPRESS_BYTES', '1024'))
+DESCRIPTION_OFFLOAD_BYTES = int(os.environ.get('DESCRIPTION_OFFLOAD_BYTES', '16384'))
+DESCRIPTION_PREVIEW_CHARS = int(os.environ.get('DESCRIPTION_PREVIEW_CHARS', '200'))
+
+# Modos de lectura de las descripciones
+DESCRIPTION_MODES = ('full', 'preview')
+
+VERSION_ATTRIBUTE = 'v'
+
+# Nombre lógico -> atributo físico en v2 (ninguno puede coincidir con un
+# nombre lógico)
+ATTRIBUTE_NAMES = {
+    'userId': 'u',
+    'name': 'n',
+    'password': 'pw',
+    'projectId': 'p',
+    'projectName': 'pn',
+    'description': 'd',
+    'status': 's',
+    'createdBy': 'cb',
+    'createdByName': 'cbn',
+    'createdAt': 'ca',
+    'updatedAt': 'ua',
+    'joinedAt': 'ja',
+    'taskCount': 'tc',
+    'memberCount': 'mc',
+    'userName': 'un',
+    'role': 'r',
+    'taskId': 't',
+    'title': 'ti',
+    'assignedTo': 'at',
+}
+
+LOGICAL_NAMES = {physical: logical for logical, physical in ATTRIBUTE_NAMES.items()}
+
+TIMESTAMP_FIELDS = {'createdAt', 'updatedAt', 'joinedAt'}
+
+COUNTER_FIELDS = {'taskCount', 'memberCount'}
+
+# Atributos físicos de 'description' en sus distintas formas
+DESCRIPTION_ATTRIBUTES = ('description', 'd', 'dz', 'dr', 'dp')
+
+# Campos que se pueden pedir con ?fields= (los que no salen del item, como
+# userRole o members, los arma el handler)
+TASK_FIELDS = ('taskId', 'projectId', 'title', 'description', 'status', 'assignedTo',
+               'createdBy', 'createdAt', 'updatedAt')
+PROJECT_FIELDS = ('projectId', 'name', 'description', 'status', 'createdBy', 'createdByName',
+                  'createdAt', 'updatedAt', 'taskCount', 'memberCount')
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_ms(timestamp):
+    """
+    Timestamp ISO (UTC si no trae zona) a epoch en milisegundos
+    
+    Un string que no es ISO (p.ej. un createdAt importado a mano) se guarda
+    tal cual.
+    """
+    if not isinstance(timestamp, str):
+        return timestamp
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return timestamp
+    
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return calendar.timegm(parsed.timetuple()) * 1000 + parsed.microsecond // 1000
+
+
+def from_epoch_ms(value):
+    """Epoch en milisegundos (int o Decimal) al ISO que arma db_utils.get_timestamp"""
+    if isinstance(value, str):
+        return value
+    return (_EPOCH + timedelta(milliseconds=int(value))).isoformat(timespec='milliseconds')
+
+
+def physical_name(name):
+    """Atributo en el que se escribe un campo lógico"""
+    if ITEM_SCHEMA_VERSION < 2:
+        return name
+    return ATTRIBUTE_NAMES.get(name, name)
+
+
+def stale_name(name):
+    """
+    Atributo del otro esquema que un update tiene que eliminar al escribir el
+    campo (el largo en v2, el corto en v1), o None si el campo no cambia de nombre
+    """
+    if name not in ATTRIBUTE_NAMES:
+        return None
+    return name if ITEM_SCHEMA_VERSION >= 2 else ATTRIBUTE_NAMES[name]
+
+
+def pack_value(name, value):
+    """Valor de un campo lógico como se escribe en el esquema actual"""
+    if ITEM_SCHEMA_VERSION >= 2 and name in TIMESTAMP_FIELDS:
+        return to_epoch_ms(value)
+    return value
+
+
+def pack_field(name, value, key=None):
+    """
+    Atributos físicos de un campo lógico en el esquema actual
+    
+    Args:
+        name: Nombre lógico
+        value: Valor lógico
+        key: (PK, SK) del item; arma la clave de una descripción que va al
+            blob store
+    
+    Returns:
+        (dict atributo -> valor a escribir, atributos a eliminar en un update)
+    """
+    if name == 'description':
+        if ITEM_SCHEMA_VERSION >= 2 and isinstance(value, str):
+            attributes = _pack_description(value, key)
+        else:
+            # v1, o un valor que no es texto (null): va tal cual
+            attributes = {physical_name(name): value}
+        # Siempre se eliminan las otras formas: unpack_item prefiere dz y dr a d
+        return attributes, [a for a in DESCRIPTION_ATTRIBUTES if a not in attributes]
+    
+    stale = stale_name(name)
+    return {physical_name(name): pack_value(name, value)}, [stale] if stale else []
+
+
+def _pack_description(text, key):
+    data = text.encode('utf-8')
+    if len(data) < DESCRIPTION_COMPRESS_BYTES:
+        return {'d': text}
+    
+    compressed = zlib.compress(data)
+    if len(data) >= DESCRIPTION_OFFLOAD_BYTES and key:
+        from .blob_store import get_blob_store
+        
+        # Clave por item y contenido: reintentar la escritura no cambia nada y
+        # dos tareas con el mismo texto no comparten el blob
+        pk, sk = key
+        blob_key = f"descriptions/{pk.replace('#', '-')}/{sk.replace('#', '-')}/{hashlib.sha256(data).hexdigest()[:32]}"
+        get_blob_store().put(blob_key, compressed)
+        return {'dr': blob_key, 'dp': text[:DESCRIPTION_PREVIEW_CHARS]}
+    
+    # Un texto que no comprime (p.ej. ya codificado) queda como string
+    if len(compressed) >= len(data):
+        return {'d': text}
+    return {'dz': compressed}
+
+
+def pack_item(item):
+    """Item con nombres lógicos -> item a escribir en DynamoDB"""
+    if ITEM_SCHEMA_VERSION < 2:
+        return item
+    
+    key = (item['PK'], item['SK']) if 'PK' in item and 'SK' in item else None
+    packed = {VERSION_ATTRIBUTE: ITEM_SCHEMA_VERSION}
+    for name, value in item.items():
+        attributes, _ = pack_field(name, value, key)
+        packed.update(attributes)
+    return packed
+
+
+def description_ref(item):
+    """Clave en el blob store de la descripción de un item físico, o None"""
+    return (item or {}).get('dr')
+
+
+def _binary(value):
+    # Binary de boto3, bytes o base64 (tools/ddb_codec decodifica así los B)
+    if isinstance(value, str):
+        return base64.b64decode(value)
+    return bytes(getattr(value, 'value', value))
+
+
+def load_descriptions(refs, strict=False):
+    """
+    Textos de varias descripciones del blob store, en paralelo si son varias
+    
+    Args:
+        refs: Claves en el blob store
+        strict: Propagar BlobNotFound en lugar de omitir la clave (exports,
+            donde la vista previa no sirve)
+    
+    Returns:
+        dict clave -> texto (sin las claves que no están en el store)
+    """
+    from .blob_store import BlobNotFound, get_blob_store
+    from .metrics import log_error
+    
+    def load(ref):
+        try:
+            return zlib.decompress(get_blob_store().get(ref)).decode('utf-8')
+        except BlobNotFound as e:
+            if strict:
+                raise
+            # El item se lee igual, con la vista previa que guarda
+            log_error('load_description', e)
+            return None
+    
+    refs = list(dict.fromkeys(refs))
+    if len(refs) == 1:
+        texts = [load(refs[0])]
+    else:
+        from .async_db import call, fetch_all
+        texts = fetch_all(*(call(load, ref) for ref in refs))
+    return {ref: text for ref, text in zip(refs, texts) if text is not None}
+
+
+def truncate_description(item):
+    """Recortar la descripción de un item lógico a DESCRIPTION_PREVIEW_CHARS"""
+    description = item.get('description')
+    if isinstance(description, str) and len(description) > DESCRIPTION_PREVIEW_CHARS:
+        item['description'] = description[:DESCRIPTION_PREVIEW_CHARS]
+        item['descriptionTruncated'] = True
+    return item
+
+
+def unpack_item(item, descriptions='full', loaded=None):
+    """
+    Item leído de DynamoDB (v1, v2 o mezclado) -> item con nombres lógicos
+    
+    Args:
+        item: Item físico
+        descriptions: 'full' o 'preview' (ver DESCRIPTION_MODES)
+        loaded: Textos ya leídos del blob store (load_descriptions)
+    """
+    if not item:
+        return item
+    
+    unpacked = {}
+    for name, value in item.items():
+        if name == VERSION_ATTRIBUTE or name in ('dz', 'dr', 'dp'):
+            continue
+        
+        logical = LOGICAL_NAMES.get(name)
+        if logical is None:
+            # v1 o sin mapeo (PK, SK, email): no pisa al atributo corto
+            if name in COUNTER_FIELDS:
+                unpacked[name] = unpacked.get(name, 0) + value
+            else:
+                unpacked.setdefault(name, value)
+        elif logical in COUNTER_FIELDS:
+            unpacked[logical] = unpacked.get(logical, 0) + value
+        elif logical in TIMESTAMP_FIELDS:
+            unpacked[logical] = from_epoch_ms(value)
+        else:
+            unpacked[logical] = value
+    
+    if 'dz' in item:
+        unpacked['description'] = zlib.decompress(_binary(item['dz'])).decode('utf-8')
+    elif 'dr' in item:
+        ref = item['dr']
+        if descriptions == 'full' and loaded is None:
+            loaded = load_descriptions([ref])
+        
+        if descriptions == 'full' and ref in loaded:
+            unpacked['description'] = loaded[ref]
+        else:
+            # Vista previa (o el blob falta en el store): lo que guarda el item
+            unpacked['description'] = item.get('dp', '')
+            unpacked['descriptionTruncated'] = True
+    
+    if descriptions == 'preview':
+        truncate_description(unpacked)
+    
+    return unpacked
+
+
+def unpack_items(items, descriptions='full'):
+    """unpack_item de cada item, con las descripciones del blob store leídas juntas"""
+    loaded = {}
+    if descriptions == 'full':
+        refs = [item['dr'] for item in items if 'dr' in item]
+        if refs:
+            loaded = load_descriptions(refs)
+    
+    return [unpack_item(item, descriptions, loaded) for item in items]
+
+
+def parse_fields(value, allowed):
+    """
+    Lista de campos de un parámetro ?fields=a,b,c
+    
+    Args:
+        value: Valor del parámetro (None o vacío = todos los campos)
+        allowed: Campos que se pueden pedir
+    
+    Returns:
+        Lista de campos sin repetidos, o None para todos
+    
+    Raises:
+        ValueError: Con los campos que no están en allowed
+    """
+    if not value:
+        return None
+    
+    fields = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    invalid = [name for name in fields if name not in allowed]
+    if invalid:
+        raise ValueError(', '.join(invalid))
+    return fields or None
+
+
+def projection_attributes(fields):
+    """
+    Atributos físicos a leer para los campos lógicos pedidos
+    
+    Incluye los nombres de los dos esquemas (un item puede estar en v1, v2 o
+    mezclado) y todas las formas de 'description'. DynamoDB ignora los que
+    el item no tiene.
+    """
+    attributes = []
+    for name in fields:
+        if name == 'description':
+            attributes.extend(DESCRIPTION_ATTRIBUTES)
+        else:
+            attributes.append(name)
+            if name in ATTRIBUTE_NAMES:
+                attributes.append(ATTRIBUTE_NAMES[name])
+    return list(dict.fromkeys(attributes))
+
+
+def select_fields(item, fields):
+    """Item lógico con solo los campos pedidos (fields=None: el item entero)"""
+    if not fields or item is None:
+        return item
+    
+    selected = {name: item[name] for name in fields if name in item}
+    if 'descriptionTruncated' in item and 'description' in selected:
+        selected['descriptionTruncated'] = item['descriptionTruncated']
+    return selected
+
@@ -0,0 +1,336 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from decimal import Decimal
+
+from .metrics import log_error
+
+# Cache compartido entre contenedores (y procesos del servidor ASGI) para
+# las lecturas de utils.db_utils: metadata del proyecto, lista de miembros y
+# tareas (por proyecto), y los proyectos del usuario (GET /projects y las
+# estadísticas de /auth/me). Cache-aside: db_utils busca acá antes de ir al
+# repositorio y guarda lo que leyó; las escrituras lo invalidan.
+#
+# SHARED_CACHE elige el cliente:
+#
+#     '' (default)   sin cache, todas las lecturas van al repositorio
+#     redis          servidor Redis (o compatible: ElastiCache, Valkey) en
+#                    SHARED_CACHE_URL; requiere el paquete redis, que no
+#                    está en los requirements.txt (sin él no hay cache)
+#     local          LocalCache, en memoria del proceso; para desarrollo y
+#                    scripts (no se comparte entre contenedores)
+#
+# Solo se usan GET/MGET/SET del protocolo de Redis, así que cualquier cliente
+# con la API de redis-py sirve (fakeredis en pruebas, ver set_shared_cache).
+#
+# Claves versionadas: cada proyecto tiene una generación en
+# {prefijo}:gen:{projectId} y cada entrada guarda la generación con que se
+# leyó. Una escritura reemplaza la generación por una nueva (invalidate_project)
+# y todas las entradas del proyecto dejan de valer a la vez, cualquiera sea la
+# variante (fields, descriptions). Si la invalidación falla, la entrada vieja
+# vive hasta SHARED_CACHE_TTL.
+#
+# Las entradas de un usuario (cached_user) guardan su generación
+# ({prefijo}:gen:user:{userId}, la cambia invalidate_user al crear un
+# proyecto) y la de cada proyecto que incluyen: una escritura en cualquiera
+# de ellos las invalida sin saber qué usuarios lo ven.
+#
+# Las generaciones vencen a los SHARED_CACHE_GEN_TTL (más que los datos):
+# una que vence se reemplaza por otra y sus entradas dejan de valer, como en
+# una invalidación.
+#
+# Un error del cache nunca falla el request: se loguea y se lee del
+# repositorio.
+
+SHARED_CACHE = os.environ.get('SHARED_CACHE', '').lower()
+SHARED_CACHE_URL = os.environ.get('SHARED_CACHE_URL', 'redis://localhost:6379/0')
+SHARED_CACHE_TTL = int(os.environ.get('SHARED_CACHE_TTL', '300'))
+SHARED_CACHE_GEN_TTL = int(os.environ.get('SHARED_CACHE_GEN_TTL', str(12 * SHARED_CACHE_TTL)))
+
+# Valores más grandes que esto no se guardan (listas de tareas enormes)
+SHARED_CACHE_MAX_BYTES = int(os.environ.get('SHARED_CACHE_MAX_BYTES', str(512 * 1024)))
+
+# Cambiar si cambia el formato de lo que se guarda
+CACHE_FORMAT_VERSION = 1
+KEY_PREFIX = f"{os.environ.get('SHARED_CACHE_PREFIX', os.environ.get('TABLE_NAME', 'pm'))}:v{CACHE_FORMAT_VERSION}"
+
+_client = None
+_disabled = False
+_lock = threading.Lock()
+
+# Aciertos y fallos del request en curso (ver reset_stats); los threads de
+# utils.async_db y los sub-requests de un batch corren en una copia del
+# contexto y suman en el mismo contador
+_stats = contextvars.ContextVar('shared_cache_stats', default=None)
+
+
+class LocalCache:
+    """Subconjunto de la API de redis-py en memoria, con TTL"""
+    
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+    
+    def _get(self, key):
+        value, expires = self._data.get(key, (None, None))
+        if expires is not None and expires <= time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return value
+    
+    def get(self, key):
+        with self._lock:
+            return self._get(key)
+    
+    def mget(self, keys, *args):
+        with self._lock:
+            return [self._get(key) for key in ([keys, *args] if isinstance(keys, str) else keys)]
+    
+    def set(self, key, value, ex=None, nx=False):
+        with self._lock:
+            if nx and self._get(key) is not None:
+                return None
+            if isinstance(value, str):
+                value = value.encode('utf-8')
+            self._data[key] = (value, time.monotonic() + ex if ex else None)
+            return True
+    
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+
+class _Stats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+    
+    def add(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def get_shared_cache():
+    """Cliente de SHARED_CACHE, creado en el primer uso (None sin cache)"""
+    global _client, _disabled
+    if _client is None and SHARED_CACHE and not _disabled:
+        with _lock:
+            if _client is None and not _disabled:
+                try:
+                    _client = create_shared_cache(SHARED_CACHE)
+                except Exception as e:
+                    # Sin el paquete redis (u otra configuración rota) se
+                    # sigue sin cache; se registra una vez por contenedor
+                    log_error('shared_cache', e)
+                    _disabled = True
+    return _client
+
+
+def create_shared_cache(kind, url=SHARED_CACHE_URL):
+    """
+    Crear un cliente por nombre
+    
+    Args:
+        kind: 'redis' o 'local'
+        url: URL del servidor para redis (redis://host:puerto/db, rediss:// con TLS)
+    """
+    if kind == 'local':
+        return LocalCache()
+    if kind == 'redis':
+        try:
+            import redis
+        except ImportError:
+            raise ImportError('SHARED_CACHE=redis requiere el paquete redis (pip install redis)')
+        # Timeouts cortos: un cache lento no puede costar más que DynamoDB
+        return redis.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.5)
+    raise ValueError(f"SHARED_CACHE desconocido: {kind}")
+
+
+def set_shared_cache(client):
+    """Reemplazar el cliente en uso (scripts, benchmarks; None deshabilita)"""
+    global _client, _disabled
+    _client = client
+    _disabled = False
+
+
+def reset_stats():
+    """Empezar a contar aciertos y fallos de un request nuevo"""
+    _stats.set(_Stats())
+
+
+def get_stats():
+    """
+    Aciertos, fallos y errores desde el último reset_stats()
+    
+    Returns:
+        dict {'hits', 'misses', 'errors'} o None si no hubo consultas al cache
+    """
+    stats = _stats.get()
+    if stats is None or not (stats.hits or stats.misses or stats.errors):
+        return None
+    return {'hits': stats.hits, 'misses': stats.misses, 'errors': stats.errors}
+
+
+def _count(name):
+    stats = _stats.get()
+    if stats is not None:
+        stats.add(name)
+
+
+def _text(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+def _encode_value(value):
+    # Los Decimals de DynamoDB vuelven como Decimal (no como float)
+    if isinstance(value, Decimal):
+        return {'$d': str(value)}
+    raise TypeError(f"Tipo no soportado en el cache: {type(value).__name__}")
+
+
+def _decode_value(obj):
+    return Decimal(obj['$d']) if len(obj) == 1 and '$d' in obj else obj
+
+
+def _gen_key(scope):
+    return f"{KEY_PREFIX}:gen:{scope}"
+
+
+def _generation(client, scope):
+    """Generación vigente de un proyecto o usuario (se crea si no hay o venció)"""
+    key = _gen_key(scope)
+    client.set(key, uuid.uuid4().hex, ex=SHARED_CACHE_GEN_TTL, nx=True)
+    return _text(client.get(key))
+
+
+def _store(client, key, entry):
+    """Guardar una entrada si no es más grande que SHARED_CACHE_MAX_BYTES"""
+    data = json.dumps(entry, default=_encode_value, separators=(',', ':'))
+    if len(data) <= SHARED_CACHE_MAX_BYTES:
+        client.set(key, data, ex=SHARED_CACHE_TTL)
+
+
+def _invalidate(scope):
+    client = get_shared_cache()
+    if client is None:
+        return
+    
+    try:
+        client.set(_gen_key(scope), uuid.uuid4().hex, ex=SHARED_CACHE_GEN_TTL)
+    except Exception as e:
+        log_error('shared_cache', e)
+        _count('errors')
+
+
+def cached(project_id, name, load):
+    """
+    Leer un valor del proyecto a través del cache
+    
+    Args:
+        project_id: Proyecto al que pertenece (su generación lo invalida)
+        name: Qué se lee, con su variante (p.ej. 'tasks:preview:title,status')
+        load: Función sin argumentos que lee del repositorio
+    
+    Returns:
+        El valor del cache si la entrada es de la generación vigente; si no,
+        el de load(), que queda guardado
+    """
+    client = get_shared_cache()
+    if client is None:
+        return load()
+    
+    key = f"{KEY_PREFIX}:{name}:{project_id}"
+    try:
+        generation, entry = (_text(value) for value in client.mget([_gen_key(project_id), key]))
+        if generation is None:
+            generation = _generation(client, project_id)
+        elif entry is not None:
+            entry = json.loads(entry, object_hook=_decode_value)
+            if entry['g'] == generation:
+                _count('hits')
+                return entry['v']
+    except Exception as e:
+        log_error('shared_cache', e)
+        _count('errors')
+        return load()
+    
+    _count('misses')
+    value = load()
+    
+    # La generación es la leída antes de load(): si una escritura la cambió
+    # mientras tanto, esta entrada ya nace vencida
+    try:
+        _store(client, key, {'g': generation, 'v': value})
+    except Exception as e:
+        log_error('shared_cache', e)
+        _count('errors')
+    return value
+
+
+def cached_user(user_id, name, load, project_ids):
+    """
+    Leer un valor del usuario que depende de varios proyectos
+    
+    Args:
+        user_id: Usuario (invalidate_user lo invalida)
+        name: Qué se lee, con su variante (p.ej. 'projects:full:*')
+        load: Función sin argumentos que lee del repositorio
+        project_ids: Función que da los proyectos de los que depende un
+            valor leído (invalidate_project de cualquiera lo invalida)
+    
+    Returns:
+        El valor del cache si ni el usuario ni sus proyectos cambiaron de
+        generación; si no, el de load(), que queda guardado
+    """
+    client = get_shared_cache()
+    if client is None:
+        return load()
+    
+    scope = f"user:{user_id}"
+    key = f"{KEY_PREFIX}:{name}:{scope}"
+    try:
+        generation, entry = (_text(value) for value in client.mget([_gen_key(scope), key]))
+        if generation is None:
+            generation = _generation(client, scope)
+        elif entry is not None:
+            entry = json.loads(entry, object_hook=_decode_value)
+            projects = entry['p']
+            current = [_text(gen) for gen in client.mget([_gen_key(p) for p in projects])] if projects else []
+            if entry['g'] == generation and current == list(projects.values()):
+                _count('hits')
+                return entry['v']
+    except Exception as e:
+        log_error('shared_cache', e)
+        _count('errors')
+        return load()
+    
+    _count('misses')
+    value = load()
+    
+    # Las generaciones de los proyectos se leen después de load() (antes no
+    # se sabe cuáles son): una escritura en ese intervalo deja la entrada
+    # vieja hasta SHARED_CACHE_TTL, como una invalidación que falla
+    try:
+        projects = list(dict.fromkeys(project_ids(value)))
+        current = [_text(gen) for gen in client.mget([_gen_key(p) for p in projects])] if projects else []
+        generations = {p: g if g is not None else _generation(client, p) for p, g in zip(projects, current)}
+        _store(client, key, {'g': generation, 'p': generations, 'v': value})
+    except Exception as e:
+        log_error('shared_cache', e)
+        _count('errors')
+    return value
+
+
+def invalidate_project(project_id):
+    """Invalidar todo lo cacheado del proyecto (después de escribirlo)"""
+    _invalidate(project_id)
+
+
+def invalidate_user(user_id):
+    """Invalidar lo cacheado del usuario (después de cambiar sus membresías)"""
+    _invalidate(f"user:{user_id}")
@@ -0,0 +1,30 @@
+"""
+Exportar tareas de un proyecto (NDJSON)
+Endpoint: GET /projects/{id}/export?format=ndjson
+Handler: app.lambda_handler
+"""
+
+from utils.entrypoint import run_handler, prewarm
+
+HANDLER = 'handlers.tasks:export_tasks_handler'
+
+prewarm(HANDLER)
+
+
+def lambda_handler(event, context):
+    """
+    Handler principal para Exportar tareas de un proyecto
+    
+    Vía API Gateway la respuesta se materializa hasta
+    BUFFERED_STREAM_MAX_BYTES (límite de payload de Lambda) y más grande es
+    un 413 RESPONSE_TOO_LARGE; para proyectos grandes usar la Function URL
+    con response streaming servida por server.py.
+    
+    Args:
+        event: Evento de API Gateway
+        context: Contexto de Lambda
+    
+    Returns:
+        Response dict con statusCode, headers y body
+    """
+    return run_handler(event, context, HANDLER, 'GET,OPTIONS')
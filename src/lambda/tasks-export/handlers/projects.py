@@ -0,0 +1,214 @@
+import json
+import uuid
+from utils.response import success_response, error_response
+from utils.metrics import log_error
+from utils.auth_utils import require_auth
+from utils.item_codec import DESCRIPTION_MODES, PROJECT_FIELDS, parse_fields, select_fields
+from utils import async_db
+from utils.db_utils import (
+    create_project, get_user_projects,
+    update_project, delete_project, check_user_project_access
+)
+
+# Campos de ?fields= además de los del item del proyecto
+LIST_FIELDS = PROJECT_FIELDS + ('userRole',)
+DETAIL_FIELDS = PROJECT_FIELDS + ('userRole', 'members')
+
+
+@require_auth
+def list_projects(event, context, user):
+    """
+    GET /projects?descriptions=preview&fields=projectId,name,status
+    Listar todos los proyectos del usuario
+    
+    Con descriptions=preview las descripciones largas llegan recortadas
+    (descriptionTruncated: true); la completa está en GET /projects/{id}.
+    Con fields cada proyecto trae solo esos campos (de LIST_FIELDS).
+    """
+    try:
+        params = event.get('queryStringParameters') or {}
+        descriptions = params.get('descriptions', 'full')
+        if descriptions not in DESCRIPTION_MODES:
+            return error_response(400, f'Modo de descripciones no soportado: {descriptions}', 'UNSUPPORTED_DESCRIPTIONS')
+        
+        try:
+            fields = parse_fields(params.get('fields'), LIST_FIELDS)
+        except ValueError as e:
+            return error_response(400, f'Campos no soportados: {e}', 'INVALID_FIELDS')
+        
+        # createdAt se lee siempre para ordenar; userRole sale de la membresía
+        item_fields = fields and [name for name in fields if name in PROJECT_FIELDS] + ['createdAt']
+        projects = get_user_projects(user['userId'], descriptions, item_fields)
+        
+        # Ordenar por fecha de creación (más recientes primero)
+        projects.sort(key=lambda x: x.get('createdAt', ''), reverse=True)
+        projects = [select_fields(project, fields) for project in projects]
+        
+        return success_response(200, {
+            'projects': projects,
+            'count': len(projects)
+        })
+        
+    except Exception as e:
+        log_error('list_projects', e)
+        return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
+
+
+@require_auth
+def create_project_handler(event, context, user):
+    """
+    POST /projects
+    Crear nuevo proyecto
+    """
+    try:
+        body = json.loads(event.get('body', '{}'))
+        
+        # Validar campo requerido
+        if 'name' not in body or not body['name'].strip():
+            return error_response(400, 'El nombre del proyecto es requerido', 'MISSING_NAME')
+        
+        # Validar longitud del nombre
+        if len(body['name'].strip()) < 3:
+            return error_response(400, 'El nombre debe tener al menos 3 caracteres', 'NAME_TOO_SHORT')
+        
+        # Crear proyecto
+        project_id = str(uuid.uuid4())
+        
+        project = create_project(
+            project_id=project_id,
+            name=body['name'].strip(),
+            description=body.get('description', '').strip(),
+            status=body.get('status', 'active'),
+            user_id=user['userId'],
+            user_name=user['name']
+        )
+        
+        return success_response(201, {
+            'project': project
+        }, 'Proyecto creado exitosamente')
+        
+    except Exception as e:
+        log_error('create_project', e)
+        return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
+
+
+@require_auth
+def get_project_details(event, context, user):
+    """
+    GET /projects/{id}?fields=name,status,members
+    Obtener detalles de un proyecto
+    
+    Con fields el proyecto trae solo esos campos (de DETAIL_FIELDS); sin
+    'members' no se leen los miembros.
+    """
+    try:
+        project_id = event['pathParameters']['id']
+        
+        params = event.get('queryStringParameters') or {}
+        try:
+            fields = parse_fields(params.get('fields'), DETAIL_FIELDS)
+        except ValueError as e:
+            return error_response(400, f'Campos no soportados: {e}', 'INVALID_FIELDS')
+        
+        # Con fields se lee al menos projectId, para distinguir un 404
+        item_fields = fields and ([name for name in fields if name in PROJECT_FIELDS] or ['projectId'])
+        reads = [
+            async_db.check_user_project_access(user['userId'], project_id),
+            async_db.get_project(project_id, item_fields)
+        ]
+        if not fields or 'members' in fields:
+            reads.append(async_db.get_project_members(project_id))
+        
+        # Acceso, proyecto y miembros no dependen entre sí: se leen en paralelo
+        access, project, *members = async_db.fetch_all(*reads)
+        
+        if not access:
+            return error_response(403, 'No tienes acceso a este proyecto', 'FORBIDDEN')
+        
+        if not project:
+            return error_response(404, 'Proyecto no encontrado', 'NOT_FOUND')
+        
+        # Agregar información adicional
+        if members:
+            project['members'] = members[0]
+        project['userRole'] = access.get('role', 'member')
+        
+        return success_response(200, {
+            'project': select_fields(project, fields)
+        })
+        
+    except KeyError:
+        return error_response(400, 'ID de proyecto requerido', 'MISSING_ID')
+    except Exception as e:
+        log_error('get_project_details', e)
+        return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
+
+
+@require_auth
+def update_project_handler(event, context, user):
+    """
+    PUT /projects/{id}
+    Actualizar proyecto (solo owner)
+    """
+    try:
+        project_id = event['pathParameters']['id']
+        body = json.loads(event.get('body', '{}'))
+        
+        # Verificar acceso y rol
+        access = check_user_project_access(user['userId'], project_id)
+        if not access or access.get('role') != 'owner':
+            return error_response(403, 'Solo el owner puede actualizar el proyecto', 'FORBIDDEN')
+        
+        # Validar que hay campos para actualizar
+        allowed_fields = ['name', 'description', 'status']
+        updates = {k: v for k, v in body.items() if k in allowed_fields}
+        
+        if not updates:
+            return error_response(400, 'No hay campos para actualizar', 'NO_UPDATES')
+        
+        # Validar nombre si se está actualizando
+        if 'name' in updates and len(updates['name'].strip()) < 3:
+            return error_response(400, 'El nombre debe tener al menos 3 caracteres', 'NAME_TOO_SHORT')
+        
+        # Actualizar proyecto
+        updated_project = update_project(project_id, updates)
+        if updated_project is None:
+            return error_response(404, 'Proyecto no encontrado', 'NOT_FOUND')
+        
+        return success_response(200, {
+            'project': updated_project
+        }, 'Proyecto actualizado exitosamente')
+        
+    except KeyError:
+        return error_response(400, 'ID de proyecto requerido', 'MISSING_ID')
+    except Exception as e:
+        log_error('update_project', e)
+        return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
+
+
+@require_auth
+def delete_project_handler(event, context, user):
+    """
+    DELETE /projects/{id}
+    Eliminar proyecto (solo owner)
+    """
+    try:
+        project_id = event['pathParameters']['id']
+        
+        # Verificar acceso y rol
+        access = check_user_project_access(user['userId'], project_id)
+        if not access or access.get('role') != 'owner':
+            return error_response(403, 'Solo el owner puede eliminar el proyecto', 'FORBIDDEN')
+        
+        # Eliminar proyecto
+        delete_project(project_id)
+        
+        return success_response(200, {
+            'projectId': project_id
+        }, 'Proyecto eliminado exitosamente')
+        
+    except KeyError:
+        return error_response(400, 'ID de proyecto requerido', 'MISSING_ID')
+    except Exception as e:
+        log_error('delete_project', e)
+        return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
\ No newline at end of file
@@ -0,0 +1,225 @@
+import json
+import os
+import uuid
+from utils.response import success_response, error_response, stream_response, dumps
+from utils.metrics import log_error
+from utils.auth_utils import require_auth
+from utils.item_codec import DESCRIPTION_MODES, TASK_FIELDS, parse_fields, select_fields
+from utils.db_utils import (
+    check_user_project_access, get_project_tasks,
+    create_task, update_task, delete_task, iter_project_task_pages
+)
+
+EXPORT_PAGE_SIZE = int(os.environ.get('EXPORT_PAGE_SIZE', '1000'))
+EXPORT_FIRST_PAGE_SIZE = int(os.environ.get('EXPORT_FIRST_PAGE_SIZE', '100'))
+EXPORT_FORMATS = ['ndjson']
+
+
+@require_auth
+def list_tasks(event, context, user):
+    """
+    GET /projects/{id}/tasks?descriptions=preview&fields=taskId,title,status
+    Listar todas las tareas de un proyecto
+    
+    Con descriptions=preview las descripciones largas llegan recortadas
+    (descriptionTruncated: true); sin el parámetro llegan completas. Con
+    fields cada tarea trae solo esos campos (de TASK_FIELDS).
+    """
+    try:
+        project_id = event['pathParameters']['id']
+        
+        params = event.get('queryStringParameters') or {}
+        descriptions = params.get('descriptions', 'full')
+        if descriptions not in DESCRIPTION_MODES:
+            return error_response(400, f'Modo de descripciones no soportado: {descriptions}', 'UNSUPPORTED_DESCRIPTIONS')
+        
+        try:
+            fields = parse_fields(params.get('fields'), TASK_FIELDS)
+        except ValueError as e:
+            return error_response(400, f'Campos no soportados: {e}', 'INVALID_FIELDS')
+        
+        # Verificar acceso al proyecto
+        access = check_user_project_access(user['userId'], project_id)
+        if not access:
+            return error_response(403, 'No tienes acceso a este proyecto', 'FORBIDDEN')
+        
+        # Obtener tareas (createdAt se lee siempre para ordenar)
+        tasks = get_project_tasks(project_id, descriptions, fields and fields + ['createdAt'])
+        
+        # Ordenar por fecha de creación
+        tasks.sort(key=lambda x: x.get('createdAt', ''), reverse=True)
+        tasks = [select_fields(task, fields) for task in tasks]
+        
+        return success_response(200, {
+            'tasks': tasks,
+            'count': len(tasks)
+        })
+        
+    except KeyError:
+        return error_response(400, 'ID de proyecto requerido', 'MISSING_ID')
+    except Exception as e:
+        log_error('list_tasks', e)
+        return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
+
+
+@require_auth
+def create_task_handler(event, context, user):
+    """
+    POST /projects/{id}/tasks
+    Crear nueva tarea
+    """
+    try:
+        project_id = event['pathParameters']['id']
+        body = json.loads(event.get('body', '{}'))
+        
+        # Verificar acceso al proyecto
+        access = check_user_project_access(user['userId'], project_id)
+        if not access:
+            return error_response(403, 'No tienes acceso a este proyecto', 'FORBIDDEN')
+        
+        # Validar campo requerido
+        if 'title' not in body or not body['title'].strip():
+            return error_response(400, 'El título de la tarea es requerido', 'MISSING_TITLE')
+        
+        # Validar longitud del título
+        if len(body['title'].strip()) < 3:
+            return error_response(400, 'El título debe tener al menos 3 caracteres', 'TITLE_TOO_SHORT')
+        
+        # Crear tarea
+        task_id = str(uuid.uuid4())
+        
+        task = create_task(
+            task_id=task_id,
+            project_id=project_id,
+            title=body['title'].strip(),
+            description=body.get('description', '').strip(),
+            status=body.get('status', 'pending'),
+            assigned_to=body.get('assignedTo', user['userId']),
+            created_by=user['userId']
+        )
+        
+        return success_response(201, {
+            'task': task
+        }, 'Tarea creada exitosamente')
+        
+    except KeyError:
+        return error_response(400, 'ID de proyecto requerido', 'MISSING_ID')
+    except Exception as e:
+        log_error('create_task', e)
+        return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
+
+
+@require_auth
+def update_task_handler(event, context, user):
+    """
+    PUT /projects/{projectId}/tasks/{taskId}
+    Actualizar tarea
+    """
+    try:
+        project_id = event['pathParameters']['projectId']
+        task_id = event['pathParameters']['taskId']
+        body = json.loads(event.get('body', '{}'))
+        
+        # Verificar acceso al proyecto
+        access = check_user_project_access(user['userId'], project_id)
+        if not access:
+            return error_response(403, 'No tienes acceso a este proyecto', 'FORBIDDEN')
+        
+        # Validar que hay campos para actualizar
+        allowed_fields = ['title', 'description', 'status', 'assignedTo']
+        updates = {k: v for k, v in body.items() if k in allowed_fields}
+        
+        if not updates:
+            return error_response(400, 'No hay campos para actualizar', 'NO_UPDATES')
+        
+        # Validar título si se está actualizando
+        if 'title' in updates and len(updates['title'].strip()) < 3:
+            return error_response(400, 'El título debe tener al menos 3 caracteres', 'TITLE_TOO_SHORT')
+        
+        # Actualizar tarea
+        updated_task = update_task(project_id, task_id, updates)
+        if updated_task is None:
+            return error_response(404, 'Tarea no encontrada', 'NOT_FOUND')
+        
+        return success_response(200, {
+            'task': updated_task
+        }, 'Tarea actualizada exitosamente')
+        
+    except KeyError as e:
+        return error_response(400, f'Parámetro requerido faltante: {str(e)}', 'MISSING_PARAMETER')
+    except Exception as e:
+        log_error('update_task', e)
+        return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
+
+
+@require_auth
+def delete_task_handler(event, context, user):
+    """
+    DELETE /projects/{projectId}/tasks/{taskId}
+    Eliminar tarea
+    """
+    try:
+        project_id = event['pathParameters']['projectId']
+        task_id = event['pathParameters']['taskId']
+        
+        # Verificar acceso al proyecto
+        access = check_user_project_access(user['userId'], project_id)
+        if not access:
+            return error_response(403, 'No tienes acceso a este proyecto', 'FORBIDDEN')
+        
+        # Eliminar tarea
+        delete_task(project_id, task_id)
+        
+        return success_response(200, {
+            'taskId': task_id
+        }, 'Tarea eliminada exitosamente')
+        
+    except KeyError as e:
+        return error_response(400, f'Parámetro requerido faltante: {str(e)}', 'MISSING_PARAMETER')
+    except Exception as e:
+        log_error('delete_task', e)
+        return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
+
+
+def _ndjson_chunks(project_id):
+    """Generar un chunk NDJSON (una tarea por línea) por cada página de DynamoDB"""
+    pages = iter_project_task_pages(
+        project_id,
+        page_size=EXPORT_PAGE_SIZE,
+        first_page_size=EXPORT_FIRST_PAGE_SIZE
+    )
+    for page in pages:
+        yield ''.join(dumps(task) + '\n' for task in page).encode('utf-8')
+
+
+@require_auth
+def export_tasks_handler(event, context, user):
+    """
+    GET /projects/{id}/export?format=ndjson
+    Exportar todas las tareas de un proyecto como NDJSON
+    
+    El body es un iterador: con response streaming (server.py) la memoria
+    usada se limita a una página de DynamoDB sin importar el tamaño del
+    proyecto. Por API Gateway y api-router la respuesta se materializa hasta
+    BUFFERED_STREAM_MAX_BYTES (utils.response); más grande es un 413.
+    """
+    try:
+        project_id = event['pathParameters']['id']
+        
+        params = event.get('queryStringParameters') or {}
+        export_format = params.get('format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return error_response(400, f'Formato no soportado: {export_format}', 'UNSUPPORTED_FORMAT')
+        
+        # Verificar acceso al proyecto
+        access = check_user_project_access(user['userId'], project_id)
+        if not access:
+            return error_response(403, 'No tienes acceso a este proyecto', 'FORBIDDEN')
+        
+        return stream_response(200, _ndjson_chunks(project_id))
+        
+    except KeyError:
+        return error_response(400, 'ID de proyecto requerido', 'MISSING_ID')
+    except Exception as e:
+        log_error('export_tasks', e)
+        return error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
\ No newline at end of file
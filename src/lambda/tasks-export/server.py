@@ -0,0 +1,108 @@
+"""
+Servidor HTTP con response streaming para la exportación NDJSON
+Endpoint: GET /projects/{id}/export?format=ndjson
+Entry point: run.sh (Lambda Web Adapter, Function URL en modo RESPONSE_STREAM)
+
+El runtime administrado de Python no soporta response streaming; Lambda Web
+Adapter traduce la invocación a un request HTTP contra este servidor y
+reenvía al cliente cada chunk a medida que se escribe.
+"""
+
+import os
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from handlers.tasks import export_tasks_handler
+from utils.entrypoint import prewarm, begin_invocation, record_invocation
+from utils.metrics import log_error, put_metric
+from utils.response import error_response, is_stream_response
+
+EXPORT_PATH = re.compile(r'^/projects/(?P<id>[^/]+)/export/?$')
+
+
+class ExportRequestHandler(BaseHTTPRequestHandler):
+    """Traduce el request HTTP al evento que esperan los handlers"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type,Authorization')
+        self.send_header('Access-Control-Allow-Methods', 'GET,OPTIONS')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def do_GET(self):
+        url = urlsplit(self.path)
+        match = EXPORT_PATH.match(url.path)
+        if not match:
+            self._send_response(error_response(404, 'Ruta no encontrada', 'NOT_FOUND'))
+            return
+        
+        event = {
+            'httpMethod': 'GET',
+            'path': url.path,
+            'headers': dict(self.headers.items()),
+            'pathParameters': {'id': match.group('id')},
+            'queryStringParameters': dict(parse_qsl(url.query)) or None
+        }
+        
+        # Lambda Web Adapter entrega un request a la vez por entorno, así que
+        # los acumuladores de métricas corresponden a esta exportación
+        start = begin_invocation('handlers.tasks:export_tasks_handler')
+        
+        try:
+            response = export_tasks_handler(event, None)
+        except Exception as e:
+            log_error('do_GET', e)
+            response = error_response(500, 'Error interno del servidor', 'INTERNAL_ERROR')
+        
+        # Las métricas se emiten al terminar de enviar: las páginas se leen
+        # mientras se escribe el stream
+        sent = self._send_response(response)
+        if is_stream_response(response):
+            put_metric('ResponseSize', sent, 'Bytes')
+        record_invocation(response, start)
+    
+    def _send_response(self, response):
+        """Enviar la respuesta; retorna los bytes de body escritos"""
+        self.send_response(response['statusCode'])
+        for key, value in response['headers'].items():
+            self.send_header(key, value)
+        
+        if not is_stream_response(response):
+            body = response['body'].encode('utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return len(body)
+        
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        sent = 0
+        try:
+            for chunk in response['body']:
+                if chunk:
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                    self.wfile.flush()
+                    sent += len(chunk)
+            self.wfile.write(b'0\r\n\r\n')
+        except Exception as e:
+            # Los headers ya se enviaron: cortar la conexión para que el
+            # cliente no tome la exportación parcial como completa
+            log_error('streaming', e)
+            self.close_connection = True
+        return sent
+
+
+def main():
+    prewarm('handlers.tasks:export_tasks_handler')
+    port = int(os.environ.get('PORT', '8080'))
+    server = ThreadingHTTPServer(('0.0.0.0', port), ExportRequestHandler)
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
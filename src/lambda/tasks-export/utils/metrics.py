@@ -0,0 +1,177 @@
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+
+# Métricas en CloudWatch Embedded Metric Format (EMF)
+#
+# Durante la invocación las métricas, propiedades y errores se acumulan en
+# memoria; entrypoint.dispatch llama a flush() una vez al final y se escribe
+# todo en un solo print. CloudWatch extrae las métricas de esas líneas JSON
+# sin llamadas a la API; tools/emf_report.py las resume en local.
+#
+# Dimensiones:
+#     [Route]              Duration, ColdStart, ResponseSize, DynamoDB*
+#     [Route, ErrorCode]   Errors (una línea por código)
+#
+# El acumulador vive en una ContextVar: cada thread del servidor ASGI tiene
+# el suyo, y los threads de utils.async_db, que corren en una copia del
+# contexto del request, escriben en el del request que los lanzó.
+
+NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'ProjectManagement')
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+
+_lock = threading.Lock()
+_buffer = contextvars.ContextVar('metrics_buffer', default=None)
+_cold_start = True
+
+
+def start_invocation(route):
+    """
+    Empezar a acumular las métricas de una invocación
+    
+    Args:
+        route: 'módulo:función' del handler (dimensión Route)
+    """
+    _buffer.set({'route': route, 'metrics': {}, 'properties': {}, 'errors': {}, 'exceptions': []})
+
+
+def get_buffer():
+    """Acumulador del contexto actual (None fuera de una invocación)"""
+    return _buffer.get()
+
+
+def merge_buffer(buffer):
+    """
+    Sumar al acumulador actual el de otro contexto
+    
+    Para los sub-requests de POST /batch: cada uno acumula en el suyo
+    (start_invocation en su copia del contexto) y el handler los suma en el
+    orden del pedido. Las propiedades del actual no se pisan.
+    """
+    current = _buffer.get()
+    if current is None or buffer is None:
+        return
+    
+    with _lock:
+        for name, (unit, values) in buffer['metrics'].items():
+            current['metrics'].setdefault(name, (unit, []))[1].extend(values)
+        for name, value in buffer['properties'].items():
+            current['properties'].setdefault(name, value)
+        for error_code, count in buffer['errors'].items():
+            current['errors'][error_code] = current['errors'].get(error_code, 0) + count
+        current['exceptions'].extend(buffer['exceptions'])
+
+
+def put_metric(name, value, unit='None'):
+    """Agregar un valor a una métrica (varios valores forman una distribución)"""
+    buffer = _buffer.get()
+    if buffer is not None:
+        buffer['metrics'].setdefault(name, (unit, []))[1].append(value)
+
+
+def set_property(name, value):
+    """Agregar un campo al log que no es métrica (consultable en Logs Insights)"""
+    buffer = _buffer.get()
+    if buffer is not None:
+        buffer['properties'][name] = value
+
+
+def record_error(error_code):
+    """Contar una respuesta de error por su código (UNAUTHORIZED, FORBIDDEN, ...)"""
+    buffer = _buffer.get()
+    if buffer is not None:
+        with _lock:
+            buffer['errors'][error_code] = buffer['errors'].get(error_code, 0) + 1
+
+
+def log_error(where, exc):
+    """
+    Registrar una excepción atrapada por un handler
+    
+    Se emite con el resto de la invocación en flush(); fuera de una
+    invocación (scripts, tests) se imprime en el momento.
+    
+    Args:
+        where: Nombre de la operación (p.ej. 'create_task')
+        exc: Excepción atrapada
+    """
+    import traceback
+    
+    entry = {
+        'where': where,
+        'type': type(exc).__name__,
+        'message': str(exc),
+        'traceback': traceback.format_exc(),
+    }
+    
+    buffer = _buffer.get()
+    if buffer is not None:
+        buffer['exceptions'].append(entry)
+        return
+    print(f"Error en {where}: {str(exc)}")
+
+
+def flush(context=None):
+    """
+    Escribir las métricas acumuladas y cerrar la invocación
+    
+    Args:
+        context: Contexto de Lambda (requestId como propiedad)
+    """
+    global _cold_start
+    buffer = _buffer.get()
+    _buffer.set(None)
+    with _lock:
+        cold_start, _cold_start = _cold_start, False
+    
+    if buffer is None or not METRICS_ENABLED:
+        return
+    
+    timestamp = int(time.time() * 1000)
+    route = buffer['route']
+    metrics = dict(buffer['metrics'])
+    metrics['ColdStart'] = ('Count', [1 if cold_start else 0])
+    
+    record = {
+        '_aws': {
+            'Timestamp': timestamp,
+            'CloudWatchMetrics': [{
+                'Namespace': NAMESPACE,
+                'Dimensions': [['Route']],
+                'Metrics': [{'Name': name, 'Unit': unit} for name, (unit, _) in metrics.items()],
+            }],
+        },
+        'Route': route,
+        'requestId': getattr(context, 'aws_request_id', None),
+        'traceId': os.environ.get('_X_AMZN_TRACE_ID'),
+    }
+    record.update(buffer['properties'])
+    for name, (_, values) in metrics.items():
+        record[name] = values[0] if len(values) == 1 else values
+    if buffer['exceptions']:
+        record['exceptions'] = buffer['exceptions']
+    
+    lines = [json.dumps(record, default=str)]
+    for error_code, count in buffer['errors'].items():
+        lines.append(json.dumps({
+            '_aws': {
+                'Timestamp': timestamp,
+                'CloudWatchMetrics': [{
+                    'Namespace': NAMESPACE,
+                    'Dimensions': [['Route', 'ErrorCode']],
+                    'Metrics': [{'Name': 'Errors', 'Unit': 'Count'}],
+                }],
+            },
+            'Route': route,
+            'ErrorCode': error_code,
+            'Errors': count,
+            'requestId': record['requestId'],
+        }))
+    
+    # Un solo write: con varios threads (servidor ASGI) print() puede
+    # intercalar el texto de un registro con el salto de línea de otro
+    sys.stdout.write('\n'.join(lines) + '\n')
@@ -0,0 +1,158 @@
+"""
+Fixtures compartidos de los tests unitarios
+
+Los tests importan los módulos de src/lambda/api-router (todas las funciones
+comparten los mismos utils/ y handlers/) y corren contra DynamoDB en moto.
+El entorno se fija antes del primer import: los módulos leen su
+configuración de os.environ al cargarse.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+os.environ.update({
+    'TABLE_NAME': 'ProjectManagement-test',
+    'JWT_SECRET': 'test-secret',
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'STORAGE_BACKEND': 'dynamodb',
+    'BLOB_STORE': 'local',
+    'METRICS_ENABLED': 'false',
+    'PREWARM': 'false',
+    'CAPTURE': 'false',
+})
+os.environ.pop('SHARED_CACHE', None)
+os.environ.pop('AWS_ENDPOINT_URL_DYNAMODB', None)
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+sys.path.insert(0, os.path.join(ROOT, 'src', 'lambda', 'api-router'))
+
+from moto import mock_aws  # noqa: E402
+
+TABLE_NAME = os.environ['TABLE_NAME']
+
+_mock = mock_aws()
+_mock.start()
+
+import app  # noqa: E402
+from utils import auth_utils, blob_store, db_utils, repository, shared_cache  # noqa: E402
+
+
+def pytest_unconfigure(config):
+    _mock.stop()
+
+
+def create_table(table_name=TABLE_NAME):
+    """Tabla vacía con el esquema de infrastructure/template.yaml"""
+    import boto3
+    
+    dynamodb = boto3.resource('dynamodb')
+    if table_name in dynamodb.meta.client.list_tables()['TableNames']:
+        dynamodb.Table(table_name).delete()
+    return dynamodb.create_table(
+        TableName=table_name,
+        BillingMode='PAY_PER_REQUEST',
+        AttributeDefinitions=[
+            {'AttributeName': 'PK', 'AttributeType': 'S'},
+            {'AttributeName': 'SK', 'AttributeType': 'S'},
+            {'AttributeName': 'email', 'AttributeType': 'S'},
+        ],
+        KeySchema=[
+            {'AttributeName': 'PK', 'KeyType': 'HASH'},
+            {'AttributeName': 'SK', 'KeyType': 'RANGE'},
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': 'EmailIndex',
+            'KeySchema': [{'AttributeName': 'email', 'KeyType': 'HASH'}],
+            'Projection': {'ProjectionType': 'ALL'},
+        }],
+    )
+
+
+@pytest.fixture(autouse=True)
+def clean_state(tmp_path):
+    """
+    Cada test arranca con la tabla vacía, blobs en un directorio propio y sin
+    repositorio, cache compartido ni tokens cacheados de tests anteriores
+    """
+    create_table()
+    blob_store.set_blob_store(blob_store.LocalBlobStore(str(tmp_path / 'blobs')))
+    repository.set_repository(None)
+    shared_cache.set_shared_cache(None)
+    auth_utils.clear_token_cache()
+    db_utils.reset_access_checks()
+    yield
+    repository.set_repository(None)
+    shared_cache.set_shared_cache(None)
+
+
+@pytest.fixture
+def table():
+    return db_utils.get_table()
+
+
+@pytest.fixture
+def sqlite_repository():
+    """Repositorio SQLite en memoria en uso durante el test"""
+    repo = repository.create_repository('sqlite', path=':memory:')
+    repository.set_repository(repo)
+    return repo
+
+
+def make_event(method, path, body=None, token=None, headers=None, raw_body=None, query=None):
+    """Evento de API Gateway (REST, proxy) para api-router"""
+    event_headers = {'Content-Type': 'application/json'}
+    if token:
+        event_headers['Authorization'] = f"Bearer {token}"
+    event_headers.update(headers or {})
+    
+    return {
+        'resource': '/{proxy+}',
+        'path': path,
+        'httpMethod': method,
+        'headers': event_headers,
+        'queryStringParameters': query,
+        'pathParameters': {'proxy': path.lstrip('/')},
+        'body': raw_body if raw_body is not None else (json.dumps(body) if body is not None else None),
+        'isBase64Encoded': False,
+    }
+
+
+class Api:
+    """Cliente de api-router: invoca app.lambda_handler y decodifica el body"""
+    
+    def __init__(self):
+        self.token = None
+    
+    def call(self, method, path, body=None, token=None, **kwargs):
+        response = app.lambda_handler(make_event(method, path, body, token or self.token, **kwargs), None)
+        try:
+            return response['statusCode'], json.loads(response['body'])
+        except (TypeError, ValueError):
+            return response['statusCode'], response['body']
+    
+    def register(self, email='ana@example.com', password='secret123', name='Ana'):
+        """Registrar un usuario y dejar su token como el de los próximos requests"""
+        status, body = self.call('POST', '/auth/register', {'email': email, 'password': password, 'name': name})
+        assert status == 201, body
+        self.token = body['data']['token']
+        return body['data']
+    
+    def create_project(self, name='Proyecto', **fields):
+        status, body = self.call('POST', '/projects', {'name': name, **fields})
+        assert status == 201, body
+        return body['data']['project']
+    
+    def create_task(self, project_id, title='Tarea', **fields):
+        status, body = self.call('POST', f"/projects/{project_id}/tasks", {'title': title, **fields})
+        assert status == 201, body
+        return body['data']['task']
+
+
+@pytest.fixture
+def api():
+    return Api()
@@ -0,0 +1,183 @@
+"""Servidor ASGI de api-router: traducción a eventos, pool acotado y límites"""
+
+import asyncio
+import base64
+import gzip
+import json
+import threading
+
+import pytest
+
+import app
+import asgi
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def _request(server, method, path, body=b'', headers=(), query=b'', chunks=None):
+    """Enviar un request HTTP a la app ASGI y juntar la respuesta"""
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': i < len(chunks) - 1}
+                for i, chunk in enumerate(chunks)] if chunks else [{'type': 'http.request', 'body': body}]
+    sent = []
+    
+    async def receive():
+        return messages.pop(0)
+    
+    async def send(message):
+        sent.append(message)
+    
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': query,
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+        'client': ('10.0.0.1', 5000),
+    }
+    await server(scope, receive, send)
+    if not sent:
+        return None
+    start, body_message = sent
+    response_headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in start['headers']}
+    return start['status'], response_headers, body_message['body']
+
+
+@pytest.fixture
+def server():
+    server = asgi.LambdaASGIApp(app.lambda_handler, threads=2, max_pending=2)
+    yield server
+    if server._executor is not None:
+        server._executor.shutdown(wait=True)
+
+
+def test_requests_run_the_router(server, api):
+    api.register()
+    body = json.dumps({'name': 'Desde ASGI'}).encode('utf-8')
+    
+    status, headers, data = _run(_request(server, 'POST', '/projects', chunks=[body[:5], body[5:]],
+                                          headers=[('Authorization', f"Bearer {api.token}"),
+                                                   ('Content-Type', 'application/json')]))
+    
+    assert status == 201
+    assert headers['content-length'] == str(len(data))
+    assert json.loads(data)['data']['project']['name'] == 'Desde ASGI'
+
+
+def test_compressed_responses_pass_through(server, api):
+    api.register()
+    for i in range(20):
+        api.create_project(name=f"Proyecto con un nombre largo para comprimir {i}")
+    
+    status, headers, data = _run(_request(server, 'GET', '/projects', headers=[
+        ('Authorization', f"Bearer {api.token}"), ('Accept-Encoding', 'gzip')]))
+    
+    assert status == 200
+    assert headers['content-encoding'] == 'gzip'
+    assert len(json.loads(gzip.decompress(data))['data']['projects']) == 20
+
+
+def test_build_event():
+    scope = {
+        'method': 'GET', 'path': '/projects/p1/tasks', 'query_string': b'fields=title&fields=status&limit=5',
+        'headers': [(b'x-tag', b'a'), (b'x-tag', b'b'), (b'authorization', b'Bearer t')],
+        'client': ('10.0.0.1', 5000),
+    }
+    
+    event = asgi.build_event(scope, b'', 'req-1')
+    
+    assert event['headers'] == {'x-tag': 'a,b', 'authorization': 'Bearer t'}
+    assert event['multiValueHeaders']['x-tag'] == ['a', 'b']
+    assert event['queryStringParameters'] == {'fields': 'status', 'limit': '5'}
+    assert event['multiValueQueryStringParameters']['fields'] == ['title', 'status']
+    assert event['pathParameters'] == {'proxy': 'projects/p1/tasks'}
+    assert event['requestContext']['requestId'] == 'req-1'
+    assert event['requestContext']['identity']['sourceIp'] == '10.0.0.1'
+    assert event['body'] is None and event['isBase64Encoded'] is False
+
+
+def test_binary_body_is_base64():
+    scope = {'method': 'POST', 'path': '/batch', 'headers': []}
+    
+    event = asgi.build_event(scope, b'\xff\xfe', 'req-1')
+    
+    assert event['isBase64Encoded'] is True
+    assert base64.b64decode(event['body']) == b'\xff\xfe'
+
+
+def test_oversized_body_is_rejected(server, monkeypatch):
+    monkeypatch.setattr(asgi, 'MAX_BODY_BYTES', 10)
+    
+    status, _, data = _run(_request(server, 'POST', '/projects', chunks=[b'x' * 8, b'x' * 8]))
+    
+    assert status == 413
+    assert json.loads(data)['errorCode'] == 'PAYLOAD_TOO_LARGE'
+
+
+def test_saturated_pool_answers_503():
+    release = threading.Event()
+    
+    def slow_handler(event, context):
+        release.wait(5)
+        return {'statusCode': 200, 'headers': {}, 'body': 'ok'}
+    
+    server = asgi.LambdaASGIApp(slow_handler, threads=1, max_pending=1)
+    
+    async def run():
+        first = [asyncio.create_task(_request(server, 'GET', '/auth/me')) for _ in range(2)]
+        while server._in_flight < 2:
+            await asyncio.sleep(0.01)
+        rejected = await _request(server, 'GET', '/auth/me')
+        release.set()
+        return rejected, await asyncio.gather(*first)
+    
+    rejected, accepted = _run(run())
+    server._executor.shutdown(wait=True)
+    
+    assert rejected[0] == 503
+    assert json.loads(rejected[2])['errorCode'] == 'SERVICE_UNAVAILABLE'
+    assert [response[0] for response in accepted] == [200, 200]
+    assert server._in_flight == 0
+
+
+def test_disconnect_before_body_sends_nothing(server):
+    sent = []
+    
+    async def receive():
+        return {'type': 'http.disconnect'}
+    
+    async def send(message):
+        sent.append(message)
+    
+    _run(server({'type': 'http', 'method': 'POST', 'path': '/projects', 'headers': []}, receive, send))
+    
+    assert sent == []
+
+
+def test_lifespan_starts_and_stops_the_pool():
+    server = asgi.LambdaASGIApp(app.lambda_handler, threads=1)
+    messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+    sent = []
+    
+    async def receive():
+        return messages.pop(0)
+    
+    async def send(message):
+        sent.append(message['type'])
+    
+    _run(server({'type': 'lifespan'}, receive, send))
+    
+    assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+    assert server._executor is not None and server._executor._shutdown
+
+
+def test_response_parts_decode_base64_and_multi_value_headers():
+    status, headers, body = asgi._response_parts({
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Content-Length': '999'},
+        'multiValueHeaders': {'Set-Cookie': ['a=1', 'b=2']},
+        'body': base64.b64encode(b'{}').decode('ascii'),
+        'isBase64Encoded': True,
+    })
+    
+    assert (status, body) == (200, b'{}')
+    assert headers == [(b'content-type', b'application/json'), (b'set-cookie', b'a=1'),
+                       (b'set-cookie', b'b=2'), (b'content-length', b'2')]
@@ -0,0 +1,123 @@
+"""Fan-out de lecturas con utils.async_db"""
+
+import threading
+import time
+
+import pytest
+
+from utils import async_db, ddb_usage
+from utils.async_db import call, fetch_all
+
+
+def _slow(value, delay=0.05):
+    time.sleep(delay)
+    return value, threading.current_thread().name
+
+
+def _fail(message):
+    raise LookupError(message)
+
+
+def test_results_in_argument_order():
+    # La primera termina última: el orden es el de los argumentos
+    results = fetch_all(call(_slow, 'a', 0.1), call(_slow, 'b', 0.0), call(_slow, 'c', 0.05))
+    
+    assert [value for value, _ in results] == ['a', 'b', 'c']
+    assert all(name.startswith('db-fanout') for _, name in results)
+
+
+def test_calls_overlap():
+    start = time.perf_counter()
+    fetch_all(*(call(_slow, i, 0.1) for i in range(async_db.DB_FANOUT_THREADS)))
+    
+    assert time.perf_counter() - start < 0.1 * async_db.DB_FANOUT_THREADS * 0.75
+
+
+def test_exception_propagates_after_all_finish():
+    finished = []
+    
+    def record(value):
+        time.sleep(0.05)
+        finished.append(value)
+        return value
+    
+    with pytest.raises(LookupError, match='no está'):
+        fetch_all(call(record, 1), call(_fail, 'no está'), call(record, 2))
+    
+    assert sorted(finished) == [1, 2]
+    # El loop queda limpio para la invocación siguiente
+    assert fetch_all(call(_slow, 'ok', 0))[0][0] == 'ok'
+
+
+def test_event_loop_reused_per_thread():
+    fetch_all(call(_slow, 1, 0))
+    loop = async_db._local.loop
+    fetch_all(call(_slow, 2, 0))
+    
+    assert async_db._local.loop is loop
+    
+    loops = []
+    
+    def other_thread():
+        fetch_all(call(_slow, 3, 0))
+        loops.append(async_db._local.loop)
+    
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    thread.join()
+    assert loops[0] is not loop
+    assert not loops[0].is_closed()
+
+
+def test_fanout_disabled_runs_inline(monkeypatch):
+    monkeypatch.setattr(async_db, 'DB_FANOUT_ENABLED', False)
+    
+    results = fetch_all(call(_slow, 'a', 0), call(_slow, 'b', 0))
+    
+    assert [value for value, _ in results] == ['a', 'b']
+    assert {name for _, name in results} == {threading.current_thread().name}
+
+
+def test_nested_fetch_all_in_pool_thread():
+    def nested():
+        return fetch_all(call(_slow, 'x', 0), call(_slow, 'y', 0))
+    
+    [inner] = fetch_all(call(nested))
+    
+    assert [value for value, _ in inner] == ['x', 'y']
+
+
+def test_project_details_fan_out(api, monkeypatch):
+    api.register()
+    project = api.create_project(name='Fan-out')
+    api.create_task(project['projectId'])
+    threads = []
+    
+    for name in ('check_user_project_access', 'get_project', 'get_project_members'):
+        original = getattr(async_db.db_utils, name)
+        
+        def traced(*args, _original=original):
+            threads.append(threading.current_thread().name)
+            return _original(*args)
+        
+        monkeypatch.setattr(async_db.db_utils, name, traced)
+    
+    status, body = api.call('GET', f"/projects/{project['projectId']}")
+    
+    assert status == 200
+    assert body['data']['project']['name'] == 'Fan-out'
+    assert body['data']['project']['taskCount'] == 1
+    assert len(body['data']['project']['members']) == 1
+    assert len(threads) == 3
+    assert all(name.startswith('db-fanout') for name in threads)
+    # El consumo de los threads del pool se suma al del request
+    assert ddb_usage.get_usage()['calls'] == 3
+
+
+def test_project_details_forbidden(api):
+    api.register()
+    project = api.create_project()
+    
+    api.register(email='otro@example.com')
+    status, body = api.call('GET', f"/projects/{project['projectId']}")
+    assert (status, body['errorCode']) == (403, 'FORBIDDEN')
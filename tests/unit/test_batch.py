@@ -0,0 +1,189 @@
+"""POST /batch: límites, autenticación, orden de las escrituras y métricas"""
+
+import contextvars
+import json
+
+import pytest
+
+from conftest import make_event
+from handlers import batch
+from utils import metrics
+
+
+def _batch(api, requests, **kwargs):
+    return api.call('POST', '/batch', {'requests': requests}, **kwargs)
+
+
+def test_requires_token(api):
+    status, body = _batch(api, [{'method': 'GET', 'path': '/projects'}])
+    
+    assert status == 401
+    assert body['errorCode'] == 'UNAUTHORIZED'
+
+
+def test_invalid_token_rejected(api):
+    status, body = _batch(api, [{'method': 'GET', 'path': '/projects'}], token='no-es-un-token')
+    
+    assert status == 401
+
+
+@pytest.mark.parametrize('body', [{}, {'requests': []}, {'requests': 'GET /projects'}, []])
+def test_missing_requests(api, body):
+    api.register()
+    
+    status, result = api.call('POST', '/batch', body)
+    
+    assert status == 400
+    assert result['errorCode'] == 'MISSING_REQUESTS'
+
+
+def test_too_many_requests(api):
+    api.register()
+    
+    status, body = _batch(api, [{'method': 'GET', 'path': '/projects'}] * (batch.BATCH_MAX_REQUESTS + 1))
+    
+    assert status == 400
+    assert body['errorCode'] == 'BATCH_TOO_LARGE'
+
+
+def test_max_requests_accepted(api):
+    api.register()
+    
+    status, body = _batch(api, [{'method': 'GET', 'path': '/auth/me'}] * batch.BATCH_MAX_REQUESTS)
+    
+    assert status == 200
+    assert body['data']['count'] == batch.BATCH_MAX_REQUESTS
+
+
+def test_invalid_json(api):
+    api.register()
+    
+    status, body = api.call('POST', '/batch', raw_body='{no es json')
+    
+    assert status == 400
+    assert body['errorCode'] == 'INVALID_JSON'
+
+
+def test_sub_request_errors(api):
+    api.register()
+    
+    status, body = _batch(api, [
+        {'id': 'nested', 'method': 'POST', 'path': '/batch', 'body': {'requests': []}},
+        {'id': 'missing', 'method': 'GET', 'path': '/nothing-here'},
+        {'id': 'method', 'method': 'PATCH', 'path': '/projects'},
+        {'id': 'invalid', 'method': 'GET'},
+        'GET /projects',
+    ])
+    
+    assert status == 200
+    responses = body['data']['responses']
+    assert [r.get('id') for r in responses] == ['nested', 'missing', 'method', 'invalid', None]
+    assert [r['status'] for r in responses] == [400, 404, 405, 400, 400]
+    assert [r['body']['errorCode'] for r in responses] == [
+        'NESTED_BATCH', 'NOT_FOUND', 'METHOD_NOT_ALLOWED', 'INVALID_REQUEST', 'INVALID_REQUEST'
+    ]
+
+
+@pytest.mark.parametrize('request_', [
+    {'method': 'GET', 'path': '/projects', 'query': 'fields=name'},
+    {'method': 'GET', 'path': '/projects', 'query': ['fields', 'name']},
+    {'method': 'GET', 'path': '/projects', 'query': {'fields': ['name']}},
+    {'method': 'GET', 'path': '/projects', 'id': {'nested': True}},
+    {'method': 7, 'path': '/projects'},
+    {'method': 'GET', 'path': ['/projects']},
+])
+def test_sub_request_types_validated(api, request_):
+    api.register()
+    
+    status, body = _batch(api, [request_, {'method': 'GET', 'path': '/auth/me'}])
+    
+    assert status == 200
+    first, second = body['data']['responses']
+    assert first['status'] == 400
+    assert first['body']['errorCode'] == 'VALIDATION_ERROR'
+    assert second['status'] == 200
+
+
+def test_string_body_passed_through(api):
+    api.register()
+    project = api.create_project()
+    
+    status, body = _batch(api, [
+        {'method': 'POST', 'path': f"/projects/{project['projectId']}/tasks", 'body': json.dumps({'title': 'Desde string'})},
+        {'method': 'POST', 'path': f"/projects/{project['projectId']}/tasks", 'body': {'title': 'Desde objeto'}},
+        {'method': 'GET', 'path': f"/projects/{project['projectId']}/tasks", 'query': {'fields': 'title'}},
+    ])
+    
+    assert status == 200
+    created, _, listed = body['data']['responses']
+    assert created['status'] == 201
+    assert sorted(t['title'] for t in listed['body']['data']['tasks']) == ['Desde objeto', 'Desde string']
+
+
+def test_responses_in_request_order_with_query(api):
+    api.register()
+    projects = [api.create_project(name=f"Proyecto {i}") for i in range(3)]
+    
+    status, body = _batch(api, [
+        {'id': p['projectId'], 'method': 'GET', 'path': f"/projects/{p['projectId']}?fields=name"}
+        for p in projects
+    ])
+    
+    assert status == 200
+    responses = body['data']['responses']
+    assert [r['id'] for r in responses] == [p['projectId'] for p in projects]
+    assert [r['body']['data']['project']['name'] for r in responses] == [p['name'] for p in projects]
+
+
+def test_reads_after_write_see_the_write(api):
+    api.register()
+    project = api.create_project()
+    task = api.create_task(project['projectId'])
+    task_path = f"/projects/{project['projectId']}/tasks/{task['taskId']}"
+    
+    status, body = _batch(api, [
+        {'method': 'GET', 'path': f"/projects/{project['projectId']}/tasks"},
+        {'method': 'DELETE', 'path': task_path},
+        {'method': 'GET', 'path': f"/projects/{project['projectId']}/tasks"},
+        {'method': 'DELETE', 'path': f"/projects/{project['projectId']}"},
+        {'method': 'GET', 'path': f"/projects/{project['projectId']}"},
+    ])
+    
+    assert status == 200
+    responses = body['data']['responses']
+    assert len(responses[0]['body']['data']['tasks']) == 1
+    assert responses[1]['status'] == 200
+    assert responses[2]['body']['data']['tasks'] == []
+    assert responses[3]['status'] == 200
+    assert responses[4]['status'] == 404
+
+
+def test_sub_request_errors_merged_into_metrics(api):
+    api.register()
+    event = make_event('POST', '/batch', {'requests': [
+        {'method': 'GET', 'path': '/nothing-here'},
+        {'method': 'GET', 'path': '/nothing-here'},
+        {'method': 'PATCH', 'path': '/projects'},
+    ]}, token=api.token)
+    
+    def run():
+        metrics.start_invocation(batch.BATCH_REF)
+        response = batch.batch_handler(event, None)
+        return response, metrics.get_buffer()
+    
+    response, buffer = contextvars.copy_context().run(run)
+    
+    assert response['statusCode'] == 200
+    assert buffer['errors'] == {'NOT_FOUND': 2, 'METHOD_NOT_ALLOWED': 1}
+
+
+def test_export_sub_request_is_buffered(api):
+    api.register()
+    project = api.create_project()
+    api.create_task(project['projectId'], title='Exportada')
+    
+    status, body = _batch(api, [{'method': 'GET', 'path': f"/projects/{project['projectId']}/export"}])
+    
+    assert status == 200
+    lines = body['data']['responses'][0]['body'].splitlines()
+    assert any(json.loads(line).get('title') == 'Exportada' for line in lines)
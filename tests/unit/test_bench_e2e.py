@@ -0,0 +1,106 @@
+"""Benchmark end-to-end: dataset sintético, percentiles y comparación con baseline"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import bench_e2e  # noqa: E402
+import dataset  # noqa: E402
+
+SHAPE = ['--users', '3', '--projects-per-user', '1', '--tasks-per-project', '3', '--members-per-project', '1']
+
+
+def _run(tmp_path, *extra):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    return subprocess.run([sys.executable, os.path.join(ROOT, 'benchmarks', 'bench_e2e.py'), *SHAPE,
+                           '--iterations', '3', '--warmup', '0', *extra],
+                          cwd=tmp_path, env=env, capture_output=True, text=True)
+
+
+def test_iter_items_follows_the_shape():
+    data = dataset.Dataset()
+    
+    items = list(dataset.iter_items(data, users=4, projects_per_user=2, tasks_per_project=5, members_per_project=2))
+    
+    assert len(data.users) == 4 and len(data.owned) == 8
+    assert len(data.memberships) == 8 * 3
+    assert all(len(task_ids) == 5 for task_ids in data.tasks.values())
+    tasks = [item for item in items if item['SK'].startswith('TASK#')]
+    assert len(tasks) == 40
+    projects = [item for item in items if item['SK'] == 'METADATA']
+    assert {(project['taskCount'], project['memberCount']) for project in projects} == {(5, 3)}
+
+
+def test_iter_items_is_deterministic_per_seed():
+    def ids(seed):
+        data = dataset.Dataset()
+        list(dataset.iter_items(data, 2, 1, 2, 1, seed=seed))
+        return [user['userId'] for user in data.users], data.tasks
+    
+    assert ids(7) == ids(7)
+    assert ids(7) != ids(8)
+
+
+@pytest.mark.parametrize('size', [2048, 20000])
+def test_long_descriptions_have_the_requested_bytes(size):
+    data = dataset.Dataset()
+    
+    items = list(dataset.iter_items(data, 1, 1, 4, 0, description_bytes=size))
+    
+    descriptions = [item['description'] for item in items if item['SK'].startswith('TASK#')]
+    assert [len(text.encode('utf-8')) for text in descriptions] == [size] * 4
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+    
+    assert bench_e2e.percentile(values, 50) == 50
+    assert bench_e2e.percentile(values, 99) == 99
+    assert bench_e2e.percentile([3.0], 95) == 3.0
+
+
+def test_compare_flags_slower_p95_and_extra_calls():
+    def result(p95, calls):
+        return {'latencyMs': {'p95': p95}, 'ddb': {'callsPerRequest': calls}}
+    
+    baseline = {'endpoints': {'lento': result(10.0, 2), 'llamadas': result(10.0, 2), 'ruido': result(1.0, 2)}}
+    results = {'lento': result(20.0, 2), 'llamadas': result(10.0, 3), 'ruido': result(2.5, 2), 'nuevo': result(99, 9)}
+    
+    assert bench_e2e.compare(results, baseline, 0.2) == [
+        ('lento', 'p95 ms', 10.0, 20.0),
+        ('llamadas', 'llamadas DynamoDB', 2, 3),
+    ]
+
+
+def test_run_saves_every_endpoint(tmp_path):
+    result = _run(tmp_path, '--save', 'e2e.json')
+    
+    assert result.returncode == 0, result.stderr
+    with open(tmp_path / 'e2e.json') as f:
+        saved = json.load(f)
+    assert saved['backend'] == 'moto'
+    assert saved['shape'] == {'users': 3, 'projects_per_user': 1, 'tasks_per_project': 3, 'members_per_project': 1}
+    assert [endpoint.function for endpoint in bench_e2e.ENDPOINTS] == list(saved['endpoints'])
+    for name, endpoint in saved['endpoints'].items():
+        assert all(status.startswith('2') for status in endpoint['status']), (name, endpoint['status'])
+        assert endpoint['ddb']['callsPerRequest'] >= 1
+        assert set(endpoint['latencyMs']) == {'p50', 'p95', 'p99', 'mean', 'max'}
+    assert saved['endpoints']['auth-login']['ddb']['operationsPerRequest'] == {'Query': 1.0}
+
+
+@pytest.mark.parametrize('target', ['functions', 'router'])
+def test_baseline_with_fewer_calls_fails_the_run(tmp_path, target):
+    baseline = {'endpoints': {'auth-login': {'latencyMs': {'p95': 1e6}, 'ddb': {'callsPerRequest': 0}}}}
+    (tmp_path / 'baseline.json').write_text(json.dumps(baseline))
+    
+    result = _run(tmp_path, '--endpoints', 'auth-login', '--target', target, '--baseline', 'baseline.json')
+    
+    assert result.returncode == 1
+    assert 'REGRESIÓN auth-login: llamadas DynamoDB 0.00 -> 1.00' in result.stderr
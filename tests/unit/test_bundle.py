@@ -0,0 +1,88 @@
+"""Bundles mínimos de tools/bundle.py"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+import bundle  # noqa: E402
+
+# Importa cada handler de la tabla de rutas desde el bundle (en otro proceso:
+# los módulos del bundle no se mezclan con los de api-router)
+IMPORT_ROUTES = '''
+import importlib
+from utils.routing import ROUTES
+for _, _, ref in ROUTES:
+    module, function = ref.split(':')
+    getattr(importlib.import_module(module), function)
+'''
+
+
+def _bundle(function, output):
+    args = argparse.Namespace(output=str(output), skip_install=True, sourceless=False, measure=False,
+                              python_version='3.11', repeat=1)
+    return bundle.bundle_function(function, args)
+
+
+@pytest.mark.parametrize('function', ['batch', 'api-router'])
+def test_routed_functions_bundle_every_route_target(function, tmp_path):
+    report = _bundle(function, tmp_path)
+    
+    assert {'handlers/auth.py', 'handlers/projects.py', 'handlers/tasks.py'} <= set(report['localModules'])
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run([sys.executable, '-c', IMPORT_ROUTES], cwd=tmp_path / function, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_single_route_function_bundles_only_its_handler(tmp_path):
+    report = _bundle('tasks-list', tmp_path)
+    
+    handlers = {path for path in report['localModules'] if path.startswith('handlers/')}
+    assert handlers == {'handlers/__init__.py', 'handlers/tasks.py'}
+    assert os.path.exists(tmp_path / 'tasks-list' / 'app.py')
+
+
+def test_handler_refs():
+    batch_refs = bundle.handler_refs(os.path.join(bundle.LAMBDA_DIR, 'batch'))
+    
+    assert {'handlers.batch', 'handlers.auth', 'handlers.projects', 'handlers.tasks'} <= batch_refs
+    assert bundle.handler_refs(os.path.join(bundle.LAMBDA_DIR, 'auth-login')) == {'handlers.auth'}
+
+
+def test_required_distributions_skip_runtime_and_unreached(tmp_path):
+    (tmp_path / 'requirements.txt').write_text('# deps\nPyJWT==2.8.0\nboto3==1.34.21\norjson>=3.9\nrequests==2.31\n')
+    
+    requirements = bundle.required_distributions(str(tmp_path), {'jwt', 'orjson', 'boto3'})
+    
+    assert requirements == ['PyJWT==2.8.0', 'orjson>=3.9']
+
+
+def test_sourceless_bundle_ships_only_bytecode_and_runs(tmp_path):
+    args = argparse.Namespace(output=str(tmp_path), skip_install=True, sourceless=True, measure=True,
+                              python_version='3.11', repeat=1)
+    
+    report = bundle.bundle_function('auth-profile', args)
+    
+    files = [os.path.join(directory, name) for directory, _, names in os.walk(tmp_path / 'auth-profile')
+             for name in names]
+    assert files and not [path for path in files if path.endswith('.py')]
+    assert os.path.exists(tmp_path / 'auth-profile' / 'app.pyc')
+    assert 'PyJWT==2.8.0' in report['vendored'] and not any('boto3' in line for line in report['vendored'])
+    assert 0 < report['bundleZipBytes'] < report['bundleBytes']
+    assert report['bundleInitMs'] > 0 and report['sourceInitMs'] > 0
+
+
+def test_precompile_keeps_sources_by_default(tmp_path):
+    (tmp_path / 'mod.py').write_text('VALUE = 1\n')
+    
+    bundle.precompile(str(tmp_path), sourceless=False)
+    
+    assert (tmp_path / 'mod.py').exists()
+    assert [name for name in os.listdir(tmp_path / '__pycache__') if name.startswith('mod.')]
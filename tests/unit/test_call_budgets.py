@@ -0,0 +1,86 @@
+"""
+Presupuesto de llamadas a DynamoDB por endpoint (benchmarks/call_budgets.json)
+
+Mismo chequeo que benchmarks/check_call_budgets.py: cada función corre con
+su propio app.py contra las formas de dataset del archivo.
+"""
+
+import json
+import os
+import random
+import sys
+
+import pytest
+
+from conftest import ROOT, TABLE_NAME, create_table
+
+BENCHMARKS_DIR = os.path.join(ROOT, 'benchmarks')
+
+with open(os.path.join(BENCHMARKS_DIR, 'call_budgets.json')) as f:
+    BUDGETS = json.load(f)
+
+
+def _is_function_module(name):
+    return name == 'app' or name.split('.')[0] in ('utils', 'handlers')
+
+
+@pytest.fixture(scope='module')
+def bench():
+    """
+    Módulos de benchmarks/ con un CallRecorder instalado
+    
+    function_app reemplaza app/utils/handlers en sys.modules; al terminar se
+    restauran los de api-router que usan los demás tests.
+    """
+    saved_modules = {name: module for name, module in sys.modules.items() if _is_function_module(name)}
+    saved_path = list(sys.path)
+    sys.path.insert(0, BENCHMARKS_DIR)
+    
+    import bench_e2e
+    import check_call_budgets
+    import dataset
+    from ddb_calls import CallRecorder
+    
+    recorder = CallRecorder().install()
+    yield bench_e2e, check_call_budgets, dataset, recorder
+    
+    import boto3
+    events = boto3._get_default_session().events
+    events.unregister('provide-client-params.dynamodb.*', recorder._request_capacity)
+    events.unregister('after-call.dynamodb.*', recorder._record)
+    
+    for name in [name for name in sys.modules if _is_function_module(name)]:
+        del sys.modules[name]
+    sys.modules.update(saved_modules)
+    sys.path[:] = saved_path
+
+
+@pytest.mark.parametrize('shape', BUDGETS['shapes'], ids=lambda shape: f"{shape['projects_per_user']}x{shape['tasks_per_project']}")
+def test_endpoints_within_budget(bench, shape):
+    bench_e2e, check_call_budgets, dataset, recorder = bench
+    data = dataset.seed(create_table(TABLE_NAME), **shape)
+    scenario = bench_e2e.Scenario(dataset=data, rng=random.Random(0))
+    
+    failures = {}
+    for endpoint in bench_e2e.ENDPOINTS:
+        if endpoint.function not in BUDGETS['endpoints']:
+            continue
+        with bench_e2e.function_app(endpoint.function) as function:
+            result = bench_e2e.run_endpoint(function, endpoint, scenario, recorder, BUDGETS['requests'])
+        
+        violations = check_call_budgets.check(result, BUDGETS['endpoints'][endpoint.function])
+        if violations:
+            failures[endpoint.function] = violations
+    
+    assert not failures
+
+
+def test_check_reports_violations(bench):
+    _, check_call_budgets, _, _ = bench
+    result = {'ddb': {'maxPerRequest': {'calls': 3, 'GetItem': 2}}, 'status': {'200': 4, '500': 1}}
+    
+    violations = check_call_budgets.check(result, {'calls': 2, 'GetItem': 2, 'Query': 0})
+    
+    assert ('calls', 2, 3) in violations
+    assert ('status', '2xx', {'200': 4, '500': 1}) in violations
+    assert len(violations) == 2
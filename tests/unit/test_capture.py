@@ -0,0 +1,97 @@
+"""Saneamiento de eventos capturados para tools/replay.py"""
+
+import json
+import time
+
+from utils import capture
+from utils.auth_utils import generate_token
+from utils.capture import REDACTED, sanitize_event
+
+USER = {'userId': 'u1', 'email': 'ana@example.com', 'name': 'Ana'}
+
+
+def _event(body=None, headers=None):
+    return {
+        'httpMethod': 'POST',
+        'path': '/auth/login',
+        'resource': '/{proxy+}',
+        'headers': headers or {},
+        'multiValueHeaders': {'Cookie': ['session=1']},
+        'requestContext': {'identity': {'sourceIp': '10.0.0.1'}},
+        'body': json.dumps(body) if isinstance(body, dict) else body,
+        'isBase64Encoded': False,
+    }
+
+
+def test_sensitive_headers_and_identity_dropped():
+    event = _event(headers={
+        'Cookie': 'session=1',
+        'X-Forwarded-For': '10.0.0.1',
+        'x-api-key': 'k',
+        'Accept-Encoding': 'gzip',
+    })
+    
+    sanitized = sanitize_event(event)
+    
+    assert sanitized['headers'] == {'Accept-Encoding': 'gzip'}
+    assert 'requestContext' not in sanitized
+    assert 'multiValueHeaders' not in sanitized
+    assert sanitized['path'] == '/auth/login'
+
+
+def test_passwords_redacted_recursively():
+    body = {
+        'email': 'ana@example.com',
+        'password': 'secret123',
+        'requests': [{'body': {'newPassword': 'otro', 'title': 'x'}}],
+    }
+    
+    sanitized = json.loads(sanitize_event(_event(body))['body'])
+    
+    assert sanitized['password'] == REDACTED
+    assert sanitized['requests'][0]['body'] == {'newPassword': REDACTED, 'title': 'x'}
+    assert sanitized['email'] == 'ana@example.com'
+
+
+def test_non_json_body_with_password_redacted():
+    assert sanitize_event(_event('email=a&password=secret'))['body'] == REDACTED
+    assert sanitize_event(_event('texto plano'))['body'] == 'texto plano'
+
+
+def test_valid_token_replaced_by_claims():
+    token = generate_token(USER)
+    
+    sanitized = sanitize_event(_event(headers={'Authorization': f"Bearer {token}"}))
+    
+    assert sanitized['auth'] == {**USER, 'valid': True}
+    assert 'Authorization' not in sanitized['headers']
+    assert token not in json.dumps(sanitized)
+
+
+def test_invalid_token_keeps_readable_claims():
+    token = generate_token(USER)
+    header, payload, _ = token.split('.')
+    forged = f"{header}.{payload}.firma-invalida"
+    
+    sanitized = sanitize_event(_event(headers={'authorization': f"Bearer {forged}"}))
+    
+    assert sanitized['auth'] == {**USER, 'valid': False}
+
+
+def test_malformed_authorization_header():
+    assert sanitize_event(_event(headers={'Authorization': 'Basic abc'}))['auth'] == {'valid': False}
+    assert sanitize_event(_event(headers={'Authorization': 'Bearer no-es-jwt'}))['auth'] == {'valid': False}
+
+
+def test_capture_request_writes_sanitized_line(tmp_path, monkeypatch):
+    path = tmp_path / 'capture.ndjson'
+    monkeypatch.setattr(capture, 'CAPTURE_PATH', str(path))
+    event = _event({'email': 'ana@example.com', 'password': 'secret123'})
+    
+    capture.capture_request(event, 'handlers.auth:login', {'statusCode': 200}, time.perf_counter(),
+                            {'calls': 1, 'operations': {'Query': 1}})
+    
+    record = json.loads(path.read_text())
+    assert record['route'] == 'handlers.auth:login'
+    assert record['statusCode'] == 200
+    assert 'secret123' not in path.read_text()
@@ -0,0 +1,133 @@
+"""Negociación de Content-Encoding y decodificación de bodies en base64"""
+
+import base64
+import gzip
+import json
+
+import pytest
+
+import app
+from conftest import make_event
+from utils import response
+from utils.response import compress_response, decode_request_body, success_response
+
+
+def _large_response():
+    return success_response(200, {'tasks': [{'title': f"Tarea {i}", 'status': 'pending'} for i in range(100)]})
+
+
+def _event(accept_encoding):
+    return {'headers': {'Accept-Encoding': accept_encoding}}
+
+
+def _decode(compressed):
+    raw = base64.b64decode(compressed['body'])
+    if compressed['headers']['Content-Encoding'] == 'br':
+        return response.brotli.decompress(raw).decode('utf-8')
+    return gzip.decompress(raw).decode('utf-8')
+
+
+def test_gzip_round_trip():
+    original = _large_response()
+    
+    compressed = compress_response(_event('gzip, deflate'), original)
+    
+    assert compressed['isBase64Encoded'] is True
+    assert compressed['headers']['Content-Encoding'] == 'gzip'
+    assert compressed['headers']['Vary'] == 'Accept-Encoding'
+    assert _decode(compressed) == original['body']
+    assert 'Content-Encoding' not in original['headers']
+
+
+@pytest.mark.skipif(response.brotli is None, reason='brotli no instalado')
+def test_brotli_preferred_over_gzip():
+    original = _large_response()
+    
+    compressed = compress_response(_event('gzip, deflate, br'), original)
+    
+    assert compressed['headers']['Content-Encoding'] == 'br'
+    assert _decode(compressed) == original['body']
+
+
+def test_q_zero_excludes_encoding():
+    compressed = compress_response(_event('br;q=0, gzip;q=0.5'), _large_response())
+    
+    assert compressed['headers']['Content-Encoding'] == 'gzip'
+
+
+@pytest.mark.parametrize('accept_encoding', ['gzip;q=0, *', '*, gzip;q=0', 'br;q=0, gzip;q=0, *;q=1'])
+def test_explicit_q_zero_wins_over_wildcard(accept_encoding):
+    original = _large_response()
+    
+    assert compress_response(_event(accept_encoding), original) is original
+
+
+def test_wildcard_accepts_gzip():
+    compressed = compress_response(_event('*'), _large_response())
+    
+    assert compressed['headers']['Content-Encoding'] == 'gzip'
+
+
+@pytest.mark.parametrize('accept_encoding', ['', 'identity', 'deflate', 'gzip;q=0'])
+def test_unsupported_encoding_keeps_body(accept_encoding):
+    original = _large_response()
+    
+    assert compress_response(_event(accept_encoding), original) is original
+
+
+def test_small_body_not_compressed():
+    original = success_response(200, {'ok': True})
+    assert len(original['body']) < response.COMPRESSION_MIN_BYTES
+    
+    assert compress_response(_event('gzip'), original) is original
+
+
+def test_header_name_case_insensitive():
+    compressed = compress_response({'headers': {'accept-encoding': 'gzip'}}, _large_response())
+    
+    assert compressed['headers']['Content-Encoding'] == 'gzip'
+
+
+def test_router_compresses_large_response(api):
+    api.register()
+    project = api.create_project()
+    for i in range(20):
+        api.create_task(project['projectId'], title=f"Tarea con un título bastante largo número {i}")
+    
+    event = make_event('GET', f"/projects/{project['projectId']}/tasks", token=api.token,
+                       headers={'Accept-Encoding': 'gzip'})
+    
+    result = app.lambda_handler(event, None)
+    
+    assert result['statusCode'] == 200
+    assert result['headers']['Content-Encoding'] == 'gzip'
+    assert len(json.loads(_decode(result))['data']['tasks']) == 20
+
+
+def test_decode_base64_request_body():
+    body = json.dumps({'title': 'Título con acentos'})
+    event = {'body': base64.b64encode(body.encode('utf-8')).decode('ascii'), 'isBase64Encoded': True}
+    
+    decoded = decode_request_body(event)
+    
+    assert decoded['body'] == body
+    assert decoded['isBase64Encoded'] is False
+
+
+def test_decode_leaves_plain_body():
+    event = {'body': '{"title": "x"}', 'isBase64Encoded': False}
+    
+    assert decode_request_body(event)['body'] == '{"title": "x"}'
+
+
+def test_router_accepts_base64_body(api):
+    api.register()
+    body = json.dumps({'name': 'Proyecto en base64'})
+    
+    event = make_event('POST', '/projects', token=api.token, raw_body=base64.b64encode(body.encode('utf-8')).decode('ascii'))
+    event['isBase64Encoded'] = True
+    
+    result = app.lambda_handler(event, None)
+    
+    assert result['statusCode'] == 201
+    assert json.loads(result['body'])['data']['project']['name'] == 'Proyecto en base64'
@@ -0,0 +1,107 @@
+"""Capacidad consumida y operaciones lentas de DynamoDB por invocación"""
+
+import json
+import threading
+
+from utils import ddb_usage
+from utils.ddb_usage import describe_key, get_usage, merge_usage, reset_usage
+
+
+def test_request_accumulates_calls_and_capacity(api):
+    api.register()
+    project = api.create_project()
+    api.create_task(project['projectId'])
+    
+    status, _ = api.call('GET', f"/projects/{project['projectId']}/tasks")
+    
+    usage = get_usage()
+    assert status == 200
+    assert usage['calls'] == sum(usage['operations'].values()) >= 1
+    assert 'Query' in usage['operations']
+    assert usage['rcu'] > 0 and usage['wcu'] == 0
+    assert usage['ddbMs'] > 0
+    assert usage['slowOperations'] == []
+
+
+def test_writes_count_as_wcu(api):
+    api.register()
+    
+    api.create_project()
+    
+    usage = get_usage()
+    assert usage['wcu'] > 0
+    assert set(usage['operations']) & {'PutItem', 'TransactWriteItems', 'BatchWriteItem'}
+
+
+def test_each_invocation_starts_from_zero(api):
+    api.register()
+    api.create_project()
+    
+    api.call('GET', '/auth/me')
+    
+    assert not set(get_usage()['operations']) & {'PutItem', 'TransactWriteItems', 'BatchWriteItem'}
+
+
+def test_slow_operations_are_kept_with_their_key(api, monkeypatch):
+    api.register()
+    project = api.create_project()
+    monkeypatch.setattr(ddb_usage, 'SLOW_OPERATION_MS', 0)
+    
+    api.call('GET', f"/projects/{project['projectId']}/tasks")
+    
+    slow = get_usage()['slowOperations']
+    assert len(slow) == get_usage()['calls']
+    query = next(operation for operation in slow if operation['operation'] == 'Query')
+    assert query['type'] == 'ddb_slow_operation'
+    assert f"PROJECT#{project['projectId']}" in query['key']
+    assert query['durationMs'] >= 0
+
+
+def test_slow_operation_outside_an_invocation_is_printed(table, monkeypatch, capsys):
+    monkeypatch.setattr(ddb_usage, 'SLOW_OPERATION_MS', 0)
+    
+    # Un thread nuevo no tiene acumulado: la operación se imprime al momento
+    thread = threading.Thread(target=table.get_item, kwargs={'Key': {'PK': 'USER#u1', 'SK': 'PROFILE'}})
+    thread.start()
+    thread.join()
+    
+    line = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert line['operation'] == 'GetItem'
+    assert line['key'] == 'PK=USER#u1 SK=PROFILE'
+
+
+def test_merge_usage_adds_another_thread():
+    reset_usage()
+    other = {'calls': 2, 'operations': {'GetItem': 2}, 'rcu': 1.0, 'wcu': 0.0, 'indexes': {'EmailIndex': 0.5},
+             'ddbMs': 3.0, 'slowOperations': [{'operation': 'GetItem'}]}
+    
+    merge_usage(other)
+    merge_usage(other)
+    merge_usage(None)
+    
+    usage = get_usage()
+    assert (usage['calls'], usage['rcu'], usage['ddbMs']) == (4, 2.0, 6.0)
+    assert usage['operations'] == {'GetItem': 4}
+    assert usage['indexes'] == {'EmailIndex': 1.0}
+    assert len(usage['slowOperations']) == 2
+
+
+def test_get_usage_returns_a_copy():
+    reset_usage()
+    
+    get_usage()['operations']['Query'] = 1
+    
+    assert get_usage()['operations'] == {}
+
+
+def test_describe_key():
+    query = {
+        'KeyConditionExpression': '#pk = :pk AND begins_with(#sk, :sk)',
+        'ExpressionAttributeNames': {'#pk': 'PK', '#sk': 'SK'},
+        'ExpressionAttributeValues': {':pk': {'S': 'PROJECT#p1'}, ':sk': {'S': 'TASK#'}},
+    }
+    
+    assert describe_key('Query', query) == "PK = 'PROJECT#p1' AND begins_with(SK, 'TASK#')"
+    assert describe_key('GetItem', {'Key': {'PK': {'S': 'USER#u1'}, 'SK': {'S': 'PROFILE'}}}) == 'PK=USER#u1 SK=PROFILE'
+    assert describe_key('BatchGetItem', {'RequestItems': {'t': {'Keys': [{}, {}, {}]}}}) == '3 claves'
+    assert describe_key('BatchWriteItem', {'RequestItems': {'t': [{}, {}]}}) == '2 claves'
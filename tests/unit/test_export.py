@@ -0,0 +1,178 @@
+"""Exportación NDJSON: framing, paginación, tope sin streaming y server.py"""
+
+import http.client
+import importlib.util
+import json
+import os
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from conftest import ROOT, make_event
+from handlers import tasks as task_handlers
+from utils import response
+from utils.response import buffer_stream_response, stream_response
+
+
+def _export_event(api, project_id):
+    """Evento de API Gateway para la función tasks-export (sin router)"""
+    event = make_event('GET', f"/projects/{project_id}/export", token=api.token)
+    event['pathParameters'] = {'id': project_id}
+    return event
+
+
+@pytest.fixture
+def project(api):
+    api.register()
+    project = api.create_project()
+    titles = [f"Tarea {i}" for i in range(5)]
+    for title in titles:
+        api.create_task(project['projectId'], title=title, description='línea 1\nlínea 2')
+    return project['projectId'], titles
+
+
+def test_one_task_per_line(api, project):
+    project_id, titles = project
+    
+    status, body = api.call('GET', f"/projects/{project_id}/export")
+    
+    assert status == 200
+    assert body.endswith('\n')
+    lines = body.splitlines()
+    assert sorted(json.loads(line)['title'] for line in lines) == titles
+    # Los saltos de línea del contenido van escapados dentro del JSON
+    assert all(json.loads(line)['description'] == 'línea 1\nlínea 2' for line in lines)
+
+
+def test_chunk_per_page(api, project, monkeypatch):
+    project_id, titles = project
+    monkeypatch.setattr(task_handlers, 'EXPORT_FIRST_PAGE_SIZE', 1)
+    monkeypatch.setattr(task_handlers, 'EXPORT_PAGE_SIZE', 2)
+    
+    result = task_handlers.export_tasks_handler(_export_event(api, project_id), None)
+    
+    assert result['headers']['Content-Type'] == 'application/x-ndjson'
+    chunks = list(result['body'])
+    assert [chunk.count(b'\n') for chunk in chunks] == [1, 2, 2]
+    exported = [json.loads(line)['title'] for chunk in chunks for line in chunk.splitlines()]
+    assert sorted(exported) == titles
+
+
+def test_export_checks_access_and_format(api, project):
+    project_id, _ = project
+    
+    status, body = api.call('GET', f"/projects/{project_id}/export", query={'format': 'csv'})
+    assert (status, body['errorCode']) == (400, 'UNSUPPORTED_FORMAT')
+    
+    api.register(email='otro@example.com')
+    status, body = api.call('GET', f"/projects/{project_id}/export")
+    assert (status, body['errorCode']) == (403, 'FORBIDDEN')
+
+
+def test_buffer_stream_response_joins_chunks():
+    buffered = buffer_stream_response(stream_response(200, iter([b'{"a":1}\n', b'{"a":2}\n'])))
+    
+    assert buffered['body'] == '{"a":1}\n{"a":2}\n'
+    assert buffered['headers']['Content-Type'] == 'application/x-ndjson'
+    
+    plain = {'statusCode': 200, 'headers': {}, 'body': 'x'}
+    assert buffer_stream_response(plain) is plain
+
+
+def test_buffer_stream_response_cap(monkeypatch):
+    monkeypatch.setattr(response, 'STREAM_URL', 'https://export.example.com')
+    closed = []
+    
+    def chunks():
+        try:
+            while True:
+                yield b'x' * 100
+        finally:
+            closed.append(True)
+    
+    result = buffer_stream_response(stream_response(200, chunks()), max_bytes=250)
+    
+    assert result['statusCode'] == 413
+    body = json.loads(result['body'])
+    assert body['errorCode'] == 'RESPONSE_TOO_LARGE'
+    assert 'https://export.example.com' in body['error']
+    # El generador se corta sin leer el resto
+    assert closed == [True]
+
+
+def test_router_answers_413_over_cap(api, project, monkeypatch):
+    project_id, _ = project
+    monkeypatch.setattr(response, 'BUFFERED_STREAM_MAX_BYTES', 100)
+    
+    status, body = api.call('GET', f"/projects/{project_id}/export")
+    
+    assert status == 413
+    assert body['errorCode'] == 'RESPONSE_TOO_LARGE'
+
+
+# ==================== server.py ====================
+
+@pytest.fixture
+def export_server():
+    """server.py de tasks-export escuchando en un puerto libre"""
+    spec = importlib.util.spec_from_file_location(
+        'export_server', os.path.join(ROOT, 'src', 'lambda', 'tasks-export', 'server.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), module.ExportRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield module, server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def _get(port, path, token=None):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    connection.request('GET', path, headers={'Authorization': f"Bearer {token}"} if token else {})
+    return connection.getresponse()
+
+
+def test_server_streams_chunked_ndjson(api, project, export_server):
+    project_id, titles = project
+    _, port = export_server
+    
+    result = _get(port, f"/projects/{project_id}/export", api.token)
+    
+    assert result.status == 200
+    assert result.getheader('Transfer-Encoding') == 'chunked'
+    assert result.getheader('Content-Type') == 'application/x-ndjson'
+    lines = result.read().decode('utf-8').splitlines()
+    assert sorted(json.loads(line)['title'] for line in lines) == titles
+
+
+def test_server_errors_are_json(api, export_server):
+    _, port = export_server
+    
+    missing = _get(port, '/projects/p1/tasks')
+    assert missing.status == 404
+    assert json.loads(missing.read())['errorCode'] == 'NOT_FOUND'
+    
+    unauthorized = _get(port, '/projects/p1/export')
+    assert unauthorized.status == 401
+
+
+def test_server_cuts_connection_on_mid_stream_error(api, export_server, monkeypatch):
+    module, port = export_server
+    
+    def failing_chunks():
+        yield b'{"title": "primera"}\n'
+        raise RuntimeError('DynamoDB no responde')
+    
+    monkeypatch.setattr(module, 'export_tasks_handler', lambda event, context: stream_response(200, failing_chunks()))
+    
+    result = _get(port, '/projects/p1/export')
+    
+    assert result.status == 200
+    # Sin el chunk final el cliente no puede tomar la exportación como completa
+    with pytest.raises(http.client.IncompleteRead) as error:
+        result.read()
+    assert error.value.partial == b'{"title": "primera"}\n'
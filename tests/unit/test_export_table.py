@@ -0,0 +1,156 @@
+"""Exportación de la tabla completa (tools/export_table.py) contra moto"""
+
+import glob
+import json
+import os
+import sys
+
+import pytest
+
+from conftest import ROOT, TABLE_NAME
+
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+import ddb_codec  # noqa: E402
+import export_table  # noqa: E402
+
+LONG = ' '.join(str(i) for i in range(5000))
+
+
+@pytest.fixture
+def seeded(api):
+    api.register()
+    project = api.create_project()
+    titles = [f"Tarea {i}" for i in range(6)]
+    for title in titles:
+        api.create_task(project['projectId'], title=title)
+    api.create_task(project['projectId'], title='Larga', description=LONG)
+    return project['projectId'], titles + ['Larga']
+
+
+def _export(monkeypatch, tmp_path, *extra):
+    argv = ['export_table.py', '--table', TABLE_NAME, '--output', str(tmp_path / 'out'),
+            '--segments', '2', '--page-size', '2', '--blob-store', 'local',
+            '--blob-path', str(tmp_path / 'blobs'), *extra]
+    monkeypatch.setattr(sys, 'argv', argv)
+    export_table.main()
+
+
+def _rows(tmp_path, entity):
+    rows = []
+    for path in sorted(glob.glob(str(tmp_path / 'out' / entity / '*.ndjson'))):
+        with open(path, encoding='utf-8') as f:
+            rows.extend(json.loads(line) for line in f)
+    return rows
+
+
+def test_exports_one_file_per_entity_and_segment(monkeypatch, tmp_path, capsys, seeded):
+    project_id, titles = seeded
+    
+    _export(monkeypatch, tmp_path)
+    
+    summary = json.loads(capsys.readouterr().out)
+    assert summary['items'] == {'USER': 1, 'USER_PROJECT': 1, 'PROJECT': 1, 'MEMBER': 1, 'TASK': 7}
+    assert summary['failedSegments'] == 0
+    assert sorted(os.listdir(tmp_path / 'out' / '_checkpoints')) == ['segment-0000.json', 'segment-0001.json']
+    tasks = _rows(tmp_path, 'TASK')
+    assert sorted(task['title'] for task in tasks) == sorted(titles)
+    assert all(task['projectId'] == project_id for task in tasks)
+
+
+def test_rows_use_logical_names_and_full_descriptions(monkeypatch, tmp_path, seeded):
+    _export(monkeypatch, tmp_path)
+    
+    tasks = {task['title']: task for task in _rows(tmp_path, 'TASK')}
+    
+    # El blob se lee entero: no la vista previa que guarda el item
+    assert tasks['Larga']['description'] == LONG
+    assert 'descriptionTruncated' not in tasks['Larga']
+    assert not {'v', 'ti', 'dr', 'dp'} & set(tasks['Larga'])
+    assert tasks['Tarea 0']['createdAt'].startswith('20')
+
+
+def test_missing_blob_fails_the_segment(monkeypatch, tmp_path, capsys, seeded):
+    for path in glob.glob(str(tmp_path / 'blobs' / '**' / '*'), recursive=True):
+        if os.path.isfile(path):
+            os.remove(path)
+    
+    with pytest.raises(SystemExit) as excinfo:
+        _export(monkeypatch, tmp_path)
+    
+    assert excinfo.value.code == 1
+    assert 'BlobNotFound' in capsys.readouterr().err
+
+
+def test_existing_checkpoints_require_resume(monkeypatch, tmp_path, seeded):
+    _export(monkeypatch, tmp_path)
+    
+    with pytest.raises(SystemExit) as excinfo:
+        _export(monkeypatch, tmp_path)
+    
+    assert excinfo.value.code == 2
+
+
+def test_resume_skips_finished_segments(monkeypatch, tmp_path, capsys, seeded):
+    _export(monkeypatch, tmp_path)
+    capsys.readouterr()
+    
+    _export(monkeypatch, tmp_path, '--resume')
+    
+    assert json.loads(capsys.readouterr().out)['totalItems'] == 0
+    assert len(_rows(tmp_path, 'TASK')) == 7
+
+
+def test_resume_after_crash_does_not_duplicate(monkeypatch, tmp_path, seeded):
+    save = export_table.SegmentCheckpoint.save
+    saves = []
+    
+    def crash_on_third_page(self):
+        # La página ya está escrita pero su checkpoint no
+        saves.append(self.path)
+        if saves.count(self.path) == 3:
+            raise RuntimeError('caída')
+        save(self)
+    
+    monkeypatch.setattr(export_table.SegmentCheckpoint, 'save', crash_on_third_page)
+    with pytest.raises(SystemExit):
+        _export(monkeypatch, tmp_path, '--segments', '1', '--page-size', '1')
+    monkeypatch.setattr(export_table.SegmentCheckpoint, 'save', save)
+    
+    _export(monkeypatch, tmp_path, '--segments', '1', '--page-size', '1', '--resume')
+    
+    rows = [row for entity in ('USER', 'USER_PROJECT', 'PROJECT', 'MEMBER', 'TASK') for row in _rows(tmp_path, entity)]
+    assert len(rows) == 11
+    assert len({(row['PK'], row['SK']) for row in rows}) == 11
+
+
+def test_rate_limiter_sleeps_on_negative_balance(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(export_table.time, 'sleep', sleeps.append)
+    limiter = export_table.RateLimiter(10)
+    
+    limiter.consume(5)
+    limiter.consume(15)
+    
+    assert sleeps and sleeps[0] == pytest.approx(1.0, abs=0.05)
+
+
+def test_rate_limiter_disabled_with_zero(monkeypatch):
+    monkeypatch.setattr(export_table.time, 'sleep', lambda seconds: pytest.fail('no debería esperar'))
+    
+    export_table.RateLimiter(0).consume(1000)
+
+
+def test_codec_decodes_numbers_and_sets():
+    item = ddb_codec.decode_item({
+        'PK': {'S': 'PROJECT#p1'}, 'SK': {'S': 'TASK#t1'},
+        'ca': {'N': '1709296245123'}, 'ratio': {'N': '0.5'},
+        'tags': {'SS': ['a', 'b']}, 'meta': {'M': {'ok': {'BOOL': True}, 'none': {'NULL': True}}},
+    })
+    
+    assert item['ca'] == 1709296245123 and isinstance(item['ca'], int)
+    assert item['ratio'] == 0.5
+    assert item['tags'] == ['a', 'b']
+    assert item['meta'] == {'ok': True, 'none': None}
+    assert ddb_codec.entity_type(item) == 'TASK'
+    assert ddb_codec.decode_item(ddb_codec.encode_item(item)) == item
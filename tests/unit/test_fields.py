@@ -0,0 +1,118 @@
+"""Sparse fieldsets (?fields=) y su ProjectionExpression en DynamoDB"""
+
+import pytest
+
+from utils.dynamodb_repository import _projection
+from utils.item_codec import PROJECT_FIELDS, TASK_FIELDS, parse_fields, projection_attributes, select_fields
+
+
+@pytest.fixture
+def ddb_params(monkeypatch):
+    """
+    Parámetros de cada llamada a DynamoDB: (operación, kwargs), de todos los
+    clientes (los threads de utils.async_db tienen el suyo)
+    """
+    from botocore.client import BaseClient
+    
+    calls = []
+    make_api_call = BaseClient._make_api_call
+    
+    def capture(client, operation, params):
+        calls.append((operation, dict(params)))
+        return make_api_call(client, operation, params)
+    
+    monkeypatch.setattr(BaseClient, '_make_api_call', capture)
+    return calls
+
+
+def test_parse_fields():
+    assert parse_fields(None, TASK_FIELDS) is None
+    assert parse_fields('', TASK_FIELDS) is None
+    assert parse_fields(' , ', TASK_FIELDS) is None
+    assert parse_fields('title, status,title', TASK_FIELDS) == ['title', 'status']
+
+
+def test_parse_fields_rejects_unknown():
+    with pytest.raises(ValueError, match='password, PK'):
+        parse_fields('title,password,PK', TASK_FIELDS)
+
+
+def test_projection_attributes_cover_both_schemas():
+    attributes = projection_attributes(['title', 'description', 'createdAt'])
+    
+    assert attributes == ['title', 'ti', 'description', 'd', 'dz', 'dr', 'dp', 'createdAt', 'ca']
+
+
+def test_projection_expression_uses_placeholders():
+    assert _projection(None) == {}
+    
+    projection = _projection(['name', 'status'], keys=True)
+    
+    assert projection['ProjectionExpression'] == '#f0, #f1, #f2, #f3, #f4, #f5'
+    assert list(projection['ExpressionAttributeNames'].values()) == ['PK', 'SK', 'name', 'n', 'status', 's']
+
+
+def test_select_fields():
+    item = {'taskId': 't1', 'title': 'Tarea', 'description': 'corta', 'descriptionTruncated': True}
+    
+    assert select_fields(item, None) is item
+    assert select_fields(None, ['title']) is None
+    assert select_fields(item, ['title', 'assignedTo']) == {'title': 'Tarea'}
+    assert select_fields(item, ['description']) == {'description': 'corta', 'descriptionTruncated': True}
+
+
+def test_task_list_fields(api, ddb_params):
+    api.register()
+    project = api.create_project()
+    api.create_task(project['projectId'], title='Con campos', description='No se lee')
+    ddb_params.clear()
+    
+    status, body = api.call('GET', f"/projects/{project['projectId']}/tasks", query={'fields': 'taskId,title'})
+    
+    assert status == 200
+    assert [set(task) for task in body['data']['tasks']] == [{'taskId', 'title'}]
+    query = next(params for operation, params in ddb_params if operation == 'Query')
+    projected = set(query['ExpressionAttributeNames'].values())
+    assert {'title', 'ti', 'taskId', 't'} <= projected
+    assert not {'description', 'd', 'status', 's'} & projected
+
+
+def test_project_list_fields(api):
+    api.register()
+    api.create_project(name='Primero')
+    
+    status, body = api.call('GET', '/projects', query={'fields': 'name,userRole'})
+    
+    assert status == 200
+    assert body['data']['projects'] == [{'name': 'Primero', 'userRole': 'owner'}]
+
+
+def test_project_detail_fields_skip_members(api, ddb_params):
+    api.register()
+    project = api.create_project(name='Detalle')
+    ddb_params.clear()
+    
+    status, body = api.call('GET', f"/projects/{project['projectId']}", query={'fields': 'name'})
+    
+    assert status == 200
+    assert body['data']['project'] == {'name': 'Detalle'}
+    # Sin 'members' no se consulta MEMBER#; la metadata se lee proyectada
+    assert [operation for operation, _ in ddb_params] == ['GetItem', 'GetItem']
+    projected = [params for _, params in ddb_params if 'ProjectionExpression' in params]
+    assert len(projected) == 1
+    assert set(projected[0]['ExpressionAttributeNames'].values()) == {'name', 'n'}
+
+
+@pytest.mark.parametrize('path', ['/projects', '/projects/{id}', '/projects/{id}/tasks'])
+def test_invalid_fields_rejected(api, path):
+    api.register()
+    project = api.create_project()
+    
+    status, body = api.call('GET', path.format(id=project['projectId']), query={'fields': 'name,password'})
+    
+    assert status == 400
+    assert body['errorCode'] == 'INVALID_FIELDS'
+
+
+def test_fields_are_whitelisted():
+    assert 'password' not in PROJECT_FIELDS + TASK_FIELDS
@@ -0,0 +1,194 @@
+"""Importación masiva de tareas (tools/import_tasks.py) contra moto"""
+
+import csv
+import json
+import os
+import sys
+
+import pytest
+from botocore.exceptions import ClientError
+
+from conftest import ROOT, TABLE_NAME
+from utils.repository import get_repository
+
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+import import_tasks  # noqa: E402
+
+LONG = ' '.join(str(i) for i in range(5000))
+
+
+@pytest.fixture
+def project(api):
+    user = api.register()
+    project = api.create_project()
+    return project['projectId'], user['user']['userId']
+
+
+def _write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['title', 'description', 'status', 'taskId'])
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def _import(monkeypatch, tmp_path, path, project_id, user_id, *extra):
+    argv = ['import_tasks.py', path, '--table', TABLE_NAME, '--project-id', project_id,
+            '--created-by', user_id, '--workers', '2', '--blob-store', 'local',
+            '--blob-path', str(tmp_path / 'blobs'), *extra]
+    monkeypatch.setattr(sys, 'argv', argv)
+    import_tasks.main()
+
+
+def test_imports_rows_and_fixes_task_count(monkeypatch, tmp_path, capsys, api, project):
+    project_id, user_id = project
+    rows = [{'title': f"Importada {i}", 'status': 'pending'} for i in range(60)]
+    rows.append({'title': 'Larga', 'description': LONG, 'status': 'completed'})
+    path = _write_csv(tmp_path / 'tasks.csv', rows)
+    
+    _import(monkeypatch, tmp_path, path, project_id, user_id)
+    
+    summary = json.loads(capsys.readouterr().out)
+    assert summary['written'] == 61
+    assert summary['batches'] == 3
+    assert summary['taskCounts'] == {project_id: 61}
+    status, body = api.call('GET', f"/projects/{project_id}")
+    assert body['data']['project']['taskCount'] == 61
+    status, body = api.call('GET', f"/projects/{project_id}/tasks", query={'limit': '100'})
+    tasks = {task['title']: task for task in body['data']['tasks']}
+    assert len(tasks) == 61
+    assert tasks['Larga']['status'] == 'completed'
+    imported = {task['title']: task for task in get_repository().get_project_tasks(project_id)}
+    assert imported['Larga']['description'] == LONG
+
+
+def test_invalid_rows_are_rejected(monkeypatch, tmp_path, capsys, project):
+    project_id, user_id = project
+    path = _write_csv(tmp_path / 'tasks.csv', [
+        {'title': 'Válida'},
+        {'title': 'no'},
+        {'title': 'Estado raro', 'status': 'archived'},
+    ])
+    
+    _import(monkeypatch, tmp_path, path, project_id, user_id)
+    
+    captured = capsys.readouterr()
+    summary = json.loads(captured.out)
+    assert (summary['rows'], summary['written'], summary['rejected']) == (3, 1, 2)
+    assert 'fila 2 rechazada' in captured.err
+    assert 'status inválido: archived' in captured.err
+
+
+def test_reimport_overwrites_instead_of_duplicating(monkeypatch, tmp_path, capsys, api, project):
+    project_id, user_id = project
+    path = _write_csv(tmp_path / 'tasks.csv', [{'title': 'Primera', 'taskId': 'ext-1'}, {'title': 'Segunda'}])
+    
+    _import(monkeypatch, tmp_path, path, project_id, user_id)
+    _import(monkeypatch, tmp_path, path, project_id, user_id)
+    
+    assert capsys.readouterr().out.count(f'"{project_id}": 2') == 2
+    status, body = api.call('GET', f"/projects/{project_id}/tasks")
+    assert sorted(task['title'] for task in body['data']['tasks']) == ['Primera', 'Segunda']
+
+
+def test_unknown_project_is_refused(monkeypatch, tmp_path, project):
+    _, user_id = project
+    path = _write_csv(tmp_path / 'tasks.csv', [{'title': 'Huérfana'}])
+    
+    with pytest.raises(SystemExit) as excinfo:
+        _import(monkeypatch, tmp_path, path, 'no-existe', user_id)
+    
+    assert excinfo.value.code == 2
+
+
+def test_resume_skips_committed_batches(monkeypatch, tmp_path, capsys, project):
+    project_id, user_id = project
+    path = _write_csv(tmp_path / 'tasks.csv', [{'title': f"Importada {i}"} for i in range(30)])
+    with open(path + '.checkpoint.json', 'w') as f:
+        json.dump({'committedBatch': 0, 'projects': [project_id], 'done': False}, f)
+    
+    _import(monkeypatch, tmp_path, path, project_id, user_id, '--resume')
+    
+    summary = json.loads(capsys.readouterr().out)
+    assert (summary['skippedResumed'], summary['written']) == (25, 5)
+    with open(path + '.checkpoint.json') as f:
+        assert json.load(f) == {'committedBatch': 1, 'projects': [project_id], 'done': True}
+
+
+def test_row_ids_are_deterministic():
+    args = type('Args', (), {'project_id': 'p1', 'created_by': 'u1'})
+    
+    first, _ = import_tasks.row_to_item({'title': 'Tarea', 'taskId': 'ext-1'}, 1, args)
+    again, _ = import_tasks.row_to_item({'title': 'Tarea', 'taskId': 'ext-1'}, 7, args)
+    by_row, _ = import_tasks.row_to_item({'title': 'Tarea'}, 7, args)
+    
+    assert first['taskId'] == again['taskId'] != by_row['taskId']
+    assert first['SK'] == f"TASK#{first['taskId']}"
+    assert first['assignedTo'] == 'u1'
+
+
+def test_checkpoint_commits_only_contiguous_batches():
+    checkpoint = import_tasks.Checkpoint(None)
+    
+    checkpoint.complete(1)
+    checkpoint.complete(2)
+    assert checkpoint.committed == -1
+    checkpoint.complete(0)
+    
+    assert checkpoint.committed == 2
+
+
+def test_adaptive_throttle_doubles_and_decays():
+    throttle = import_tasks.AdaptiveThrottle(base_delay=0.1, max_delay=0.3)
+    
+    throttle.throttled()
+    assert throttle.delay == 0.1
+    throttle.throttled()
+    throttle.throttled()
+    assert throttle.delay == 0.3
+    throttle.succeeded()
+    assert throttle.delay == pytest.approx(0.24)
+    for _ in range(10):
+        throttle.succeeded()
+    assert throttle.delay == 0.0
+
+
+class FlakyClient:
+    """batch_write_item que primero throttlea y después deja items sin procesar"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def batch_write_item(self, RequestItems):
+        requests = RequestItems[TABLE_NAME]
+        self.calls.append(len(requests))
+        if len(self.calls) == 1:
+            raise ClientError({'Error': {'Code': 'ProvisionedThroughputExceededException'}}, 'BatchWriteItem')
+        if len(self.calls) == 2:
+            return {'UnprocessedItems': {TABLE_NAME: requests[:1]}}
+        return {'UnprocessedItems': {}}
+
+
+def test_write_batch_retries_throttles_and_unprocessed(monkeypatch):
+    monkeypatch.setattr(import_tasks.time, 'sleep', lambda seconds: None)
+    args = type('Args', (), {'project_id': 'p1', 'created_by': 'u1'})
+    items = [import_tasks.row_to_item({'title': f"Tarea {i}"}, i, args)[0] for i in range(3)]
+    client = FlakyClient()
+    stats = import_tasks.ImportStats()
+    
+    import_tasks.write_batch(client, TABLE_NAME, items, import_tasks.AdaptiveThrottle(base_delay=0), stats, 5)
+    
+    assert client.calls == [3, 3, 1]
+    assert stats.counters['throttles'] == 1
+    assert stats.counters['unprocessedRetries'] == 1
+
+
+def test_write_batch_gives_up_after_max_attempts(monkeypatch):
+    monkeypatch.setattr(import_tasks.time, 'sleep', lambda seconds: None)
+    args = type('Args', (), {'project_id': 'p1', 'created_by': 'u1'})
+    items = [import_tasks.row_to_item({'title': 'Tarea'}, 1, args)[0]]
+    
+    with pytest.raises(RuntimeError):
+        import_tasks.write_batch(FlakyClient(), TABLE_NAME, items, import_tasks.AdaptiveThrottle(base_delay=0),
+                                 import_tasks.ImportStats(), 1)
@@ -0,0 +1,230 @@
+"""Formato físico de los items: esquemas v1, v2 y items mezclados"""
+
+from decimal import Decimal
+
+import pytest
+
+from utils import item_codec
+from utils.blob_store import BlobNotFound, S3BlobStore, get_blob_store
+from utils.item_codec import load_descriptions, pack_item, unpack_item, unpack_items
+from utils.repository import create_repository
+
+TASK = {
+    'PK': 'PROJECT#p1',
+    'SK': 'TASK#t1',
+    'taskId': 't1',
+    'projectId': 'p1',
+    'title': 'Tarea',
+    'description': 'Corta',
+    'status': 'pending',
+    'assignedTo': None,
+    'createdBy': 'u1',
+    'createdAt': '2024-03-01T12:30:45.123',
+    'updatedAt': '2024-03-02T08:00:00.000',
+}
+
+
+def test_v2_round_trip():
+    packed = pack_item(TASK)
+    
+    assert packed['v'] == 2
+    assert packed['ti'] == 'Tarea'
+    assert packed['ca'] == 1709296245123
+    assert 'title' not in packed and 'createdAt' not in packed
+    assert packed['PK'] == 'PROJECT#p1'
+    assert unpack_item(packed) == TASK
+
+
+def test_v2_reads_decimal_numbers():
+    packed = {key: Decimal(value) if isinstance(value, int) else value for key, value in pack_item(TASK).items()}
+    
+    assert unpack_item(packed) == TASK
+
+
+def test_v1_items_read_unchanged():
+    assert unpack_item(dict(TASK)) == TASK
+
+
+def test_schema_v1_writes_logical_names(monkeypatch):
+    monkeypatch.setattr(item_codec, 'ITEM_SCHEMA_VERSION', 1)
+    
+    assert pack_item(TASK) == TASK
+    assert item_codec.pack_field('title', 'x') == ({'title': 'x'}, ['ti'])
+
+
+def test_update_field_removes_other_schema_name():
+    assert item_codec.pack_field('title', 'x') == ({'ti': 'x'}, ['title'])
+    assert item_codec.pack_field('createdAt', '1970-01-01T00:00:01') == ({'ca': 1000}, ['createdAt'])
+
+
+def test_mixed_item_prefers_short_names_and_sums_counters():
+    mixed = {
+        'PK': 'PROJECT#p1',
+        'SK': 'METADATA',
+        'v': 2,
+        'name': 'Nombre viejo',
+        'n': 'Nombre nuevo',
+        'taskCount': Decimal(3),
+        'tc': Decimal(-1),
+        'createdAt': '2024-03-01T12:30:45.123',
+        'ua': 1709366400000,
+    }
+    
+    assert unpack_item(mixed) == {
+        'PK': 'PROJECT#p1',
+        'SK': 'METADATA',
+        'name': 'Nombre nuevo',
+        'taskCount': 2,
+        'createdAt': '2024-03-01T12:30:45.123',
+        'updatedAt': '2024-03-02T08:00:00.000',
+    }
+
+
+def test_unpack_items_mixed_list():
+    items = unpack_items([pack_item(TASK), dict(TASK, SK='TASK#t2', taskId='t2')])
+    
+    assert [item['taskId'] for item in items] == ['t1', 't2']
+    assert items[0] == TASK
+
+
+def test_repository_updates_v1_item_in_place(table):
+    # Proyecto y tarea escritos por una versión anterior (v1)
+    table.put_item(Item={
+        'PK': 'PROJECT#p1', 'SK': 'METADATA', 'projectId': 'p1', 'name': 'Viejo', 'description': 'd',
+        'status': 'active', 'createdBy': 'u1', 'createdByName': 'Ana', 'taskCount': 1, 'memberCount': 1,
+        'createdAt': '2024-03-01T00:00:00', 'updatedAt': '2024-03-01T00:00:00',
+    })
+    table.put_item(Item=dict(TASK))
+    repo = create_repository('dynamodb')
+    
+    repo.create_task('t2', 'p1', 'Nueva', None, 'pending', None, 'u1')
+    updated = repo.update_task('p1', 't1', {'title': 'Renombrada'})
+    
+    assert repo.get_project('p1')['taskCount'] == 2
+    assert updated['title'] == 'Renombrada'
+    raw = table.get_item(Key={'PK': 'PROJECT#p1', 'SK': 'TASK#t1'})['Item']
+    assert raw['ti'] == 'Renombrada'
+    assert 'title' not in raw
+    assert {task['taskId'] for task in repo.get_project_tasks('p1')} == {'t1', 't2'}
+
+
+@pytest.mark.parametrize('value', ['2024-03-01T12:30:45.123', '2024-03-01T12:30:45.123+00:00'])
+def test_timestamps_to_epoch(value):
+    assert item_codec.to_epoch_ms(value) == 1709296245123
+    assert item_codec.from_epoch_ms(1709296245123) == '2024-03-01T12:30:45.123'
+
+
+def test_non_iso_timestamp_kept():
+    assert item_codec.to_epoch_ms('ayer') == 'ayer'
+    assert item_codec.from_epoch_ms('ayer') == 'ayer'
+
+
+# ==================== DESCRIPCIONES ====================
+
+SHORT = 'Descripción corta'
+MEDIUM = 'Criterio de aceptación. ' * 100
+LONG = 'Especificación completa del endpoint. ' * 1000
+
+
+def _raw_task(table, task_id='t1'):
+    return table.get_item(Key={'PK': 'PROJECT#p1', 'SK': f"TASK#{task_id}"})['Item']
+
+
+def _blob_exists(ref):
+    try:
+        get_blob_store().get(ref)
+    except BlobNotFound:
+        return False
+    return True
+
+
+@pytest.mark.parametrize('text, attribute', [(SHORT, 'd'), (MEDIUM, 'dz'), (LONG, 'dr')])
+def test_description_forms_round_trip(text, attribute):
+    packed = pack_item(dict(TASK, description=text))
+    
+    assert attribute in packed
+    assert not set(packed) & ({'d', 'dz', 'dr'} - {attribute})
+    assert unpack_item(packed)['description'] == text
+
+
+def test_offloaded_description_preview():
+    packed = pack_item(dict(TASK, description=LONG))
+    
+    preview = unpack_item(packed, descriptions='preview')
+    
+    assert preview['description'] == LONG[:item_codec.DESCRIPTION_PREVIEW_CHARS]
+    assert preview['descriptionTruncated'] is True
+
+
+def test_missing_blob_falls_back_to_preview():
+    packed = pack_item(dict(TASK, description=LONG))
+    get_blob_store().delete(packed['dr'])
+    
+    item = unpack_item(packed)
+    
+    assert item['description'] == packed['dp']
+    assert item['descriptionTruncated'] is True
+    assert load_descriptions([packed['dr']]) == {}
+    with pytest.raises(BlobNotFound):
+        load_descriptions([packed['dr']], strict=True)
+
+
+def test_null_description_clears_every_form():
+    attributes, removed = item_codec.pack_field('description', None)
+    
+    assert attributes == {'d': None}
+    assert set(removed) == {'description', 'dz', 'dr', 'dp'}
+
+
+def test_update_to_null_description_clears_blob(table):
+    repo = create_repository('dynamodb')
+    repo.create_project('p1', 'Proyecto', None, 'active', 'u1', 'Ana')
+    repo.create_task('t1', 'p1', 'Tarea', LONG, 'pending', None, 'u1')
+    ref = _raw_task(table)['dr']
+    
+    updated = repo.update_task('p1', 't1', {'description': None})
+    
+    assert updated['description'] is None
+    raw = _raw_task(table)
+    assert not {'dz', 'dr', 'dp'} & set(raw)
+    assert not _blob_exists(ref)
+
+
+def test_replaced_and_deleted_descriptions_remove_blobs(table):
+    repo = create_repository('dynamodb')
+    repo.create_project('p1', 'Proyecto', None, 'active', 'u1', 'Ana')
+    repo.create_task('t1', 'p1', 'Tarea', LONG, 'pending', None, 'u1')
+    first = _raw_task(table)['dr']
+    
+    repo.update_task('p1', 't1', {'description': LONG + 'v2'})
+    second = _raw_task(table)['dr']
+    
+    assert second != first
+    assert not _blob_exists(first)
+    assert repo.get_project_tasks('p1')[0]['description'] == LONG + 'v2'
+    
+    # Un update que no toca la descripción conserva el blob
+    repo.update_task('p1', 't1', {'status': 'completed'})
+    assert _blob_exists(second)
+    
+    repo.delete_task('p1', 't1')
+    assert not _blob_exists(second)
+
+
+def test_unpack_items_loads_blobs_together():
+    items = [pack_item(dict(TASK, SK=f"TASK#t{i}", taskId=f"t{i}", description=LONG + str(i))) for i in range(3)]
+    
+    assert [item['description'] for item in unpack_items(items)] == [LONG + str(i) for i in range(3)]
+
+
+def test_s3_blob_store():
+    import boto3
+    boto3.client('s3').create_bucket(Bucket='pm-blobs-test')
+    store = S3BlobStore('pm-blobs-test')
+    
+    store.put('descriptions/a', b'data')
+    
+    assert store.get('descriptions/a') == b'data'
+    store.delete('descriptions/a')
+    with pytest.raises(BlobNotFound):
+        store.get('descriptions/a')
@@ -0,0 +1,91 @@
+"""Imports diferidos del init: preflights, 400 y 401 sin boto3 ni jwt"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import profile_init  # noqa: E402
+from fixtures import FUNCTION_ROUTES  # noqa: E402
+
+LAMBDA_DIR = os.path.join(ROOT, 'src', 'lambda')
+
+# Invoca app con cada evento y reporta status y módulos pesados cargados
+INVOKE = '''
+import json, sys
+import app
+heavy = lambda: sorted(name for name in ('boto3', 'botocore', 'jwt') if name in sys.modules)
+result = {'init': heavy(), 'requests': []}
+for event in json.loads(sys.argv[1]):
+    response = app.lambda_handler(event, None)
+    result['requests'].append([response['statusCode'], heavy()])
+print(json.dumps(result))
+'''
+
+
+def _invoke(function, events):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run([sys.executable, '-c', INVOKE, json.dumps(events)], cwd=os.path.join(LAMBDA_DIR, function),
+                            env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize('function', sorted(FUNCTION_ROUTES))
+def test_preflight_and_unauthenticated_skip_heavy_modules(function):
+    method, path = FUNCTION_ROUTES[function]
+    events = [
+        {'httpMethod': 'OPTIONS', 'path': path, 'headers': {}},
+        {'httpMethod': method, 'path': path, 'headers': {}, 'body': '{}'},
+    ]
+    
+    result = _invoke(function, events)
+    
+    assert result['init'] == []
+    (options_status, after_options), (status, after_request) = result['requests']
+    assert options_status == 200 and after_options == []
+    assert status in (400, 401) and after_request == []
+
+
+def test_validation_error_skips_boto3():
+    event = {'httpMethod': 'POST', 'path': '/auth/register', 'headers': {},
+             'body': json.dumps({'email': 'sin-arroba', 'password': 'secret123', 'name': 'Ana'})}
+    
+    result = _invoke('auth-register', [event])
+    
+    assert result['requests'] == [[400, []]]
+
+
+def test_profile_init_reports_init_and_first_request():
+    event = profile_init.build_event('auth-profile', 'unauthenticated')
+    
+    result = profile_init.profile_function('auth-profile', event, 1)
+    
+    assert result['initMs'] > 0 and result['firstRequestMs'] > 0
+    assert 'utils' in result['initModulesUs']
+    assert not {'boto3', 'botocore', 'jwt'} & (set(result['initModulesUs']) | set(result['firstRequestModulesUs']))
+
+
+def test_parse_importtime_sums_self_time_per_package():
+    lines = [
+        'import time: self [us] | cumulative | imported package',
+        'import time:       120 |        120 |   utils.response',
+        'import time:        30 |        150 | utils',
+        'import time:      2000 |       2000 |     botocore.session',
+        'otra línea',
+    ]
+    
+    assert profile_init.parse_importtime(lines) == {'utils': 150, 'botocore': 2000}
+
+
+def test_compare_flags_regressions_above_tolerance_and_noise_floor():
+    baseline = {'functions': {'lenta': {'initMs': 100.0}, 'rapida': {'initMs': 4.0}, 'igual': {'initMs': 50.0}}}
+    results = {'lenta': {'initMs': 130.0}, 'rapida': {'initMs': 8.0}, 'igual': {'initMs': 55.0}, 'nueva': {'initMs': 1.0}}
+    
+    assert profile_init.compare(results, baseline, 0.2) == [('lenta', 100.0, 130.0)]
@@ -0,0 +1,227 @@
+"""Generador de carga (tools/loadgen.py) contra api-router detrás de un server HTTP local"""
+
+import argparse
+import asyncio
+import base64
+import gzip
+import json
+import os
+import random
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+import pytest
+
+import app
+from conftest import ROOT, make_event
+
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+import loadgen  # noqa: E402
+
+
+class ApiBridge(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive -> evento de API Gateway -> app.lambda_handler"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8') if length else None
+        path, _, query = self.path.partition('?')
+        event = make_event(self.command, path, headers=dict(self.headers), raw_body=body,
+                           query=dict(parse_qsl(query)) or None)
+        
+        response = app.lambda_handler(event, None)
+        data = response.get('body') or ''
+        data = base64.b64decode(data) if response.get('isBase64Encoded') else data.encode('utf-8')
+        
+        self.send_response(response['statusCode'])
+        for key, value in (response.get('headers') or {}).items():
+            if key.lower() != 'content-length':
+                self.send_header(key, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ApiBridge)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _args(base_url, **overrides):
+    args = dict(base_url=base_url, rate=40, duration=0.5, stages=None, mix=loadgen.DEFAULT_MIX, users=2,
+                user_prefix='loadgen', password='loadgen-password', projects_per_user=1, seed_tasks=3,
+                connections=8, max_inflight=5000, setup_concurrency=2, timeout=10, interval=0.25, seed=0,
+                output=None)
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def test_run_against_the_api(base_url, tmp_path, capsys):
+    output = tmp_path / 'run.json'
+    
+    asyncio.run(loadgen.main_async(_args(base_url, output=str(output))))
+    
+    out = capsys.readouterr().out
+    assert '2 usuarios listos' in out and 'TOTAL' in out
+    with open(output) as f:
+        run = json.load(f)
+    samples = run['samples']
+    assert samples and run['summary']['requests'] == len(samples)
+    assert run['summary']['errors'] == {}
+    assert all(200 <= sample['status'] < 300 for sample in samples)
+    assert {sample['op'] for sample in samples} <= {'list_tasks', 'update_task', 'create_task'}
+    # La latencia cuenta desde el instante programado
+    assert all(sample['done'] >= sample['t'] for sample in samples)
+
+
+def test_setup_reuses_existing_users(base_url, api):
+    args = _args(base_url)
+    
+    async def prepare():
+        client = loadgen.HttpClient(base_url, 4, 10)
+        try:
+            return await loadgen.prepare_users(client, args)
+        finally:
+            client.close()
+    
+    first = asyncio.run(prepare())
+    again = asyncio.run(prepare())
+    
+    assert [user['projects'] for user in first] == [user['projects'] for user in again]
+    assert all(len(user['tasks'][user['projects'][0]]) == 3 for user in again)
+
+
+def test_setup_error_on_bad_login(base_url):
+    async def prepare():
+        client = loadgen.HttpClient(base_url, 4, 10)
+        try:
+            await loadgen.prepare_user(client, 0, _args(base_url, password='corta'))
+        finally:
+            client.close()
+    
+    with pytest.raises(loadgen.SetupError):
+        asyncio.run(prepare())
+
+
+def test_parse_mix():
+    assert loadgen.parse_mix('list_tasks=70,profile') == (['list_tasks', 'profile'], [70.0, 1.0])
+    with pytest.raises(SystemExit):
+        loadgen.parse_mix('list_tasks=70,delete_everything=30')
+
+
+def test_arrival_offsets_follow_each_stage():
+    offsets = loadgen.arrival_offsets([(200, 2), (20, 1)], random.Random(0))
+    
+    first = [t for t in offsets if t < 2]
+    second = [t for t in offsets if t >= 2]
+    assert offsets == sorted(offsets) and offsets[-1] < 3
+    assert 340 < len(first) < 460
+    assert 8 < len(second) < 35
+
+
+def test_parse_stages_defaults_to_rate_and_duration():
+    assert loadgen.parse_stages(_args('', rate=10, duration=5)) == [(10, 5)]
+    assert loadgen.parse_stages(_args('', stages='100:30,500:60')) == [(100.0, 30.0), (500.0, 60.0)]
+
+
+def test_overloaded_client_drops_arrivals():
+    user = {'auth': {}, 'projects': ['p1'], 'tasks': {'p1': ['t1']}}
+    samples = []
+    
+    async def run():
+        await loadgen.fire(None, 'list_tasks', user, random.Random(0), 0.0, 0.0, samples, [1],
+                           _args('', max_inflight=1))
+    
+    asyncio.run(run())
+    
+    sample, = samples
+    assert (sample['status'], sample['error'], sample['latencyMs']) == (0, 'CLIENT_OVERLOAD', None)
+
+
+def test_connection_errors_are_samples():
+    user = {'auth': {}, 'projects': ['p1'], 'tasks': {'p1': []}}
+    samples = []
+    
+    async def run():
+        client = loadgen.HttpClient('http://127.0.0.1:1', 1, 2)
+        await loadgen.fire(client, 'update_task', user, random.Random(0), 0.0, 0.0, samples, [0], _args(''))
+    
+    asyncio.run(run())
+    
+    sample, = samples
+    # update_task sin tareas conocidas se degrada a list_tasks
+    assert sample['error'] == 'CONNECTION_ERROR' and sample['latencyMs'] is not None
+
+
+def _serve_raw(responses):
+    """Server asyncio que contesta cada request con el siguiente de responses (bytes o None = cerrar)"""
+    async def handle(reader, writer):
+        while responses:
+            request = await reader.readuntil(b'\r\n\r\n')
+            if not request:
+                break
+            response = responses.pop(0)
+            if response is None:
+                writer.close()
+                return
+            writer.write(response)
+            await writer.drain()
+        writer.close()
+    
+    return asyncio.start_server(handle, '127.0.0.1', 0)
+
+
+def test_client_reads_chunked_gzip():
+    payload = gzip.compress(b'{"data": {"ok": true}}')
+    chunked = (b'HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\nTransfer-Encoding: chunked\r\n\r\n'
+               + f"{len(payload[:5]):x}\r\n".encode() + payload[:5] + b'\r\n'
+               + f"{len(payload[5:]):x}\r\n".encode() + payload[5:] + b'\r\n0\r\n\r\n')
+    
+    async def run():
+        server = await _serve_raw([chunked])
+        client = loadgen.HttpClient(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/dev", 1, 5)
+        try:
+            return await client.request('GET', '/projects')
+        finally:
+            client.close()
+            server.close()
+    
+    status, headers, data = asyncio.run(run())
+    
+    assert status == 200
+    assert json.loads(data) == {'data': {'ok': True}}
+
+
+def test_client_retries_a_closed_keep_alive_connection():
+    ok = b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}'
+    
+    async def run():
+        # El primer socket contesta y se cierra sin avisar; el reintento abre otro
+        server = await _serve_raw([ok, None, ok])
+        client = loadgen.HttpClient(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}", 1, 5)
+        try:
+            first = await client.request('GET', '/a')
+            second = await client.request('GET', '/b')
+            return first, second
+        finally:
+            client.close()
+            server.close()
+    
+    first, second = asyncio.run(run())
+    
+    assert first[0] == second[0] == 200
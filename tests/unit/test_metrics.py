@@ -0,0 +1,157 @@
+"""Métricas EMF por ruta, errores por código y excepciones en el registro del request"""
+
+import contextvars
+import json
+import os
+import sys
+
+import pytest
+
+from conftest import ROOT
+from handlers import tasks as task_handlers
+from utils import async_db, metrics
+
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+import emf_report  # noqa: E402
+
+
+@pytest.fixture
+def emf(monkeypatch, capsys):
+    """Habilitar las métricas y retornar un lector de los registros EMF impresos"""
+    monkeypatch.setattr(metrics, 'METRICS_ENABLED', True)
+    monkeypatch.setattr(metrics, '_cold_start', False)
+    capsys.readouterr()
+    
+    def read():
+        return list(emf_report.parse_records(capsys.readouterr().out.splitlines()))
+    
+    return read
+
+
+def test_one_record_per_request(api, emf):
+    api.register()
+    project = api.create_project()
+    emf()
+    
+    status, _ = api.call('GET', f"/projects/{project['projectId']}/tasks")
+    
+    record, = emf()
+    assert status == 200
+    assert record['Route'] == 'handlers.tasks:list_tasks'
+    assert record['statusCode'] == 200
+    directive, = record['_aws']['CloudWatchMetrics']
+    assert directive['Dimensions'] == [['Route']]
+    names = {metric['Name'] for metric in directive['Metrics']}
+    assert {'Duration', 'ColdStart', 'ResponseSize', 'DynamoDBCalls', 'ConsumedRCU', 'ConsumedWCU'} <= names
+    assert all(name in record for name in names)
+    assert record['DynamoDBCalls'] >= 1
+    assert record['ColdStart'] == 0
+    assert 'Query' in record['ddbOperations']
+
+
+def test_error_codes_get_their_own_line(api, emf):
+    status, _ = api.call('GET', '/projects')
+    
+    record, error = emf()
+    assert status == 401
+    assert record['statusCode'] == 401
+    assert error['ErrorCode'] == 'UNAUTHORIZED' and error['Errors'] == 1
+    assert error['Route'] == record['Route']
+    assert error['_aws']['CloudWatchMetrics'][0]['Dimensions'] == [['Route', 'ErrorCode']]
+
+
+def test_handler_exception_travels_in_the_record(api, emf, monkeypatch, capsys):
+    api.register()
+    project = api.create_project()
+    
+    def fail(*args, **kwargs):
+        raise RuntimeError('tabla no disponible')
+    
+    monkeypatch.setattr(task_handlers, 'get_project_tasks', fail)
+    emf()
+    
+    status, _ = api.call('GET', f"/projects/{project['projectId']}/tasks")
+    
+    out = capsys.readouterr().out
+    assert status == 500
+    assert 'Error en' not in out
+    record, error = emf_report.parse_records(out.splitlines())
+    exception, = record['exceptions']
+    assert (exception['where'], exception['type'], exception['message']) == ('list_tasks', 'RuntimeError',
+                                                                             'tabla no disponible')
+    assert 'RuntimeError' in exception['traceback']
+    assert error['ErrorCode'] == 'INTERNAL_ERROR'
+
+
+def test_cold_start_only_on_first_invocation(api, emf, monkeypatch):
+    monkeypatch.setattr(metrics, '_cold_start', True)
+    
+    api.call('GET', '/auth/me')
+    api.call('GET', '/auth/me')
+    
+    records = [record for record in emf() if 'ErrorCode' not in record]
+    assert [record['ColdStart'] for record in records] == [1, 0]
+
+
+def test_disabled_metrics_print_nothing(api, capsys):
+    api.call('GET', '/projects')
+    
+    assert capsys.readouterr().out == ''
+
+
+def test_log_error_outside_an_invocation_prints(capsys):
+    metrics.log_error('script', ValueError('mal'))
+    
+    assert capsys.readouterr().out == 'Error en script: mal\n'
+
+
+def test_fanout_threads_report_into_the_request_buffer(monkeypatch):
+    monkeypatch.setattr(async_db, 'DB_FANOUT_ENABLED', True)
+    
+    def run():
+        metrics.start_invocation('handlers.projects:get_project_details')
+        async_db.fetch_all(*(async_db.call(metrics.put_metric, 'Leidas', value) for value in (1, 2, 3)))
+        async_db.fetch_all(async_db.call(metrics.record_error, 'NOT_FOUND'))
+        return metrics.get_buffer()
+    
+    buffer = contextvars.copy_context().run(run)
+    
+    unit, values = buffer['metrics']['Leidas']
+    assert sorted(values) == [1, 2, 3]
+    assert buffer['errors'] == {'NOT_FOUND': 1}
+
+
+def test_merge_buffer_keeps_current_properties():
+    def run():
+        metrics.start_invocation('handlers.batch:batch_handler')
+        metrics.set_property('statusCode', 200)
+        metrics.put_metric('Duration', 5, 'Milliseconds')
+        metrics.merge_buffer({'metrics': {'Duration': ('Milliseconds', [7])}, 'properties': {'statusCode': 404},
+                              'errors': {'NOT_FOUND': 1}, 'exceptions': []})
+        return metrics.get_buffer()
+    
+    buffer = contextvars.copy_context().run(run)
+    
+    assert buffer['metrics']['Duration'] == ('Milliseconds', [5, 7])
+    assert buffer['properties'] == {'statusCode': 200}
+    assert buffer['errors'] == {'NOT_FOUND': 1}
+
+
+def test_emf_report_summarizes_per_route(api, emf, monkeypatch):
+    monkeypatch.setattr(metrics, '_cold_start', True)
+    api.register()
+    for _ in range(3):
+        api.call('GET', '/auth/me')
+    api.call('GET', '/auth/me', token='no-es-un-token')
+    lines = [f"2024-03-01T12:00:00Z {json.dumps(record)}" for record in emf()] + ['START RequestId: x']
+    
+    summary = emf_report.summarize(emf_report.parse_records(lines))
+    
+    profile = summary['handlers.auth:get_profile']
+    assert profile['requests'] == 4 and profile['coldStarts'] == 0
+    assert profile['statuses'] == {'200': 3, '401': 1}
+    assert profile['errors'] == {'UNAUTHORIZED': 1}
+    assert profile['errorRate'] == 0.25
+    assert profile['warmMs']['p50'] <= profile['warmMs']['p99']
+    assert summary['handlers.auth:register']['coldStarts'] == 1
@@ -0,0 +1,56 @@
+"""Pre-calentamiento en el init de Lambda (PREWARM)"""
+
+import sys
+
+from utils import auth_utils, db_utils, entrypoint, response, routing
+
+HANDLERS = ['handlers.projects:list_projects', 'handlers.tasks:list_tasks']
+
+
+def test_disabled_by_default(monkeypatch):
+    calls = []
+    monkeypatch.setattr(db_utils, 'prewarm_connection', lambda: calls.append('connection'))
+    
+    entrypoint.prewarm(*HANDLERS)
+    
+    assert not entrypoint.PREWARM_ENABLED
+    assert calls == []
+
+
+def test_prewarm_imports_handlers_and_opens_connection(monkeypatch):
+    monkeypatch.setattr(entrypoint, 'PREWARM_ENABLED', True)
+    for ref in HANDLERS:
+        routing._handlers.pop(ref, None)
+    opened = []
+    monkeypatch.setattr(db_utils, 'prewarm_connection', lambda: opened.append(True))
+    
+    entrypoint.prewarm(*HANDLERS)
+    
+    assert all(ref in routing._handlers for ref in HANDLERS)
+    assert 'jwt' in sys.modules
+    assert response._orjson_loaded
+    assert opened
+
+
+def test_prewarm_connection_uses_repository():
+    # Con DynamoDB abre el recurso de boto3 del thread
+    db_utils.prewarm_connection()
+    
+    assert db_utils._local.resource is not None
+
+
+def test_prewarm_errors_never_fail_init(monkeypatch):
+    monkeypatch.setattr(entrypoint, 'PREWARM_ENABLED', True)
+    errors = []
+    monkeypatch.setattr(entrypoint, 'log_error', lambda where, e: errors.append(where))
+    
+    entrypoint.prewarm('handlers.nothing:missing')
+    
+    assert errors == ['prewarm']
+
+
+def test_prewarm_jwt_keeps_tokens_valid():
+    auth_utils.prewarm_jwt()
+    
+    token = auth_utils.generate_token({'userId': 'u1', 'email': 'a@example.com', 'name': 'Ana'})
+    assert auth_utils.decode_token(token)['userId'] == 'u1'
@@ -0,0 +1,127 @@
+"""Profiling bajo demanda: header firmado, muestreo y salida de los perfiles"""
+
+import contextvars
+import json
+import os
+import time
+
+import pytest
+
+from utils import entrypoint, metrics, profiling
+from utils.profiling import DEBUG_HEADER, should_profile, sign_debug_header, verify_debug_header
+
+SECRET = 'profile-secret'
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return 'listo'
+
+
+@pytest.fixture
+def armed(monkeypatch, tmp_path):
+    """Profiling armado con PROFILE_SECRET y perfiles en un directorio"""
+    monkeypatch.setattr(entrypoint, 'PROFILING_ARMED', True)
+    monkeypatch.setattr(profiling, 'PROFILE_SECRET', SECRET)
+    monkeypatch.setattr(profiling, 'PROFILE_OUTPUT', str(tmp_path / 'profiles'))
+    return tmp_path / 'profiles'
+
+
+def test_signed_header_round_trip():
+    value = sign_debug_header(SECRET, ttl_seconds=60, now=1000)
+    
+    assert value.startswith('1060.')
+    assert verify_debug_header(value, SECRET, now=1059)
+    assert not verify_debug_header(value, SECRET, now=1061)
+    assert not verify_debug_header(value, 'otro-secreto', now=1000)
+    assert not verify_debug_header('1060.' + '0' * 64, SECRET, now=1000)
+    assert not verify_debug_header('no-es-un-header', SECRET)
+    assert not verify_debug_header(None, SECRET)
+
+
+def test_should_profile_needs_a_valid_header(monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_SECRET', SECRET)
+    
+    assert should_profile({'headers': {DEBUG_HEADER.lower(): sign_debug_header(SECRET)}})
+    assert not should_profile({'headers': {DEBUG_HEADER: sign_debug_header('otro-secreto')}})
+    assert not should_profile({'headers': None})
+
+
+def test_header_ignored_without_secret(monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_SECRET', '')
+    
+    assert not should_profile({'headers': {DEBUG_HEADER: sign_debug_header('')}})
+
+
+@pytest.mark.parametrize('rate, expected', [(1, True), (0, False)])
+def test_sampling_rate(monkeypatch, rate, expected):
+    monkeypatch.setattr(profiling, 'PROFILE_ENABLED', True)
+    monkeypatch.setattr(profiling, 'PROFILE_SAMPLE_RATE', rate)
+    
+    assert should_profile({'headers': {}}) is expected
+
+
+def test_signed_request_writes_a_profile(api, armed):
+    api.register()
+    
+    status, _ = api.call('GET', '/auth/me', headers={DEBUG_HEADER: sign_debug_header(SECRET)})
+    
+    assert status == 200
+    profile, = os.listdir(armed)
+    assert '-handlers.auth.get_profile-' in profile and profile.endswith('.collapsed')
+
+
+def test_unsigned_request_is_not_profiled(api, armed):
+    api.register()
+    
+    api.call('GET', '/auth/me')
+    api.call('GET', '/auth/me', headers={DEBUG_HEADER: sign_debug_header('otro-secreto')})
+    
+    assert not os.path.exists(armed)
+
+
+def test_sampling_profiler_collapses_stacks(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, 'PROFILE_OUTPUT', str(tmp_path))
+    monkeypatch.setattr(profiling, 'PROFILE_INTERVAL_MS', 1)
+    
+    def run():
+        metrics.start_invocation('handlers.tasks:list_tasks')
+        result = profiling.run_profiled(_busy, 'handlers.tasks:list_tasks', None, 0.1)
+        return result, metrics.get_buffer()
+    
+    result, buffer = contextvars.copy_context().run(run)
+    
+    assert result == 'listo'
+    path = buffer['properties']['profile']
+    assert path.startswith(str(tmp_path)) and path.endswith('.collapsed')
+    with open(path) as f:
+        lines = f.read().split('\n')
+    stack, count = lines[0].rsplit(' ', 1)
+    assert stack.endswith('test_profiling._busy') and int(count) > 0
+
+
+def test_pstats_profile_goes_to_the_log(monkeypatch, capsys):
+    monkeypatch.setattr(profiling, 'PROFILE_OUTPUT', '')
+    monkeypatch.setattr(profiling, 'PROFILE_FORMAT', 'pstats')
+    
+    result = profiling.run_profiled(_busy, 'handlers.auth:login', None, 0.01)
+    
+    record = json.loads(capsys.readouterr().out)
+    assert result == 'listo'
+    assert (record['type'], record['format'], record['route']) == ('profile', 'pstats', 'handlers.auth:login')
+    assert '_busy' in record['stats']
+    assert record['durationMs'] >= 10
+
+
+def test_profiled_handler_error_still_writes_the_profile(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, 'PROFILE_OUTPUT', str(tmp_path))
+    
+    def fail():
+        raise RuntimeError('caída')
+    
+    with pytest.raises(RuntimeError):
+        profiling.run_profiled(fail, 'handlers.auth:login', None)
+    
+    assert len(os.listdir(tmp_path)) == 1
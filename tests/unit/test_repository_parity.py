@@ -0,0 +1,116 @@
+"""SQLite y DynamoDB devuelven los mismos items para las mismas operaciones"""
+
+import os
+
+import pytest
+
+from utils import repository
+from utils.blob_store import get_blob_store
+from utils.repository import Repository, create_repository
+
+TIMESTAMPS = ('createdAt', 'updatedAt', 'joinedAt')
+
+
+def _normalize(value):
+    """Quitar los timestamps (los genera cada backend) y ordenar las listas"""
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items() if key not in TIMESTAMPS}
+    if isinstance(value, list):
+        return sorted((_normalize(item) for item in value), key=repr)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if hasattr(value, 'to_integral_value'):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def _run(repo):
+    """Misma secuencia de operaciones en un backend; retorna cada resultado"""
+    results = {}
+    results['user'] = repo.create_user('u1', 'ana@example.com', 'Ana', 'hash')
+    results['user_by_email'] = repo.get_user_by_email('ana@example.com')
+    results['user_missing'] = repo.get_user_by_email('nadie@example.com')
+    results['user_by_id'] = repo.get_user_by_id('u1')
+    
+    results['project'] = repo.create_project('p1', 'Proyecto', 'Descripción', 'active', 'u1', 'Ana')
+    repo.create_project('p2', 'Otro', 'x' * 3000, 'active', 'u1', 'Ana')
+    results['access'] = repo.check_user_project_access('u1', 'p1')
+    results['no_access'] = repo.check_user_project_access('u2', 'p1')
+    results['members'] = repo.get_project_members('p1')
+    
+    for i in range(3):
+        repo.create_task(f"t{i}", 'p1', f"Tarea {i}", f"Descripción {i}", 'pending', None, 'u1')
+    results['project_after_tasks'] = repo.get_project('p1')
+    results['updated_task'] = repo.update_task('p1', 't0', {'status': 'completed', 'description': 'y' * 2000})
+    repo.delete_task('p1', 't1')
+    results['tasks'] = repo.get_project_tasks('p1')
+    results['tasks_preview'] = repo.get_project_tasks('p1', descriptions='preview', fields=['taskId', 'description'])
+    results['task_pages'] = [len(page) for page in repo.iter_project_task_pages('p1', page_size=1)]
+    
+    results['updated_project'] = repo.update_project('p1', {'status': 'completed', 'name': 'Renombrado'})
+    results['projects'] = repo.get_user_projects('u1')
+    results['projects_fields'] = repo.get_user_projects('u1', descriptions='preview', fields=['projectId', 'description'])
+    repo.delete_project('p2')
+    results['deleted_project'] = repo.get_project('p2')
+    
+    # Un update de algo que no existe no lo crea
+    results['update_missing_project'] = repo.update_project('p2', {'name': 'Fantasma'})
+    results['update_missing_task'] = repo.update_task('p1', 't1', {'title': 'Fantasma'})
+    results['after_missing_updates'] = (repo.get_project('p2'), [t['taskId'] for t in repo.get_project_tasks('p1')])
+    return results
+
+
+def test_sqlite_matches_dynamodb():
+    dynamodb = _run(create_repository('dynamodb'))
+    sqlite = _run(create_repository('sqlite', path=':memory:'))
+    
+    for name in dynamodb:
+        assert _normalize(sqlite[name]) == _normalize(dynamodb[name]), name
+
+
+@pytest.mark.parametrize('backend', ['dynamodb', 'sqlite'])
+def test_api_behaves_the_same_on_both_backends(api, backend):
+    if backend == 'sqlite':
+        repository.set_repository(create_repository('sqlite', path=':memory:'))
+    
+    api.register()
+    project = api.create_project(name='Proyecto', description='Descripción')
+    task = api.create_task(project['projectId'])
+    
+    status, body = api.call('GET', f"/projects/{project['projectId']}")
+    assert status == 200
+    assert body['data']['project']['taskCount'] == 1
+    
+    status, _ = api.call('DELETE', f"/projects/{project['projectId']}/tasks/{task['taskId']}")
+    assert status == 200
+    
+    status, body = api.call('GET', '/projects')
+    assert status == 200
+    assert [p['projectId'] for p in body['data']['projects']] == [project['projectId']]
+    assert body['data']['projects'][0]['taskCount'] == 0
+    
+    status, body = api.call('PUT', f"/projects/{project['projectId']}/tasks/{task['taskId']}", {'title': 'Borrada'})
+    assert status == 404
+    assert body['errorCode'] == 'NOT_FOUND'
+    status, body = api.call('GET', f"/projects/{project['projectId']}/tasks")
+    assert body['data']['tasks'] == []
+
+
+def test_repository_is_abstract():
+    with pytest.raises(TypeError):
+        Repository()
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_repository('postgres')
+
+
+def test_failed_update_removes_uploaded_blob(table):
+    repo = create_repository('dynamodb')
+    repo.create_project('p1', 'Proyecto', None, 'active', 'u1', 'Ana')
+    
+    assert repo.update_task('p1', 'missing', {'description': 'z' * 20000}) is None
+    
+    blob_dir = get_blob_store().path
+    assert not any(files for _, _, files in os.walk(blob_dir))
@@ -0,0 +1,69 @@
+"""Tabla de rutas de api-router: parámetros de path, 404, 405 y preflight"""
+
+import pytest
+
+import app
+from conftest import make_event
+from utils.routing import ROUTES, match_route, resolve_handler
+
+
+@pytest.mark.parametrize('method, path, ref, params', [
+    ('GET', '/projects', 'handlers.projects:list_projects', {}),
+    ('GET', '/projects/', 'handlers.projects:list_projects', {}),
+    ('GET', '/projects/p1', 'handlers.projects:get_project_details', {'id': 'p1'}),
+    ('GET', '/projects/p1/tasks', 'handlers.tasks:list_tasks', {'id': 'p1'}),
+    ('PUT', '/projects/p1/tasks/t1', 'handlers.tasks:update_task_handler', {'projectId': 'p1', 'taskId': 't1'}),
+    ('POST', '/batch', 'handlers.batch:batch_handler', {}),
+])
+def test_match_route(method, path, ref, params):
+    assert match_route(method, path) == (ref, params)
+
+
+def test_unknown_path_has_no_allowed_methods():
+    assert match_route('GET', '/unknown') == (None, [])
+    assert match_route('GET', '/projects/p1/tasks/t1/extra') == (None, [])
+    assert match_route('GET', None) == (None, [])
+
+
+def test_wrong_method_returns_allowed_methods():
+    ref, allowed = match_route('PATCH', '/projects/p1')
+    
+    assert ref is None
+    assert sorted(allowed) == ['DELETE', 'GET', 'PUT']
+
+
+def test_every_route_resolves_to_a_handler():
+    for _, _, ref in ROUTES:
+        assert callable(resolve_handler(ref))
+
+
+def test_router_not_found(api):
+    status, body = api.call('GET', '/nothing-here')
+    
+    assert status == 404
+    assert body['errorCode'] == 'NOT_FOUND'
+
+
+def test_router_method_not_allowed(api):
+    status, body = api.call('DELETE', '/auth/login')
+    
+    assert status == 405
+    assert body['errorCode'] == 'METHOD_NOT_ALLOWED'
+
+
+def test_router_preflight_lists_allowed_methods():
+    response = app.lambda_handler(make_event('OPTIONS', '/projects/p1/tasks'), None)
+    
+    assert response['statusCode'] == 200
+    methods = response['headers']['Access-Control-Allow-Methods'].split(',')
+    assert sorted(methods) == ['GET', 'OPTIONS', 'POST']
+
+
+def test_router_passes_path_parameters(api):
+    api.register()
+    project = api.create_project(name='Con ruta')
+    
+    status, body = api.call('GET', f"/projects/{project['projectId']}")
+    
+    assert status == 200
+    assert body['data']['project']['projectId'] == project['projectId']
@@ -0,0 +1,82 @@
+"""Backends de serialización JSON de utils.response"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from utils import response
+from utils.response import (
+    available_serializers, dumps, get_serializer, json_default, register_serializer, success_response
+)
+
+DATA = {
+    'taskCount': Decimal('3'),
+    'ratio': Decimal('0.25'),
+    'createdAt': datetime(2024, 3, 1, 12, 30),
+    'day': date(2024, 3, 1),
+    'title': 'Tarea con acentos: ñ',
+    'tags': ['a', None, True],
+}
+
+EXPECTED = {
+    'taskCount': 3,
+    'ratio': 0.25,
+    'createdAt': '2024-03-01T12:30:00',
+    'day': '2024-03-01',
+    'title': 'Tarea con acentos: ñ',
+    'tags': ['a', None, True],
+}
+
+
+@pytest.fixture
+def serializers():
+    """Restaurar los backends registrados al terminar"""
+    saved = dict(response._SERIALIZERS)
+    yield
+    response._SERIALIZERS.clear()
+    response._SERIALIZERS.update(saved)
+
+
+def test_json_default():
+    assert json_default(Decimal('7')) == 7
+    assert isinstance(json_default(Decimal('7')), int)
+    assert json_default(Decimal('1.5')) == 1.5
+    with pytest.raises(TypeError):
+        json_default(object())
+
+
+@pytest.mark.parametrize('backend', available_serializers())
+def test_backends_produce_the_same_json(backend):
+    assert json.loads(get_serializer(backend)(DATA)) == EXPECTED
+
+
+def test_orjson_falls_back_for_big_integers():
+    pytest.importorskip('orjson')
+    
+    assert json.loads(get_serializer('orjson')({'n': 2 ** 70})) == {'n': 2 ** 70}
+
+
+def test_unknown_backend_uses_fastest_available():
+    expected = 'orjson' if 'orjson' in available_serializers() else 'json'
+    
+    assert get_serializer('no-existe') is response._SERIALIZERS[expected]
+
+
+def test_register_serializer(serializers, monkeypatch):
+    register_serializer('upper', lambda obj: json.dumps(obj).upper())
+    monkeypatch.setattr(response, 'JSON_BACKEND', 'upper')
+    
+    assert 'upper' in available_serializers()
+    assert dumps({'a': 'b'}) == '{"A": "B"}'
+    assert success_response(200, {'a': 'b'})['body'] == '{"SUCCESS": TRUE, "DATA": {"A": "B"}}'
+
+
+def test_stdlib_backend_selectable(monkeypatch):
+    monkeypatch.setattr(response, 'JSON_BACKEND', 'json')
+    
+    assert get_serializer() is response._dumps_stdlib
+    assert json.loads(success_response(201, DATA, 'Creado')['body']) == {
+        'success': True, 'message': 'Creado', 'data': EXPECTED
+    }
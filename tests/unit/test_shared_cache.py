@@ -0,0 +1,143 @@
+"""Cache compartido de las lecturas de db_utils e invalidación por generaciones"""
+
+import pytest
+
+from utils import db_utils, shared_cache
+from utils.shared_cache import LocalCache, get_stats, reset_stats, set_shared_cache
+
+
+def _fakeredis():
+    fakeredis = pytest.importorskip('fakeredis')
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture(params=['local', 'fakeredis'])
+def cache(request):
+    client = LocalCache() if request.param == 'local' else _fakeredis()
+    set_shared_cache(client)
+    return client
+
+
+def _stats(read):
+    reset_stats()
+    value = read()
+    return value, get_stats()
+
+
+class BrokenCache:
+    """Cliente cuyas operaciones fallan (servidor caído)"""
+    
+    def _fail(self, *args, **kwargs):
+        raise ConnectionError('cache caído')
+    
+    get = mget = set = delete = _fail
+
+
+def test_local_cache_ttl_and_nx(monkeypatch):
+    client = LocalCache()
+    now = [100.0]
+    monkeypatch.setattr(shared_cache.time, 'monotonic', lambda: now[0])
+    
+    assert client.set('a', 'uno', ex=10)
+    assert client.set('a', 'dos', nx=True) is None
+    assert client.mget(['a', 'b']) == [b'uno', None]
+    
+    now[0] += 10
+    assert client.get('a') is None
+    assert client.delete('a') == 0
+
+
+def test_project_reads_hit_after_first_miss(cache, api):
+    api.register()
+    project = api.create_project(name='Cacheado')
+    
+    _, first = _stats(lambda: db_utils.get_project(project['projectId']))
+    value, second = _stats(lambda: db_utils.get_project(project['projectId']))
+    
+    assert first == {'hits': 0, 'misses': 1, 'errors': 0}
+    assert second == {'hits': 1, 'misses': 0, 'errors': 0}
+    assert value['name'] == 'Cacheado'
+
+
+def test_task_writes_invalidate_project_reads(cache, api):
+    api.register()
+    project = api.create_project()
+    path = f"/projects/{project['projectId']}/tasks"
+    
+    assert api.call('GET', path)[1]['data']['tasks'] == []
+    task = api.create_task(project['projectId'], title='Nueva')
+    assert [t['title'] for t in api.call('GET', path)[1]['data']['tasks']] == ['Nueva']
+    
+    api.call('PUT', f"{path}/{task['taskId']}", {'title': 'Renombrada'})
+    assert [t['title'] for t in api.call('GET', path)[1]['data']['tasks']] == ['Renombrada']
+    
+    api.call('DELETE', f"{path}/{task['taskId']}")
+    assert api.call('GET', path)[1]['data']['tasks'] == []
+    assert api.call('GET', f"/projects/{project['projectId']}")[1]['data']['project']['taskCount'] == 0
+
+
+def test_user_project_list_follows_writes(cache, api):
+    user = api.register()
+    user_id = user['user']['userId']
+    
+    def names():
+        return sorted(p['name'] for p in api.call('GET', '/projects')[1]['data']['projects'])
+    
+    assert names() == []
+    first = api.create_project(name='Primero')
+    assert names() == ['Primero']
+    
+    _, stats = _stats(lambda: db_utils.get_user_projects(user_id))
+    _, stats = _stats(lambda: db_utils.get_user_projects(user_id))
+    assert stats['hits'] == 1
+    
+    api.create_project(name='Segundo')
+    assert names() == ['Primero', 'Segundo']
+    
+    api.call('PUT', f"/projects/{first['projectId']}", {'name': 'Renombrado'})
+    assert names() == ['Renombrado', 'Segundo']
+    
+    api.call('DELETE', f"/projects/{first['projectId']}")
+    assert names() == ['Segundo']
+    
+    status, body = api.call('GET', '/auth/me')
+    assert status == 200
+    assert body['data']['statistics']['totalProjects'] == 1
+
+
+def test_fields_variant_keeps_requested_fields(cache, api):
+    user = api.register()
+    api.create_project(name='Con campos')
+    
+    for _ in range(2):
+        projects = db_utils.get_user_projects(user['user']['userId'], fields=['name'])
+        assert [set(p) for p in projects] == [{'name', 'userRole'}]
+
+
+def test_generations_expire():
+    client = _fakeredis()
+    set_shared_cache(client)
+    
+    shared_cache.invalidate_project('p1')
+    db_utils.get_user_projects('u1')
+    
+    assert 0 < client.ttl(shared_cache._gen_key('p1')) <= shared_cache.SHARED_CACHE_GEN_TTL
+    assert 0 < client.ttl(shared_cache._gen_key('user:u1')) <= shared_cache.SHARED_CACHE_GEN_TTL
+
+
+def test_broken_cache_falls_back_to_repository(api):
+    api.register()
+    project = api.create_project(name='Sin cache')
+    set_shared_cache(BrokenCache())
+    
+    value, stats = _stats(lambda: db_utils.get_project(project['projectId']))
+    
+    assert value['name'] == 'Sin cache'
+    assert stats['errors'] == 1
+    assert api.call('GET', '/projects')[1]['data']['projects'][0]['name'] == 'Sin cache'
+    assert api.call('PUT', f"/projects/{project['projectId']}", {'name': 'Igual'})[0] == 200
+
+
+def test_unknown_cache_kind():
+    with pytest.raises(ValueError):
+        shared_cache.create_shared_cache('memcached')
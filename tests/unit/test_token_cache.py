@@ -0,0 +1,170 @@
+"""Cache de tokens verificados: aciertos, vencimiento, LRU y revocación"""
+
+import time
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+
+from utils import auth_utils
+from utils.auth_utils import (
+    _TokenCache, clear_token_cache, decode_token, generate_token, get_token_cache_stats, revoke_token
+)
+
+USER = {'userId': 'u1', 'email': 'ana@example.com', 'name': 'Ana'}
+
+
+def _token(expires_in, **claims):
+    payload = {**USER, **claims, 'exp': datetime.utcnow() + timedelta(seconds=expires_in), 'iat': datetime.utcnow()}
+    return jwt.encode(payload, auth_utils.JWT_KEY, algorithm=auth_utils.JWT_ALGORITHM)
+
+
+@pytest.fixture
+def verifications(monkeypatch):
+    """Contar las verificaciones de firma (las que el cache evita)"""
+    calls = []
+    verify = auth_utils._verify_token
+    
+    def counting(token):
+        calls.append(token)
+        return verify(token)
+    
+    monkeypatch.setattr(auth_utils, '_verify_token', counting)
+    return calls
+
+
+def test_second_decode_is_a_hit(verifications):
+    token = generate_token(USER)
+    
+    first = decode_token(token)
+    second = decode_token(token)
+    
+    assert first == second
+    assert first['userId'] == 'u1'
+    assert len(verifications) == 1
+    stats = get_token_cache_stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+
+def test_returned_claims_are_copies():
+    token = generate_token(USER)
+    decode_token(token)['userId'] = 'otro'
+    
+    assert decode_token(token)['userId'] == 'u1'
+
+
+def test_invalid_tokens_not_cached(verifications):
+    token = generate_token(USER)
+    forged = token[:-4] + ('AAAA' if not token.endswith('AAAA') else 'BBBB')
+    
+    assert decode_token(forged) is None
+    assert decode_token(forged) is None
+    assert decode_token(_token(-10)) is None
+    assert len(verifications) == 3
+    assert get_token_cache_stats()['size'] == 0
+
+
+def test_cached_entry_expires():
+    cache = _TokenCache(4)
+    now = time.time()
+    cache.put(b'a', {'userId': 'u1'}, now + 5)
+    
+    assert cache.get(b'a', now) == {'userId': 'u1'}
+    assert cache.get(b'a', now + 5) is None
+    assert cache.stats()['expired'] == 1
+    assert cache.stats()['size'] == 0
+
+
+def test_token_expiring_while_cached(monkeypatch, verifications):
+    token = _token(60)
+    assert decode_token(token)['userId'] == 'u1'
+    
+    real_time = time.time
+    monkeypatch.setattr(auth_utils.time, 'time', lambda: real_time() + 120)
+    
+    # Pasado su exp el cache no lo da por válido: vuelve a jwt.decode (que
+    # acá lo acepta, su reloj no está adelantado)
+    decode_token(token)
+    assert len(verifications) == 2
+    assert get_token_cache_stats()['expired'] == 1
+
+
+def test_lru_eviction():
+    cache = _TokenCache(2)
+    far = time.time() + 3600
+    cache.put(b'a', {'n': 1}, far)
+    cache.put(b'b', {'n': 2}, far)
+    cache.get(b'a', time.time())
+    
+    cache.put(b'c', {'n': 3}, far)
+    
+    assert cache.get(b'b', time.time()) is None
+    assert cache.get(b'a', time.time()) == {'n': 1}
+    assert cache.stats()['evictions'] == 1
+
+
+def test_revoked_token_rejected_even_if_cached():
+    token = generate_token(USER)
+    assert decode_token(token) is not None
+    
+    assert revoke_token(token) is True
+    
+    assert decode_token(token) is None
+    stats = get_token_cache_stats()
+    assert stats['revoked'] == 1
+    assert stats['revokedTokens'] >= 1
+
+
+def test_revocation_survives_clear():
+    token = _token(3600, jti='clear')
+    revoke_token(token)
+    
+    clear_token_cache()
+    
+    assert decode_token(token) is None
+
+
+def test_revoke_invalid_token():
+    assert revoke_token('no-es-un-token') is False
+    assert revoke_token(_token(-10)) is False
+
+
+def test_revoked_entry_forgotten_after_exp():
+    cache = _TokenCache(4)
+    now = time.time()
+    cache.revoke(b'a', now + 5)
+    
+    assert cache.is_revoked(b'a', now)
+    assert not cache.is_revoked(b'a', now + 5)
+    assert cache.stats()['revokedTokens'] == 0
+
+
+def test_clear_resets_entries_and_counters():
+    decode_token(generate_token(USER))
+    
+    clear_token_cache()
+    
+    stats = get_token_cache_stats()
+    assert all(stats[name] == 0 for name in ('hits', 'misses', 'expired', 'evictions', 'revoked', 'size'))
+
+
+def test_cache_disabled(monkeypatch, verifications):
+    monkeypatch.setattr(auth_utils, 'TOKEN_CACHE_SIZE', 0)
+    token = generate_token(USER)
+    
+    decode_token(token)
+    decode_token(token)
+    
+    assert len(verifications) == 2
+    assert get_token_cache_stats()['size'] == 0
+
+
+def test_api_rejects_revoked_token(api):
+    api.register()
+    assert api.call('GET', '/auth/me')[0] == 200
+    
+    revoke_token(api.token)
+    
+    status, body = api.call('GET', '/auth/me')
+    assert status == 401
+    assert body['errorCode'] == 'UNAUTHORIZED'
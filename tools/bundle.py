@@ -0,0 +1,265 @@
+"""
+Bundles mínimos por función con bytecode precompilado
+
+Para cada función de src/lambda:
+
+1. Resuelve estáticamente (modulefinder) qué módulos alcanza app.py, más
+   los handlers referenciados como 'módulo:función' (HANDLER del app.py, o
+   toda la tabla de utils/routing.py si el app usa ROUTES o es el batch) y
+   los scripts que lance run.sh.
+2. Copia solo esos módulos locales: tasks-list, por ejemplo, no lleva
+   handlers/auth.py ni handlers/projects.py.
+3. Instala solo los paquetes de requirements.txt que el código alcanza y
+   que el runtime no provee (boto3/botocore ya vienen en Lambda).
+4. Precompila todo a .pyc con invalidación UNCHECKED_HASH: /var/task es de
+   solo lectura, así que sin .pyc empaquetados cada cold start recompila
+   las fuentes.
+5. Reporta tamaño (en disco y zip) e init medido (import app + primer
+   request sin token) del bundle frente al directorio original.
+
+Uso:
+    python tools/bundle.py --output build/lambda
+    python tools/bundle.py --functions tasks-list api-router --sourceless
+"""
+
+import argparse
+import ast
+import compileall
+import io
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import zipfile
+from modulefinder import ModuleFinder
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+LAMBDA_DIR = os.path.join(ROOT, 'src', 'lambda')
+
+# Paquetes incluidos en el runtime python3.11 de Lambda
+RUNTIME_PROVIDED = {'boto3', 'botocore', 's3transfer', 'jmespath', 'urllib3', 'python-dateutil', 'six'}
+
+# Nombre de distribución (requirements.txt) -> módulo importable
+DISTRIBUTION_MODULES = {'pyjwt': 'jwt', 'python-dateutil': 'dateutil'}
+
+HANDLER_REF = re.compile(r'^[\w.]+:\w+$')
+
+# Handler que resuelve sus sub-requests con la tabla de utils/routing.py
+BATCH_MODULE = 'handlers.batch'
+
+INIT_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import app
+app.lambda_handler(json.loads(sys.argv[1]), None)
+print(time.perf_counter() - start)
+'''
+
+
+def _string_refs(tree):
+    """Constantes 'módulo:función' de un AST"""
+    return {
+        node.value.split(':')[0] for node in ast.walk(tree)
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and HANDLER_REF.match(node.value)
+    }
+
+
+def handler_refs(function_dir):
+    """
+    Módulos de handlers referenciados como 'módulo:función' desde app.py
+    
+    Toda la tabla de utils/routing.py se agrega si el app usa ROUTES o si
+    alcanza handlers.batch, que despacha sus sub-requests por esa tabla.
+    """
+    with open(os.path.join(function_dir, 'app.py'), encoding='utf-8') as f:
+        app_tree = ast.parse(f.read())
+    
+    modules = _string_refs(app_tree)
+    uses_routes = any(isinstance(node, ast.Name) and node.id == 'ROUTES' for node in ast.walk(app_tree))
+    if uses_routes or BATCH_MODULE in modules:
+        with open(os.path.join(function_dir, 'utils', 'routing.py'), encoding='utf-8') as f:
+            modules |= _string_refs(ast.parse(f.read()))
+    return modules
+
+
+def entry_scripts(function_dir):
+    """app.py más los scripts Python que lance run.sh (p.ej. server.py)"""
+    scripts = ['app.py']
+    run_sh = os.path.join(function_dir, 'run.sh')
+    if os.path.exists(run_sh):
+        with open(run_sh) as f:
+            scripts += [name for name in re.findall(r'([\w-]+\.py)', f.read()) if name not in scripts]
+    return scripts
+
+
+def resolve_modules(function_dir):
+    """
+    Resolver los módulos que alcanza la función
+    
+    Returns:
+        (archivos locales relativos a function_dir, módulos de terceros de primer nivel)
+    """
+    finder = ModuleFinder(path=[function_dir] + sys.path)
+    for script in entry_scripts(function_dir):
+        finder.run_script(os.path.join(function_dir, script))
+    for module in handler_refs(function_dir):
+        finder.import_hook(module)
+    
+    function_dir = os.path.realpath(function_dir)
+    local_files = set(entry_scripts(function_dir))
+    third_party = set()
+    for name, module in finder.modules.items():
+        path = module.__file__
+        if not path:
+            continue
+        path = os.path.realpath(path)
+        if path.startswith(function_dir + os.sep):
+            local_files.add(os.path.relpath(path, function_dir))
+        else:
+            third_party.add(name.split('.')[0])
+    
+    # Paquetes opcionales que el código importa dentro de try/except
+    third_party.update(name.split('.')[0] for name in finder.badmodules)
+    return sorted(local_files), third_party
+
+
+def required_distributions(function_dir, reached_modules):
+    """Líneas de requirements.txt alcanzadas y no provistas por el runtime"""
+    path = os.path.join(function_dir, 'requirements.txt')
+    if not os.path.exists(path):
+        return []
+    
+    requirements = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            distribution = re.split(r'[<>=!~\[ ]', line, maxsplit=1)[0].lower()
+            module = DISTRIBUTION_MODULES.get(distribution, distribution.replace('-', '_'))
+            if distribution not in RUNTIME_PROVIDED and module in reached_modules:
+                requirements.append(line)
+    return requirements
+
+
+def install_requirements(requirements, target, python_version):
+    if not requirements:
+        return
+    subprocess.run(
+        [sys.executable, '-m', 'pip', 'install', '--quiet', '--target', target,
+         '--platform', 'manylinux2014_x86_64', '--implementation', 'cp',
+         '--python-version', python_version, '--only-binary=:all:', '--no-compile',
+         *requirements],
+        check=True
+    )
+
+
+def precompile(target, sourceless):
+    """Compilar a .pyc; con sourceless se reemplazan los .py por los .pyc"""
+    compileall.compile_dir(target, quiet=1, legacy=sourceless,
+                           invalidation_mode=compileall.py_compile.PycInvalidationMode.UNCHECKED_HASH)
+    if sourceless:
+        for directory, _, files in os.walk(target):
+            for name in files:
+                if name.endswith('.py') and os.path.exists(os.path.join(directory, name + 'c')):
+                    os.remove(os.path.join(directory, name))
+
+
+def directory_size(path):
+    """(bytes en disco, bytes comprimidos en zip) de un directorio"""
+    raw = 0
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for directory, _, files in os.walk(path):
+            for name in files:
+                file_path = os.path.join(directory, name)
+                raw += os.path.getsize(file_path)
+                archive.write(file_path, os.path.relpath(file_path, path))
+    return raw, buffer.tell()
+
+
+def measure_init(function_dir, repeat):
+    """Mediana en ms de import app + primer request sin token"""
+    event = json.dumps({'httpMethod': 'GET', 'path': '/auth/me', 'headers': {}})
+    env = dict(os.environ)
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    env['PREWARM'] = 'false'
+    
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', INIT_SCRIPT, event], cwd=function_dir,
+                                env=env, capture_output=True, text=True, check=True)
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings) * 1000
+
+
+def bundle_function(function, args):
+    source = os.path.join(LAMBDA_DIR, function)
+    target = os.path.join(args.output, function)
+    shutil.rmtree(target, ignore_errors=True)
+    os.makedirs(target)
+    
+    local_files, third_party = resolve_modules(source)
+    for relative in local_files:
+        os.makedirs(os.path.dirname(os.path.join(target, relative)), exist_ok=True)
+        shutil.copy2(os.path.join(source, relative), os.path.join(target, relative))
+    for extra in ('run.sh',):
+        if os.path.exists(os.path.join(source, extra)):
+            shutil.copy2(os.path.join(source, extra), os.path.join(target, extra))
+    
+    requirements = required_distributions(source, third_party)
+    if not args.skip_install:
+        install_requirements(requirements, target, args.python_version)
+    precompile(target, args.sourceless)
+    
+    report = {
+        'localModules': local_files,
+        'vendored': requirements,
+        'sourceBytes': directory_size(source)[0],
+    }
+    report['bundleBytes'], report['bundleZipBytes'] = directory_size(target)
+    if args.measure:
+        report['sourceInitMs'] = round(measure_init(source, args.repeat), 2)
+        report['bundleInitMs'] = round(measure_init(target, args.repeat), 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--functions', nargs='*', help='Default: todas las de src/lambda')
+    parser.add_argument('--output', default=os.path.join(ROOT, 'build', 'lambda'))
+    parser.add_argument('--python-version', default='3.11', help='Versión del runtime de Lambda')
+    parser.add_argument('--sourceless', action='store_true', help='Empaquetar solo .pyc (sin .py)')
+    parser.add_argument('--skip-install', action='store_true', help='No instalar dependencias (sin red)')
+    parser.add_argument('--no-measure', dest='measure', action='store_false', help='No medir init')
+    parser.add_argument('--repeat', type=int, default=5, help='Procesos para medir init (mediana)')
+    args = parser.parse_args()
+    
+    if f"{sys.version_info.major}.{sys.version_info.minor}" != args.python_version:
+        print(f"Aviso: el bytecode se compila con Python {sys.version_info.major}.{sys.version_info.minor} "
+              f"y el runtime es {args.python_version}; los .pyc no se usarán", file=sys.stderr)
+    
+    functions = args.functions or sorted(
+        name for name in os.listdir(LAMBDA_DIR) if os.path.exists(os.path.join(LAMBDA_DIR, name, 'app.py'))
+    )
+    
+    reports = {}
+    for function in functions:
+        report = reports[function] = bundle_function(function, args)
+        line = (f"{function:<18}{len(report['localModules']):>3} módulos  "
+                f"{report['bundleBytes'] / 1024:>8.1f} KB (zip {report['bundleZipBytes'] / 1024:.1f} KB)  "
+                f"vendor: {', '.join(report['vendored']) or '-'}")
+        if args.measure:
+            line += f"  init {report['sourceInitMs']:.1f} -> {report['bundleInitMs']:.1f} ms"
+        print(line)
+    
+    with open(os.path.join(args.output, 'report.json'), 'w') as f:
+        json.dump(reports, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
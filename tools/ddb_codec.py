@@ -0,0 +1,96 @@
+"""
+Codec rápido entre el formato de atributos de bajo nivel de DynamoDB
+({'S': ...}, {'N': ...}) y tipos de Python
+
+Evita el TypeDeserializer de boto3, que crea un Decimal con contexto por cada
+número. Los números se decodifican a int cuando son enteros y a float si no,
+que es lo que necesitan los formatos de exportación (NDJSON / Parquet).
+"""
+
+import base64
+from decimal import Decimal
+
+
+def _decode_number(value):
+    if '.' in value or 'e' in value or 'E' in value:
+        return float(value)
+    return int(value)
+
+
+def _decode_binary(value):
+    return base64.b64encode(value).decode('ascii')
+
+
+_DECODERS = {
+    'S': lambda value: value,
+    'N': _decode_number,
+    'BOOL': lambda value: value,
+    'NULL': lambda value: None,
+    'B': _decode_binary,
+    'SS': list,
+    'NS': lambda values: [_decode_number(v) for v in values],
+    'BS': lambda values: [_decode_binary(v) for v in values],
+    'M': lambda value: decode_item(value),
+    'L': lambda values: [decode_value(v) for v in values],
+}
+
+
+def decode_value(attribute):
+    """Decodificar un atributo de bajo nivel ({'S': 'x'}) a Python"""
+    (type_code, value), = attribute.items()
+    return _DECODERS[type_code](value)
+
+
+def decode_item(item):
+    """Decodificar un item completo de bajo nivel a un dict de Python"""
+    return {name: decode_value(attribute) for name, attribute in item.items()}
+
+
+def encode_value(value):
+    """Codificar un valor de Python a un atributo de bajo nivel"""
+    if value is None:
+        return {'NULL': True}
+    if isinstance(value, bool):
+        return {'BOOL': value}
+    if isinstance(value, str):
+        return {'S': value}
+    if isinstance(value, (int, float, Decimal)):
+        return {'N': str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {'B': bytes(value)}
+    if isinstance(value, dict):
+        return {'M': encode_item(value)}
+    if isinstance(value, (list, tuple)):
+        return {'L': [encode_value(v) for v in value]}
+    raise TypeError(f"Tipo no soportado por el codec: {type(value).__name__}")
+
+
+def encode_item(item):
+    """Codificar un dict de Python a un item de bajo nivel"""
+    return {name: encode_value(value) for name, value in item.items()}
+
+
+def entity_type(item):
+    """
+    Clasificar un item decodificado según su PK/SK
+    
+    Returns:
+        USER, USER_PROJECT, PROJECT, MEMBER, TASK u OTHER
+    """
+    pk = item.get('PK', '')
+    sk = item.get('SK', '')
+    
+    if pk.startswith('USER#'):
+        if sk == 'PROFILE':
+            return 'USER'
+        if sk.startswith('PROJECT#'):
+            return 'USER_PROJECT'
+    elif pk.startswith('PROJECT#'):
+        if sk == 'METADATA':
+            return 'PROJECT'
+        if sk.startswith('MEMBER#'):
+            return 'MEMBER'
+        if sk.startswith('TASK#'):
+            return 'TASK'
+    
+    return 'OTHER'
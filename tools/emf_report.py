@@ -0,0 +1,160 @@
+"""
+Reporte de las métricas EMF (utils/metrics.py) capturadas de los logs
+
+Lee la salida de las funciones (CloudWatch Logs exportado, `sam logs`,
+`sam local start-api` o stdout de los benchmarks) y resume por ruta:
+requests, cold starts, latencia p50/p95/p99 de invocaciones calientes,
+duración media de los cold starts, porcentaje del tiempo en DynamoDB,
+tamaño de respuesta, RCU/WCU, tasa de aciertos del cache compartido
+(utils/shared_cache.py) y errores por código. Las líneas que no son
+EMF se ignoran; el JSON puede venir precedido de timestamp o requestId.
+
+Uso:
+    sam logs -n taskslistFunction --stack-name <stack> > logs.txt
+    python tools/emf_report.py logs.txt
+    aws logs tail /aws/lambda/tasks-list-dev --since 1h | python tools/emf_report.py --json
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+from collections import Counter, defaultdict
+
+
+def parse_records(lines):
+    """Generar los registros EMF (dicts con '_aws') de un iterable de líneas"""
+    for line in lines:
+        start = line.find('{')
+        if start < 0 or '"_aws"' not in line:
+            continue
+        try:
+            record = json.loads(line[start:])
+        except ValueError:
+            continue
+        if isinstance(record, dict) and '_aws' in record:
+            yield record
+
+
+def percentile(values, pct):
+    """Percentil por rango más cercano"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _mean(values):
+    return statistics.fmean(values) if values else None
+
+
+def _values(record, name):
+    value = record.get(name)
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def summarize(records):
+    """
+    Agregar los registros por ruta
+    
+    Returns:
+        dict {route: resumen}
+    """
+    routes = defaultdict(lambda: {
+        'warm': [], 'cold': [], 'share': [], 'size': [], 'rcu': 0.0, 'wcu': 0.0, 'hits': 0, 'misses': 0,
+        'statuses': Counter(), 'errors': Counter(), 'exceptions': Counter(),
+    })
+    
+    for record in records:
+        data = routes[record.get('Route', '?')]
+        
+        # Líneas de error: una por código, sin el resto de las métricas
+        if 'ErrorCode' in record:
+            data['errors'][record['ErrorCode']] += record.get('Errors', 1)
+            continue
+        
+        durations = _values(record, 'Duration')
+        data['cold' if record.get('ColdStart') else 'warm'].extend(durations)
+        data['share'].extend(_values(record, 'DynamoDBTimeShare'))
+        data['size'].extend(_values(record, 'ResponseSize'))
+        data['rcu'] += sum(_values(record, 'ConsumedRCU'))
+        data['wcu'] += sum(_values(record, 'ConsumedWCU'))
+        data['hits'] += sum(_values(record, 'CacheHits'))
+        data['misses'] += sum(_values(record, 'CacheMisses'))
+        if 'statusCode' in record:
+            data['statuses'][str(record['statusCode'])] += 1
+        for exc in record.get('exceptions', []):
+            data['exceptions'][f"{exc.get('where')}: {exc.get('type')}"] += 1
+    
+    summary = {}
+    for route, data in sorted(routes.items()):
+        warm, cold = data['warm'], data['cold']
+        requests = len(warm) + len(cold)
+        lookups = data['hits'] + data['misses']
+        summary[route] = {
+            'requests': requests,
+            'coldStarts': len(cold),
+            'warmMs': {
+                'p50': percentile(warm, 50),
+                'p95': percentile(warm, 95),
+                'p99': percentile(warm, 99),
+                'max': max(warm),
+            } if warm else None,
+            'coldStartMeanMs': _mean(cold),
+            'dynamoDbTimeSharePct': _mean(data['share']),
+            'responseBytesMean': _mean(data['size']),
+            'rcu': data['rcu'],
+            'wcu': data['wcu'],
+            'cacheHitRatePct': 100 * data['hits'] / lookups if lookups else None,
+            'statuses': dict(data['statuses']),
+            'errors': dict(data['errors']),
+            'errorRate': sum(data['errors'].values()) / requests if requests else None,
+            'exceptions': dict(data['exceptions']),
+        }
+    return summary
+
+
+def _fmt(value, spec='.1f'):
+    return '-' if value is None else format(value, spec)
+
+
+def print_report(summary):
+    print(f"{'ruta':<40}{'req':>6}{'cold':>6}{'p50':>8}{'p95':>8}{'p99':>8}{'cold ms':>9}"
+          f"{'ddb %':>7}{'bytes':>8}{'RCU':>8}{'WCU':>8}{'cache %':>9}  errores")
+    for route, data in summary.items():
+        warm = data['warmMs'] or {}
+        errors = ', '.join(f"{code} {count}" for code, count in sorted(data['errors'].items())) or '-'
+        print(f"{route:<40}{data['requests']:>6}{data['coldStarts']:>6}"
+              f"{_fmt(warm.get('p50')):>8}{_fmt(warm.get('p95')):>8}{_fmt(warm.get('p99')):>8}"
+              f"{_fmt(data['coldStartMeanMs']):>9}{_fmt(data['dynamoDbTimeSharePct']):>7}"
+              f"{_fmt(data['responseBytesMean'], '.0f'):>8}{data['rcu']:>8.1f}{data['wcu']:>8.1f}"
+              f"{_fmt(data['cacheHitRatePct']):>9}  {errors}")
+        for where, count in sorted(data['exceptions'].items()):
+            print(f"{'':<40}excepción {where} x{count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*', help='Archivos de log (default: stdin)')
+    parser.add_argument('--json', action='store_true', help='Imprimir el resumen como JSON')
+    args = parser.parse_args()
+    
+    records = []
+    for path in args.files or ['-']:
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8', errors='replace')
+        with stream:
+            records.extend(parse_records(stream))
+    
+    if not records:
+        raise SystemExit('No se encontraron registros EMF')
+    
+    summary = summarize(records)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(summary)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+"""
+Exportación paralela de la tabla completa a NDJSON o Parquet
+
+Ejecuta un Scan paralelo (Segment / TotalSegments) en un pool de threads o
+procesos y escribe un archivo por tipo de entidad (USER, USER_PROJECT,
+PROJECT, MEMBER, TASK) y segmento:
+
+    <output>/TASK/segment-0003.ndjson
+    <output>/TASK/segment-0003-page-000012.parquet
+
+Los items salen con los nombres lógicos de sus atributos y timestamps ISO
+(utils.item_codec), sin importar el esquema con que se escribieron. Las
+descripciones que están en el blob store se leen de --blob-store (el mismo
+que usan las funciones; BLOB_STORE si no se pasa), todas las de una página
+juntas. Si falta un blob el segmento falla: no se exporta la vista previa
+en lugar del texto.
+
+Cada segmento guarda un checkpoint después de cada página (LastEvaluatedKey
+y tamaño de sus archivos), así que con --resume se retoma donde quedó sin
+duplicar items. --max-rcu limita la capacidad de lectura consumida por
+segundo entre todos los workers.
+
+Uso:
+    python tools/export_table.py --table ProjectManagement-dev --output snapshot/ --segments 8 \\
+        --blob-store s3 --blob-bucket <bucket>
+    python tools/export_table.py --table ProjectManagement-dev --endpoint-url http://localhost:8000 \\
+        --output snapshot/ --format parquet --max-rcu 200 --resume --blob-store local
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import boto3
+
+from ddb_codec import decode_item, entity_type
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'lambda', 'tasks-list'))
+
+from utils.blob_store import create_blob_store, set_blob_store  # noqa: E402
+from utils.item_codec import description_ref, load_descriptions, unpack_item  # noqa: E402
+
+CHECKPOINT_DIR = '_checkpoints'
+
+
+class RateLimiter:
+    """
+    Token bucket de unidades de capacidad por segundo
+    
+    consume() descuenta lo que ya se consumió y duerme mientras el balance
+    sea negativo, así que un Scan que lee de más se compensa en la página
+    siguiente.
+    """
+    
+    def __init__(self, rate):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def consume(self, units):
+        if not self.rate:
+            return
+        
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= units
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        
+        if wait:
+            time.sleep(wait)
+
+
+class SegmentCheckpoint:
+    """Estado persistido de un segmento del Scan"""
+    
+    def __init__(self, output, segment):
+        self.path = os.path.join(output, CHECKPOINT_DIR, f"segment-{segment:04d}.json")
+        self.state = {'done': False, 'lastEvaluatedKey': None, 'pages': 0, 'items': 0,
+                      'consumedCapacity': 0.0, 'offsets': {}}
+    
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.state = json.load(f)
+        return self.state
+    
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+
+class NDJSONSegmentWriter:
+    """Un archivo NDJSON por entidad para un segmento"""
+    
+    def __init__(self, output, segment, offsets):
+        self.output = output
+        self.segment = segment
+        self.files = {}
+        
+        # Descartar lo escrito después del último checkpoint
+        for entity, offset in offsets.items():
+            f = open(self._path(entity), 'r+b' if os.path.exists(self._path(entity)) else 'w+b')
+            f.truncate(offset)
+            f.seek(offset)
+            self.files[entity] = f
+    
+    def _path(self, entity):
+        return os.path.join(self.output, entity, f"segment-{self.segment:04d}.ndjson")
+    
+    def write_page(self, page, rows_by_entity):
+        for entity, rows in rows_by_entity.items():
+            f = self.files.get(entity)
+            if f is None:
+                os.makedirs(os.path.dirname(self._path(entity)), exist_ok=True)
+                f = self.files[entity] = open(self._path(entity), 'wb')
+            f.write(''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows).encode('utf-8'))
+        
+        for f in self.files.values():
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def offsets(self):
+        return {entity: f.tell() for entity, f in self.files.items()}
+    
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+
+class ParquetSegmentWriter:
+    """Un archivo Parquet por entidad y página para un segmento"""
+    
+    def __init__(self, output, segment, offsets):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit('El formato parquet requiere pyarrow (pip install pyarrow)')
+        
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.output = output
+        self.segment = segment
+    
+    def write_page(self, page, rows_by_entity):
+        for entity, rows in rows_by_entity.items():
+            # Unión de columnas de la página (los items no comparten esquema fijo)
+            columns = {}
+            for row in rows:
+                columns.update(dict.fromkeys(row))
+            normalized = [{column: row.get(column) for column in columns} for row in rows]
+            
+            directory = os.path.join(self.output, entity)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"segment-{self.segment:04d}-page-{page:06d}.parquet")
+            self.pq.write_table(self.pa.Table.from_pylist(normalized), path)
+    
+    def offsets(self):
+        return {}
+    
+    def close(self):
+        pass
+
+
+WRITERS = {'ndjson': NDJSONSegmentWriter, 'parquet': ParquetSegmentWriter}
+
+_limiter = None
+
+
+def _init_worker(rate, blob_store, blob_options):
+    """Inicializar el limitador y el blob store del proceso/worker"""
+    global _limiter
+    _limiter = RateLimiter(rate)
+    set_blob_store(create_blob_store(blob_store, **blob_options))
+
+
+def export_segment(options, segment):
+    """
+    Exportar un segmento del Scan
+    
+    Returns:
+        dict con items por entidad, páginas y capacidad consumida
+    """
+    checkpoint = SegmentCheckpoint(options['output'], segment)
+    state = checkpoint.load() if options['resume'] else checkpoint.state
+    counts = {}
+    if state['done']:
+        return {'segment': segment, 'skipped': True, 'items': {}, 'pages': 0, 'consumedCapacity': 0.0}
+    
+    client = boto3.client('dynamodb', endpoint_url=options['endpoint_url'], region_name=options['region'])
+    writer = WRITERS[options['format']](options['output'], segment, state['offsets'])
+    
+    scan_kwargs = {
+        'TableName': options['table'],
+        'Segment': segment,
+        'TotalSegments': options['segments'],
+        'ConsistentRead': options['consistent_read'],
+        'ReturnConsumedCapacity': 'TOTAL',
+        'Limit': options['page_size']
+    }
+    if state['lastEvaluatedKey']:
+        scan_kwargs['ExclusiveStartKey'] = state['lastEvaluatedKey']
+    
+    try:
+        while True:
+            response = client.scan(**scan_kwargs)
+            consumed = response.get('ConsumedCapacity', {}).get('CapacityUnits', 0.0)
+            
+            items = [decode_item(raw_item) for raw_item in response.get('Items', [])]
+            refs = [ref for ref in map(description_ref, items) if ref]
+            # Las descripciones de la página juntas; strict: un blob que falta
+            # corta el segmento (BlobNotFound)
+            loaded = load_descriptions(refs, strict=True) if refs else {}
+            
+            rows_by_entity = {}
+            for item in items:
+                item = unpack_item(item, loaded=loaded)
+                rows_by_entity.setdefault(entity_type(item), []).append(item)
+            
+            writer.write_page(state['pages'], rows_by_entity)
+            for entity, rows in rows_by_entity.items():
+                counts[entity] = counts.get(entity, 0) + len(rows)
+            
+            state['pages'] += 1
+            state['items'] += len(response.get('Items', []))
+            state['consumedCapacity'] += consumed
+            state['lastEvaluatedKey'] = response.get('LastEvaluatedKey')
+            state['done'] = state['lastEvaluatedKey'] is None
+            state['offsets'] = writer.offsets()
+            checkpoint.save()
+            
+            _limiter.consume(consumed)
+            if state['done']:
+                break
+            scan_kwargs['ExclusiveStartKey'] = state['lastEvaluatedKey']
+    finally:
+        writer.close()
+    
+    return {'segment': segment, 'skipped': False, 'items': counts, 'pages': state['pages'],
+            'consumedCapacity': state['consumedCapacity']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--table', default=os.environ.get('TABLE_NAME', 'ProjectManagement-dev'))
+    parser.add_argument('--endpoint-url', default=None, help='p.ej. http://localhost:8000 para DynamoDB Local')
+    parser.add_argument('--region', default=os.environ.get('AWS_REGION', os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')))
+    parser.add_argument('--output', required=True, help='Directorio de salida')
+    parser.add_argument('--format', choices=sorted(WRITERS), default='ndjson')
+    parser.add_argument('--segments', type=int, default=8, help='TotalSegments del Scan paralelo')
+    parser.add_argument('--workers', type=int, default=None, help='Workers del pool (default: segments)')
+    parser.add_argument('--pool', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--page-size', type=int, default=1000, help='Limit de cada Scan')
+    parser.add_argument('--max-rcu', type=float, default=0, help='RCU por segundo (0 = sin límite)')
+    parser.add_argument('--consistent-read', action='store_true')
+    parser.add_argument('--resume', action='store_true', help='Retomar desde los checkpoints existentes')
+    parser.add_argument('--blob-store', choices=['local', 's3'], default=os.environ.get('BLOB_STORE'),
+                        help='Store de las descripciones largas (default: BLOB_STORE)')
+    parser.add_argument('--blob-bucket', default=os.environ.get('BLOB_BUCKET'), help='Bucket con --blob-store s3')
+    parser.add_argument('--blob-path', default=os.environ.get('BLOB_PATH', 'blobs'), help='Directorio con --blob-store local')
+    args = parser.parse_args()
+    
+    if not args.blob_store:
+        parser.error('--blob-store (o BLOB_STORE) es requerido: el mismo store que usan las funciones')
+    if args.blob_store == 's3' and not args.blob_bucket:
+        parser.error('--blob-store s3 requiere --blob-bucket (o BLOB_BUCKET)')
+    blob_options = {'bucket': args.blob_bucket} if args.blob_store == 's3' else {'path': args.blob_path}
+    
+    workers = args.workers or args.segments
+    checkpoint_dir = os.path.join(args.output, CHECKPOINT_DIR)
+    if not args.resume and os.path.isdir(checkpoint_dir) and os.listdir(checkpoint_dir):
+        parser.error(f"{args.output} ya tiene checkpoints: usar --resume o un directorio vacío")
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    options = {
+        'table': args.table,
+        'endpoint_url': args.endpoint_url,
+        'region': args.region,
+        'output': args.output,
+        'format': args.format,
+        'segments': args.segments,
+        'page_size': args.page_size,
+        'consistent_read': args.consistent_read,
+        'resume': args.resume,
+    }
+    
+    # Con threads el límite es compartido; con procesos se reparte entre workers
+    if args.pool == 'thread':
+        _init_worker(args.max_rcu, args.blob_store, blob_options)
+        executor = ThreadPoolExecutor(max_workers=workers)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(args.max_rcu / workers, args.blob_store, blob_options))
+    
+    start = time.monotonic()
+    totals = {}
+    consumed = 0.0
+    failed = 0
+    with executor:
+        futures = {executor.submit(export_segment, options, segment): segment for segment in range(args.segments)}
+        for future in as_completed(futures):
+            segment = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"segmento {segment}: error {type(e).__name__}: {e}", file=sys.stderr)
+                continue
+            
+            status = 'ya completo' if result['skipped'] else f"{result['pages']} páginas"
+            print(f"segmento {segment}: {status} {result['items']}", file=sys.stderr)
+            consumed += result['consumedCapacity']
+            for entity, count in result['items'].items():
+                totals[entity] = totals.get(entity, 0) + count
+    
+    elapsed = time.monotonic() - start
+    total_items = sum(totals.values())
+    print(json.dumps({
+        'items': totals,
+        'totalItems': total_items,
+        'consumedCapacity': round(consumed, 1),
+        'seconds': round(elapsed, 2),
+        'itemsPerSecond': round(total_items / elapsed, 1) if elapsed else None,
+        'failedSegments': failed
+    }, indent=2))
+    
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
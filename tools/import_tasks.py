@@ -0,0 +1,409 @@
+"""
+Importación masiva de tareas desde CSV o NDJSON
+
+Cada fila se convierte en un item TASK# con la misma forma que create_task
+(build_task_item) y se escribe con BatchWriteItem desde varios workers. Ante
+throttling (ProvisionedThroughputExceeded, UnprocessedItems) todos los
+workers frenan juntos con un retardo adaptativo que se duplica en cada
+throttle y decae con cada batch limpio.
+
+Columnas / campos reconocidos:
+    title (requerido), description, status, assignedTo, projectId, taskId, createdAt
+
+Los taskId se derivan de forma determinística (uuid5 de proyecto + taskId
+externo o número de fila), así que reimportar o retomar con --resume
+sobrescribe los mismos items en vez de duplicarlos. Al terminar, taskCount
+de cada proyecto se recalcula con un Query COUNT y se fija en un solo update;
+con SHARED_CACHE (utils/shared_cache.py) se invalida además el cache de cada
+proyecto importado.
+
+Las descripciones de más de DESCRIPTION_OFFLOAD_BYTES van al blob store
+(utils/blob_store.py), que tiene que ser el mismo que leen las funciones:
+--blob-store s3 --blob-bucket <bucket> para un despliegue (el bucket
+DescriptionsBucket de la plantilla). Sin --blob-store ni BLOB_STORE el
+import no arranca.
+
+Uso:
+    python tools/import_tasks.py tasks.csv --project-id <id> --created-by <userId> \\
+        --blob-store s3 --blob-bucket <bucket>
+    python tools/import_tasks.py tasks.ndjson --created-by <userId> --workers 16 --resume \\
+        --blob-store local --blob-path blobs
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from ddb_codec import encode_item
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'lambda', 'tasks-create'))
+
+from utils.blob_store import create_blob_store, set_blob_store  # noqa: E402
+from utils.db_utils import build_task_item  # noqa: E402
+from utils.item_codec import ITEM_SCHEMA_VERSION, pack_item, physical_name, stale_name  # noqa: E402
+from utils.shared_cache import invalidate_project  # noqa: E402
+
+BATCH_SIZE = 25
+TASK_ID_NAMESPACE = uuid.UUID('6f1c7c5e-4d3b-4b8e-9a8e-2f5b3c1d9e70')
+THROTTLE_ERRORS = ('ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded')
+VALID_STATUSES = ('pending', 'in_progress', 'completed')
+
+
+class AdaptiveThrottle:
+    """
+    Retardo compartido entre workers
+    
+    Se duplica con cada throttle (hasta max_delay) y decae un 20% con cada
+    batch escrito sin throttling.
+    """
+    
+    def __init__(self, base_delay=0.05, max_delay=20.0):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.delay = 0.0
+        self._lock = threading.Lock()
+    
+    def throttled(self):
+        with self._lock:
+            self.delay = min(self.max_delay, max(self.base_delay, self.delay * 2))
+    
+    def succeeded(self):
+        with self._lock:
+            self.delay = self.delay * 0.8 if self.delay > self.base_delay else 0.0
+    
+    def wait(self):
+        delay = self.delay
+        if delay:
+            time.sleep(delay * random.uniform(0.5, 1.0))
+
+
+class ImportStats:
+    """Contadores del import (thread-safe)"""
+    
+    def __init__(self):
+        self.counters = {'rows': 0, 'written': 0, 'rejected': 0, 'batches': 0,
+                         'throttles': 0, 'unprocessedRetries': 0, 'skippedResumed': 0}
+        self._lock = threading.Lock()
+    
+    def add(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+
+class Checkpoint:
+    """
+    Batches completados del import
+    
+    Persiste el mayor índice de batch tal que todos los anteriores están
+    escritos; al retomar se saltan esos batches.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.committed = -1
+        self.projects = set()
+        self._pending = set()
+        self._lock = threading.Lock()
+    
+    def load(self):
+        if self.path and os.path.exists(self.path):
+            with open(self.path) as f:
+                state = json.load(f)
+            self.committed = state['committedBatch']
+            self.projects = set(state['projects'])
+        return self
+    
+    def complete(self, batch_index):
+        with self._lock:
+            self._pending.add(batch_index)
+            while self.committed + 1 in self._pending:
+                self.committed += 1
+                self._pending.remove(self.committed)
+    
+    def add_projects(self, project_ids):
+        with self._lock:
+            self.projects.update(project_ids)
+    
+    def save(self, done=False):
+        if not self.path:
+            return
+        
+        with self._lock:
+            state = {'committedBatch': self.committed, 'projects': sorted(self.projects), 'done': done}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+
+def read_rows(path, input_format):
+    """Iterar las filas del archivo (o stdin con '-') como dicts"""
+    f = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+    try:
+        if input_format == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def row_to_item(row, row_number, args):
+    """
+    Convertir una fila en un item de tarea
+    
+    Returns:
+        (item, None) o (None, motivo de rechazo)
+    """
+    project_id = (row.get('projectId') or args.project_id or '').strip()
+    if not project_id:
+        return None, 'projectId faltante'
+    
+    title = (row.get('title') or '').strip()
+    if len(title) < 3:
+        return None, 'title faltante o menor a 3 caracteres'
+    
+    status = (row.get('status') or 'pending').strip()
+    if status not in VALID_STATUSES:
+        return None, f'status inválido: {status}'
+    
+    external_id = (row.get('taskId') or '').strip() or f"row-{row_number}"
+    task_id = str(uuid.uuid5(TASK_ID_NAMESPACE, f"{project_id}:{external_id}"))
+    
+    item = build_task_item(
+        task_id=task_id,
+        project_id=project_id,
+        title=title,
+        description=(row.get('description') or '').strip(),
+        status=status,
+        assigned_to=(row.get('assignedTo') or args.created_by).strip(),
+        created_by=args.created_by,
+        timestamp=(row.get('createdAt') or '').strip() or None
+    )
+    return item, None
+
+
+def iter_batches(args, stats, project_exists_cached):
+    """Agrupar las filas válidas en batches numerados de hasta 25 items"""
+    batch = {}
+    batch_index = 0
+    
+    for row_number, row in enumerate(read_rows(args.input, args.format), start=1):
+        stats.add('rows')
+        item, reason = row_to_item(row, row_number, args)
+        if item is not None and not project_exists_cached(item['projectId']):
+            item, reason = None, f"el proyecto {item['projectId']} no existe"
+        if item is None:
+            stats.add('rejected')
+            if stats.counters['rejected'] <= 20:
+                print(f"fila {row_number} rechazada: {reason}", file=sys.stderr)
+            continue
+        
+        # BatchWriteItem no acepta claves repetidas: gana la última fila
+        batch[(item['PK'], item['SK'])] = item
+        if len(batch) == BATCH_SIZE:
+            yield batch_index, list(batch.values())
+            batch = {}
+            batch_index += 1
+    
+    if batch:
+        yield batch_index, list(batch.values())
+
+
+def write_batch(client, table_name, items, throttle, stats, max_attempts):
+    """Escribir un batch reintentando UnprocessedItems y throttling"""
+    requests = [{'PutRequest': {'Item': encode_item(pack_item(item))}} for item in items]
+    
+    for attempt in range(max_attempts):
+        throttle.wait()
+        try:
+            response = client.batch_write_item(RequestItems={table_name: requests})
+        except ClientError as e:
+            if e.response['Error']['Code'] not in THROTTLE_ERRORS:
+                raise
+            stats.add('throttles')
+            throttle.throttled()
+            time.sleep(min(throttle.max_delay, 0.05 * 2 ** attempt) * random.random())
+            continue
+        
+        requests = response.get('UnprocessedItems', {}).get(table_name, [])
+        if not requests:
+            throttle.succeeded()
+            return
+        
+        stats.add('unprocessedRetries')
+        throttle.throttled()
+        time.sleep(min(throttle.max_delay, 0.05 * 2 ** attempt) * random.random())
+    
+    raise RuntimeError(f"{len(requests)} items sin escribir después de {max_attempts} intentos")
+
+
+def fix_task_counts(client, table_name, project_ids):
+    """Recalcular taskCount de cada proyecto con un Query COUNT y un único update"""
+    counts = {}
+    for project_id in sorted(project_ids):
+        total = 0
+        query_kwargs = {
+            'TableName': table_name,
+            'KeyConditionExpression': 'PK = :pk AND begins_with(SK, :task)',
+            'ExpressionAttributeValues': {':pk': {'S': f"PROJECT#{project_id}"}, ':task': {'S': 'TASK#'}},
+            'Select': 'COUNT'
+        }
+        while True:
+            response = client.query(**query_kwargs)
+            total += response['Count']
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        
+        client.update_item(
+            TableName=table_name,
+            Key={'PK': {'S': f"PROJECT#{project_id}"}, 'SK': {'S': 'METADATA'}},
+            UpdateExpression='SET #count = :count REMOVE #stale',
+            ExpressionAttributeNames={'#count': physical_name('taskCount'), '#stale': stale_name('taskCount')},
+            ExpressionAttributeValues={':count': {'N': str(total)}},
+            ConditionExpression='attribute_exists(PK)'
+        )
+        invalidate_project(project_id)
+        counts[project_id] = total
+    return counts
+
+
+def project_exists(client, table_name, project_id):
+    """Verificar que el proyecto destino existe antes de escribirle tareas"""
+    response = client.get_item(
+        TableName=table_name,
+        Key={'PK': {'S': f"PROJECT#{project_id}"}, 'SK': {'S': 'METADATA'}},
+        ProjectionExpression='PK'
+    )
+    return 'Item' in response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help="Archivo CSV/NDJSON o '-' para stdin")
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default=None, help='Default: según extensión')
+    parser.add_argument('--table', default=os.environ.get('TABLE_NAME', 'ProjectManagement-dev'))
+    parser.add_argument('--endpoint-url', default=None, help='p.ej. http://localhost:8000 para DynamoDB Local')
+    parser.add_argument('--region', default=os.environ.get('AWS_REGION', os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')))
+    parser.add_argument('--project-id', default=None, help='Proyecto destino si las filas no traen projectId')
+    parser.add_argument('--created-by', required=True, help='userId que figura como creador')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--max-attempts', type=int, default=12, help='Intentos por batch')
+    parser.add_argument('--checkpoint', default=None, help='Default: <input>.checkpoint.json')
+    parser.add_argument('--resume', action='store_true', help='Saltar los batches ya confirmados')
+    parser.add_argument('--blob-store', choices=['local', 's3'], default=os.environ.get('BLOB_STORE'),
+                        help='Store de las descripciones largas (default: BLOB_STORE)')
+    parser.add_argument('--blob-bucket', default=os.environ.get('BLOB_BUCKET'), help='Bucket con --blob-store s3')
+    parser.add_argument('--blob-path', default=os.environ.get('BLOB_PATH', 'blobs'), help='Directorio con --blob-store local')
+    args = parser.parse_args()
+    
+    args.format = args.format or ('csv' if args.input.endswith('.csv') else 'ndjson')
+    if args.input == '-' and args.resume:
+        parser.error('--resume requiere un archivo de entrada')
+    
+    # Un default silencioso (archivos locales) deja las descripciones largas
+    # donde las funciones desplegadas no las encuentran
+    if ITEM_SCHEMA_VERSION >= 2:
+        if not args.blob_store:
+            parser.error('--blob-store (o BLOB_STORE) es requerido: el mismo store que usan las funciones')
+        if args.blob_store == 's3' and not args.blob_bucket:
+            parser.error('--blob-store s3 requiere --blob-bucket (o BLOB_BUCKET)')
+        set_blob_store(create_blob_store(args.blob_store, **(
+            {'bucket': args.blob_bucket} if args.blob_store == 's3' else {'path': args.blob_path}
+        )))
+    
+    checkpoint_path = args.checkpoint or (args.input + '.checkpoint.json' if args.input != '-' else None)
+    checkpoint = Checkpoint(checkpoint_path)
+    if args.resume:
+        checkpoint.load()
+    
+    client = boto3.client('dynamodb', endpoint_url=args.endpoint_url, region_name=args.region,
+                          config=Config(retries={'max_attempts': 1, 'mode': 'standard'},
+                                        max_pool_connections=args.workers * 2))
+    if args.project_id and not project_exists(client, args.table, args.project_id):
+        parser.error(f"El proyecto {args.project_id} no existe")
+    
+    known_projects = {}
+    
+    def project_exists_cached(project_id):
+        if project_id not in known_projects:
+            known_projects[project_id] = project_exists(client, args.table, project_id)
+        return known_projects[project_id]
+    
+    throttle = AdaptiveThrottle()
+    stats = ImportStats()
+    in_flight = threading.BoundedSemaphore(args.workers * 2)
+    errors = []
+    start = time.monotonic()
+    last_report = start
+    
+    def run(batch_index, items):
+        try:
+            write_batch(client, args.table, items, throttle, stats, args.max_attempts)
+            stats.add('written', len(items))
+            stats.add('batches')
+            checkpoint.complete(batch_index)
+        except Exception as e:
+            errors.append((batch_index, e))
+        finally:
+            in_flight.release()
+    
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for batch_index, items in iter_batches(args, stats, project_exists_cached):
+            if errors:
+                break
+            
+            checkpoint.add_projects(item['projectId'] for item in items)
+            if batch_index <= checkpoint.committed:
+                stats.add('skippedResumed', len(items))
+                continue
+            
+            in_flight.acquire()
+            executor.submit(run, batch_index, items)
+            
+            now = time.monotonic()
+            if now - last_report >= 5:
+                last_report = now
+                checkpoint.save()
+                print(f"{stats.counters['written']} escritas, {stats.counters['written'] / (now - start):.0f} filas/s, "
+                      f"delay {throttle.delay:.2f}s, throttles {stats.counters['throttles']}", file=sys.stderr)
+    
+    checkpoint.save(done=not errors)
+    elapsed = time.monotonic() - start
+    
+    if errors:
+        batch_index, error = errors[0]
+        print(f"Import interrumpido en el batch {batch_index}: {error}. Retomar con --resume.", file=sys.stderr)
+        counts = {}
+    else:
+        counts = fix_task_counts(client, args.table, checkpoint.projects)
+    
+    print(json.dumps({
+        **stats.counters,
+        'seconds': round(elapsed, 2),
+        'rowsPerSecond': round(stats.counters['written'] / elapsed, 1) if elapsed else None,
+        'taskCounts': counts,
+        'failed': bool(errors)
+    }, indent=2))
+    
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,493 @@
+"""
+Generador de carga sintética asíncrono contra la API
+
+Registra (o reutiliza) --users usuarios sintéticos, les asegura un proyecto
+con tareas y después dispara requests con una mezcla ponderada contra
+--base-url: `sam local start-api`, el router (api-router/asgi o un server
+propio) o el stage desplegado.
+
+Las llegadas son de lazo abierto: los instantes de envío se generan de
+antemano como un proceso de Poisson a la tasa pedida y cada request sale a
+su hora aunque los anteriores no hayan terminado. La latencia se mide desde
+el instante programado (no desde que hubo una conexión libre), así que las
+esperas que genera un servidor saturado cuentan y no hay coordinated
+omission. Si el propio generador se atrasa (CPU del cliente), se reporta
+como "atraso".
+
+Cada --interval segundos imprime throughput, p50/p95/p99, requests en vuelo,
+errores por código y throttles (429) de lo que terminó en ese intervalo;
+al final un resumen por operación y, con --output, todas las muestras en
+JSON.
+
+Operaciones para --mix:
+    list_tasks      GET  /projects/{id}/tasks
+    list_projects   GET  /projects
+    get_project     GET  /projects/{id}
+    create_task     POST /projects/{id}/tasks
+    update_task     PUT  /projects/{id}/tasks/{taskId}
+    profile         GET  /auth/me
+
+Uso:
+    python tools/loadgen.py --base-url http://127.0.0.1:3000 --rate 50 --duration 30
+    python tools/loadgen.py --base-url https://<api>.execute-api.us-east-1.amazonaws.com/dev \\
+        --users 200 --stages 100:30,500:60 --mix list_tasks=70,update_task=20,create_task=10 --output run.json
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import math
+import random
+import ssl
+import sys
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+OPERATIONS = {
+    'list_tasks': ('GET', '/projects/{project}/tasks'),
+    'list_projects': ('GET', '/projects'),
+    'get_project': ('GET', '/projects/{project}'),
+    'create_task': ('POST', '/projects/{project}/tasks'),
+    'update_task': ('PUT', '/projects/{project}/tasks/{task}'),
+    'profile': ('GET', '/auth/me'),
+}
+
+DEFAULT_MIX = 'list_tasks=70,update_task=20,create_task=10'
+
+TASK_STATUSES = ['pending', 'in_progress', 'completed']
+
+
+class HttpError(Exception):
+    """Error de transporte (conexión, timeout, respuesta malformada)"""
+
+
+class SetupError(Exception):
+    """No se pudo preparar un usuario sintético"""
+
+
+class HttpClient:
+    """
+    Cliente HTTP/1.1 mínimo sobre asyncio con pool de conexiones keep-alive
+    
+    Solo stdlib: el generador no agrega dependencias. Acepta respuestas con
+    Content-Length, chunked o cerradas por el servidor, y descomprime gzip.
+    """
+    
+    def __init__(self, base_url, max_connections, timeout):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() if url.scheme == 'https' else None
+        self.prefix = url.path.rstrip('/')
+        self.timeout = timeout
+        self._idle = []
+        self._slots = asyncio.Semaphore(max_connections)
+    
+    async def request(self, method, path, body=None, headers=None):
+        """
+        Enviar un request
+        
+        body puede ser un objeto (se envía como JSON) o bytes ya codificados.
+        
+        Returns:
+            (status, headers en minúsculas, body en bytes)
+        """
+        if isinstance(body, bytes):
+            payload = body
+        else:
+            payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        lines = [
+            f"{method} {self.prefix}{path} HTTP/1.1",
+            f"Host: {self.host}",
+            'Accept: application/json',
+            'Accept-Encoding: gzip',
+            'Connection: keep-alive',
+            f"Content-Length: {len(payload)}",
+        ]
+        if body is not None:
+            lines.append('Content-Type: application/json')
+        lines.extend(f"{k}: {v}" for k, v in (headers or {}).items())
+        raw = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + payload
+        
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else None
+            reused = conn is not None
+            
+            while True:
+                if conn is None:
+                    try:
+                        conn = await asyncio.wait_for(
+                            asyncio.open_connection(self.host, self.port, ssl=self.ssl), self.timeout
+                        )
+                    except (OSError, asyncio.TimeoutError) as e:
+                        raise HttpError(f"conexión: {e!r}")
+                
+                try:
+                    status, response_headers, data, keep_alive = await asyncio.wait_for(
+                        self._roundtrip(conn, raw), self.timeout
+                    )
+                except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                    conn[1].close()
+                    conn = None
+                    # Una conexión keep-alive que el servidor ya cerró: reintentar una vez
+                    if reused:
+                        reused = False
+                        continue
+                    raise HttpError(repr(e))
+                except asyncio.TimeoutError:
+                    conn[1].close()
+                    raise HttpError('timeout')
+                
+                if keep_alive:
+                    self._idle.append(conn)
+                else:
+                    conn[1].close()
+                
+                if response_headers.get('content-encoding') == 'gzip':
+                    data = gzip.decompress(data)
+                return status, response_headers, data
+    
+    async def _roundtrip(self, conn, raw):
+        reader, writer = conn
+        writer.write(raw)
+        await writer.drain()
+        
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('conexión cerrada por el servidor')
+        status = int(status_line.split()[1])
+        
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+        
+        if 'content-length' in headers:
+            data = await reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            data = b''.join(chunks)
+        else:
+            data = await reader.read()
+            headers['connection'] = 'close'
+        
+        return status, headers, data, headers.get('connection', '').lower() != 'close'
+    
+    def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+def _json(data):
+    try:
+        return json.loads(data or b'{}')
+    except ValueError:
+        return {}
+
+
+# ==================== SETUP ====================
+
+async def prepare_user(client, index, args):
+    """
+    Registrar (o loguear) un usuario sintético y asegurarle un proyecto con tareas
+    
+    Returns:
+        dict con token, proyectos y tareas por proyecto
+    """
+    email = f"{args.user_prefix}-{index}@example.com"
+    credentials = {'email': email, 'password': args.password}
+    
+    await client.request('POST', '/auth/register', dict(credentials, name=f"Carga {index}"))
+    status, _, data = await client.request('POST', '/auth/login', credentials)
+    if status != 200:
+        raise SetupError(f"Login de {email} falló ({status}): {data[:200]!r}")
+    
+    token = _json(data)['data']['token']
+    auth = {'Authorization': f"Bearer {token}"}
+    
+    _, _, data = await client.request('GET', '/projects', headers=auth)
+    projects = [p['projectId'] for p in _json(data).get('data', {}).get('projects', [])]
+    if not projects:
+        _, _, data = await client.request('POST', '/projects', {'name': f"Proyecto de carga {index}"}, auth)
+        projects = [_json(data)['data']['project']['projectId']]
+    
+    tasks = {}
+    for project_id in projects[:args.projects_per_user]:
+        _, _, data = await client.request('GET', f"/projects/{project_id}/tasks", headers=auth)
+        task_ids = [t['taskId'] for t in _json(data).get('data', {}).get('tasks', [])]
+        
+        for i in range(len(task_ids), args.seed_tasks):
+            _, _, data = await client.request(
+                'POST', f"/projects/{project_id}/tasks", {'title': f"Tarea de carga {i}"}, auth
+            )
+            task = _json(data).get('data', {}).get('task')
+            if task:
+                task_ids.append(task['taskId'])
+        tasks[project_id] = task_ids
+    
+    return {'auth': auth, 'projects': list(tasks), 'tasks': tasks}
+
+
+async def prepare_users(client, args):
+    semaphore = asyncio.Semaphore(args.setup_concurrency)
+    
+    async def one(index):
+        async with semaphore:
+            return await prepare_user(client, index, args)
+    
+    return await asyncio.gather(*(one(i) for i in range(args.users)))
+
+
+# ==================== CARGA ====================
+
+def parse_mix(text):
+    """'list_tasks=70,update_task=20' -> ([operaciones], [pesos])"""
+    operations, weights = [], []
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise SystemExit(f"Operación desconocida en --mix: {name} (válidas: {', '.join(OPERATIONS)})")
+        operations.append(name)
+        weights.append(float(weight or 1))
+    return operations, weights
+
+
+def parse_stages(args):
+    """--stages '100:30,500:60' (req/s:segundos) o --rate/--duration"""
+    if not args.stages:
+        return [(args.rate, args.duration)]
+    return [tuple(float(x) for x in stage.split(':')) for stage in args.stages.split(',')]
+
+
+def arrival_offsets(stages, rng):
+    """Instantes de llegada (s desde el inicio) de un proceso de Poisson por etapa"""
+    offsets, start = [], 0.0
+    for rate, duration in stages:
+        t = start
+        while True:
+            t += rng.expovariate(rate)
+            if t >= start + duration:
+                break
+            offsets.append(t)
+        start += duration
+    return offsets
+
+
+def build_request(operation, user, rng):
+    method, template = OPERATIONS[operation]
+    project_id = rng.choice(user['projects'])
+    task_ids = user['tasks'].get(project_id) or []
+    
+    if operation == 'update_task' and not task_ids:
+        operation, (method, template) = 'list_tasks', OPERATIONS['list_tasks']
+    
+    path = template.format(project=project_id, task=rng.choice(task_ids) if task_ids else '')
+    body = None
+    if operation == 'create_task':
+        body = {'title': f"Tarea sintética {rng.getrandbits(32):08x}", 'description': 'Generada por loadgen'}
+    elif operation == 'update_task':
+        body = {'status': rng.choice(TASK_STATUSES)}
+    return method, path, body, project_id
+
+
+async def fire(client, operation, user, rng, scheduled, origin, samples, inflight, args):
+    """Enviar un request programado y registrar su muestra"""
+    method, path, body, project_id = build_request(operation, user, rng)
+    lag = time.perf_counter() - (origin + scheduled)
+    sample = {'t': scheduled, 'op': operation, 'lagMs': lag * 1000}
+    
+    if inflight[0] >= args.max_inflight:
+        sample.update(status=0, error='CLIENT_OVERLOAD', latencyMs=None, done=scheduled + lag)
+        samples.append(sample)
+        return
+    
+    inflight[0] += 1
+    try:
+        status, _, data = await client.request(method, path, body, user['auth'])
+        sample['status'] = status
+        if status >= 400:
+            sample['error'] = _json(data).get('errorCode') or f"HTTP_{status}"
+        elif operation == 'create_task':
+            task = _json(data).get('data', {}).get('task')
+            if task:
+                user['tasks'].setdefault(project_id, []).append(task['taskId'])
+    except HttpError as e:
+        sample.update(status=0, error='TIMEOUT' if str(e) == 'timeout' else 'CONNECTION_ERROR')
+    finally:
+        inflight[0] -= 1
+    
+    # Desde el instante programado: incluye la espera por conexión libre
+    done = time.perf_counter() - origin
+    sample['latencyMs'] = (done - scheduled) * 1000
+    sample['done'] = done
+    samples.append(sample)
+
+
+async def run_load(client, users, args):
+    operations, weights = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    offsets = arrival_offsets(parse_stages(args), rng)
+    samples, inflight, pending = [], [0], []
+    printed = [0.0]
+    
+    reporter = asyncio.create_task(report_windows(samples, args.interval, printed, inflight))
+    origin = time.perf_counter()
+    
+    for scheduled in offsets:
+        delay = origin + scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        operation = rng.choices(operations, weights)[0]
+        pending.append(asyncio.create_task(
+            fire(client, operation, rng.choice(users), rng, scheduled, origin, samples, inflight, args)
+        ))
+    
+    await asyncio.gather(*pending)
+    reporter.cancel()
+    
+    # Ventanas que el reporter no llegó a imprimir
+    end = max((s['done'] for s in samples), default=0)
+    while printed[0] <= end:
+        print_window(samples, printed[0], args.interval, 0)
+        printed[0] += args.interval
+    return samples
+
+
+# ==================== REPORTES ====================
+
+def percentile(values, pct):
+    """Percentil por rango más cercano"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)] if ordered else None
+
+
+def _fmt(value):
+    return '-' if value is None else f"{value:.1f}"
+
+
+def summarize(samples, duration):
+    latencies = [s['latencyMs'] for s in samples if s.get('latencyMs') is not None]
+    errors = Counter(s['error'] for s in samples if 'error' in s)
+    return {
+        'requests': len(samples),
+        'throughput': len(samples) / duration if duration else None,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'max': max(latencies) if latencies else None,
+        'errors': dict(errors),
+        'throttles': sum(1 for s in samples if s.get('status') == 429),
+        'lagP99': percentile([s['lagMs'] for s in samples], 99),
+    }
+
+
+def print_window(samples, start, interval, inflight):
+    """Una línea con los requests que terminaron en [start, start + interval)"""
+    window = [s for s in samples if start <= s['done'] < start + interval]
+    stats = summarize(window, interval)
+    errors = ', '.join(f"{code} {n}" for code, n in sorted(stats['errors'].items())) or '-'
+    print(f"[{start:>6.0f}s] {stats['throughput']:>7.1f} req/s  p50 {_fmt(stats['p50']):>7}  "
+          f"p95 {_fmt(stats['p95']):>7}  p99 {_fmt(stats['p99']):>7} ms  en vuelo {inflight:>5}  "
+          f"throttles {stats['throttles']:>4}  atraso p99 {_fmt(stats['lagP99'])} ms  errores {errors}", flush=True)
+
+
+async def report_windows(samples, interval, printed, inflight):
+    """
+    Imprimir cada ventana apenas termina
+    
+    Las ventanas agrupan por instante de finalización (lo que el servidor
+    está devolviendo ahora); la latencia de cada muestra sigue contando
+    desde su instante programado. printed[0] es el inicio de la próxima
+    ventana a imprimir; run_load imprime las que queden al terminar.
+    """
+    origin = time.perf_counter()
+    while True:
+        await asyncio.sleep(max(0, origin + printed[0] + interval - time.perf_counter()))
+        print_window(samples, printed[0], interval, inflight[0])
+        printed[0] += interval
+
+
+def print_summary(samples, duration):
+    by_operation = defaultdict(list)
+    for sample in samples:
+        by_operation[sample['op']].append(sample)
+    
+    print(f"\n{'operación':<16}{'req':>8}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  errores")
+    for operation, group in sorted(by_operation.items()) + [('TOTAL', samples)]:
+        stats = summarize(group, duration)
+        errors = ', '.join(f"{code} {n}" for code, n in sorted(stats['errors'].items())) or '-'
+        print(f"{operation:<16}{stats['requests']:>8}{stats['throughput']:>9.1f}{_fmt(stats['p50']):>9}"
+              f"{_fmt(stats['p95']):>9}{_fmt(stats['p99']):>9}{_fmt(stats['max']):>9}  {errors}")
+
+
+async def main_async(args):
+    client = HttpClient(args.base_url, args.connections, args.timeout)
+    try:
+        start = time.perf_counter()
+        users = await prepare_users(client, args)
+        print(f"{len(users)} usuarios listos en {time.perf_counter() - start:.1f} s", flush=True)
+        
+        samples = await run_load(client, users, args)
+        # Hasta la última respuesta: si el servidor se atrasó, la carga dura más que las etapas
+        duration = max((s['done'] for s in samples), default=0)
+        print_summary(samples, duration)
+        
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump({
+                    'baseUrl': args.base_url,
+                    'stages': parse_stages(args),
+                    'mix': args.mix,
+                    'summary': summarize(samples, duration),
+                    'samples': samples,
+                }, f)
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', required=True, help='p.ej. http://127.0.0.1:3000 o la URL del stage')
+    parser.add_argument('--rate', type=float, default=50, help='Requests por segundo (llegadas de Poisson)')
+    parser.add_argument('--duration', type=float, default=30, help='Segundos de carga')
+    parser.add_argument('--stages', help='Etapas "tasa:segundos,..." (reemplaza --rate/--duration)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"Pesos por operación (default {DEFAULT_MIX})")
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--user-prefix', default='loadgen', help='Los emails son <prefix>-<n>@example.com')
+    parser.add_argument('--password', default='loadgen-password')
+    parser.add_argument('--projects-per-user', type=int, default=1)
+    parser.add_argument('--seed-tasks', type=int, default=20, help='Tareas mínimas por proyecto antes de la carga')
+    parser.add_argument('--connections', type=int, default=200, help='Conexiones simultáneas máximas')
+    parser.add_argument('--max-inflight', type=int, default=5000,
+                        help='Requests en vuelo antes de descartar llegadas (CLIENT_OVERLOAD)')
+    parser.add_argument('--setup-concurrency', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--interval', type=float, default=5, help='Segundos por ventana del reporte')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Guardar resumen y muestras en este archivo JSON')
+    args = parser.parse_args()
+    
+    try:
+        asyncio.run(main_async(args))
+    except SetupError as e:
+        raise SystemExit(str(e))
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+
+if __name__ == '__main__':
+    main()
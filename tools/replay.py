@@ -0,0 +1,500 @@
+"""
+Replay acelerado del tráfico capturado con CAPTURE=true (utils/capture.py)
+
+`run` reproduce las capturas respetando los intervalos entre llegadas,
+divididos por --speed (1× tiempo real, 50× cincuenta veces más rápido):
+
+    en proceso (default)  importa api-router de --src e invoca lambda_handler;
+                          cuenta las llamadas a DynamoDB con
+                          benchmarks/ddb_calls.py (sirve para cualquier versión
+                          del código). Los requests corren uno a la vez: si
+                          uno se atrasa, los siguientes salen tarde y el
+                          atraso queda en "lagMs", no en la latencia.
+    --url                 envía los requests por HTTP con llegadas de lazo
+                          abierto (como loadgen.py); la latencia se mide
+                          desde el instante programado. Sin conteo de
+                          llamadas a DynamoDB.
+
+Los tokens capturados se reemplazan por uno nuevo firmado con el
+JWT_SECRET del destino (--jwt-secret o el del entorno) para el mismo
+usuario; los que eran inválidos se envían inválidos. Los passwords
+redactados se reemplazan por --password; con --reset-passwords se asigna
+ese password, antes del replay, a los usuarios de los logins capturados.
+Hacerlo solo contra una copia de la tabla: el replay escribe (crea, edita y
+borra lo mismo que el tráfico original).
+
+`diff` compara dos corridas sobre la misma captura: latencia p50/p95 y
+llamadas a DynamoDB por ruta, y los requests cuyo status cambió.
+
+Uso:
+    # Capturar (en local: sam local start-api con CAPTURE=true CAPTURE_PATH=/tmp/capture.ndjson)
+    aws logs tail /aws/lambda/api-router-dev --since 1h > captura.log
+    python tools/replay.py run captura.log --table copia-dev --reset-passwords --speed 10 --output antes.json
+    git worktree add /tmp/nueva <commit>
+    python tools/replay.py run captura.log --src /tmp/nueva/src/lambda --table copia-dev --speed 10 --output despues.json
+    python tools/replay.py diff antes.json despues.json
+    python tools/replay.py run captura.log --url https://<api>.execute-api.us-east-1.amazonaws.com/dev \\
+        --jwt-secret <secret> --speed 20 --output stage.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlencode
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DEFAULT_SRC = os.path.join(ROOT, 'src', 'lambda')
+
+# El mismo valor que utils.capture.REDACTED (definido acá para poder hacer
+# replay contra versiones del código anteriores a la captura)
+REDACTED = '<redacted>'
+
+INVALID_TOKEN = 'invalid.replay.token'
+
+# Headers que arma el cliente HTTP
+CLIENT_HEADERS = {'host', 'content-length', 'connection', 'accept-encoding', 'content-encoding', 'content-type'}
+
+
+def parse_captures(lines):
+    """Generar las capturas (dicts con "type": "capture") de NDJSON o de un log"""
+    for line in lines:
+        start = line.find('{')
+        if start < 0 or '"capture"' not in line:
+            continue
+        try:
+            record = json.loads(line[start:])
+        except ValueError:
+            continue
+        if isinstance(record, dict) and record.get('type') == 'capture':
+            yield record
+
+
+def load_captures(paths, routes=None, limit=None):
+    records = []
+    for path in paths:
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8', errors='replace')
+        with stream:
+            records.extend(parse_captures(stream))
+    
+    if routes:
+        records = [r for r in records if any(route in r['route'] for route in routes)]
+    records.sort(key=lambda r: r['ts'])
+    return records[:limit] if limit else records
+
+
+class LambdaContext:
+    def __init__(self, index):
+        self.function_name = 'replay'
+        self.aws_request_id = f"replay-{index}"
+    
+    def get_remaining_time_in_millis(self):
+        return 30000
+
+
+class TokenSigner:
+    """Un token nuevo por usuario capturado, firmado con el secreto del destino"""
+    
+    def __init__(self, generate_token):
+        self.generate_token = generate_token
+        self.tokens = {}
+    
+    def header(self, auth):
+        if not auth.get('valid') or not auth.get('userId'):
+            return f"Bearer {INVALID_TOKEN}"
+        
+        user_id = auth['userId']
+        if user_id not in self.tokens:
+            self.tokens[user_id] = self.generate_token({
+                'userId': user_id,
+                'email': auth.get('email', ''),
+                'name': auth.get('name', ''),
+            })
+        return f"Bearer {self.tokens[user_id]}"
+
+
+def _restore_passwords(value, password):
+    if isinstance(value, dict):
+        return {
+            key: password if item == REDACTED and 'password' in key.lower() else _restore_passwords(item, password)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_restore_passwords(item, password) for item in value]
+    return value
+
+
+def build_event(record, signer, password):
+    """Evento de API Gateway listo para el handler a partir de una captura"""
+    captured = record['event']
+    event = {key: value for key, value in captured.items() if key != 'auth'}
+    event['headers'] = dict(captured.get('headers') or {})
+    event['requestContext'] = {'requestId': f"replay-{record['ts']}"}
+    
+    if 'auth' in captured:
+        event['headers']['Authorization'] = signer.header(captured['auth'])
+    
+    body = captured.get('body')
+    if body and REDACTED in body and not captured.get('isBase64Encoded'):
+        try:
+            event['body'] = json.dumps(_restore_passwords(json.loads(body), password))
+        except ValueError:
+            pass
+    return event
+
+
+def load_target(src, args):
+    """
+    Importar api-router de src: todas las rutas en un proceso, con el mismo
+    código (handlers/ y utils/) que cada función
+    
+    Returns:
+        (lambda_handler, módulo utils.auth_utils)
+    """
+    if args.jwt_secret:
+        os.environ['JWT_SECRET'] = args.jwt_secret
+    if args.table:
+        os.environ['TABLE_NAME'] = args.table
+    if args.endpoint_url:
+        os.environ['AWS_ENDPOINT_URL_DYNAMODB'] = args.endpoint_url
+    os.environ.setdefault('METRICS_ENABLED', 'false')
+    os.environ['CAPTURE'] = 'false'
+    os.environ['PROFILE'] = 'false'
+    os.environ['PROFILE_SECRET'] = ''
+    
+    sys.path.insert(0, os.path.join(os.path.abspath(src), 'api-router'))
+    import app
+    from utils import auth_utils
+    return app.lambda_handler, auth_utils
+
+
+def reset_passwords(records, password):
+    """Asignar el password de replay a los usuarios de los logins capturados"""
+    from utils.auth_utils import hash_password
+    from utils.db_utils import get_table, get_user_by_email
+    from utils.item_codec import physical_name, stale_name
+    
+    emails = set()
+    for record in records:
+        if record['event'].get('path', '').rstrip('/').endswith('/auth/login') and record['event'].get('body'):
+            try:
+                emails.add(json.loads(record['event']['body']).get('email'))
+            except ValueError:
+                pass
+    
+    table = get_table()
+    hashed = hash_password(password)
+    updated = 0
+    for email in filter(None, emails):
+        user = get_user_by_email(email)
+        if user:
+            table.update_item(
+                Key={'PK': user['PK'], 'SK': user['SK']},
+                UpdateExpression='SET #password = :p REMOVE #stale',
+                ExpressionAttributeNames={'#password': physical_name('password'), '#stale': stale_name('password')},
+                ExpressionAttributeValues={':p': hashed},
+            )
+            updated += 1
+    print(f"Password de replay asignado a {updated} de {len(emails)} usuarios", flush=True)
+
+
+def _result(index, record, event):
+    return {
+        'i': index,
+        'route': record['route'],
+        'method': event.get('httpMethod'),
+        'path': event.get('path'),
+        'capturedStatus': record.get('statusCode'),
+        'capturedMs': record.get('durationMs'),
+        'capturedCalls': record.get('ddbCalls'),
+    }
+
+
+def install_recorder():
+    """
+    Contar llamadas a DynamoDB con benchmarks/ddb_calls.py (antes de que se
+    cree el primer cliente de boto3)
+    """
+    sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+    from ddb_calls import CallRecorder
+    return CallRecorder().install()
+
+
+def replay_in_process(records, handler, signer, recorder, args):
+    results = []
+    t0 = records[0]['ts']
+    origin = time.perf_counter()
+    
+    for index, record in enumerate(records):
+        scheduled = origin + (record['ts'] - t0) / args.speed
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        
+        event = build_event(record, signer, args.password)
+        result = _result(index, record, event)
+        recorder.reset()
+        
+        start = time.perf_counter()
+        response = handler(event, LambdaContext(index))
+        end = time.perf_counter()
+        
+        usage = recorder.snapshot()
+        result.update(
+            status=response.get('statusCode'),
+            latencyMs=(end - start) * 1000,
+            lagMs=max(0.0, start - scheduled) * 1000,
+            ddbCalls=usage['calls'],
+            operations=usage['operations'],
+        )
+        results.append(result)
+        
+        if args.progress and (index + 1) % args.progress == 0:
+            print(f"{index + 1}/{len(records)}", flush=True)
+    return results
+
+
+async def replay_url(records, signer, args):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from loadgen import HttpClient, HttpError
+    
+    client = HttpClient(args.url, args.connections, args.timeout)
+    results = [None] * len(records)
+    t0 = records[0]['ts']
+    
+    async def send(index, record, scheduled):
+        event = build_event(record, signer, args.password)
+        result = _result(index, record, event)
+        headers = {k: v for k, v in event['headers'].items() if k.lower() not in CLIENT_HEADERS}
+        path = event['path']
+        if event.get('queryStringParameters'):
+            path += '?' + urlencode(event['queryStringParameters'])
+        body = event['body'].encode('utf-8') if event.get('body') else None
+        
+        result['lagMs'] = max(0.0, time.perf_counter() - scheduled) * 1000
+        try:
+            status, _, _ = await client.request(event['httpMethod'], path, body, headers)
+        except HttpError as e:
+            status = f"error: {e}"
+        result.update(status=status, latencyMs=(time.perf_counter() - scheduled) * 1000)
+        results[index] = result
+    
+    try:
+        origin = time.perf_counter()
+        pending = []
+        for index, record in enumerate(records):
+            scheduled = origin + (record['ts'] - t0) / args.speed
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            pending.append(asyncio.create_task(send(index, record, scheduled)))
+        await asyncio.gather(*pending)
+    finally:
+        client.close()
+    return results
+
+
+# ==================== REPORTES ====================
+
+def percentile(values, pct):
+    """Percentil por rango más cercano"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)] if ordered else None
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else None
+
+
+def _fmt(value, spec='.1f'):
+    return '-' if value is None else format(value, spec)
+
+
+def summarize(results):
+    """Resumen por ruta de una corrida"""
+    by_route = defaultdict(list)
+    for result in results:
+        by_route[result['route']].append(result)
+    
+    summary = {}
+    for route, group in sorted(by_route.items()):
+        latencies = [r['latencyMs'] for r in group]
+        calls = [r['ddbCalls'] for r in group if r.get('ddbCalls') is not None]
+        summary[route] = {
+            'requests': len(group),
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'ddbCallsMean': _mean(calls),
+            'statuses': dict(Counter(str(r['status']) for r in group)),
+            'statusChanges': sum(1 for r in group if r['status'] != r['capturedStatus']),
+        }
+    return summary
+
+
+def print_summary(summary):
+    print(f"{'ruta':<44}{'req':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'llamadas':>10}  {'≠ captura':>10}  status")
+    for route, data in summary.items():
+        statuses = ', '.join(f"{code} {n}" for code, n in sorted(data['statuses'].items()))
+        print(f"{route:<44}{data['requests']:>6}{_fmt(data['p50']):>9}{_fmt(data['p95']):>9}"
+              f"{_fmt(data['p99']):>9}{_fmt(data['ddbCallsMean'], '.2f'):>10}  {data['statusChanges']:>10}  {statuses}")
+
+
+def _delta(before, after):
+    if before is None or after is None:
+        return '-'
+    if not before:
+        return f"{after - before:+.2f}"
+    return f"{100 * (after - before) / before:+.0f}%"
+
+
+def diff_runs(before, after):
+    """
+    Comparar dos corridas de la misma captura
+    
+    Returns:
+        dict con el resumen por ruta de cada corrida y los requests cuyo
+        status o cantidad de llamadas cambió
+    """
+    if before['captures'] != after['captures']:
+        print(f"Aviso: las corridas tienen distinta cantidad de capturas "
+              f"({before['captures']} y {after['captures']})", file=sys.stderr)
+    
+    paired = list(zip(before['results'], after['results']))
+    return {
+        'before': {'commit': before.get('commit'), 'target': before.get('target'), 'routes': summarize(before['results'])},
+        'after': {'commit': after.get('commit'), 'target': after.get('target'), 'routes': summarize(after['results'])},
+        'statusChanges': [
+            {'i': a['i'], 'method': a['method'], 'path': a['path'], 'before': a['status'], 'after': b['status']}
+            for a, b in paired if a['status'] != b['status']
+        ],
+        'callChanges': [
+            {'i': a['i'], 'route': a['route'], 'before': a['ddbCalls'], 'after': b['ddbCalls']}
+            for a, b in paired
+            if a.get('ddbCalls') is not None and b.get('ddbCalls') is not None and a['ddbCalls'] != b['ddbCalls']
+        ],
+    }
+
+
+def print_diff(diff):
+    before, after = diff['before'], diff['after']
+    print(f"antes: {before['commit'] or '?'} ({before['target']})  después: {after['commit'] or '?'} ({after['target']})\n")
+    print(f"{'ruta':<44}{'req':>6}{'p50 antes':>11}{'después':>9}{'Δ':>7}{'p95 antes':>11}{'después':>9}{'Δ':>7}"
+          f"{'llamadas':>10}{'después':>9}{'Δ':>7}")
+    for route in sorted(set(before['routes']) | set(after['routes'])):
+        a = before['routes'].get(route, {})
+        b = after['routes'].get(route, {})
+        print(f"{route:<44}{b.get('requests', 0):>6}"
+              f"{_fmt(a.get('p50')):>11}{_fmt(b.get('p50')):>9}{_delta(a.get('p50'), b.get('p50')):>7}"
+              f"{_fmt(a.get('p95')):>11}{_fmt(b.get('p95')):>9}{_delta(a.get('p95'), b.get('p95')):>7}"
+              f"{_fmt(a.get('ddbCallsMean'), '.2f'):>10}{_fmt(b.get('ddbCallsMean'), '.2f'):>9}"
+              f"{_delta(a.get('ddbCallsMean'), b.get('ddbCallsMean')):>7}")
+    
+    changes = diff['statusChanges']
+    print(f"\n{len(changes)} requests cambiaron de status")
+    for change in changes[:20]:
+        print(f"  #{change['i']} {change['method']} {change['path']}: {change['before']} -> {change['after']}")
+    print(f"{len(diff['callChanges'])} requests cambiaron la cantidad de llamadas a DynamoDB")
+
+
+def git_commit(path):
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=path).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def cmd_run(args):
+    if args.speed <= 0:
+        raise SystemExit('--speed debe ser mayor que 0')
+    
+    records = load_captures(args.captures, args.routes.split(',') if args.routes else None, args.limit)
+    if not records:
+        raise SystemExit('No se encontraron capturas')
+    
+    span = records[-1]['ts'] - records[0]['ts']
+    print(f"{len(records)} capturas en {span:.1f} s; replay a {args.speed:g}x: ~{span / args.speed:.1f} s", flush=True)
+    
+    recorder = None if args.url else install_recorder()
+    handler, auth_utils = load_target(args.src, args)
+    signer = TokenSigner(auth_utils.generate_token)
+    if args.reset_passwords:
+        reset_passwords(records, args.password)
+    
+    if args.url:
+        results = asyncio.run(replay_url(records, signer, args))
+    else:
+        results = replay_in_process(records, handler, signer, recorder, args)
+    
+    summary = summarize(results)
+    print_summary(summary)
+    
+    lag = percentile([r['lagMs'] for r in results], 99)
+    print(f"\natraso p99 respecto del plan: {_fmt(lag)} ms")
+    
+    with open(args.output, 'w') as f:
+        json.dump({
+            'captures': len(records),
+            'speed': args.speed,
+            'target': args.url or 'in-process',
+            'src': os.path.abspath(args.src),
+            'commit': git_commit(args.src),
+            'summary': summary,
+            'results': results,
+        }, f)
+
+
+def cmd_diff(args):
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    
+    diff = diff_runs(before, after)
+    if args.json:
+        print(json.dumps(diff, indent=2))
+    else:
+        print_diff(diff)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run = commands.add_parser('run', help='Reproducir capturas')
+    run.add_argument('captures', nargs='+', help='NDJSON de CAPTURE_PATH o logs con líneas "type": "capture" (- = stdin)')
+    run.add_argument('--output', required=True, help='Archivo JSON con los resultados')
+    run.add_argument('--speed', type=float, default=1, help='Factor de aceleración (1 a 50)')
+    run.add_argument('--src', default=DEFAULT_SRC, help='src/lambda de la versión del código a probar')
+    run.add_argument('--url', help='Enviar por HTTP a esta URL en lugar de invocar en proceso')
+    run.add_argument('--jwt-secret', help='JWT_SECRET del destino (default: el del entorno)')
+    run.add_argument('--password', default='replay-password', help='Reemplazo de los passwords redactados')
+    run.add_argument('--reset-passwords', action='store_true',
+                     help='Asignar --password a los usuarios de los logins capturados (solo en una copia de la tabla)')
+    run.add_argument('--table', help='Tabla destino (TABLE_NAME) para el replay en proceso y --reset-passwords')
+    run.add_argument('--endpoint-url', help='Endpoint de DynamoDB (p.ej. DynamoDB Local)')
+    run.add_argument('--routes', help='Solo estas rutas (subcadenas de "módulo:función", separadas por coma)')
+    run.add_argument('--limit', type=int, help='Solo las primeras N capturas')
+    run.add_argument('--connections', type=int, default=100, help='Conexiones simultáneas con --url')
+    run.add_argument('--timeout', type=float, default=30)
+    run.add_argument('--progress', type=int, default=0, help='Imprimir el avance cada N requests')
+    run.set_defaults(func=cmd_run)
+    
+    diff = commands.add_parser('diff', help='Comparar dos corridas')
+    diff.add_argument('before')
+    diff.add_argument('after')
+    diff.add_argument('--json', action='store_true', help='Imprimir la comparación como JSON')
+    diff.set_defaults(func=cmd_diff)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()